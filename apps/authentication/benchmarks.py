@@ -0,0 +1,68 @@
+from apps.authentication.models.UserModel import User
+from apps.authentication.repositories.UserRepository import UserRepository
+from apps.authentication.services.UserService import AuthService
+from apps.monitoring.services.BenchmarkService import benchmark
+
+# Cases for `manage.py benchmark`; each returns the call to time, see BenchmarkService.benchmark
+# Password hashing dominates create_user and authenticate_user by design.
+
+
+@benchmark(UserRepository, 'create_user')
+def create_user(data):
+    repository = UserRepository()
+    return lambda: repository.create_user('bench-new', 'bench-password', 'bench-new@example.com')
+
+
+@benchmark(UserRepository, 'get_user_by_username')
+def get_user_by_username(data):
+    repository = UserRepository()
+    return lambda: repository.get_user_by_username(data.user.username)
+
+
+@benchmark(UserRepository, 'get_user_by_email')
+def get_user_by_email(data):
+    repository = UserRepository()
+    return lambda: repository.get_user_by_email(data.user.email)
+
+
+@benchmark(UserRepository, 'get_user_by_id')
+def get_user_by_id(data):
+    repository = UserRepository()
+    return lambda: repository.get_user_by_id(data.user.id)
+
+
+@benchmark(UserRepository, 'update_user')
+def update_user(data):
+    repository = UserRepository()
+    user = User.objects.get(id=data.user.id)
+    return lambda: repository.update_user(user, first_name='Bench')
+
+
+@benchmark(UserRepository, 'update_user_fields')
+def update_user_fields(data):
+    repository = UserRepository()
+    return lambda: repository.update_user_fields(data.user.id, first_name='Bench')
+
+
+@benchmark(UserRepository, 'bulk_update_user_fields')
+def bulk_update_user_fields(data):
+    repository = UserRepository()
+    return lambda: repository.bulk_update_user_fields(data.user_ids[:100], first_name='Bench')
+
+
+@benchmark(UserRepository, 'authenticate_user')
+def authenticate_user(data):
+    repository = UserRepository()
+    return lambda: repository.authenticate_user(data.admin.username, 'bench-admin')
+
+
+@benchmark(AuthService, 'update_user')
+def service_update_user(data):
+    service = AuthService(UserRepository())
+    return lambda: service.update_user(data.admin, data.user.id, first_name='Bench')
+
+
+@benchmark(AuthService, 'delete_user')
+def delete_user(data):
+    service = AuthService(UserRepository())
+    return lambda: service.delete_user(data.admin, data.user.id)
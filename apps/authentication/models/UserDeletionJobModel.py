@@ -0,0 +1,36 @@
+from django.db import models
+from django.db.models import Q
+
+class UserDeletionJob(models.Model):
+    """
+    Model tracking the background deletion of a user and their history.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    )
+
+    user_id = models.BigIntegerField()  # Not a foreign key: the job outlives the user
+    username = models.CharField(max_length=150)
+    requested_by_id = models.BigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    step = models.PositiveSmallIntegerField(default=0)  # Index of the current step in DELETION_STEPS
+    deleted_rows = models.JSONField(default=dict)  # Rows deleted so far, per step
+    worker_token = models.CharField(max_length=32, blank=True, default='')  # Set by the worker that claimed the job
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)  # Bumped by every batch; a stale heartbeat means the worker died
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user_id'], condition=Q(status__in=['pending', 'running']), name='user_deletion_job_active_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'heartbeat_at'], name='user_deletion_job_status_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Deletion of {self.username} ({self.user_id}): {self.status}'
@@ -1,2 +1,3 @@
 
 from .UserModel import User
+from .UserDeletionJobModel import UserDeletionJob
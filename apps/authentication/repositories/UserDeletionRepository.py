@@ -0,0 +1,175 @@
+import uuid
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional, Tuple, Type
+from django.db import IntegrityError, router, transaction # type: ignore
+from django.db.models import Q, QuerySet # type: ignore
+from django.utils.timezone import now # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.authentication.models.UserDeletionJobModel import UserDeletionJob
+from apps.billing.models.BalanceModel import UserBalance
+from apps.billing.models.BillAdjustmentModel import BillAdjustment
+from apps.billing.models.BillingModel import Bill
+from apps.billing.models.TariffModel import TariffAssignment
+from apps.consumption.models.ArchivedBillLinkModel import ArchivedBillLink
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.DirtyPeriodModel import DirtyPeriod
+from apps.consumption.models.IntervalReadingModel import IntervalReading
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.invoices.models.InvoiceModel import Invoice
+
+
+class DeletionStep(NamedTuple):
+    """
+    One table of a user's history, deleted in batches before the tables it references, or data
+    outside the database removed by `purge` in one go.
+    """
+    label: str
+    rows: Optional[Callable[[int], QuerySet]] = None
+    purge: Optional[Callable[[int], int]] = None  # Returns the number of records removed
+
+
+# Dependency order: link tables and children before the rows they point to, the user last.
+# Dirty periods go first so re-billing cannot recreate bills while the job runs.
+DELETION_STEPS: List[DeletionStep] = [
+    DeletionStep('dirty_periods', lambda user_id: DirtyPeriod.objects.filter(user_id=user_id)),
+    DeletionStep('quarantined_readings', lambda user_id: QuarantinedReading.objects.filter(user_id=user_id)),
+    DeletionStep('invoice_bills', lambda user_id: Invoice.bills.through.objects.filter(Q(invoice__user_id=user_id) | Q(bill__user_id=user_id))),
+    DeletionStep('bill_consumptions', lambda user_id: Bill.consumption.through.objects.filter(Q(bill__user_id=user_id) | Q(consumption__user_id=user_id))),
+    DeletionStep('bill_adjustments', lambda user_id: BillAdjustment.objects.filter(bill__user_id=user_id)),
+    DeletionStep('invoices', lambda user_id: Invoice.objects.filter(user_id=user_id)),
+    DeletionStep('archived_bill_links', lambda user_id: ArchivedBillLink.objects.filter(bill__user_id=user_id)),
+    DeletionStep('bills', lambda user_id: Bill.objects.filter(user_id=user_id)),
+    DeletionStep('interval_readings', lambda user_id: IntervalReading.objects.filter(user_id=user_id)),
+    DeletionStep('consumptions', lambda user_id: Consumption.objects.filter(user_id=user_id)),
+    DeletionStep('archived_consumptions', purge=lambda user_id: ConsumptionArchiveRepository().purge_user(user_id)),
+    DeletionStep('tariff_assignments', lambda user_id: TariffAssignment.objects.filter(user_id=user_id)),
+    DeletionStep('balance', lambda user_id: UserBalance.objects.filter(user_id=user_id)),
+]
+
+
+class DeletionJobLost(Exception):
+    """
+    Raised when another worker has claimed the job this worker was running.
+    """
+
+
+class UserDeletionRepository:
+    """
+    Repository class for background user deletion jobs.
+
+    Each batch selects up to `batch_size` primary keys of the current step and removes them with
+    a raw DELETE, without Django's cascade collector. The batch and the job's progress commit
+    together, so a crashed job resumes at the step and counts it had reached.
+    """
+
+    def __init__(self, job_model: Optional[Type[UserDeletionJob]] = None, user_model: Optional[Type[User]] = None) -> None:
+        """
+        Initializes the UserDeletionRepository.
+
+        Args:
+            job_model (Optional[Type[UserDeletionJob]]): The job model to use. Defaults to UserDeletionJob.
+            user_model (Optional[Type[User]]): The user model to use. Defaults to User.
+        """
+        self.job_model: Type[UserDeletionJob] = job_model or UserDeletionJob
+        self.user_model: Type[User] = user_model or User
+
+    def create_job(self, user: User, requested_by_id: Optional[int] = None) -> Tuple[UserDeletionJob, bool]:
+        """
+        Deactivates the user and records a pending deletion job, unless one is already active.
+
+        Args:
+            user (User): The user to delete.
+            requested_by_id (Optional[int]): The admin who asked for the deletion.
+
+        Returns:
+            Tuple[UserDeletionJob, bool]: The active job, and whether it was created by this call.
+        """
+        try:
+            with transaction.atomic():
+                self.user_model.objects.filter(id=user.id).update(is_active=False)
+                job = self.job_model.objects.create(user_id=user.id, username=user.username, requested_by_id=requested_by_id)
+                return job, True
+        except IntegrityError:
+            return self.job_model.objects.get(user_id=user.id, status__in=['pending', 'running']), False
+
+    def get_job(self, job_id: int) -> Optional[UserDeletionJob]:
+        """
+        Retrieves a deletion job by its ID.
+        """
+        return self.job_model.objects.filter(id=job_id).first()
+
+    def claim_job(self, job_id: int, stale_before: datetime) -> Optional[str]:
+        """
+        Marks a pending job, or a running job whose worker stopped sending heartbeats, as running for this worker.
+
+        Returns:
+            Optional[str]: The token the worker must hold to record progress, or None if the job is
+            finished or alive in another worker.
+        """
+        token = uuid.uuid4().hex
+        claimed = self.job_model.objects.filter(
+            Q(status='pending') | Q(status='running', heartbeat_at__lt=stale_before), id=job_id,
+        ).update(status='running', worker_token=token, heartbeat_at=now())
+        return token if claimed else None
+
+    def get_resumable_job_ids(self, stale_before: datetime) -> List[int]:
+        """
+        Lists the jobs nobody is working on: pending jobs never picked up and running jobs with a stale heartbeat.
+        """
+        return list(
+            self.job_model.objects.filter(
+                Q(status='pending', created_at__lt=stale_before) | Q(status='running', heartbeat_at__lt=stale_before)
+            ).order_by('id').values_list('id', flat=True)
+        )
+
+    def delete_batch(self, job: UserDeletionJob, token: str, batch_size: int) -> bool:
+        """
+        Deletes the next batch of the job's current step, or the user once every step is done,
+        and records the progress in the same transaction.
+
+        Args:
+            job (UserDeletionJob): The claimed job; updated in place.
+            token (str): The token returned by `claim_job`.
+            batch_size (int): Maximum rows deleted by the batch.
+
+        Returns:
+            bool: True once the user itself has been deleted.
+
+        Raises:
+            DeletionJobLost: If another worker claimed the job; the batch is rolled back.
+        """
+        with transaction.atomic():
+            finished = job.step >= len(DELETION_STEPS)
+            if finished:
+                # Only small relations (groups, permissions, admin log) are left for the collector
+                self.user_model.objects.filter(id=job.user_id).delete()
+                job.deleted_rows['user'] = 1
+                job.status, job.finished_at = 'completed', now()
+            else:
+                step = DELETION_STEPS[job.step]
+                if step.purge is not None:
+                    job.deleted_rows[step.label] = job.deleted_rows.get(step.label, 0) + step.purge(job.user_id)
+                    job.step += 1
+                else:
+                    rows = step.rows(job.user_id)
+                    ids = list(rows.values_list('pk', flat=True)[:batch_size])
+                    if ids:
+                        deleted = rows.model.objects.filter(pk__in=ids)._raw_delete(router.db_for_write(rows.model))
+                        job.deleted_rows[step.label] = job.deleted_rows.get(step.label, 0) + deleted
+                    else:
+                        job.step += 1
+            job.heartbeat_at = now()
+            progress = dict(step=job.step, deleted_rows=job.deleted_rows, heartbeat_at=job.heartbeat_at)
+            if finished:
+                progress.update(status=job.status, finished_at=job.finished_at)
+            updated = self.job_model.objects.filter(id=job.id, worker_token=token).update(**progress)
+            if not updated:
+                raise DeletionJobLost(f"Deletion job {job.id} was claimed by another worker.")
+        return finished
+
+    def fail_job(self, job: UserDeletionJob, token: str, error: str) -> None:
+        """
+        Marks the job failed, keeping its progress so it can be retried.
+        """
+        self.job_model.objects.filter(id=job.id, worker_token=token).update(status='failed', error=error, finished_at=now())
@@ -1,11 +1,14 @@
 from django.db import IntegrityError # type: ignore
 from django.core.exceptions import ObjectDoesNotExist # type: ignore
-from typing import Optional, Type, Any, cast
+from typing import Optional, Type, Any, Dict, Sequence, cast
 from django.contrib.auth import authenticate # type: ignore
+from django.contrib.auth.hashers import make_password # type: ignore
 
 from apps.authentication.models.UserModel import User  # Import your custom User model
+from apps.monitoring.services.MetricsService import traced_repository
 
 
+@traced_repository
 class UserRepository:
     """
     Repository class for user-related database operations.
@@ -106,11 +109,7 @@ class UserRepository:
         user: Optional[User] = self.get_user_by_username(username)
         if not user:
             return None
-        
-        for field, value in updated_fields.items():
-            setattr(user, field, value)
-        user.save()
-        return user
+        return self.update_user(user, **updated_fields)
 
     def update_user_by_id(self, user_id: int, **updated_fields: Any) -> Optional[User]:
         """
@@ -123,14 +122,86 @@ class UserRepository:
         Returns:
             Optional[User]: The updated user object if the user was found and updated, otherwise None.
         """
-        try:
-            user: User = self.user_model.objects.get(id=user_id)
-            for field, value in updated_fields.items():
-                setattr(user, field, value)
-            user.save()
-            return user
-        except ObjectDoesNotExist:
+        user: Optional[User] = self.get_user_by_id(user_id)
+        if not user:
             return None
+        return self.update_user(user, **updated_fields)
+
+    def update_user(self, user: User, **updated_fields: Any) -> User:
+        """
+        Updates an already loaded user, writing only the changed columns.
+
+        Args:
+            user (User): The user to update.
+            **updated_fields (Any): Fields to update on the user object.
+
+        Returns:
+            User: The updated user object.
+        """
+        columns = self._column_values(updated_fields)
+        for field, value in columns.items():
+            setattr(user, field, value)
+        user.save(update_fields=list(columns))
+        return user
+
+    def update_user_fields(self, user_id: int, **updated_fields: Any) -> bool:
+        """
+        Updates a user's columns by ID in one UPDATE, without loading the user first.
+
+        Args:
+            user_id (int): The ID of the user to update.
+            **updated_fields (Any): Fields to update.
+
+        Returns:
+            bool: True if the user exists.
+        """
+        return self.user_model.objects.filter(id=user_id).update(**self._column_values(updated_fields)) > 0
+
+    def bulk_update_user_fields(self, user_ids: Sequence[int], **updated_fields: Any) -> int:
+        """
+        Sets the same column values (e.g. is_active=False) on several users in one UPDATE.
+
+        Args:
+            user_ids (Sequence[int]): The IDs of the users to update.
+            **updated_fields (Any): Fields to update.
+
+        Returns:
+            int: The number of users updated.
+        """
+        return self.user_model.objects.filter(id__in=user_ids).update(**self._column_values(updated_fields))
+
+    def bulk_update_users(self, users: Sequence[User], fields: Sequence[str], batch_size: Optional[int] = None) -> int:
+        """
+        Writes the given columns of several modified users, in batches of one UPDATE each.
+
+        Args:
+            users (Sequence[User]): Users whose attributes were changed in memory.
+            fields (Sequence[str]): The columns to write.
+            batch_size (Optional[int]): Users per UPDATE. Defaults to all in one statement.
+
+        Returns:
+            int: The number of users updated.
+        """
+        fields = list(fields)
+        if 'role' in fields:
+            # Mirror User.save(), which bulk_update bypasses
+            for user in users:
+                if user.role == 'admin':
+                    user.is_staff = user.is_superuser = True
+            fields += [field for field in ('is_staff', 'is_superuser') if field not in fields]
+        return self.user_model.objects.bulk_update(users, fields, batch_size=batch_size)
+
+    def _column_values(self, updated_fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Turns requested field changes into the column values to write: passwords are hashed and
+        the admin role carries the staff flags User.save() would set.
+        """
+        columns = dict(updated_fields)
+        if 'password' in columns:
+            columns['password'] = make_password(columns['password'])
+        if columns.get('role') == 'admin':
+            columns.update(is_staff=True, is_superuser=True)
+        return columns
 
     def delete_user_by_username(self, username: str) -> bool:
         """
@@ -45,3 +45,19 @@ class UserDetailSerializer(serializers.Serializer):
 
 
 
+
+
+class UserDeletionJobSerializer(serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
+    username = serializers.CharField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    step = serializers.IntegerField(read_only=True)
+    deleted_rows = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+    error = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    heartbeat_at = serializers.DateTimeField(read_only=True)
+    finished_at = serializers.DateTimeField(read_only=True)
+
+    class Meta:
+        fields = ['id', 'user_id', 'username', 'status', 'step', 'deleted_rows', 'error', 'created_at', 'heartbeat_at', 'finished_at']
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from django.conf import settings
+from django.utils.timezone import now
+from apps.authentication.models.UserDeletionJobModel import UserDeletionJob
+from apps.authentication.repositories.UserDeletionRepository import DeletionJobLost, UserDeletionRepository
+from energy_billing.db_router import use_primary
+
+
+class UserDeletionService:
+    """
+    Service class running background user deletion jobs batch by batch.
+    """
+
+    def __init__(self, deletion_repository: UserDeletionRepository) -> None:
+        self.deletion_repository = deletion_repository
+
+    def run_job(self, job_id: int, batch_size: Optional[int] = None) -> Optional[UserDeletionJob]:
+        """
+        Claim a deletion job and delete the user's history until the user is gone.
+
+        Args:
+            job_id (int): The job to run.
+            batch_size (Optional[int]): Rows per batch. Defaults to settings.USER_DELETION_BATCH_SIZE.
+
+        Returns:
+            Optional[UserDeletionJob]: The job as this worker left it, or None if it could not be
+            claimed because it is finished or another worker is running it.
+        """
+        batch_size = batch_size or settings.USER_DELETION_BATCH_SIZE
+        token = self.deletion_repository.claim_job(job_id, self._stale_before())
+        if token is None:
+            return None
+        # Progress is read back and batches selected on the primary, never from a lagging replica
+        with use_primary():
+            job = self.deletion_repository.get_job(job_id)
+            try:
+                while not self.deletion_repository.delete_batch(job, token, batch_size):
+                    pass
+            except DeletionJobLost:
+                return None
+            except Exception as e:
+                self.deletion_repository.fail_job(job, token, str(e))
+                raise
+        return job
+
+    def get_resumable_job_ids(self) -> List[int]:
+        """
+        Get the jobs whose worker died or that were never picked up.
+        """
+        return self.deletion_repository.get_resumable_job_ids(self._stale_before())
+
+    @staticmethod
+    def _stale_before() -> datetime:
+        return now() - timedelta(seconds=settings.USER_DELETION_STALE_SECONDS)
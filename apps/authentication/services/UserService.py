@@ -1,15 +1,20 @@
 from apps.authentication.repositories.UserRepository import UserRepository
+from apps.authentication.repositories.UserDeletionRepository import UserDeletionRepository
 from apps.authentication.models.UserModel import User
+from apps.authentication.models.UserDeletionJobModel import UserDeletionJob
+from apps.authentication.tasks import run_user_deletion
 from typing import Optional
 from django.core.exceptions import PermissionDenied
+from django.db import transaction
 
 class AuthService:
     """
     Service class for authentication and registration-related business logic.
     """
 
-    def __init__(self, user_repository: UserRepository) -> None:
+    def __init__(self, user_repository: UserRepository, deletion_repository: Optional[UserDeletionRepository] = None) -> None:
         self.user_repository = user_repository
+        self.deletion_repository = deletion_repository or UserDeletionRepository()
 
     def register_customer(self, username: str, password: str, email: Optional[str] = None) -> User:
         """
@@ -99,25 +104,44 @@ class AuthService:
         user_to_update = self.user_repository.get_user_by_id(user_id)
 
         if current_user.is_staff or current_user == user_to_update:  # Admins or the user themselves
-            user = self.user_repository.update_user_by_id(user_id, **updated_fields)
-            return user
+            if user_to_update is None:
+                return None
+            return self.user_repository.update_user(user_to_update, **updated_fields)
         raise PermissionDenied("You do not have permission to update this user.")
 
-    def delete_user(self, current_user: User, user_id: int) -> bool:
+    def delete_user(self, current_user: User, user_id: int) -> Optional[UserDeletionJob]:
         """
-        Deletes a user by their ID.
-        
+        Deactivates a user and schedules the deletion of the user and their history in the background.
+        Asking again while a deletion is in progress returns the running job.
+
         Args:
             current_user (User): The current user making the request (for permission checks).
             user_id (int): The ID of the user to delete.
 
         Returns:
-            bool: True if the user was successfully deleted, False if the user was not found.
+            Optional[UserDeletionJob]: The deletion job, or None if the user was not found.
 
         Raises:
             PermissionDenied: If the current user does not have permission to delete the user.
         """
         if not current_user.is_staff:
             raise PermissionDenied("Only admins can delete users.")
-        
-        return self.user_repository.delete_user_by_id(user_id)
+
+        user_to_delete = self.user_repository.get_user_by_id(user_id)
+        if user_to_delete is None:
+            return None
+        job, created = self.deletion_repository.create_job(user_to_delete, requested_by_id=current_user.id)
+        if created:
+            transaction.on_commit(lambda: run_user_deletion.delay(job.id))
+        return job
+
+    def get_deletion_job(self, current_user: User, job_id: int) -> Optional[UserDeletionJob]:
+        """
+        Gets a user deletion job and its progress.
+
+        Raises:
+            PermissionDenied: If the current user is not an admin.
+        """
+        if not current_user.is_staff:
+            raise PermissionDenied("Only admins can view user deletions.")
+        return self.deletion_repository.get_job(job_id)
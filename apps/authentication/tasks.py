@@ -0,0 +1,22 @@
+from celery import shared_task # type: ignore
+from typing import List, Optional
+from apps.authentication.repositories.UserDeletionRepository import UserDeletionRepository
+from apps.authentication.services.UserDeletionService import UserDeletionService
+
+@shared_task(acks_late=True)
+def run_user_deletion(job_id: int) -> Optional[str]:
+    """
+    Task to delete a user and their history in bounded batches.
+    """
+    job = UserDeletionService(UserDeletionRepository()).run_job(job_id)
+    return job.status if job else None
+
+@shared_task
+def resume_user_deletions() -> List[int]:
+    """
+    Task to re-queue deletion jobs whose worker died or that were never picked up.
+    """
+    job_ids = UserDeletionService(UserDeletionRepository()).get_resumable_job_ids()
+    for job_id in job_ids:
+        run_user_deletion.delay(job_id)
+    return job_ids
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views.UserViews import RegisterView, AdminRegisterView, LoginView, UserProfileView, AdminUserManagementView # type: ignore
+from .views.UserViews import RegisterView, AdminRegisterView, LoginView, UserProfileView, AdminUserManagementView, AdminUserDeletionJobView # type: ignore
 
 urlpatterns = [
     path('register/', RegisterView.as_view(), name='register'),
@@ -7,4 +7,5 @@ urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),
     path('profile/', UserProfileView.as_view(), name='user-profile'),
     path('admin/user/<int:user_id>/', AdminUserManagementView.as_view(), name='admin-user-management'),
+    path('admin/user/deletions/<int:job_id>/', AdminUserDeletionJobView.as_view(), name='admin-user-deletion-job'),
 ]
@@ -3,7 +3,7 @@ from rest_framework.response import Response # type: ignore
 from rest_framework import status # type: ignore
 from drf_yasg.utils import swagger_auto_schema # type: ignore
 from drf_yasg import openapi # type: ignore
-from ..serializers.UserSerializers import UserRegistrationSerializer, UserDetailSerializer, UserLoginSerializer # type: ignore
+from ..serializers.UserSerializers import UserRegistrationSerializer, UserDetailSerializer, UserLoginSerializer, UserDeletionJobSerializer # type: ignore
 from ..services.UserService import AuthService # type: ignore
 from apps.authentication.repositories.UserRepository import UserRepository # type: ignore
 from rest_framework.permissions import IsAuthenticated # type: ignore
@@ -142,13 +142,34 @@ class AdminUserManagementView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     @swagger_auto_schema(
-        responses={204: 'No Content', 403: 'Forbidden', 404: 'Not found'}
+        responses={202: UserDeletionJobSerializer, 403: 'Forbidden', 404: 'Not found'}
     )
     def delete(self, request, user_id):
+        """
+        Deactivates the user and deletes them with their history in the background.
+        Poll the returned job at admin/user/deletions/<job_id>/.
+        """
         current_user = request.user
         user_repository = UserRepository()
         auth_service = AuthService(user_repository)
-        success = auth_service.delete_user(current_user, user_id)
-        if success:
-            return Response(status=status.HTTP_204_NO_CONTENT)
+        job = auth_service.delete_user(current_user, user_id)
+        if job:
+            return Response(UserDeletionJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
         return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class AdminUserDeletionJobView(APIView):
+    """
+    Admin-only view for following the progress of a user deletion.
+    """
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        responses={200: UserDeletionJobSerializer, 403: 'Forbidden', 404: 'Not found'}
+    )
+    def get(self, request, job_id):
+        auth_service = AuthService(UserRepository())
+        job = auth_service.get_deletion_job(request.user, job_id)
+        if job:
+            return Response(UserDeletionJobSerializer(job).data)
+        return Response({'error': 'Deletion job not found'}, status=status.HTTP_404_NOT_FOUND)
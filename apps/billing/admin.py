@@ -1,3 +1,56 @@
 from django.contrib import admin
+from django.db import transaction
+from apps.billing.models.TariffModel import Tariff, TariffRate, TariffAssignment
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.services.TariffService import invalidate_tariff_index
 
-# Register your models here.
+
+class TariffIndexAdminMixin:
+    """
+    Publishes a tariff index change after every admin write, so workers reload their index.
+    The admin saves a form and its inlines in one transaction; the change is published once it commits.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        self.publish_change()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        self.publish_change()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        self.publish_change()
+
+    def publish_change(self):
+        TariffRepository().publish_change_on_commit()
+        transaction.on_commit(invalidate_tariff_index)
+
+
+class TariffRateInline(admin.TabularInline):
+    model = TariffRate
+    extra = 1
+    ordering = ['valid_from']
+
+
+@admin.register(Tariff)
+class TariffAdmin(TariffIndexAdminMixin, admin.ModelAdmin):
+    list_display = ['code', 'name', 'currency', 'version', 'updated_at']
+    search_fields = ['code', 'name']
+    readonly_fields = ['version', 'updated_at']
+    inlines = [TariffRateInline]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        if change and any(formset.has_changed() for formset in formsets):
+            TariffRepository().bump_versions([form.instance.id])
+            transaction.on_commit(invalidate_tariff_index)
+
+
+@admin.register(TariffAssignment)
+class TariffAssignmentAdmin(TariffIndexAdminMixin, admin.ModelAdmin):
+    list_display = ['user', 'tariff', 'valid_from', 'valid_to']
+    list_filter = ['tariff']
+    search_fields = ['user__username']
+    raw_id_fields = ['user']
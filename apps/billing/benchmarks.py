@@ -0,0 +1,252 @@
+from datetime import timedelta
+from decimal import Decimal
+from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BalanceRepository import BalanceRepository, new_deltas, add_bill_delta
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.services.BalanceService import BalanceService
+from apps.billing.services.BillSimulationService import BillSimulationService
+from apps.billing.services.BillingService import BillService
+from apps.billing.services.RebillingService import RebillingService
+from apps.billing.services.TariffService import TariffService, invalidate_tariff_index
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+from apps.monitoring.services.BenchmarkService import benchmark
+
+# Cases for `manage.py benchmark`; each returns the call to time, see BenchmarkService.benchmark
+
+
+def _user_bill(data):
+    return Bill.objects.filter(user=data.user).order_by('-date').first()
+
+
+@benchmark(BillRepository, 'create_bill')
+def create_bill(data):
+    repository = BillRepository()
+    day = (data.end_date + timedelta(days=1)).isoformat()
+    return lambda: repository.create_bill(data.user, day, 42.0)
+
+
+@benchmark(BillRepository, 'bulk_create_bills')
+def bulk_create_bills(data):
+    repository = BillRepository()
+    bills = [Bill(user_id=user_id, date=data.end_date + timedelta(days=1), amount=Decimal('42.00')) for user_id in data.user_ids[:100]]
+    return lambda: repository.bulk_create_bills(bills)
+
+
+@benchmark(BillRepository, 'get_bill_by_id')
+def get_bill_by_id(data):
+    repository = BillRepository()
+    return lambda: repository.get_bill_by_id(data.bill_ids[0])
+
+
+@benchmark(BillRepository, 'get_bills_by_user')
+def get_bills_by_user(data):
+    repository = BillRepository()
+    return lambda: repository.get_bills_by_user(data.user)
+
+
+@benchmark(BillRepository, 'get_all_bills')
+def get_all_bills(data):
+    repository = BillRepository()
+    return lambda: repository.get_all_bills()
+
+
+@benchmark(BillRepository, 'get_bills_for_period')
+def get_bills_for_period(data):
+    repository = BillRepository()
+    return lambda: repository.get_bills_for_period(data.user.id, data.start_date, data.end_date)
+
+
+@benchmark(BillRepository, 'adjust_bill')
+def adjust_bill(data):
+    repository = BillRepository()
+    bill = _user_bill(data)
+    consumption_ids = list(Consumption.objects.filter(user=data.user, date__gte=bill.period_start, date__lte=bill.period_end).values_list('id', flat=True))
+    return lambda: repository.adjust_bill(bill, bill.amount + Decimal('1.00'), (bill.billed_kwh or 0) + 4, consumption_ids)
+
+
+@benchmark(BillRepository, 'update_bill')
+def update_bill(data):
+    repository = BillRepository()
+    bill = _user_bill(data)
+    return lambda: repository.update_bill(bill, amount=bill.amount + Decimal('1.00'))
+
+
+@benchmark(BillRepository, 'update_bill_fields')
+def update_bill_fields(data):
+    repository = BillRepository()
+    return lambda: repository.update_bill_fields(data.bill_ids[0], amount=Decimal('1.00'))
+
+
+@benchmark(BillRepository, 'bulk_update_bill_fields')
+def bulk_update_bill_fields(data):
+    repository = BillRepository()
+    return lambda: repository.bulk_update_bill_fields(data.bill_ids, amount=Decimal('1.00'))
+
+
+@benchmark(BillRepository, 'bulk_update_bills')
+def bulk_update_bills(data):
+    repository = BillRepository()
+    bills = list(Bill.objects.filter(id__in=data.bill_ids))
+    for bill in bills:
+        bill.amount += Decimal('1.00')
+    return lambda: repository.bulk_update_bills(bills, ['amount'])
+
+
+@benchmark(BillRepository, 'delete_bill')
+def delete_bill(data):
+    repository = BillRepository()
+    bill = _user_bill(data)
+    return lambda: repository.delete_bill(bill)
+
+
+@benchmark(BillRepository, 'lock_bills_for_payment')
+def lock_bills_for_payment(data):
+    repository = BillRepository()
+    return lambda: repository.lock_bills_for_payment(data.bill_ids)
+
+
+@benchmark(BillRepository, 'mark_bills_paid')
+def mark_bills_paid(data):
+    repository = BillRepository()
+    return lambda: repository.mark_bills_paid(data.bill_ids)
+
+
+@benchmark(BillRepository, 'set_bills_status')
+def set_bills_status(data):
+    repository = BillRepository()
+    return lambda: repository.set_bills_status(data.bill_ids, 'unpaid')
+
+
+@benchmark(BillRepository, 'mark_invoice_bills_paid')
+def mark_invoice_bills_paid(data):
+    repository = BillRepository()
+    return lambda: repository.mark_invoice_bills_paid(data.invoice_ids)
+
+
+@benchmark(BillRepository, 'aggregate_user_billing')
+def aggregate_user_billing(data):
+    repository = BillRepository()
+    return lambda: repository.aggregate_user_billing(data.user)
+
+
+@benchmark(BillRepository, 'aggregate_all_users_billing')
+def aggregate_all_users_billing(data):
+    repository = BillRepository()
+    return lambda: repository.aggregate_all_users_billing()
+
+
+@benchmark(BillService, 'create_bill')
+def service_create_bill(data):
+    service = BillService(BillRepository(), ConsumptionRepository())
+    day = data.end_date + timedelta(days=1)
+    # The default period is the month before the bill's date, the last month of the dataset
+    return lambda: service.create_bill(data.user, day, 42.0)
+
+
+@benchmark(BillService, 'get_user_bills')
+def get_user_bills(data):
+    service = BillService(BillRepository())
+    return lambda: service.get_user_bills(data.user)
+
+
+@benchmark(BillService, 'aggregate_all_users_billing')
+def service_aggregate_all_users_billing(data):
+    service = BillService(BillRepository())
+    return lambda: service.aggregate_all_users_billing()
+
+
+@benchmark(BillService, 'update_bill')
+def service_update_bill(data):
+    service = BillService(BillRepository())
+    bill = _user_bill(data)
+    return lambda: service.update_bill(bill.id, amount=bill.amount + Decimal('1.00'))
+
+
+@benchmark(BillService, 'set_bills_status')
+def service_set_bills_status(data):
+    service = BillService(BillRepository())
+    return lambda: service.set_bills_status(data.bill_ids, 'paid')
+
+
+@benchmark(BillService, 'delete_bill')
+def service_delete_bill(data):
+    service = BillService(BillRepository())
+    bill = _user_bill(data)
+    return lambda: service.delete_bill(bill.id)
+
+
+@benchmark(RebillingService, 'rebill_dirty_periods')
+def rebill_dirty_periods(data):
+    service = RebillingService(BillRepository(), ConsumptionRepository(), DirtyPeriodRepository(), InvoiceRepository())
+    DirtyPeriodRepository().mark_dirty((user_id, data.end_date) for user_id in data.user_ids[:100])
+    return lambda: service.rebill_dirty_periods()
+
+
+@benchmark(BillSimulationService, 'simulate')
+def simulate(data):
+    tariff_service = TariffService(TariffRepository())
+    service = BillSimulationService(ConsumptionRepository(), tariff_service)
+    tariff_ids = []
+    for number in range(3):
+        tariff = tariff_service.create_tariff(f'BENCH-{number}', f'Benchmark {number}')
+        # A rate change in the middle of the period, so every reading is looked up against two spans
+        tariff_service.add_rate(tariff, valid_from=data.start_date, valid_to=data.end_date - timedelta(days=45), price_per_kwh=Decimal('0.20000') + number)
+        tariff_service.add_rate(tariff, valid_from=data.end_date - timedelta(days=45), price_per_kwh=Decimal('0.25000') + number, standing_charge_per_day=Decimal('0.50000'))
+        tariff_ids.append(tariff.id)
+    # The rolled-back writes never publish, so rebuild the index here rather than inside the timed call
+    invalidate_tariff_index()
+    tariff_service.get_index()
+    # A new data version for the user, so the call prices the readings instead of hitting the result cache
+    DirtyPeriodRepository().mark_dirty([(data.user.id, data.end_date)])
+    return lambda: service.simulate(data.user.id, tariff_ids, data.start_date, data.end_date)
+
+
+@benchmark(BalanceRepository, 'apply_deltas')
+def apply_deltas(data):
+    repository = BalanceRepository()
+    deltas = new_deltas()
+    for user_id in data.user_ids[:100]:
+        add_bill_delta(deltas, user_id, 'unpaid', Decimal('1.00'))
+    return lambda: repository.apply_deltas(deltas)
+
+
+@benchmark(BalanceRepository, 'get_totals')
+def get_totals(data):
+    repository = BalanceRepository()
+    return lambda: repository.get_totals()
+
+
+@benchmark(BalanceRepository, 'rebuild_range')
+def rebuild_range(data):
+    repository = BalanceRepository()
+    user_ids = data.user_ids[:100]
+    return lambda: repository.rebuild_range(user_ids[0], user_ids[-1])
+
+
+@benchmark(BalanceService, 'get_balance')
+def get_balance(data):
+    service = BalanceService(BalanceRepository())
+    return lambda: service.get_balance(data.user.id)
+
+
+@benchmark(TariffRepository, 'get_rate_rows')
+def get_rate_rows(data):
+    repository = TariffRepository()
+    return lambda: repository.get_rate_rows()
+
+
+@benchmark(TariffRepository, 'get_assignment_rows')
+def get_assignment_rows(data):
+    repository = TariffRepository()
+    return lambda: repository.get_assignment_rows()
+
+
+@benchmark(TariffService, 'rate_for')
+def rate_for(data):
+    service = TariffService(TariffRepository())
+    service.get_index()
+    return lambda: service.rate_for(data.user.id, data.end_date)
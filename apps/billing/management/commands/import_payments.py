@@ -0,0 +1,41 @@
+import csv
+import sys
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.conf import settings
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.PaymentImportService import PaymentImportService, PaymentIssue, OUTCOMES
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class Command(BaseCommand):
+    """
+    Imports a bank payment file and marks the settled bills and invoices paid.
+    """
+    help = 'Reconcile a CSV payment file (reference, amount) against bills and invoices.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with reference (BILL-<id> or INV-<id>) and amount columns.')
+        parser.add_argument('--batch-size', type=int, default=settings.PAYMENT_IMPORT_BATCH_SIZE,
+                            help='Payments matched and applied per transaction.')
+        parser.add_argument('--report', help='Where to write the reconciliation report CSV (default: stdout).')
+
+    def handle(self, *args, **options):
+        service = PaymentImportService(BillRepository(), InvoiceRepository())
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as payment_file:
+                report = service.import_payments(payment_file, options['batch_size'])
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        report_file = open(options['report'], 'w', newline='') if options['report'] else sys.stdout
+        try:
+            writer = csv.writer(report_file)
+            writer.writerow(PaymentIssue._fields)
+            writer.writerows(report['issues'])
+        finally:
+            if options['report']:
+                report_file.close()
+        counts = ', '.join(f'{report[outcome]} {outcome}' for outcome in OUTCOMES)
+        self.stderr.write(self.style.SUCCESS(
+            f"Imported {report['rows']} payments ({counts}); received {report['received']}, applied {report['applied']}."
+        ))
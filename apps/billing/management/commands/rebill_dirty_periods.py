@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand # type: ignore
+from django.conf import settings
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.RebillingService import RebillingService
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class Command(BaseCommand):
+    """
+    Re-bills the bills overlapping (user, month) periods whose consumption changed.
+    """
+    help = 'Recompute bills and invoices affected by late or corrected consumption readings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.REBILLING_BATCH_SIZE,
+                            help='Dirty periods handled per batch.')
+        parser.add_argument('--all', action='store_true', help='Keep going until no dirty period is left.')
+
+    def handle(self, *args, **options):
+        service = RebillingService(BillRepository(), ConsumptionRepository(), DirtyPeriodRepository(), InvoiceRepository())
+        totals = {'periods': 0, 'bills': 0, 'adjustments': 0}
+        while True:
+            result = service.rebill_dirty_periods(options['batch_size'])
+            for key in totals:
+                totals[key] += result[key]
+            if not options['all'] or result['periods'] < options['batch_size']:
+                break
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-billed {totals['periods']} periods: {totals['bills']} bills checked, {totals['adjustments']} adjusted."
+        ))
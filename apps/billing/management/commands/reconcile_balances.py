@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand # type: ignore
+from django.conf import settings
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.billing.services.BalanceService import BalanceService
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the per-user balance ledger from bills and invoices and reports drift.
+    """
+    help = 'Recompute every user balance in parallel chunks and report where the ledger had drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=settings.BALANCE_RECONCILE_CHUNK_SIZE,
+                            help='Users per chunk.')
+        parser.add_argument('--workers', type=int, default=settings.BALANCE_RECONCILE_WORKERS,
+                            help='Chunks rebuilt concurrently.')
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without correcting it.')
+
+    def handle(self, *args, **options):
+        service = BalanceService(BalanceRepository())
+        report = service.reconcile(options['chunk_size'], options['workers'], dry_run=options['dry_run'])
+        for entry in report['sample']:
+            self.stdout.write(f"user {entry['user']}: {entry['field']} stored {entry['stored']}, actual {entry['actual']}")
+        drift = ', '.join(f'{field} {amount}' for field, amount in report['drift'].items() if amount)
+        verb = 'would be corrected' if options['dry_run'] else 'corrected'
+        style = self.style.WARNING if report['drifted_users'] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"Checked {report['chunks']} chunks: {report['drifted_users']} users drifted ({verb})" + (f"; drift {drift}." if drift else ".")
+        ))
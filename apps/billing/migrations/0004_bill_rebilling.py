@@ -0,0 +1,69 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, F, FloatField, Max, Min, Sum, Value, When
+
+# kWh factor per EnergyUnits code at the time of this migration
+KWH_FACTORS = {1: 0.001, 2: 1.0, 3: 1000.0, 4: 1000000.0}
+
+
+def backfill_billed_periods(apps, schema_editor):
+    """
+    Derive each existing bill's period and billed kWh from the readings linked to it.
+    """
+    Bill = apps.get_model('billing', 'Bill')
+    factor = Case(
+        *[When(consumption__unit=code, then=Value(value)) for code, value in KWH_FACTORS.items()],
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    rows = (
+        Bill.consumption.through.objects
+        .values('bill_id')
+        .annotate(start=Min('consumption__date'), end=Max('consumption__date'), kwh=Sum(F('consumption__consumption') * factor))
+    )
+    bills = []
+    for row in rows:
+        bills.append(Bill(id=row['bill_id'], period_start=row['start'], period_end=row['end'], billed_kwh=row['kwh']))
+    Bill.objects.bulk_update(bills, ['period_start', 'period_end', 'billed_kwh'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0003_initial'),
+        ('consumption', '0007_consumption_unit_code'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bill',
+            name='billed_kwh',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='period_end',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bill',
+            name='period_start',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='BillAdjustment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('previous_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('new_amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('previous_kwh', models.FloatField()),
+                ('new_kwh', models.FloatField()),
+                ('invoice_updated', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='adjustments', to='billing.bill')),
+            ],
+        ),
+        migrations.RunPython(backfill_billed_periods, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_balances(apps, schema_editor):
+    """
+    Build every user's ledger row from their existing bills and invoices.
+    """
+    Bill = apps.get_model('billing', 'Bill')
+    Invoice = apps.get_model('invoices', 'Invoice')
+    UserBalance = apps.get_model('billing', 'UserBalance')
+    balances = {}
+    for row in Bill.objects.values('user_id', 'status').annotate(total=Sum('amount')).order_by():
+        balances.setdefault(row['user_id'], {})[f"bills_{row['status']}"] = row['total']
+    for row in Invoice.objects.values('user_id', 'status').annotate(total=Sum('total_amount')).order_by():
+        balances.setdefault(row['user_id'], {})[f"invoices_{row['status']}"] = row['total']
+    UserBalance.objects.bulk_create([UserBalance(user_id=user_id, **totals) for user_id, totals in balances.items()], batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_role'),
+        ('billing', '0005_tariffs'),
+        ('invoices', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserBalance',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='balance', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('bills_unpaid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('bills_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('invoices_unpaid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('invoices_overdue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('invoices_paid', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+from django.db import models
+from apps.authentication.models.UserModel import User
+
+class UserBalance(models.Model):
+    """
+    Model holding one ledger row per user with the running totals of their bills and invoices by status.
+    Kept up to date by the bill and invoice repositories in the same transaction as each write.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='balance')
+    bills_unpaid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    bills_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    invoices_unpaid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    invoices_overdue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    invoices_paid = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def outstanding(self):
+        """
+        What the user owes: the total of their unpaid bills.
+        """
+        return self.bills_unpaid
+
+    def __str__(self) -> str:
+        return f'Balance of {self.user_id}: {self.bills_unpaid} USD outstanding' #type: ignore
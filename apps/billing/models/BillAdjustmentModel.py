@@ -0,0 +1,21 @@
+from django.db import models
+from apps.billing.models.BillingModel import Bill
+
+class BillAdjustment(models.Model):
+    """
+    Model recording a change of a bill's amount after its consumption was corrected.
+    """
+    bill = models.ForeignKey(Bill, on_delete=models.CASCADE, related_name='adjustments')
+    previous_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    new_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    previous_kwh = models.FloatField()
+    new_kwh = models.FloatField()
+    invoice_updated = models.BooleanField(default=False)  # False when the bill's invoice was already paid
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @property
+    def delta(self):
+        return self.new_amount - self.previous_amount
+
+    def __str__(self) -> str:
+        return f'Adjustment of bill {self.bill_id}: {self.previous_amount} -> {self.new_amount} USD' #type: ignore
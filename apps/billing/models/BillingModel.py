@@ -17,6 +17,9 @@ class Bill(models.Model):
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='unpaid')
     consumption = models.ManyToManyField(Consumption, related_name='bills', blank=True)
+    period_start = models.DateField(null=True, blank=True)  # First day of the billed readings
+    period_end = models.DateField(null=True, blank=True)  # Last day of the billed readings
+    billed_kwh = models.FloatField(null=True, blank=True)  # Consumption the amount was computed from, for re-billing
 
     def __str__(self) -> str:
         return f'Bill {self.id} for {self.user.username} on {self.date}: {self.amount} USD ({self.status})' #type: ignore
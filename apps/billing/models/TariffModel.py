@@ -0,0 +1,77 @@
+from django.db import models
+from django.core.exceptions import ValidationError
+from apps.authentication.models.UserModel import User
+
+class Tariff(models.Model):
+    """
+    Model for a named tariff whose prices change over time through effective-dated rates.
+    """
+    code = models.CharField(max_length=32, unique=True)
+    name = models.CharField(max_length=100)
+    currency = models.CharField(max_length=3, default='USD')
+    version = models.PositiveIntegerField(default=1)  # Bumped whenever the tariff or one of its rates changes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.code} - {self.name} (v{self.version})'
+
+
+class TariffRate(models.Model):
+    """
+    Model for the price of a tariff between two dates (`valid_to` exclusive, open-ended when empty).
+    """
+    tariff = models.ForeignKey(Tariff, on_delete=models.CASCADE, related_name='rates')
+    valid_from = models.DateField()
+    valid_to = models.DateField(null=True, blank=True)
+    price_per_kwh = models.DecimalField(max_digits=10, decimal_places=5)
+    standing_charge_per_day = models.DecimalField(max_digits=10, decimal_places=5, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['tariff', 'valid_from'], name='tariff_rate_start_unique'),
+            models.CheckConstraint(condition=models.Q(valid_to__isnull=True) | models.Q(valid_to__gt=models.F('valid_from')), name='tariff_rate_valid_range'),
+        ]
+
+    def clean(self) -> None:
+        """
+        Reject rates overlapping another rate of the same tariff.
+        """
+        overlapping = TariffRate.objects.filter(tariff_id=self.tariff_id).exclude(id=self.id)
+        if self.valid_to is not None:
+            overlapping = overlapping.filter(valid_from__lt=self.valid_to)
+        overlapping = overlapping.filter(models.Q(valid_to__isnull=True) | models.Q(valid_to__gt=self.valid_from))
+        if overlapping.exists():
+            raise ValidationError("Rate overlaps another rate of the same tariff.")
+
+    def __str__(self) -> str:
+        return f'{self.tariff_id}: {self.price_per_kwh}/kWh from {self.valid_from} to {self.valid_to or "open"}' #type: ignore
+
+
+class TariffAssignment(models.Model):
+    """
+    Model for the tariff a customer is on between two dates (`valid_to` exclusive, open-ended when empty).
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tariff_assignments')
+    tariff = models.ForeignKey(Tariff, on_delete=models.PROTECT, related_name='assignments')
+    valid_from = models.DateField()
+    valid_to = models.DateField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'valid_from'], name='tariff_assignment_start_unique'),
+            models.CheckConstraint(condition=models.Q(valid_to__isnull=True) | models.Q(valid_to__gt=models.F('valid_from')), name='tariff_assignment_valid_range'),
+        ]
+
+    def clean(self) -> None:
+        """
+        Reject assignments overlapping another assignment of the same customer.
+        """
+        overlapping = TariffAssignment.objects.filter(user_id=self.user_id).exclude(id=self.id)
+        if self.valid_to is not None:
+            overlapping = overlapping.filter(valid_from__lt=self.valid_to)
+        overlapping = overlapping.filter(models.Q(valid_to__isnull=True) | models.Q(valid_to__gt=self.valid_from))
+        if overlapping.exists():
+            raise ValidationError("Assignment overlaps another tariff assignment of the same customer.")
+
+    def __str__(self) -> str:
+        return f'{self.user_id} on {self.tariff_id} from {self.valid_from} to {self.valid_to or "open"}' #type: ignore
@@ -1 +1,4 @@
-from .BillingModel import Bill
\ No newline at end of file
+from .BillingModel import Bill
+from .BillAdjustmentModel import BillAdjustment
+from .TariffModel import Tariff, TariffRate, TariffAssignment
+from .BalanceModel import UserBalance
@@ -0,0 +1,181 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, DefaultDict, Dict, Iterator, List, Optional, Tuple, Type
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Q, Sum, Value, When
+from django.utils.timezone import now
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BalanceModel import UserBalance
+from apps.billing.models.BillingModel import Bill
+from apps.invoices.models.InvoiceModel import Invoice
+
+CENT = Decimal('0.01')
+BILL_FIELDS = {'unpaid': 'bills_unpaid', 'paid': 'bills_paid'}
+INVOICE_FIELDS = {'unpaid': 'invoices_unpaid', 'overdue': 'invoices_overdue', 'paid': 'invoices_paid'}
+BALANCE_FIELDS = list(BILL_FIELDS.values()) + list(INVOICE_FIELDS.values())
+UPDATE_CHUNK_SIZE = 500  # Users per UPDATE statement when applying deltas
+
+BalanceDeltas = DefaultDict[int, DefaultDict[str, Decimal]]
+
+
+def to_amount(value: Any) -> Decimal:
+    """
+    Converts an amount as stored on a bill or invoice (Decimal, float or string) to cents.
+    """
+    return Decimal(str(value)).quantize(CENT)
+
+
+def new_deltas() -> BalanceDeltas:
+    """
+    Returns an empty per-user, per-field delta accumulator for `apply_deltas`.
+    """
+    return defaultdict(lambda: defaultdict(Decimal))
+
+
+def add_bill_delta(deltas: BalanceDeltas, user_id: int, status: str, amount: Any, sign: int = 1) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) a bill amount under its status.
+    """
+    deltas[user_id][BILL_FIELDS[status]] += sign * to_amount(amount)
+
+
+def add_invoice_delta(deltas: BalanceDeltas, user_id: int, status: str, amount: Any, sign: int = 1) -> None:
+    """
+    Adds (sign=1) or removes (sign=-1) an invoice total under its status.
+    """
+    deltas[user_id][INVOICE_FIELDS[status]] += sign * to_amount(amount)
+
+
+class BalanceRepository:
+    """
+    Repository class for the per-user balance ledger.
+
+    Writers accumulate signed deltas per (user, field) and apply them with `F()` increments, so
+    concurrent writes never overwrite each other and a balance read is a single-row lookup.
+    """
+
+    def __init__(self, balance_model: Optional[Type[UserBalance]] = None) -> None:
+        """
+        Initializes the BalanceRepository.
+
+        Args:
+            balance_model (Optional[Type[UserBalance]]): The balance model to use. Defaults to UserBalance.
+        """
+        self.balance_model: Type[UserBalance] = balance_model or UserBalance
+
+    def apply_deltas(self, deltas: BalanceDeltas) -> None:
+        """
+        Adds the accumulated deltas to the users' balances, creating missing rows first.
+        Must run inside the transaction of the write the deltas describe.
+
+        Args:
+            deltas (BalanceDeltas): Signed amounts per user and balance field.
+        """
+        changes = {
+            user_id: {field: amount for field, amount in fields.items() if amount}
+            for user_id, fields in deltas.items()
+        }
+        changes = {user_id: fields for user_id, fields in changes.items() if fields}
+        if not changes:
+            return
+        user_ids = sorted(changes)
+        self.balance_model.objects.bulk_create([self.balance_model(user_id=user_id) for user_id in user_ids], ignore_conflicts=True)
+        for start in range(0, len(user_ids), UPDATE_CHUNK_SIZE):
+            chunk = user_ids[start:start + UPDATE_CHUNK_SIZE]
+            updates: Dict[str, Any] = {}
+            for field in BALANCE_FIELDS:
+                whens = [When(user_id=user_id, then=F(field) + Value(changes[user_id][field])) for user_id in chunk if field in changes[user_id]]
+                if whens:
+                    updates[field] = Case(*whens, default=F(field), output_field=DecimalField(max_digits=14, decimal_places=2))
+            self.balance_model.objects.filter(user_id__in=chunk).update(updated_at=now(), **updates)
+
+    def get_balance(self, user_id: int) -> UserBalance:
+        """
+        Retrieves a user's balance; users without bills or invoices get an unsaved zero balance.
+        """
+        try:
+            return self.balance_model.objects.get(user_id=user_id)
+        except self.balance_model.DoesNotExist:
+            return self.balance_model(user_id=user_id)
+
+    def get_totals(self) -> Dict[str, Any]:
+        """
+        Totals every balance field across users, plus the number of users owing money, in one query.
+        """
+        totals = self.balance_model.objects.aggregate(
+            owing_users=Count('user_id', filter=Q(bills_unpaid__gt=0)),
+            **{field: Sum(field) for field in BALANCE_FIELDS},
+        )
+        return {key: value if value is not None else Decimal('0.00') for key, value in totals.items()}
+
+    def iter_user_id_ranges(self, chunk_size: int) -> Iterator[Tuple[int, int]]:
+        """
+        Walks the user table in ID order and yields inclusive (first ID, last ID) ranges of `chunk_size` users.
+        """
+        last_id = 0
+        while True:
+            ids = list(User.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield ids[0], ids[-1]
+            last_id = ids[-1]
+
+    def rebuild_range(self, user_id_min: int, user_id_max: int, dry_run: bool = False) -> List[Tuple[int, str, Decimal, Decimal]]:
+        """
+        Recomputes the balances of a range of users from their bills and invoices and reports drift.
+
+        The range's ledger rows are locked first, so a concurrent writer's delta waits and lands on
+        top of the rebuilt value instead of being lost.
+
+        Args:
+            user_id_min (int): First user ID of the range.
+            user_id_max (int): Last user ID of the range.
+            dry_run (bool): Only report drift, without correcting it.
+
+        Returns:
+            List[Tuple[int, str, Decimal, Decimal]]: (user ID, field, stored amount, actual amount) for every drifted field.
+        """
+        with transaction.atomic():
+            stored = self.balance_model.objects.filter(user_id__gte=user_id_min, user_id__lte=user_id_max)
+            if not dry_run:
+                stored = stored.select_for_update()
+            balances = list(stored)
+
+            expected: DefaultDict[int, Dict[str, Decimal]] = defaultdict(dict)
+            bill_totals = (
+                Bill.objects.filter(user_id__gte=user_id_min, user_id__lte=user_id_max)
+                .values('user_id', 'status').annotate(total=Sum('amount')).order_by()
+            )
+            for row in bill_totals:
+                expected[row['user_id']][BILL_FIELDS[row['status']]] = to_amount(row['total'])
+            invoice_totals = (
+                Invoice.objects.filter(user_id__gte=user_id_min, user_id__lte=user_id_max)
+                .values('user_id', 'status').annotate(total=Sum('total_amount')).order_by()
+            )
+            for row in invoice_totals:
+                expected[row['user_id']][INVOICE_FIELDS[row['status']]] = to_amount(row['total'])
+
+            zero = Decimal('0.00')
+            drift = []
+            changed = []
+            for balance in balances:
+                actual = expected.pop(balance.user_id, {})
+                drifted = False
+                for field in BALANCE_FIELDS:
+                    value = actual.get(field, zero)
+                    if getattr(balance, field) != value:
+                        drift.append((balance.user_id, field, getattr(balance, field), value))
+                        setattr(balance, field, value)
+                        drifted = True
+                if drifted:
+                    balance.updated_at = now()
+                    changed.append(balance)
+            # Users with bills or invoices but no ledger row
+            missing = []
+            for user_id, actual in expected.items():
+                drift.extend((user_id, field, zero, value) for field, value in actual.items() if value)
+                missing.append(self.balance_model(user_id=user_id, **actual))
+            if not dry_run:
+                self.balance_model.objects.bulk_update(changed, BALANCE_FIELDS + ['updated_at'])
+                self.balance_model.objects.bulk_create(missing, ignore_conflicts=True)
+            return drift
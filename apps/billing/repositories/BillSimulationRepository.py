@@ -0,0 +1,46 @@
+from datetime import date
+from typing import Any, Dict, Optional, Sequence
+from django.conf import settings
+from django.core.cache import caches
+
+RESULT_KEY = 'bill-simulation:{user_id}:{data_version}:{tariff_id}:{tariff_version}:{start}:{end}'
+
+
+class BillSimulationRepository:
+    """
+    Repository class for cached bill simulation results.
+
+    Keys embed the user's data version and the tariff's version, so a changed reading or rate
+    simply makes the old entries unreachable instead of requiring invalidation.
+    """
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        """
+        Initializes the BillSimulationRepository.
+
+        Args:
+            cache_alias (Optional[str]): Cache holding the results. Defaults to settings.BILL_SIMULATION_CACHE.
+        """
+        self.cache_alias: str = cache_alias or settings.BILL_SIMULATION_CACHE
+
+    def result_key(self, user_id: int, data_version: str, tariff_id: int, tariff_version: int, start_date: date, end_date: date) -> str:
+        """
+        Builds the cache key of one user's simulation against one tariff over a period.
+        """
+        return RESULT_KEY.format(
+            user_id=user_id, data_version=data_version, tariff_id=tariff_id,
+            tariff_version=tariff_version, start=start_date.isoformat(), end=end_date.isoformat(),
+        )
+
+    def get_results(self, keys: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieves the cached results for the keys in one round trip; missing keys are absent.
+        """
+        return caches[self.cache_alias].get_many(list(keys))
+
+    def save_results(self, results: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Stores simulation results under their keys in one round trip.
+        """
+        if results:
+            caches[self.cache_alias].set_many(results, timeout=settings.BILL_SIMULATION_CACHE_TIMEOUT)
@@ -1,24 +1,38 @@
-from typing import Optional, List, Type
+from typing import Optional, Dict, List, Sequence, Tuple, Type
+from datetime import date
+from decimal import Decimal
 from apps.billing.models.BillingModel import Bill
+from apps.billing.models.BillAdjustmentModel import BillAdjustment
+from apps.billing.repositories.BalanceRepository import BalanceRepository, new_deltas, add_bill_delta
 from apps.authentication.models.UserModel import User
-from django.db.models import Sum
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from django.db import transaction
+from django.db.models import Sum, QuerySet
+from apps.monitoring.services.MetricsService import traced_repository
 
+LEDGER_FIELDS = {'user', 'user_id', 'amount', 'status'}  # Columns whose changes move balances
+
+@traced_repository
 class BillRepository:
     """
     Repository class for handling billing-related database operations.
     """
 
-    def __init__ (self, bill_model: Optional[Type[Bill]] = None) -> None:
+    def __init__ (self, bill_model: Optional[Type[Bill]] = None, balance_repository: Optional[BalanceRepository] = None, archive_repository: Optional[ConsumptionArchiveRepository] = None) -> None:
         """
         Initializes the BillRepository with the specified bill model.
 
         Args:
             bill_model (Optional[Type[Bill]]): The bill model to use. Defaults to the project's Bill model.
+            balance_repository (Optional[BalanceRepository]): The ledger kept in step with every bill write.
+            archive_repository (Optional[ConsumptionArchiveRepository]): Where the links to archived readings are kept.
         """
         self.bill_model: Type[Bill] = bill_model or Bill
+        self.balance_repository: BalanceRepository = balance_repository or BalanceRepository()
+        self.archive_repository: ConsumptionArchiveRepository = archive_repository or ConsumptionArchiveRepository()
 
 
-    def create_bill(self, user: User, date: str, amount: float, status: str = 'unpaid') -> Bill:
+    def create_bill(self, user: User, date: str, amount: float, status: str = 'unpaid', period_start: Optional[date] = None, period_end: Optional[date] = None, billed_kwh: Optional[float] = None, consumption_ids: Sequence[int] = (), archived_consumption_ids: Sequence[int] = ()) -> Bill:
         """
         Creates a new bill for a user.
         
@@ -27,11 +41,46 @@ class BillRepository:
             date (str): The date of the bill.
             amount (float): The amount due.
             status (str, optional): The status of the bill. Defaults to 'unpaid'.
+            period_start (Optional[date]): First day of the billed readings.
+            period_end (Optional[date]): Last day of the billed readings.
+            billed_kwh (Optional[float]): The consumption the amount was computed from, for re-billing.
+            consumption_ids (Sequence[int]): The hot-table readings the bill covers.
+            archived_consumption_ids (Sequence[int]): The archived readings the bill covers.
         
         Returns:
             Bill: The created bill instance.
         """
-        return self.bill_model.objects.create(user=user, date=date, amount=amount, status=status)
+        deltas = new_deltas()
+        add_bill_delta(deltas, user.id, status, amount)
+        with transaction.atomic():
+            bill = self.bill_model.objects.create(
+                user=user, date=date, amount=amount, status=status,
+                period_start=period_start, period_end=period_end, billed_kwh=billed_kwh,
+            )
+            if consumption_ids:
+                bill.consumption.set(consumption_ids)
+            if archived_consumption_ids:
+                self.archive_repository.set_bill_readings(bill.id, archived_consumption_ids)
+            self.balance_repository.apply_deltas(deltas)
+        return bill
+
+    def bulk_create_bills(self, bills: Sequence[Bill]) -> List[Bill]:
+        """
+        Inserts several bills in one statement and adds them to their users' balances.
+        
+        Args:
+            bills (Sequence[Bill]): Unsaved bills.
+        
+        Returns:
+            List[Bill]: The created bills.
+        """
+        deltas = new_deltas()
+        for bill in bills:
+            add_bill_delta(deltas, bill.user_id, bill.status, bill.amount)
+        with transaction.atomic():
+            created = self.bill_model.objects.bulk_create(bills)
+            self.balance_repository.apply_deltas(deltas)
+        return created
 
     def get_bill_by_id(self, bill_id: int) -> Optional[Bill]:
         """
@@ -69,9 +118,62 @@ class BillRepository:
         """
         return list(self.bill_model.objects.all().order_by('-date'))
 
+    def get_bills_for_period(self, user_id: int, start_date: date, end_date: date) -> List[Bill]:
+        """
+        Retrieves a user's re-billable bills whose billed period overlaps the given dates.
+        
+        Args:
+            user_id (int): The ID of the user.
+            start_date (date): First day of the changed period.
+            end_date (date): Last day of the changed period.
+        
+        Returns:
+            List[Bill]: The bills with a recorded period and billed consumption.
+        """
+        return list(self.bill_model.objects.filter(
+            user_id=user_id,
+            period_start__lte=end_date,
+            period_end__gte=start_date,
+            billed_kwh__isnull=False,
+        ))
+
+    def adjust_bill(self, bill: Bill, new_amount: Decimal, new_kwh: float, consumption_ids: Sequence[int], archived_consumption_ids: Sequence[int] = ()) -> BillAdjustment:
+        """
+        Re-prices a bill, links it to its current readings and records the adjustment.
+        
+        Args:
+            bill (Bill): The bill being re-billed.
+            new_amount (Decimal): The recomputed amount.
+            new_kwh (float): The consumption the new amount was computed from.
+            consumption_ids (Sequence[int]): The hot-table readings the bill now covers.
+            archived_consumption_ids (Sequence[int]): The archived readings the bill now covers.
+        
+        Returns:
+            BillAdjustment: The recorded (saved) adjustment.
+        """
+        deltas = new_deltas()
+        add_bill_delta(deltas, bill.user_id, bill.status, bill.amount, sign=-1)
+        add_bill_delta(deltas, bill.user_id, bill.status, new_amount)
+        with transaction.atomic():
+            adjustment = BillAdjustment.objects.create(
+                bill=bill,
+                previous_amount=bill.amount,
+                new_amount=new_amount,
+                previous_kwh=bill.billed_kwh,
+                new_kwh=new_kwh,
+            )
+            bill.amount = new_amount
+            bill.billed_kwh = new_kwh
+            bill.save(update_fields=['amount', 'billed_kwh'])
+            bill.consumption.set(consumption_ids)
+            self.archive_repository.set_bill_readings(bill.id, archived_consumption_ids)
+            self.balance_repository.apply_deltas(deltas)
+        return adjustment
+
     def update_bill(self, bill: Bill, **updated_fields) -> Bill:
         """
         Updates a bill with new fields.
+        The ledger moves from the locked row's values, not the possibly stale instance's.
         
         Args:
             bill (Bill): The bill instance to update.
@@ -79,25 +181,221 @@ class BillRepository:
         
         Returns:
             Bill: The updated bill instance.
+        
+        Raises:
+            Bill.DoesNotExist: If the bill was deleted meanwhile.
         """
-        for field, value in updated_fields.items():
-            setattr(bill, field, value)
-        bill.save()
+        with transaction.atomic():
+            old = self.bill_model.objects.filter(id=bill.id).select_for_update().values_list('user_id', 'amount', 'status').first()
+            if old is None:
+                raise self.bill_model.DoesNotExist(f"Bill with ID {bill.id} does not exist.")
+            bill.user_id, bill.amount, bill.status = old
+            deltas = new_deltas()
+            add_bill_delta(deltas, bill.user_id, bill.status, bill.amount, sign=-1)
+            for field, value in updated_fields.items():
+                setattr(bill, field, value)
+            add_bill_delta(deltas, bill.user_id, bill.status, bill.amount)
+            # Only the given columns are written
+            bill.save(update_fields=list(updated_fields))
+            self.balance_repository.apply_deltas(deltas)
         return bill
 
+    def update_bill_fields(self, bill_id: int, **updated_fields) -> bool:
+        """
+        Updates a bill's columns by ID in one UPDATE, without loading it first.
+        Changes to the user, amount or status also lock and read the old values to keep the ledger in step.
+        
+        Args:
+            bill_id (int): The ID of the bill to update.
+            **updated_fields: The columns to set.
+        
+        Returns:
+            bool: True if the bill exists.
+        """
+        return self.bulk_update_bill_fields([bill_id], **updated_fields) > 0
+
+    def bulk_update_bill_fields(self, bill_ids: Sequence[int], **updated_fields) -> int:
+        """
+        Sets the same column values on several bills in one UPDATE.
+        
+        Args:
+            bill_ids (Sequence[int]): The IDs of the bills to update.
+            **updated_fields: The columns to set.
+        
+        Returns:
+            int: The number of bills updated.
+        """
+        queryset = self.bill_model.objects.filter(id__in=bill_ids)
+        if not LEDGER_FIELDS & set(updated_fields):
+            return queryset.update(**updated_fields)
+        with transaction.atomic():
+            old = list(queryset.select_for_update().values_list('id', 'user_id', 'amount', 'status'))
+            if not old:
+                return 0
+            deltas = new_deltas()
+            for _, user_id, amount, status in old:
+                add_bill_delta(deltas, user_id, status, amount, sign=-1)
+                add_bill_delta(
+                    deltas,
+                    updated_fields.get('user_id', getattr(updated_fields.get('user'), 'id', user_id)),
+                    updated_fields.get('status', status),
+                    updated_fields.get('amount', amount),
+                )
+            updated = self.bill_model.objects.filter(id__in=[row[0] for row in old]).update(**updated_fields)
+            self.balance_repository.apply_deltas(deltas)
+        return updated
+
+    def bulk_update_bills(self, bills: Sequence[Bill], fields: Sequence[str], batch_size: Optional[int] = None) -> int:
+        """
+        Writes the given columns of several modified bills, in batches of one UPDATE each.
+        
+        Args:
+            bills (Sequence[Bill]): Bills whose attributes were changed in memory.
+            fields (Sequence[str]): The columns to write.
+            batch_size (Optional[int]): Bills per UPDATE. Defaults to all in one statement.
+        
+        Returns:
+            int: The number of bills updated.
+        """
+        fields = list(fields)
+        if not bills:
+            return 0
+        if not LEDGER_FIELDS & set(fields):
+            return self.bill_model.objects.bulk_update(bills, fields, batch_size=batch_size)
+        with transaction.atomic():
+            old = {
+                bill_id: row for bill_id, *row in
+                self.bill_model.objects.filter(id__in=[bill.id for bill in bills]).select_for_update().values_list('id', 'user_id', 'amount', 'status')
+            }
+            # Bills deleted meanwhile are not written; columns outside `fields` keep their stored values
+            bills = [bill for bill in bills if bill.id in old]
+            if not bills:
+                return 0
+            deltas = new_deltas()
+            for bill in bills:
+                user_id, amount, status = old[bill.id]
+                add_bill_delta(deltas, user_id, status, amount, sign=-1)
+                add_bill_delta(
+                    deltas,
+                    bill.user_id if {'user', 'user_id'} & set(fields) else user_id,
+                    bill.status if 'status' in fields else status,
+                    bill.amount if 'amount' in fields else amount,
+                )
+            updated = self.bill_model.objects.bulk_update(bills, fields, batch_size=batch_size)
+            self.balance_repository.apply_deltas(deltas)
+        return updated
+
     def delete_bill(self, bill: Bill) -> bool:
         """
-        Deletes a bill.
+        Deletes a bill, removing the locked row's amount from the ledger.
         
         Args:
             bill (Bill): The bill instance to delete.
         
         Returns:
-            bool: True if deletion was successful, else False.
+            bool: True if deletion was successful, False if the bill no longer exists.
         """
-        bill.delete()
+        with transaction.atomic():
+            old = self.bill_model.objects.filter(id=bill.id).select_for_update().values_list('user_id', 'amount', 'status').first()
+            if old is None:
+                return False
+            user_id, amount, status = old
+            deltas = new_deltas()
+            add_bill_delta(deltas, user_id, status, amount, sign=-1)
+            bill.delete()
+            self.balance_repository.apply_deltas(deltas)
         return True
 
+    def lock_bills_for_payment(self, bill_ids: Sequence[int]) -> Dict[int, Tuple[int, Decimal, str]]:
+        """
+        Locks the bills with the given IDs for the rest of the transaction and returns what a payment is matched against.
+        
+        Args:
+            bill_ids (Sequence[int]): The IDs referenced by a batch of payments.
+        
+        Returns:
+            Dict[int, Tuple[int, Decimal, str]]: (user ID, amount, status) per existing bill.
+        """
+        rows = self.bill_model.objects.filter(id__in=bill_ids).select_for_update().values_list('id', 'user_id', 'amount', 'status')
+        return {bill_id: (user_id, amount, status) for bill_id, user_id, amount, status in rows}
+
+    def lock_invoice_bills_for_payment(self, invoice_ids: Sequence[int]) -> Dict[int, List[Tuple[int, Decimal, str]]]:
+        """
+        Locks the bills of the given invoices for the rest of the transaction and returns them per invoice.
+        
+        Args:
+            invoice_ids (Sequence[int]): The IDs of the invoices referenced by a batch of payments.
+        
+        Returns:
+            Dict[int, List[Tuple[int, Decimal, str]]]: (bill ID, amount, status) of every bill, per invoice.
+        """
+        rows = (
+            self.bill_model.objects.filter(invoices__id__in=invoice_ids).select_for_update(of=('self',))
+            .values_list('invoices__id', 'id', 'amount', 'status')
+        )
+        bills: Dict[int, List[Tuple[int, Decimal, str]]] = {}
+        for invoice_id, bill_id, amount, status in rows:
+            bills.setdefault(invoice_id, []).append((bill_id, amount, status))
+        return bills
+
+    def mark_bills_paid(self, bill_ids: Sequence[int]) -> int:
+        """
+        Marks unpaid bills as paid with one UPDATE and moves their amounts to the paid balance.
+        
+        Args:
+            bill_ids (Sequence[int]): The IDs of the bills to mark as paid.
+        
+        Returns:
+            int: The number of bills that changed status.
+        """
+        return self.set_bills_status(bill_ids, 'paid')
+
+    def set_bills_status(self, bill_ids: Sequence[int], status: str) -> int:
+        """
+        Moves several bills to a status with one UPDATE of the status column, keeping the ledger in step.
+        
+        Args:
+            bill_ids (Sequence[int]): The IDs of the bills.
+            status (str): The new status.
+        
+        Returns:
+            int: The number of bills that changed status.
+        """
+        return self._set_status(self.bill_model.objects.filter(id__in=bill_ids), status)
+
+    def mark_invoice_bills_paid(self, invoice_ids: Sequence[int]) -> int:
+        """
+        Marks the unpaid bills of paid invoices as paid with one UPDATE.
+        
+        Args:
+            invoice_ids (Sequence[int]): The IDs of the invoices that were paid.
+        
+        Returns:
+            int: The number of bills that changed status.
+        """
+        return self._set_status(self.bill_model.objects.filter(invoices__id__in=invoice_ids), 'paid')
+
+    def _set_status(self, queryset: QuerySet, status: str) -> int:
+        """
+        Moves the bills of a queryset that are not yet in the status to it, updating only the status column and the ledger.
+        """
+        with transaction.atomic():
+            # A bill on several invoices comes back once per invoice
+            rows = {
+                bill_id: (user_id, amount, previous)
+                for bill_id, user_id, amount, previous in
+                queryset.exclude(status=status).select_for_update(of=('self',)).values_list('id', 'user_id', 'amount', 'status')
+            }
+            if not rows:
+                return 0
+            deltas = new_deltas()
+            for user_id, amount, previous in rows.values():
+                add_bill_delta(deltas, user_id, previous, amount, sign=-1)
+                add_bill_delta(deltas, user_id, status, amount)
+            self.bill_model.objects.filter(id__in=list(rows)).update(status=status)
+            self.balance_repository.apply_deltas(deltas)
+        return len(rows)
+
     def aggregate_user_billing(self, user: User) -> float:
         """
         Aggregates total billing amount for a specific user.
@@ -0,0 +1,159 @@
+import uuid
+from typing import List, Optional, Sequence, Tuple, Type
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.utils.timezone import now
+from apps.billing.models.TariffModel import Tariff, TariffRate, TariffAssignment
+
+INDEX_STAMP_KEY = 'tariff-index-stamp'
+
+
+class TariffRepository:
+    """
+    Repository class for tariffs, their effective-dated rates and customer assignments.
+
+    Every write bumps the affected tariff's version and publishes a new index stamp in the
+    `TARIFF_INDEX_CACHE` cache, which tells every process to reload its tariff index. The stamp
+    is published once the write commits, so no process reloads the index before it can see it.
+    """
+
+    def __init__(self, tariff_model: Optional[Type[Tariff]] = None, cache_alias: Optional[str] = None) -> None:
+        """
+        Initializes the TariffRepository.
+
+        Args:
+            tariff_model (Optional[Type[Tariff]]): The tariff model to use. Defaults to Tariff.
+            cache_alias (Optional[str]): Cache holding the index stamp. Defaults to settings.TARIFF_INDEX_CACHE.
+        """
+        self.tariff_model: Type[Tariff] = tariff_model or Tariff
+        self.cache_alias: str = cache_alias or settings.TARIFF_INDEX_CACHE
+
+    def create_tariff(self, code: str, name: str, currency: str = 'USD') -> Tariff:
+        """
+        Creates a new tariff without rates.
+        """
+        tariff = self.tariff_model.objects.create(code=code, name=name, currency=currency)
+        self.publish_change_on_commit()
+        return tariff
+
+    def get_tariff_by_id(self, tariff_id: int) -> Optional[Tariff]:
+        """
+        Retrieves a tariff by its ID, or None when it does not exist.
+        """
+        try:
+            return self.tariff_model.objects.get(id=tariff_id)
+        except self.tariff_model.DoesNotExist:
+            return None
+
+    def get_all_tariffs(self) -> List[Tariff]:
+        """
+        Retrieves every tariff with its rates, ordered by code.
+        """
+        return list(self.tariff_model.objects.prefetch_related('rates').order_by('code'))
+
+    def update_tariff(self, tariff: Tariff, **updated_fields) -> Tariff:
+        """
+        Updates a tariff's fields and bumps its version.
+        """
+        for field, value in updated_fields.items():
+            setattr(tariff, field, value)
+        tariff.version += 1
+        tariff.save()
+        self.publish_change_on_commit()
+        return tariff
+
+    def delete_tariff(self, tariff: Tariff) -> bool:
+        """
+        Deletes a tariff and its rates. Tariffs still assigned to customers cannot be deleted.
+        """
+        tariff.delete()
+        self.publish_change_on_commit()
+        return True
+
+    def add_rate(self, tariff: Tariff, **fields) -> TariffRate:
+        """
+        Adds an effective-dated rate to a tariff after checking it does not overlap another one.
+        Raises:
+            ValidationError: If the rate overlaps an existing rate.
+        """
+        rate = TariffRate(tariff=tariff, **fields)
+        rate.full_clean()
+        rate.save()
+        self.bump_versions([tariff.id])
+        return rate
+
+    def delete_rate(self, rate: TariffRate) -> bool:
+        """
+        Deletes a rate and bumps its tariff's version.
+        """
+        rate.delete()
+        self.bump_versions([rate.tariff_id])
+        return True
+
+    def assign_tariff(self, user_id: int, tariff: Tariff, **fields) -> TariffAssignment:
+        """
+        Puts a customer on a tariff from a date after checking it does not overlap another assignment.
+        Raises:
+            ValidationError: If the assignment overlaps an existing one.
+        """
+        assignment = TariffAssignment(user_id=user_id, tariff=tariff, **fields)
+        assignment.full_clean()
+        assignment.save()
+        self.publish_change_on_commit()
+        return assignment
+
+    def get_rate_rows(self) -> List[Tuple]:
+        """
+        Retrieves every rate as (tariff ID, valid_from, valid_to, price per kWh, standing charge), ordered for indexing.
+        """
+        return list(
+            TariffRate.objects
+            .order_by('tariff_id', 'valid_from')
+            .values_list('tariff_id', 'valid_from', 'valid_to', 'price_per_kwh', 'standing_charge_per_day')
+        )
+
+    def get_assignment_rows(self) -> List[Tuple]:
+        """
+        Retrieves every assignment as (user ID, valid_from, valid_to, tariff ID), ordered for indexing.
+        """
+        return list(
+            TariffAssignment.objects
+            .order_by('user_id', 'valid_from')
+            .values_list('user_id', 'valid_from', 'valid_to', 'tariff_id')
+        )
+
+    def get_tariff_versions(self) -> List[Tuple[int, str, int]]:
+        """
+        Retrieves (tariff ID, code, version) for every tariff.
+        """
+        return list(self.tariff_model.objects.values_list('id', 'code', 'version'))
+
+    def bump_versions(self, tariff_ids: Sequence[int]) -> None:
+        """
+        Bumps the versions of tariffs whose rates changed and publishes a new index stamp.
+        """
+        self.tariff_model.objects.filter(id__in=tariff_ids).update(version=F('version') + 1, updated_at=now())
+        self.publish_change_on_commit()
+
+    def publish_change(self) -> str:
+        """
+        Stores a new index stamp so every process reloads its tariff index.
+        """
+        stamp = uuid.uuid4().hex
+        caches[self.cache_alias].set(INDEX_STAMP_KEY, stamp, timeout=None)
+        return stamp
+
+    def publish_change_on_commit(self) -> None:
+        """
+        Publishes a new index stamp once the current transaction commits, or right away outside one.
+        """
+        transaction.on_commit(self.publish_change)
+
+    def get_index_stamp(self) -> str:
+        """
+        Retrieves the current index stamp, publishing one when the cache has none.
+        """
+        stamp = caches[self.cache_alias].get(INDEX_STAMP_KEY)
+        return stamp if stamp is not None else self.publish_change()
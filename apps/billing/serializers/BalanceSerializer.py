@@ -0,0 +1,13 @@
+from rest_framework import serializers # type: ignore
+from apps.billing.models.BalanceModel import UserBalance
+
+class UserBalanceSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a user's balance ledger row.
+    """
+    outstanding = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = UserBalance
+        fields = ['user', 'outstanding', 'bills_unpaid', 'bills_paid', 'invoices_unpaid', 'invoices_overdue', 'invoices_paid', 'updated_at']
+        read_only_fields = fields
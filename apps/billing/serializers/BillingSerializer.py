@@ -1,4 +1,5 @@
 from rest_framework import serializers # type: ignore
+from django.conf import settings
 from apps.billing.models.BillingModel import Bill
 
 class BillSerializer(serializers.ModelSerializer):
@@ -7,8 +8,8 @@ class BillSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Bill
-        fields = ['id', 'user', 'date', 'amount', 'status']
-        read_only_fields = ['user']
+        fields = ['id', 'user', 'date', 'amount', 'status', 'period_start', 'period_end', 'billed_kwh']
+        read_only_fields = ['user', 'period_start', 'period_end', 'billed_kwh']
 
     def validate_amount(self, value: float) -> float:
         """
@@ -17,3 +18,11 @@ class BillSerializer(serializers.ModelSerializer):
         if value <= 0:
             raise serializers.ValidationError("Amount must be a positive number.")
         return value
+
+
+class BillStatusUpdateSerializer(serializers.Serializer):
+    """
+    Serializer for moving several bills to one status.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=settings.BULK_STATUS_UPDATE_MAX_IDS)
+    status = serializers.ChoiceField(choices=Bill.STATUS_CHOICES)
@@ -0,0 +1,68 @@
+from rest_framework import serializers # type: ignore
+from django.conf import settings
+from apps.billing.models.TariffModel import Tariff, TariffRate, TariffAssignment
+
+class TariffRateSerializer(serializers.ModelSerializer):
+    """
+    Serializer for an effective-dated tariff rate.
+    """
+    class Meta:
+        model = TariffRate
+        fields = ['id', 'valid_from', 'valid_to', 'price_per_kwh', 'standing_charge_per_day']
+
+    def validate(self, data):
+        """
+        Ensure the rate ends after it starts and its prices are not negative.
+        """
+        if data.get('valid_to') is not None and data['valid_to'] <= data['valid_from']:
+            raise serializers.ValidationError("valid_to must be after valid_from.")
+        if data['price_per_kwh'] < 0 or data.get('standing_charge_per_day', 0) < 0:
+            raise serializers.ValidationError("Prices cannot be negative.")
+        return data
+
+
+class TariffSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a tariff together with its rates.
+    """
+    rates = TariffRateSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Tariff
+        fields = ['id', 'code', 'name', 'currency', 'version', 'updated_at', 'rates']
+        read_only_fields = ['version', 'updated_at']
+
+
+class TariffAssignmentSerializer(serializers.ModelSerializer):
+    """
+    Serializer for putting a customer on a tariff from a date.
+    """
+    class Meta:
+        model = TariffAssignment
+        fields = ['id', 'user', 'tariff', 'valid_from', 'valid_to']
+
+    def validate(self, data):
+        """
+        Ensure the assignment ends after it starts.
+        """
+        if data.get('valid_to') is not None and data['valid_to'] <= data['valid_from']:
+            raise serializers.ValidationError("valid_to must be after valid_from.")
+        return data
+
+
+class BillSimulationRequestSerializer(serializers.Serializer):
+    """
+    Serializer for a what-if simulation request; the period defaults to the last twelve complete months.
+    """
+    tariffs = serializers.ListField(child=serializers.IntegerField(), min_length=1)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    user = serializers.IntegerField(required=False, help_text="Admins only: simulate for another customer.")
+
+    def validate_tariffs(self, value):
+        """
+        Ensure the number of candidate tariffs stays within BILL_SIMULATION_MAX_TARIFFS.
+        """
+        if len(value) > settings.BILL_SIMULATION_MAX_TARIFFS:
+            raise serializers.ValidationError(f"At most {settings.BILL_SIMULATION_MAX_TARIFFS} tariffs can be compared.")
+        return value
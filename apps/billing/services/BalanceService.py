@@ -0,0 +1,67 @@
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db import connections
+from apps.billing.models.BalanceModel import UserBalance
+from apps.billing.repositories.BalanceRepository import BalanceRepository, BALANCE_FIELDS
+
+DRIFT_SAMPLE_SIZE = 20  # Drifted users listed in a reconciliation report
+
+
+class BalanceService:
+    """
+    Service class for reading and reconciling the per-user balance ledger.
+    """
+
+    def __init__(self, balance_repository: BalanceRepository) -> None:
+        self.balance_repository = balance_repository
+
+    def get_balance(self, user_id: int) -> UserBalance:
+        """
+        Get a user's balance from their single ledger row.
+        """
+        return self.balance_repository.get_balance(user_id)
+
+    def get_totals(self) -> Dict[str, Any]:
+        """
+        Get the balance totals by document and status across every user.
+        """
+        return self.balance_repository.get_totals()
+
+    def reconcile(self, chunk_size: Optional[int] = None, workers: Optional[int] = None, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild every balance from the bills and invoices, in parallel chunks of users, and report drift.
+
+        Args:
+            chunk_size (Optional[int]): Users per chunk. Defaults to settings.BALANCE_RECONCILE_CHUNK_SIZE.
+            workers (Optional[int]): Chunks rebuilt concurrently. Defaults to settings.BALANCE_RECONCILE_WORKERS.
+            dry_run (bool): Only report drift, without correcting it.
+
+        Returns:
+            Dict[str, Any]: The number of `chunks`, the `drifted_users`, the absolute drift per field
+            and a sample of drifted fields.
+        """
+        ranges = list(self.balance_repository.iter_user_id_ranges(chunk_size or settings.BALANCE_RECONCILE_CHUNK_SIZE))
+        with ThreadPoolExecutor(max_workers=workers or settings.BALANCE_RECONCILE_WORKERS) as executor:
+            chunks = list(executor.map(lambda user_range: self._rebuild_chunk(user_range, dry_run), ranges))
+
+        drift_by_field = {field: Decimal('0.00') for field in BALANCE_FIELDS}
+        drifted_users = set()
+        sample = []
+        for chunk in chunks:
+            for user_id, field, stored, actual in chunk:
+                drift_by_field[field] += abs(actual - stored)
+                drifted_users.add(user_id)
+                if len(sample) < DRIFT_SAMPLE_SIZE:
+                    sample.append({'user': user_id, 'field': field, 'stored': stored, 'actual': actual})
+        return {'chunks': len(ranges), 'drifted_users': len(drifted_users), 'drift': drift_by_field, 'sample': sample}
+
+    def _rebuild_chunk(self, user_range: Tuple[int, int], dry_run: bool) -> List[Tuple[int, str, Decimal, Decimal]]:
+        """
+        Rebuild one chunk on a worker thread, closing the thread's database connection afterwards.
+        """
+        try:
+            return self.balance_repository.rebuild_range(user_range[0], user_range[1], dry_run=dry_run)
+        finally:
+            connections.close_all()
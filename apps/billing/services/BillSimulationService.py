@@ -0,0 +1,169 @@
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from apps.billing.repositories.BillSimulationRepository import BillSimulationRepository
+from apps.billing.services.TariffService import TariffIndex, TariffService
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.consumption.repositories.ConsumptionPartitionRepository import add_months
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by bill simulations
+    np = None
+
+TARIFF_KEY_SPAN = 1 << 22  # Larger than any date ordinal, so (tariff slot, day) pairs sort as one key
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImproperlyConfigured("Bill simulations require numpy. Did you install numpy?")
+
+
+def default_period(today: date) -> Tuple[date, date]:
+    """
+    Returns the last twelve complete months before today.
+    """
+    return add_months(today, -12), add_months(today, 0) - timedelta(days=1)
+
+
+class BillSimulationService:
+    """
+    Service class for "what would this period have cost on tariff X" simulations.
+
+    The customer's readings are loaded once as arrays and priced against every candidate tariff
+    in a single vectorized pass: each tariff's rate spans are offset into their own key range,
+    so one `searchsorted` finds the rate of every (tariff, day) pair. Results are cached per
+    tariff under the customer's data version and the tariff's version.
+    """
+
+    def __init__(self, consumption_repository: ConsumptionRepository, tariff_service: TariffService, simulation_repository: Optional[BillSimulationRepository] = None, dirty_period_repository: Optional[DirtyPeriodRepository] = None) -> None:
+        self.consumption_repository = consumption_repository
+        self.tariff_service = tariff_service
+        self.simulation_repository = simulation_repository or BillSimulationRepository()
+        self.dirty_period_repository = dirty_period_repository or DirtyPeriodRepository()
+
+    def simulate(self, user_id: int, tariff_ids: Sequence[int], start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        Price a customer's consumption over a period against candidate tariffs.
+
+        Args:
+            user_id (int): The customer whose readings are priced.
+            tariff_ids (Sequence[int]): The candidate tariffs.
+            start_date (date): First day of the period.
+            end_date (date): Last day of the period.
+
+        Returns:
+            List[Dict[str, Any]]: One result per tariff, in request order, with totals, the number
+            of days no rate covers and a monthly breakdown.
+
+        Raises:
+            ValueError: If a tariff does not exist or the period is invalid.
+        """
+        _require_numpy()
+        if end_date < start_date:
+            raise ValueError("end_date must not be before start_date.")
+        if (end_date - start_date).days + 1 > settings.BILL_SIMULATION_MAX_DAYS:
+            raise ValueError(f"Periods are limited to {settings.BILL_SIMULATION_MAX_DAYS} days.")
+        index = self.tariff_service.get_index()
+        tariff_ids = list(dict.fromkeys(tariff_ids))
+        unknown = [tariff_id for tariff_id in tariff_ids if tariff_id not in index.versions]
+        if unknown:
+            raise ValueError(f"Unknown tariffs: {unknown}")
+
+        data_version = self.dirty_period_repository.get_data_versions([user_id])[user_id]
+        keys = {
+            tariff_id: self.simulation_repository.result_key(user_id, data_version, tariff_id, index.versions[tariff_id], start_date, end_date)
+            for tariff_id in tariff_ids
+        }
+        cached = self.simulation_repository.get_results(list(keys.values()))
+        missing = [tariff_id for tariff_id in tariff_ids if keys[tariff_id] not in cached]
+        if missing:
+            series = self.consumption_repository.get_kwh_series(user_id, start_date, end_date)
+            computed = self.price_series(index, missing, series.dates, series.values, start_date, end_date)
+            fresh = {keys[tariff_id]: result for tariff_id, result in zip(missing, computed)}
+            self.simulation_repository.save_results(fresh)
+            cached.update(fresh)
+        return [cached[keys[tariff_id]] for tariff_id in tariff_ids]
+
+    def price_series(self, index: TariffIndex, tariff_ids: Sequence[int], dates: Any, values: Any, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        """
+        Price a series of (date ordinal, kWh) readings against several tariffs in one pass.
+        """
+        slots = len(tariff_ids)
+        starts, ends, prices, charges = self._stack_spans(index, tariff_ids)
+        days = np.arange(start_date.toordinal(), end_date.toordinal() + 1, dtype=np.int64)
+        first_month = self._month_numbers(days[:1])[0]
+        month_count = self._month_numbers(days[-1:])[0] - first_month + 1
+        slot_offsets = np.arange(slots, dtype=np.int64)[:, None] * TARIFF_KEY_SPAN
+
+        def lookup(ordinals: Any) -> Tuple[Any, Any]:
+            keys = (slot_offsets + ordinals[None, :]).ravel()
+            positions = np.searchsorted(starts, keys, side='right') - 1
+            return positions, keys < ends[positions]
+
+        def per_month(ordinals: Any, weights: Any) -> Any:
+            months = self._month_numbers(ordinals) - first_month
+            cells = (np.arange(slots, dtype=np.int64)[:, None] * month_count + months[None, :]).ravel()
+            return np.bincount(cells, weights=weights, minlength=slots * month_count).reshape(slots, month_count)
+
+        reading_positions, reading_covered = lookup(dates.astype(np.int64))
+        energy_cost = per_month(dates, np.where(reading_covered, np.tile(values, slots) * prices[reading_positions], 0.0))
+        kwh = np.bincount(self._month_numbers(dates) - first_month, weights=values, minlength=month_count)
+
+        day_positions, day_covered = lookup(days)
+        standing_charge = per_month(days, np.where(day_covered, charges[day_positions], 0.0))
+        uncovered_days = (~day_covered).reshape(slots, len(days)).sum(axis=1)
+
+        month_labels = [str(month) for month in (np.arange(month_count) + first_month).astype('datetime64[M]')]
+        results = []
+        for slot, tariff_id in enumerate(tariff_ids):
+            results.append({
+                'tariff_id': tariff_id,
+                'code': index.codes[tariff_id],
+                'version': index.versions[tariff_id],
+                'start_date': start_date.isoformat(),
+                'end_date': end_date.isoformat(),
+                'kwh': round(float(kwh.sum()), 3),
+                'energy_cost': round(float(energy_cost[slot].sum()), 2),
+                'standing_charge': round(float(standing_charge[slot].sum()), 2),
+                'total': round(float(energy_cost[slot].sum() + standing_charge[slot].sum()), 2),
+                'uncovered_days': int(uncovered_days[slot]),
+                'months': [
+                    {
+                        'month': label,
+                        'kwh': round(float(kwh[month]), 3),
+                        'energy_cost': round(float(energy_cost[slot, month]), 2),
+                        'standing_charge': round(float(standing_charge[slot, month]), 2),
+                        'total': round(float(energy_cost[slot, month] + standing_charge[slot, month]), 2),
+                    }
+                    for month, label in enumerate(month_labels)
+                ],
+            })
+        return results
+
+    def _stack_spans(self, index: TariffIndex, tariff_ids: Sequence[int]) -> Tuple[Any, Any, Any, Any]:
+        """
+        Concatenates the tariffs' rate spans, offsetting each tariff's dates into its own key range.
+        A leading empty span keeps lookups in bounds when no tariff has rates.
+        """
+        columns: Tuple[List[Any], List[Any], List[Any], List[Any]] = ([np.array([-1])], [np.array([-1])], [np.zeros(1)], [np.zeros(1)])
+        for slot, tariff_id in enumerate(tariff_ids):
+            spans = index.rate_spans(tariff_id)
+            if spans is None:
+                continue
+            starts, ends, prices, charges = spans
+            columns[0].append(np.asarray(starts, dtype=np.int64) + slot * TARIFF_KEY_SPAN)
+            columns[1].append(np.asarray(ends, dtype=np.int64) + slot * TARIFF_KEY_SPAN)
+            columns[2].append(np.asarray(prices, dtype=np.float64))
+            columns[3].append(np.asarray(charges, dtype=np.float64))
+        return tuple(np.concatenate(column) for column in columns) # type: ignore
+
+    @staticmethod
+    def _month_numbers(ordinals: Any) -> Any:
+        """
+        Converts date ordinals to months since the Unix epoch.
+        """
+        return (np.asarray(ordinals, dtype=np.int64) - UNIX_EPOCH_ORDINAL).astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
@@ -1,7 +1,10 @@
 from apps.billing.repositories.BillingRepository import BillRepository
 from apps.authentication.models.UserModel import User
 from apps.billing.models.BillingModel import Bill
-from typing import Optional, List
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.ConsumptionPartitionRepository import add_months
+from datetime import date, timedelta
+from typing import Optional, List, Sequence
 from django.core.exceptions import ObjectDoesNotExist
 
 class BillService:
@@ -9,20 +12,31 @@ class BillService:
     Service class for handling business logic related to billing, with exception handling.
     """
 
-    def __init__(self, bill_repository: BillRepository) -> None:
+    def __init__(self, bill_repository: BillRepository, consumption_repository: Optional[ConsumptionRepository] = None) -> None:
         """
-        Initialize the service with dependency injection for the repository.
+        Initialize the service with dependency injection for the repositories.
         """
         self.bill_repository = bill_repository
+        self.consumption_repository = consumption_repository or ConsumptionRepository()
 
-    def create_bill(self, user: User, date: str, amount: float, status: str = 'unpaid') -> Bill:
+    def create_bill(self, user: User, date: date, amount: float, status: str = 'unpaid', period_start: Optional[date] = None, period_end: Optional[date] = None) -> Bill:
         """
-        Create a billing record using the repository.
+        Create a billing record using the repository, recording the billed period, its consumption
+        and readings as re-billing computes them, so later corrections re-price the bill.
+        The period defaults to the calendar month before the bill's date.
         
         Returns:
             Bill: The created bill instance.
         """
-        return self.bill_repository.create_bill(user=user, date=date, amount=amount, status=status)
+        if period_start is None or period_end is None:
+            period_start = add_months(date, -1)
+            period_end = add_months(date, 0) - timedelta(days=1)
+        period = self.consumption_repository.get_period_consumption(user.id, period_start, period_end)
+        return self.bill_repository.create_bill(
+            user=user, date=date, amount=amount, status=status,
+            period_start=period_start, period_end=period_end, billed_kwh=period.kwh,
+            consumption_ids=period.consumption_ids, archived_consumption_ids=period.archived_ids,
+        )
 
     def get_user_bills(self, user: User) -> List[Bill]:
         """
@@ -57,6 +71,15 @@ class BillService:
             return self.bill_repository.update_bill(bill, **updated_fields)
         raise ObjectDoesNotExist(f"Bill with ID {bill_id} does not exist.")
 
+    def set_bills_status(self, bill_ids: Sequence[int], status: str) -> int:
+        """
+        Move several bills to a status in one statement, e.g. mark N bills paid.
+        
+        Returns:
+            int: The number of bills that changed status.
+        """
+        return self.bill_repository.set_bills_status(bill_ids, status)
+
     def delete_bill(self, bill_id: int) -> bool:
         """
         Delete a billing record by its ID.
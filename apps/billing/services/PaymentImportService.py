@@ -0,0 +1,168 @@
+import csv
+import re
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+from django.conf import settings
+from django.db import transaction
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.repositories.BalanceRepository import to_amount
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+REFERENCE_PATTERN = re.compile(r'^\s*(BILL|INV)-(\d+)\s*$', re.IGNORECASE)
+OUTCOMES = ('paid', 'overpaid', 'underpaid', 'already_paid', 'duplicate', 'unmatched', 'malformed')
+
+
+class Payment(NamedTuple):
+    """
+    One line of a bank payment file.
+    """
+    line: int
+    reference: str
+    kind: str  # 'bill' or 'invoice'
+    target_id: int
+    amount: Decimal
+
+
+class PaymentIssue(NamedTuple):
+    """
+    A payment that did not settle its bill or invoice exactly.
+    """
+    line: int
+    reference: str
+    amount: str
+    outcome: str
+    expected: str
+
+
+class PaymentImportService:
+    """
+    Service class for reconciling bank payment files against bills and invoices.
+
+    The file is read as a stream and handled in batches: each batch locks the referenced bills
+    and invoices with one `id__in` query per table, and marks the settled ones paid with one
+    status-only UPDATE per table, keeping the balance ledger in step. Payments are matched in
+    file order against the statuses the earlier payments left, so the outcome does not depend
+    on the batch size.
+    """
+
+    def __init__(self, bill_repository: BillRepository, invoice_repository: InvoiceRepository) -> None:
+        self.bill_repository = bill_repository
+        self.invoice_repository = invoice_repository
+
+    def import_payments(self, lines: Iterable[str], batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Import a CSV payment file with `reference` and `amount` columns.
+
+        References are `BILL-<id>` or `INV-<id>`. A payment of at least the amount due marks the
+        bill or invoice paid, and paying an invoice also settles its bills. An invoice's amount due
+        is its total less its bills that are already paid. Underpayments leave the document unpaid.
+
+        Args:
+            lines (Iterable[str]): The file's lines, header first; read lazily.
+            batch_size (Optional[int]): Payments matched per transaction. Defaults to settings.PAYMENT_IMPORT_BATCH_SIZE.
+
+        Returns:
+            Dict[str, Any]: Counts per outcome, the `received` and `applied` amounts, and the `issues`:
+            every payment that was not an exact match.
+        """
+        batch_size = batch_size or settings.PAYMENT_IMPORT_BATCH_SIZE
+        report: Dict[str, Any] = {outcome: 0 for outcome in OUTCOMES}
+        report.update(rows=0, received=Decimal('0.00'), applied=Decimal('0.00'), issues=[])
+        seen: Set[Tuple[str, int]] = set()
+        batch: List[Payment] = []
+        for payment in self._parse(lines, report):
+            key = (payment.kind, payment.target_id)
+            if key in seen:
+                self._record(report, payment, 'duplicate')
+                continue
+            seen.add(key)
+            batch.append(payment)
+            if len(batch) == batch_size:
+                self._apply_batch(batch, report)
+                batch = []
+        if batch:
+            self._apply_batch(batch, report)
+        report['issues'].sort()
+        return report
+
+    def _parse(self, lines: Iterable[str], report: Dict[str, Any]) -> Iterator[Payment]:
+        """
+        Yields the well-formed payments of the file, recording malformed lines as issues.
+        """
+        reader = csv.DictReader(lines)
+        if reader.fieldnames is None or not {'reference', 'amount'} <= {name.strip().lower() for name in reader.fieldnames}:
+            raise ValueError("Payment files need a header with 'reference' and 'amount' columns.")
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames]
+        for row in reader:
+            report['rows'] += 1
+            reference = (row.get('reference') or '').strip()
+            match = REFERENCE_PATTERN.match(reference)
+            try:
+                amount = to_amount((row.get('amount') or '').strip())
+            except InvalidOperation:
+                amount = None
+            if amount is not None and not amount.is_finite():
+                amount = None
+            if match is None or amount is None or amount <= 0:
+                report['malformed'] += 1
+                report['issues'].append(PaymentIssue(reader.line_num, reference, (row.get('amount') or '').strip(), 'malformed', ''))
+                continue
+            report['received'] += amount
+            kind = 'bill' if match.group(1).upper() == 'BILL' else 'invoice'
+            yield Payment(reader.line_num, reference, kind, int(match.group(2)), amount)
+
+    def _apply_batch(self, batch: List[Payment], report: Dict[str, Any]) -> None:
+        """
+        Matches a batch of payments and marks the settled bills and invoices paid, in one transaction.
+        Settling an invoice settles its bills for the payments after it, and bills paid before their
+        invoice are deducted from its amount due, as if each payment were its own batch.
+        """
+        with transaction.atomic():
+            invoice_ids = [p.target_id for p in batch if p.kind == 'invoice']
+            bills = self.bill_repository.lock_bills_for_payment([p.target_id for p in batch if p.kind == 'bill'])
+            invoices = self.invoice_repository.lock_invoices_for_payment(invoice_ids)
+            invoice_bills = self.bill_repository.lock_invoice_bills_for_payment(invoice_ids)
+            bill_status = {bill_id: status for bill_id, (_, _, status) in bills.items()}
+            for rows in invoice_bills.values():
+                bill_status.update((bill_id, status) for bill_id, _, status in rows)
+            settled: Dict[str, List[int]] = {'bill': [], 'invoice': []}
+            for payment in batch:
+                if payment.kind == 'bill':
+                    target = bills.get(payment.target_id)
+                    if target is None:
+                        self._record(report, payment, 'unmatched')
+                        continue
+                    status, due = bill_status[payment.target_id], target[1]
+                else:
+                    target = invoices.get(payment.target_id)
+                    if target is None:
+                        self._record(report, payment, 'unmatched')
+                        continue
+                    paid_bills = sum((amount for bill_id, amount, _ in invoice_bills.get(payment.target_id, ()) if bill_status[bill_id] == 'paid'), Decimal('0.00'))
+                    status, due = target[2], max(target[1] - paid_bills, Decimal('0.00'))
+                    if status != 'paid' and due == 0:
+                        status = 'paid'
+                if status == 'paid':
+                    self._record(report, payment, 'already_paid', due)
+                elif payment.amount < due:
+                    self._record(report, payment, 'underpaid', due)
+                else:
+                    settled[payment.kind].append(payment.target_id)
+                    if payment.kind == 'bill':
+                        bill_status[payment.target_id] = 'paid'
+                    else:
+                        invoices[payment.target_id] = (*target[:2], 'paid')
+                        bill_status.update((bill_id, 'paid') for bill_id, _, _ in invoice_bills.get(payment.target_id, ()))
+                    report['applied'] += due
+                    if payment.amount > due:
+                        self._record(report, payment, 'overpaid', due)
+                    else:
+                        report['paid'] += 1
+            self.bill_repository.mark_bills_paid(settled['bill'])
+            self.invoice_repository.mark_invoices_paid(settled['invoice'])
+            self.bill_repository.mark_invoice_bills_paid(settled['invoice'])
+
+    @staticmethod
+    def _record(report: Dict[str, Any], payment: Payment, outcome: str, expected: Optional[Decimal] = None) -> None:
+        report[outcome] += 1
+        report['issues'].append(PaymentIssue(payment.line, payment.reference, str(payment.amount), outcome, '' if expected is None else str(expected)))
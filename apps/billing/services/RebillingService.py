@@ -0,0 +1,80 @@
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.models.BillingModel import Bill
+from apps.billing.models.BillAdjustmentModel import BillAdjustment
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.consumption.repositories.ConsumptionPartitionRepository import add_months
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+from apps.invoices.tasks import generate_invoice_pdf
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Optional
+from django.conf import settings
+from django.db import transaction
+
+CENT = Decimal('0.01')
+
+
+class RebillingService:
+    """
+    Service class for re-billing periods whose consumption changed after they were billed.
+
+    Consumption writes record dirty (user, month) keys; this service only visits bills that
+    overlap those keys, so the cost of a correction run grows with the number of changes
+    rather than with the number of customers.
+    """
+
+    def __init__(self, bill_repository: BillRepository, consumption_repository: ConsumptionRepository, dirty_period_repository: DirtyPeriodRepository, invoice_repository: InvoiceRepository) -> None:
+        self.bill_repository = bill_repository
+        self.consumption_repository = consumption_repository
+        self.dirty_period_repository = dirty_period_repository
+        self.invoice_repository = invoice_repository
+
+    def rebill_bill(self, bill: Bill) -> Optional[BillAdjustment]:
+        """
+        Re-price a bill from its period's current consumption at the bill's effective price per kWh.
+
+        Returns:
+            Optional[BillAdjustment]: The recorded adjustment, or None when the amount did not change.
+        """
+        if not bill.billed_kwh:
+            return None
+        period = self.consumption_repository.get_period_consumption(bill.user_id, bill.period_start, bill.period_end)
+        price = bill.amount / Decimal(repr(bill.billed_kwh))
+        new_amount = (price * Decimal(repr(period.kwh))).quantize(CENT, rounding=ROUND_HALF_UP)
+        if new_amount == bill.amount:
+            return None
+        adjustment = self.bill_repository.adjust_bill(bill, new_amount, period.kwh, period.consumption_ids, period.archived_ids)
+        invoices = self.invoice_repository.refresh_invoice_totals(bill)
+        if invoices:
+            adjustment.invoice_updated = True
+            adjustment.save(update_fields=['invoice_updated'])
+        for invoice in invoices:
+            transaction.on_commit(lambda invoice_id=invoice.id: generate_invoice_pdf.delay(invoice_id))
+        return adjustment
+
+    def rebill_dirty_periods(self, batch_size: Optional[int] = None) -> Dict[str, int]:
+        """
+        Re-bill the bills overlapping the least recently changed dirty periods.
+
+        Each period is handled in its own transaction and cleared afterwards, unless it changed
+        again while it was being re-billed.
+
+        Args:
+            batch_size (Optional[int]): Dirty periods handled in this run. Defaults to settings.REBILLING_BATCH_SIZE.
+
+        Returns:
+            Dict[str, int]: The number of `periods` handled, `bills` visited and `adjustments` recorded.
+        """
+        result = {'periods': 0, 'bills': 0, 'adjustments': 0}
+        for period in self.dirty_period_repository.get_dirty_periods(batch_size or settings.REBILLING_BATCH_SIZE):
+            month_end = add_months(period.month, 1) - timedelta(days=1)
+            with transaction.atomic():
+                bills = self.bill_repository.get_bills_for_period(period.user_id, period.month, month_end)
+                for bill in bills:
+                    if self.rebill_bill(bill) is not None:
+                        result['adjustments'] += 1
+                self.dirty_period_repository.clear_period(period)
+            result['periods'] += 1
+            result['bills'] += len(bills)
+        return result
@@ -0,0 +1,206 @@
+import time
+from array import array
+from bisect import bisect_right
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.db import transaction
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.models.TariffModel import Tariff, TariffRate, TariffAssignment
+
+OPEN_END = date.max.toordinal() + 1  # valid_to of open-ended rates and assignments
+
+
+class EffectiveRate(NamedTuple):
+    """
+    The rate of a tariff that applies on a given day.
+    """
+    tariff_id: int
+    valid_from: date
+    valid_to: Optional[date]
+    price_per_kwh: float
+    standing_charge_per_day: float
+
+
+class TariffIndex:
+    """
+    Immutable in-memory interval index over every tariff rate and customer assignment.
+
+    Each tariff (and each customer) maps to parallel sorted arrays of start and end date
+    ordinals, so "which rate applied on this day" is one `bisect` over compact `array`
+    buffers instead of a query. Built once per process; a new index replaces it on change.
+    """
+
+    def __init__(self, rate_rows: List[Tuple], assignment_rows: List[Tuple], versions: List[Tuple[int, str, int]], stamp: str = '') -> None:
+        self.stamp = stamp
+        self.versions: Dict[int, int] = {tariff_id: version for tariff_id, _, version in versions}
+        self.codes: Dict[int, str] = {tariff_id: code for tariff_id, code, _ in versions}
+        self._rates: Dict[int, Tuple[array, array, array, array]] = {}
+        for tariff_id, valid_from, valid_to, price, standing_charge in rate_rows:
+            starts, ends, prices, charges = self._rates.setdefault(tariff_id, (array('l'), array('l'), array('d'), array('d')))
+            starts.append(valid_from.toordinal())
+            ends.append(valid_to.toordinal() if valid_to else OPEN_END)
+            prices.append(float(price))
+            charges.append(float(standing_charge))
+        self._assignments: Dict[int, Tuple[array, array, array]] = {}
+        for user_id, valid_from, valid_to, tariff_id in assignment_rows:
+            starts, ends, tariffs = self._assignments.setdefault(user_id, (array('l'), array('l'), array('l')))
+            starts.append(valid_from.toordinal())
+            ends.append(valid_to.toordinal() if valid_to else OPEN_END)
+            tariffs.append(tariff_id)
+
+    def rate_on(self, tariff_id: int, day: date) -> Optional[EffectiveRate]:
+        """
+        Returns the tariff's rate on the day, or None when no rate covers it.
+        """
+        spans = self._rates.get(tariff_id)
+        if spans is None:
+            return None
+        starts, ends, prices, charges = spans
+        ordinal = day.toordinal()
+        position = bisect_right(starts, ordinal) - 1
+        if position < 0 or ordinal >= ends[position]:
+            return None
+        valid_to = None if ends[position] == OPEN_END else date.fromordinal(ends[position])
+        return EffectiveRate(tariff_id, date.fromordinal(starts[position]), valid_to, prices[position], charges[position])
+
+    def tariff_for(self, user_id: int, day: date) -> Optional[int]:
+        """
+        Returns the ID of the tariff the customer was on that day, or None.
+        """
+        spans = self._assignments.get(user_id)
+        if spans is None:
+            return None
+        starts, ends, tariffs = spans
+        ordinal = day.toordinal()
+        position = bisect_right(starts, ordinal) - 1
+        if position < 0 or ordinal >= ends[position]:
+            return None
+        return tariffs[position]
+
+    def rate_for(self, user_id: int, day: date) -> Optional[EffectiveRate]:
+        """
+        Returns the rate that applied to the customer on the day, or None.
+        """
+        tariff_id = self.tariff_for(user_id, day)
+        return self.rate_on(tariff_id, day) if tariff_id is not None else None
+
+    def rate_spans(self, tariff_id: int) -> Optional[Tuple[array, array, array, array]]:
+        """
+        Returns the tariff's raw (starts, ends, prices per kWh, standing charges) arrays, for vectorized pricing.
+        """
+        return self._rates.get(tariff_id)
+
+
+# Per-process index, replaced when another process publishes a new stamp
+_index: Optional[TariffIndex] = None
+_checked_at: float = 0.0
+
+
+def get_tariff_index(repository: Optional[TariffRepository] = None) -> TariffIndex:
+    """
+    Returns this process's tariff index, reloading it when the published stamp changed.
+    The stamp is re-read at most every `TARIFF_INDEX_RECHECK_SECONDS`.
+    """
+    global _index, _checked_at
+    if _index is not None and time.monotonic() - _checked_at < settings.TARIFF_INDEX_RECHECK_SECONDS:
+        return _index
+    repository = repository or TariffRepository()
+    stamp = repository.get_index_stamp()
+    if _index is None or _index.stamp != stamp:
+        _index = TariffIndex(repository.get_rate_rows(), repository.get_assignment_rows(), repository.get_tariff_versions(), stamp)
+    _checked_at = time.monotonic()
+    return _index
+
+
+def invalidate_tariff_index() -> None:
+    """
+    Drops this process's index so the next lookup reloads it.
+    """
+    global _index
+    _index = None
+
+
+class TariffService:
+    """
+    Service class for managing tariffs and looking up the rates that apply on a given day.
+    """
+
+    def __init__(self, tariff_repository: TariffRepository) -> None:
+        self.tariff_repository = tariff_repository
+
+    def get_index(self) -> TariffIndex:
+        """
+        Get the current in-memory tariff index.
+        """
+        return get_tariff_index(self.tariff_repository)
+
+    def rate_for(self, user_id: int, day: date) -> Optional[EffectiveRate]:
+        """
+        Get the rate that applied to a customer on a day, without querying the database.
+        """
+        return self.get_index().rate_for(user_id, day)
+
+    def rate_on(self, tariff_id: int, day: date) -> Optional[EffectiveRate]:
+        """
+        Get a tariff's rate on a day, without querying the database.
+        """
+        return self.get_index().rate_on(tariff_id, day)
+
+    def create_tariff(self, code: str, name: str, currency: str = 'USD') -> Tariff:
+        """
+        Create a tariff.
+        """
+        tariff = self.tariff_repository.create_tariff(code, name, currency)
+        transaction.on_commit(invalidate_tariff_index)
+        return tariff
+
+    def get_tariff(self, tariff_id: int) -> Optional[Tariff]:
+        """
+        Get a tariff by its ID.
+        """
+        return self.tariff_repository.get_tariff_by_id(tariff_id)
+
+    def get_all_tariffs(self) -> List[Tariff]:
+        """
+        Get every tariff with its rates.
+        """
+        return self.tariff_repository.get_all_tariffs()
+
+    def update_tariff(self, tariff: Tariff, **updated_fields) -> Tariff:
+        """
+        Update a tariff.
+        """
+        tariff = self.tariff_repository.update_tariff(tariff, **updated_fields)
+        transaction.on_commit(invalidate_tariff_index)
+        return tariff
+
+    def delete_tariff(self, tariff: Tariff) -> bool:
+        """
+        Delete a tariff and its rates.
+        Raises:
+            ProtectedError: If customers are still assigned to the tariff.
+        """
+        deleted = self.tariff_repository.delete_tariff(tariff)
+        transaction.on_commit(invalidate_tariff_index)
+        return deleted
+
+    def add_rate(self, tariff: Tariff, **fields) -> TariffRate:
+        """
+        Add an effective-dated rate to a tariff.
+        Raises:
+            ValidationError: If the rate overlaps an existing rate of the tariff.
+        """
+        rate = self.tariff_repository.add_rate(tariff, **fields)
+        transaction.on_commit(invalidate_tariff_index)
+        return rate
+
+    def assign_tariff(self, user_id: int, tariff: Tariff, **fields) -> TariffAssignment:
+        """
+        Put a customer on a tariff.
+        Raises:
+            ValidationError: If the assignment overlaps another one of the customer.
+        """
+        assignment = self.tariff_repository.assign_tariff(user_id, tariff, **fields)
+        transaction.on_commit(invalidate_tariff_index)
+        return assignment
@@ -0,0 +1,15 @@
+from celery import shared_task # type: ignore
+from typing import Dict
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.RebillingService import RebillingService
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+@shared_task
+def rebill_dirty_periods() -> Dict[str, int]:
+    """
+    Task to re-bill the bills whose consumption changed since they were issued.
+    """
+    service = RebillingService(BillRepository(), ConsumptionRepository(), DirtyPeriodRepository(), InvoiceRepository())
+    return service.rebill_dirty_periods()
@@ -0,0 +1,83 @@
+from datetime import date
+from decimal import Decimal
+from django.conf import settings
+from django.test import TestCase
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.authentication.repositories.UserRepository import UserRepository
+from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class AdminStatusViewTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='customer', password='secret')
+        self.bill = BillRepository().create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        self.invoice = InvoiceRepository().create_invoice(self.user, date(2025, 1, 1), date(2025, 1, 31), Decimal('100.00'), date(2025, 2, 28))
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='operator', password='secret', role='admin'))
+
+    def test_admins_change_the_status_of_several_records(self):
+        response = self.client.post('/billing/admin/status/', {'ids': [self.bill.id, 0], 'status': 'paid'}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertEqual(Bill.objects.get(id=self.bill.id).status, 'paid')
+
+        response = self.client.post('/invoices/admin/status/', {'ids': [self.invoice.id], 'status': 'overdue'}, format='json')
+        self.assertEqual(response.data, {'updated': 1})
+        self.assertEqual(Invoice.objects.get(id=self.invoice.id).status, 'overdue')
+
+    def test_requests_are_capped_at_the_configured_number_of_ids(self):
+        too_many = list(range(1, settings.BULK_STATUS_UPDATE_MAX_IDS + 2))
+        for path in ('/billing/admin/status/', '/invoices/admin/status/'):
+            with self.subTest(path=path):
+                response = self.client.post(path, {'ids': too_many, 'status': 'paid'}, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('ids', response.data)
+                self.assertEqual(self.client.post(path, {'ids': [], 'status': 'paid'}, format='json').status_code, 400)
+                self.assertEqual(self.client.post(path, {'ids': [1], 'status': 'refunded'}, format='json').status_code, 400)
+
+    def test_customers_cannot_change_statuses(self):
+        self.client.force_authenticate(self.user)
+
+        for path in ('/billing/admin/status/', '/invoices/admin/status/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.post(path, {'ids': [self.bill.id], 'status': 'paid'}, format='json').status_code, 403)
+
+
+class UserBulkUpdateTest(TestCase):
+    def setUp(self):
+        self.repository = UserRepository()
+        self.users = [User.objects.create_user(username=f'user-{number}', password='secret') for number in range(3)]
+
+    def test_passwords_are_hashed_on_every_path(self):
+        self.repository.update_user(self.users[0], password='first')
+        self.repository.update_user_fields(self.users[1].id, password='second')
+        self.repository.bulk_update_user_fields([self.users[2].id], password='third')
+
+        for user, password in zip(self.users, ('first', 'second', 'third')):
+            with self.subTest(user=user.username):
+                stored = User.objects.get(id=user.id)
+                self.assertNotEqual(stored.password, password)
+                self.assertTrue(stored.check_password(password))
+
+    def test_admin_role_carries_the_staff_flags_on_every_path(self):
+        self.repository.update_user(self.users[0], role='admin')
+        self.assertTrue(self.repository.update_user_fields(self.users[1].id, role='admin'))
+        self.users[2].role = 'admin'
+        self.assertEqual(self.repository.bulk_update_users([self.users[2]], ['role']), 1)
+
+        for user in User.objects.filter(id__in=[user.id for user in self.users]):
+            with self.subTest(user=user.username):
+                self.assertEqual((user.role, user.is_staff, user.is_superuser), ('admin', True, True))
+
+    def test_bulk_updates_write_only_the_listed_fields(self):
+        for user in self.users:
+            user.email, user.first_name = f'{user.username}@example.com', 'Changed'
+
+        self.assertEqual(self.repository.bulk_update_users(self.users, ['email']), 3)
+        self.assertEqual(self.repository.bulk_update_user_fields([user.id for user in self.users] + [0], is_active=False), 3)
+
+        stored = list(User.objects.filter(id__in=[user.id for user in self.users]).values_list('username', 'email', 'first_name', 'is_active'))
+        self.assertEqual(sorted(stored), [(f'user-{number}', f'user-{number}@example.com', '', False) for number in range(3)])
@@ -0,0 +1,114 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.billing.repositories.BillingRepository import BillRepository
+
+
+class BillLedgerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ledger', password='secret')
+        self.repository = BillRepository()
+        self.balance_repository = BalanceRepository()
+
+    def assertNoDrift(self):
+        self.assertEqual(self.balance_repository.rebuild_range(self.user.id, self.user.id, dry_run=True), [])
+
+    def test_every_write_keeps_the_ledger_in_step(self):
+        other = User.objects.create_user(username='other', password='secret')
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        self.assertNoDrift()
+        created = self.repository.bulk_create_bills([
+            Bill(user=self.user, date=date(2025, 3, 1), amount=Decimal('40.00'), status='unpaid'),
+            Bill(user=self.user, date=date(2025, 4, 1), amount=Decimal('25.50'), status='paid'),
+        ])
+        self.assertNoDrift()
+        self.repository.update_bill(bill, amount=Decimal('90.00'), status='paid')
+        self.assertNoDrift()
+        self.repository.update_bill_fields(created[0].id, amount=Decimal('45.00'))
+        self.assertNoDrift()
+        self.repository.bulk_update_bill_fields([bill.id, created[1].id], status='unpaid')
+        self.assertNoDrift()
+        for changed in created:
+            changed.amount += Decimal('1.00')
+        created[1].status = 'paid'
+        self.repository.bulk_update_bills(created, ['amount', 'status'])
+        self.assertNoDrift()
+        self.repository.set_bills_status([bill.id, created[0].id], 'paid')
+        self.assertNoDrift()
+        self.repository.update_bill_fields(created[0].id, user=other)
+        self.assertNoDrift()
+        self.assertEqual(self.balance_repository.rebuild_range(other.id, other.id, dry_run=True), [])
+        self.repository.delete_bill(bill)
+        self.assertNoDrift()
+
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.bills_unpaid, balance.bills_paid), (Decimal('0.00'), Decimal('26.50')))
+
+    def test_update_of_a_stale_instance_starts_from_the_stored_row(self):
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        stale = Bill.objects.get(id=bill.id)
+        self.repository.mark_bills_paid([bill.id])
+
+        updated = self.repository.update_bill(stale, amount=Decimal('80.00'))
+
+        self.assertEqual(updated.status, 'paid')
+        self.assertNoDrift()
+
+    def test_delete_of_a_stale_instance_removes_the_stored_row(self):
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        stale = Bill.objects.get(id=bill.id)
+        self.repository.mark_bills_paid([bill.id])
+
+        self.assertTrue(self.repository.delete_bill(stale))
+
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.bills_unpaid, balance.bills_paid), (Decimal('0.00'), Decimal('0.00')))
+        self.assertNoDrift()
+
+    def test_deleting_a_deleted_bill_leaves_the_ledger_alone(self):
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        stale = Bill.objects.get(id=bill.id)
+        self.repository.delete_bill(bill)
+
+        self.assertFalse(self.repository.delete_bill(stale))
+        with self.assertRaises(Bill.DoesNotExist):
+            self.repository.update_bill(stale, amount=Decimal('80.00'))
+        self.assertNoDrift()
+
+    def test_bulk_update_writes_only_stored_bills_and_listed_fields(self):
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        deleted = self.repository.create_bill(self.user, date(2025, 3, 1), Decimal('40.00'))
+        stale, gone = Bill.objects.get(id=bill.id), Bill.objects.get(id=deleted.id)
+        self.repository.mark_bills_paid([bill.id])
+        self.repository.delete_bill(deleted)
+        stale.amount, gone.amount = Decimal('80.00'), Decimal('50.00')
+
+        self.assertEqual(self.repository.bulk_update_bills([stale, gone], ['amount']), 1)
+
+        self.assertEqual(Bill.objects.get(id=bill.id).status, 'paid')
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.bills_unpaid, balance.bills_paid), (Decimal('0.00'), Decimal('80.00')))
+        self.assertNoDrift()
+
+    def test_bulk_update_of_deleted_bills_changes_nothing(self):
+        bill = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'))
+        stale = Bill.objects.get(id=bill.id)
+        self.repository.delete_bill(bill)
+        stale.status = 'paid'
+
+        self.assertEqual(self.repository.bulk_update_bills([stale], ['status']), 0)
+        self.assertEqual(self.repository.bulk_update_bill_fields([bill.id], status='paid'), 0)
+        self.assertFalse(self.repository.update_bill_fields(bill.id, amount=Decimal('1.00')))
+        self.assertEqual(self.repository.set_bills_status([bill.id], 'paid'), 0)
+        self.assertNoDrift()
+
+    def test_status_changes_count_only_the_bills_that_moved(self):
+        paid = self.repository.create_bill(self.user, date(2025, 2, 1), Decimal('100.00'), status='paid')
+        unpaid = self.repository.create_bill(self.user, date(2025, 3, 1), Decimal('40.00'))
+
+        self.assertEqual(self.repository.set_bills_status([paid.id, unpaid.id], 'paid'), 1)
+        self.assertEqual(self.repository.mark_bills_paid([paid.id, unpaid.id]), 0)
+        self.assertNoDrift()
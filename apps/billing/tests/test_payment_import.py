@@ -0,0 +1,72 @@
+from datetime import date
+from decimal import Decimal
+from django.db import transaction
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.PaymentImportService import PaymentImportService
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class PaymentImportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='secret')
+        bill_repository = BillRepository()
+        invoice_repository = InvoiceRepository()
+        self.bills = [bill_repository.create_bill(self.user, date(2025, month, 1), Decimal('50.00')) for month in (2, 3, 4, 5)]
+        self.invoice = invoice_repository.create_invoice(
+            self.user, date(2025, 4, 1), date(2025, 4, 30), Decimal('70.00'), date(2025, 5, 31), bills=self.bills[2:],
+        )
+        self.service = PaymentImportService(bill_repository, invoice_repository)
+
+    def import_payments(self, *rows, batch_size=None):
+        return self.service.import_payments(['Reference,Amount', *rows], batch_size=batch_size)
+
+    def test_payments_are_matched_and_reported(self):
+        report = self.import_payments(
+            f'BILL-{self.bills[0].id},50.00',
+            f'BILL-{self.bills[1].id},60.00',
+            f'BILL-{self.bills[0].id},50.00',
+            f'INV-{self.invoice.id},20.00',
+            'BILL-999999,10.00',
+            'nonsense,abc',
+            batch_size=2,
+        )
+
+        self.assertEqual(
+            {outcome: report[outcome] for outcome in ('rows', 'paid', 'overpaid', 'underpaid', 'duplicate', 'unmatched', 'malformed')},
+            {'rows': 6, 'paid': 1, 'overpaid': 1, 'underpaid': 1, 'duplicate': 1, 'unmatched': 1, 'malformed': 1},
+        )
+        self.assertEqual((report['received'], report['applied']), (Decimal('190.00'), Decimal('100.00')))
+        self.assertEqual([issue.line for issue in report['issues']], [3, 4, 5, 6, 7])
+        self.assertEqual(set(Bill.objects.filter(status='paid').values_list('id', flat=True)), {self.bills[0].id, self.bills[1].id})
+
+    def test_paying_an_invoice_settles_its_bills_and_the_ledger(self):
+        for batch_size in (1, 2):
+            with self.subTest(batch_size=batch_size), transaction.atomic():
+                report = self.import_payments(f'INV-{self.invoice.id},70.00', f'BILL-{self.bills[2].id},50.00', batch_size=batch_size)
+
+                self.assertEqual((report['paid'], report['already_paid'], report['applied']), (1, 1, Decimal('70.00')))
+                self.assertEqual(report['issues'][0].outcome, 'already_paid')
+                self.assertEqual(Invoice.objects.get(id=self.invoice.id).status, 'paid')
+                self.assertEqual(set(Bill.objects.filter(status='paid').values_list('id', flat=True)), {self.bills[2].id, self.bills[3].id})
+                self.assertEqual(BalanceRepository().rebuild_range(self.user.id, self.user.id, dry_run=True), [])
+                transaction.set_rollback(True)
+
+    def test_bills_paid_before_their_invoice_are_deducted_from_it(self):
+        for batch_size in (1, 2):
+            with self.subTest(batch_size=batch_size), transaction.atomic():
+                report = self.import_payments(f'BILL-{self.bills[2].id},50.00', f'INV-{self.invoice.id},70.00', batch_size=batch_size)
+
+                self.assertEqual((report['paid'], report['overpaid'], report['applied']), (1, 1, Decimal('70.00')))
+                self.assertEqual((report['issues'][0].outcome, report['issues'][0].expected), ('overpaid', '20.00'))
+                self.assertEqual(Invoice.objects.get(id=self.invoice.id).status, 'paid')
+                self.assertEqual(BalanceRepository().rebuild_range(self.user.id, self.user.id, dry_run=True), [])
+                transaction.set_rollback(True)
+
+    def test_files_without_the_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.service.import_payments(['id,value', '1,2'])
@@ -0,0 +1,42 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillAdjustmentModel import BillAdjustment
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.BillingService import BillService
+from apps.billing.services.RebillingService import RebillingService
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class RebillingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='rebilled', password='secret')
+        self.consumption_repository = ConsumptionRepository()
+        for day in (5, 10, 15):
+            self.consumption_repository.create_consumption(self.user, date(2025, 1, day), 10)
+        self.rebilling_service = RebillingService(BillRepository(), self.consumption_repository, DirtyPeriodRepository(), InvoiceRepository())
+        self.rebilling_service.rebill_dirty_periods()
+
+    def test_new_bill_records_its_period(self):
+        bill = BillService(BillRepository(), self.consumption_repository).create_bill(self.user, date(2025, 2, 1), Decimal('6.00'))
+
+        self.assertEqual((bill.period_start, bill.period_end), (date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertEqual(bill.billed_kwh, 30)
+        self.assertEqual(bill.consumption.count(), 3)
+
+    def test_new_bill_is_rebilled_after_a_late_reading(self):
+        bill = BillService(BillRepository(), self.consumption_repository).create_bill(self.user, date(2025, 2, 1), Decimal('6.00'))
+        late = self.consumption_repository.create_consumption(self.user, date(2025, 1, 20), 15)
+
+        result = self.rebilling_service.rebill_dirty_periods()
+
+        bill.refresh_from_db()
+        self.assertEqual(result['adjustments'], 1)
+        self.assertEqual(bill.amount, Decimal('9.00'))
+        self.assertEqual(bill.billed_kwh, 45)
+        self.assertIn(late.id, bill.consumption.values_list('id', flat=True))
+        adjustment = BillAdjustment.objects.get(bill=bill)
+        self.assertEqual((adjustment.previous_amount, adjustment.new_amount), (Decimal('6.00'), Decimal('9.00')))
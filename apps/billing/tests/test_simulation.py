@@ -0,0 +1,123 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.services.BillSimulationService import BillSimulationService
+from apps.billing.services.TariffService import TariffService, invalidate_tariff_index
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+
+try:
+    import numpy # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+@override_settings(TARIFF_INDEX_RECHECK_SECONDS=0)
+class BillSimulationTestCase(TestCase):
+    def setUp(self):
+        if numpy is None:
+            self.skipTest('numpy is not installed')
+        caches['default'].clear()
+        invalidate_tariff_index()
+        self.addCleanup(invalidate_tariff_index)
+        self.user = User.objects.create_user(username='simulated', password='secret')
+        self.consumption_repository = ConsumptionRepository()
+        for day, kwh in ((date(2024, 1, 30), 10), (date(2024, 1, 31), 10), (date(2024, 2, 1), 20), (date(2024, 2, 15), 5), (date(2024, 3, 1), 7)):
+            self.consumption_repository.create_consumption(self.user, day, kwh)
+        self.tariff_service = TariffService(TariffRepository())
+        with self.captureOnCommitCallbacks(execute=True):
+            # January rate, no rate from February 1 to 9, then an open-ended rate
+            self.stepped = self.tariff_service.create_tariff('STEP', 'Stepped')
+            self.tariff_service.add_rate(self.stepped, valid_from=date(2024, 1, 1), valid_to=date(2024, 2, 1), price_per_kwh=Decimal('0.2'), standing_charge_per_day=Decimal('1'))
+            self.tariff_service.add_rate(self.stepped, valid_from=date(2024, 2, 10), price_per_kwh=Decimal('0.3'), standing_charge_per_day=Decimal('0.5'))
+            self.empty = self.tariff_service.create_tariff('EMPTY', 'Without rates')
+        self.service = BillSimulationService(self.consumption_repository, self.tariff_service)
+
+    def simulate(self, *tariffs):
+        return self.service.simulate(self.user.id, [tariff.id for tariff in tariffs], date(2024, 1, 30), date(2024, 3, 1))
+
+
+class BillSimulationServiceTest(BillSimulationTestCase):
+    def test_days_without_a_rate_are_counted_and_not_priced(self):
+        stepped, empty = self.simulate(self.stepped, self.empty)
+
+        self.assertEqual(
+            {key: stepped[key] for key in ('code', 'kwh', 'energy_cost', 'standing_charge', 'total', 'uncovered_days')},
+            {'code': 'STEP', 'kwh': 52.0, 'energy_cost': 7.6, 'standing_charge': 12.5, 'total': 20.1, 'uncovered_days': 9},
+        )
+        self.assertEqual((empty['kwh'], empty['total'], empty['uncovered_days']), (52.0, 0.0, 32))
+
+    def test_results_are_broken_down_per_month(self):
+        stepped, = self.simulate(self.stepped)
+
+        self.assertEqual(stepped['months'], [
+            {'month': '2024-01', 'kwh': 20.0, 'energy_cost': 4.0, 'standing_charge': 2.0, 'total': 6.0},
+            {'month': '2024-02', 'kwh': 25.0, 'energy_cost': 1.5, 'standing_charge': 10.0, 'total': 11.5},
+            {'month': '2024-03', 'kwh': 7.0, 'energy_cost': 2.1, 'standing_charge': 0.5, 'total': 2.6},
+        ])
+
+    def test_invalid_requests_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.service.simulate(self.user.id, [self.stepped.id], date(2024, 3, 1), date(2024, 1, 1))
+        with self.assertRaises(ValueError):
+            self.service.simulate(self.user.id, [0], date(2024, 1, 1), date(2024, 3, 1))
+
+
+class BillSimulationCacheTest(BillSimulationTestCase):
+    def setUp(self):
+        super().setUp()
+        series = mock.patch.object(self.consumption_repository, 'get_kwh_series', wraps=self.consumption_repository.get_kwh_series)
+        self.get_kwh_series = series.start()
+        self.addCleanup(series.stop)
+        self.first, = self.simulate(self.stepped)
+
+    def test_repeated_simulations_are_served_from_the_cache(self):
+        self.assertEqual(self.simulate(self.stepped), [self.first])
+        self.assertEqual(self.get_kwh_series.call_count, 1)
+
+    def test_new_readings_invalidate_the_results(self):
+        self.consumption_repository.create_consumption(self.user, date(2024, 2, 20), 10)
+
+        result, = self.simulate(self.stepped)
+
+        self.assertEqual(self.get_kwh_series.call_count, 2)
+        self.assertEqual(result['kwh'], 62.0)
+        self.assertEqual(result['energy_cost'], 10.6)
+
+    def test_rate_changes_invalidate_the_results(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tariff_service.add_rate(self.stepped, valid_from=date(2024, 2, 1), valid_to=date(2024, 2, 10), price_per_kwh=Decimal('0.1'))
+
+        result, = self.simulate(self.stepped)
+
+        self.assertEqual(self.get_kwh_series.call_count, 2)
+        self.assertEqual(result['version'], self.first['version'] + 1)
+        self.assertEqual((result['uncovered_days'], result['energy_cost']), (0, 9.6))
+
+
+class BillSimulationViewTest(BillSimulationTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.request = {'tariffs': [self.stepped.id], 'start_date': '2024-01-30', 'end_date': '2024-03-01'}
+
+    def test_customers_simulate_their_own_bills_only(self):
+        other = User.objects.create_user(username='other', password='secret')
+        self.client.force_authenticate(other)
+
+        self.assertEqual(self.client.post('/billing/simulate/', {**self.request, 'user': self.user.id}, format='json').status_code, 403)
+        response = self.client.post('/billing/simulate/', self.request, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['user'], response.data['results'][0]['kwh']), (other.id, 0.0))
+
+    def test_admins_simulate_any_customer(self):
+        self.client.force_authenticate(User.objects.create_user(username='operator', password='secret', role='admin'))
+
+        response = self.client.post('/billing/simulate/', {**self.request, 'user': self.user.id}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['total'], 20.1)
@@ -0,0 +1,76 @@
+from datetime import date
+from decimal import Decimal
+from django.test import SimpleTestCase, TestCase, override_settings
+from apps.authentication.models.UserModel import User
+from apps.billing.models.TariffModel import Tariff
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.services.TariffService import TariffIndex, TariffService, get_tariff_index, invalidate_tariff_index
+
+
+class TariffIndexTest(SimpleTestCase):
+    def setUp(self):
+        rates = [
+            (1, date(2024, 1, 1), date(2024, 7, 1), Decimal('0.20000'), Decimal('0.50000')),
+            (1, date(2024, 8, 1), None, Decimal('0.25000'), Decimal('0.60000')),
+        ]
+        assignments = [(7, date(2024, 3, 1), None, 1)]
+        self.index = TariffIndex(rates, assignments, [(1, 'STD', 3)], 'stamp')
+
+    def test_rates_start_inclusive_and_end_exclusive(self):
+        self.assertIsNone(self.index.rate_on(1, date(2023, 12, 31)))
+        self.assertEqual(self.index.rate_on(1, date(2024, 1, 1)).price_per_kwh, 0.2)
+        self.assertEqual(self.index.rate_on(1, date(2024, 6, 30)).valid_to, date(2024, 7, 1))
+        self.assertIsNone(self.index.rate_on(1, date(2024, 7, 1)))
+
+    def test_open_ended_rates_cover_every_later_day(self):
+        rate = self.index.rate_on(1, date(2030, 1, 1))
+
+        self.assertEqual((rate.valid_from, rate.valid_to, rate.standing_charge_per_day), (date(2024, 8, 1), None, 0.6))
+
+    def test_customer_rates_follow_their_assignment(self):
+        self.assertIsNone(self.index.rate_for(7, date(2024, 2, 1)))
+        self.assertEqual(self.index.rate_for(7, date(2024, 3, 1)).tariff_id, 1)
+        self.assertIsNone(self.index.rate_for(8, date(2024, 3, 1)))
+        self.assertEqual(self.index.versions, {1: 3})
+
+
+@override_settings(TARIFF_INDEX_RECHECK_SECONDS=0)
+class TariffIndexPublishingTest(TestCase):
+    def setUp(self):
+        invalidate_tariff_index()
+        self.addCleanup(invalidate_tariff_index)
+        self.repository = TariffRepository()
+        self.service = TariffService(self.repository)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tariff = self.service.create_tariff('STD', 'Standard')
+
+    def test_stamp_is_published_when_the_write_commits(self):
+        stamp = self.repository.get_index_stamp()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.service.add_rate(self.tariff, valid_from=date(2024, 1, 1), price_per_kwh=Decimal('0.2'))
+            self.assertEqual(self.repository.get_index_stamp(), stamp)
+        for callback in callbacks:
+            callback()
+
+        self.assertNotEqual(self.repository.get_index_stamp(), stamp)
+        self.assertEqual(get_tariff_index().rate_on(self.tariff.id, date(2024, 5, 1)).price_per_kwh, 0.2)
+
+    def test_admin_publishes_a_new_tariff_after_its_rates(self):
+        self.client.force_login(User.objects.create_user(username='operator', password='secret', role='admin'))
+        stamp = self.repository.get_index_stamp()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/admin/billing/tariff/add/', {
+                'code': 'GREEN', 'name': 'Green', 'currency': 'USD',
+                'rates-TOTAL_FORMS': '1', 'rates-INITIAL_FORMS': '0', 'rates-MIN_NUM_FORMS': '0', 'rates-MAX_NUM_FORMS': '1000',
+                'rates-0-valid_from': '2024-01-01', 'rates-0-valid_to': '', 'rates-0-price_per_kwh': '0.30', 'rates-0-standing_charge_per_day': '0',
+            })
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(self.repository.get_index_stamp(), stamp)
+        for callback in callbacks:
+            callback()
+
+        tariff = Tariff.objects.get(code='GREEN')
+        self.assertNotEqual(self.repository.get_index_stamp(), stamp)
+        self.assertEqual(get_tariff_index().rate_on(tariff.id, date(2024, 5, 1)).price_per_kwh, 0.3)
@@ -1,8 +1,21 @@
 from django.urls import path
-from .views.BillingView import BillView, BillDetailView, AdminAggregationView
+from .views.BillingView import BillView, BillDetailView, AdminAggregationView, AdminBillStatusView
+from .views.BalanceView import BalanceView, AdminBalanceTotalsView
+from .views.PaymentImportView import PaymentImportView
+from .views.BillSimulationView import BillSimulationView
+from .views.TariffView import TariffView, TariffDetailView, TariffRateView, TariffAssignmentView
 
 urlpatterns = [
     path('user/', BillView.as_view(), name='user-bill-list'),  # GET, POST
     path('user/<int:bill_id>/', BillDetailView.as_view(), name='user-bill-detail'),  # GET, PUT, DELETE
     path('admin/aggregate/', AdminAggregationView.as_view(), name='admin-billing-aggregate'),  # GET
+    path('admin/status/', AdminBillStatusView.as_view(), name='admin-bill-status'),  # POST
+    path('admin/balances/', AdminBalanceTotalsView.as_view(), name='admin-balance-totals'),  # GET
+    path('balance/', BalanceView.as_view(), name='user-balance'),  # GET
+    path('admin/payments/import/', PaymentImportView.as_view(), name='admin-payment-import'),  # POST
+    path('tariffs/', TariffView.as_view(), name='tariff-list'),  # GET, POST
+    path('tariffs/assignments/', TariffAssignmentView.as_view(), name='tariff-assignment'),  # POST
+    path('tariffs/<int:tariff_id>/', TariffDetailView.as_view(), name='tariff-detail'),  # GET, PUT, DELETE
+    path('tariffs/<int:tariff_id>/rates/', TariffRateView.as_view(), name='tariff-rate'),  # POST
+    path('simulate/', BillSimulationView.as_view(), name='bill-simulation'),  # POST
 ]
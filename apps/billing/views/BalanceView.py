@@ -0,0 +1,70 @@
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAuthenticated, IsAdminUser # type: ignore
+from apps.billing.services.BalanceService import BalanceService
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.billing.serializers.BalanceSerializer import UserBalanceSerializer
+from typing import Optional
+
+class BalanceView(APIView):
+    """
+    Handles the outstanding balance of the logged-in user.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def __init__(self, balance_service: Optional[BalanceService] = None, **kwargs):
+        """
+        Dependency injection for BalanceService.
+        """
+        super().__init__(**kwargs)
+        self.balance_service = balance_service or BalanceService(BalanceRepository())
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter('user', openapi.IN_QUERY, description="Admins only: another user's ID", type=openapi.TYPE_INTEGER)],
+        responses={200: UserBalanceSerializer, 403: "Forbidden"},
+    )
+    def get(self, request):
+        """
+        Returns the user's balance by document and status, read from one ledger row.
+        """
+        user_id = request.query_params.get('user', request.user.id)
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return Response({"error": "user must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if user_id != request.user.id and not request.user.is_staff:
+            return Response({"error": "Only admins can read other users' balances."}, status=status.HTTP_403_FORBIDDEN)
+        try:
+            balance = self.balance_service.get_balance(user_id)
+            return Response(UserBalanceSerializer(balance).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AdminBalanceTotalsView(APIView):
+    """
+    Handles balance totals by status for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, balance_service: Optional[BalanceService] = None, **kwargs):
+        """
+        Dependency injection for BalanceService.
+        """
+        super().__init__(**kwargs)
+        self.balance_service = balance_service or BalanceService(BalanceRepository())
+
+    @swagger_auto_schema(
+        responses={200: openapi.Response('Bill and invoice totals by status, and the number of users owing money')}
+    )
+    def get(self, request):
+        """
+        Admins: total outstanding and paid amounts by status across all users.
+        """
+        try:
+            return Response(self.balance_service.get_totals(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
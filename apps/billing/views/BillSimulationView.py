@@ -0,0 +1,52 @@
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAuthenticated # type: ignore
+from apps.billing.services.BillSimulationService import BillSimulationService, default_period
+from apps.billing.services.TariffService import TariffService
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.serializers.TariffSerializer import BillSimulationRequestSerializer
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from django.utils.timezone import localdate
+from typing import Optional
+
+class BillSimulationView(APIView):
+    """
+    Handles what-if bill simulations of a customer's consumption against candidate tariffs.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def __init__(self, simulation_service: Optional[BillSimulationService] = None, **kwargs):
+        """
+        Dependency injection for BillSimulationService.
+        """
+        super().__init__(**kwargs)
+        self.simulation_service = simulation_service or BillSimulationService(ConsumptionRepository(), TariffService(TariffRepository()))
+
+    @swagger_auto_schema(
+        request_body=BillSimulationRequestSerializer,
+        responses={200: openapi.Response('One simulated bill per tariff, with a monthly breakdown'), 400: "Bad Request", 403: "Forbidden"}
+    )
+    def post(self, request):
+        """
+        Price the logged-in user's consumption (or, for admins, any customer's) against the given tariffs.
+        """
+        serializer = BillSimulationRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        user_id = data.get('user', request.user.id)
+        if user_id != request.user.id and not request.user.is_staff:
+            return Response({"error": "Only admins can simulate bills for other customers."}, status=status.HTTP_403_FORBIDDEN)
+        start_date, end_date = default_period(localdate())
+        start_date = data.get('start_date', start_date)
+        end_date = data.get('end_date', end_date)
+        try:
+            results = self.simulation_service.simulate(user_id, data['tariffs'], start_date, end_date)
+            return Response({'user': user_id, 'results': results}, status=status.HTTP_200_OK)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
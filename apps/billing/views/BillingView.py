@@ -6,7 +6,7 @@ from drf_yasg import openapi # type: ignore
 from rest_framework.permissions import IsAuthenticated, IsAdminUser # type: ignore
 from apps.billing.services.BillingService import BillService
 from apps.billing.repositories.BillingRepository import BillRepository
-from apps.billing.serializers.BillingSerializer import BillSerializer
+from apps.billing.serializers.BillingSerializer import BillSerializer, BillStatusUpdateSerializer
 from django.core.exceptions import ObjectDoesNotExist
 from typing import Optional
 
@@ -146,3 +146,34 @@ class AdminAggregationView(APIView):
             return Response({'total_billing': total_billing}, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class AdminBillStatusView(APIView):
+    """
+    Handles status changes of several bills at once for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, bill_service: Optional[BillService] = None, **kwargs):
+        """
+        Dependency injection for BillService.
+        """
+        super().__init__(**kwargs)
+        self.bill_service = bill_service or BillService(BillRepository())
+
+    @swagger_auto_schema(
+        request_body=BillStatusUpdateSerializer,
+        responses={200: openapi.Response('Number of bills that changed status'), 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Admins: move several bills to a status (e.g. mark N bills paid) in one statement.
+        """
+        serializer = BillStatusUpdateSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                updated = self.bill_service.set_bills_status(serializer.validated_data['ids'], serializer.validated_data['status'])
+                return Response({'updated': updated}, status=status.HTTP_200_OK)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,48 @@
+import io
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from rest_framework.parsers import MultiPartParser # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
+from apps.billing.services.PaymentImportService import PaymentImportService
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+from typing import Optional
+
+MAX_ISSUES_IN_RESPONSE = 1000  # The import_payments command writes the full report
+
+class PaymentImportView(APIView):
+    """
+    Admins: import a bank payment file.
+    """
+    permission_classes = [IsAdminUser]
+    parser_classes = [MultiPartParser]
+
+    def __init__(self, payment_import_service: Optional[PaymentImportService] = None, **kwargs):
+        """
+        Dependency injection for PaymentImportService.
+        """
+        super().__init__(**kwargs)
+        self.payment_import_service = payment_import_service or PaymentImportService(BillRepository(), InvoiceRepository())
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter('file', openapi.IN_FORM, description="CSV with reference and amount columns", type=openapi.TYPE_FILE, required=True)],
+        responses={200: openapi.Response('Counts per outcome and the payments that did not match exactly'), 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Match the file's payments against bills and invoices and mark the settled ones paid.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the payment file as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            report = self.payment_import_service.import_payments(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''))
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        issues = report.pop('issues')
+        report['issues'] = [issue._asdict() for issue in issues[:MAX_ISSUES_IN_RESPONSE]]
+        report['issues_truncated'] = len(issues) > MAX_ISSUES_IN_RESPONSE
+        return Response(report, status=status.HTTP_200_OK)
@@ -0,0 +1,183 @@
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
+from apps.billing.services.TariffService import TariffService
+from apps.billing.repositories.TariffRepository import TariffRepository
+from apps.billing.serializers.TariffSerializer import TariffSerializer, TariffRateSerializer, TariffAssignmentSerializer
+from django.core.exceptions import ValidationError
+from django.db.models import ProtectedError
+from typing import Optional
+
+class TariffView(APIView):
+    """
+    Admins: list and create tariffs.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, tariff_service: Optional[TariffService] = None, **kwargs):
+        """
+        Dependency injection for TariffService.
+        """
+        super().__init__(**kwargs)
+        self.tariff_service = tariff_service or TariffService(TariffRepository())
+
+    @swagger_auto_schema(
+        responses={200: TariffSerializer(many=True)},
+    )
+    def get(self, request):
+        """
+        Returns every tariff with its rates.
+        """
+        try:
+            tariffs = self.tariff_service.get_all_tariffs()
+            return Response(TariffSerializer(tariffs, many=True).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @swagger_auto_schema(
+        request_body=TariffSerializer,
+        responses={201: TariffSerializer, 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Create a tariff. Rates are added separately.
+        """
+        serializer = TariffSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                tariff = self.tariff_service.create_tariff(**serializer.validated_data)
+                return Response(TariffSerializer(tariff).data, status=status.HTTP_201_CREATED)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TariffDetailView(APIView):
+    """
+    Admins: retrieve, update, and delete a tariff.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, tariff_service: Optional[TariffService] = None, **kwargs):
+        """
+        Dependency injection for TariffService.
+        """
+        super().__init__(**kwargs)
+        self.tariff_service = tariff_service or TariffService(TariffRepository())
+
+    @swagger_auto_schema(
+        responses={200: TariffSerializer, 404: "Not Found"},
+    )
+    def get(self, request, tariff_id: int):
+        """
+        Retrieve a tariff with its rates.
+        """
+        tariff = self.tariff_service.get_tariff(tariff_id)
+        if tariff is None:
+            return Response({"error": "Tariff not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(TariffSerializer(tariff).data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        request_body=TariffSerializer,
+        responses={200: TariffSerializer, 400: "Bad Request", 404: "Not Found"}
+    )
+    def put(self, request, tariff_id: int):
+        """
+        Update a tariff's code, name, or currency.
+        """
+        tariff = self.tariff_service.get_tariff(tariff_id)
+        if tariff is None:
+            return Response({"error": "Tariff not found."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TariffSerializer(tariff, data=request.data, partial=True)
+        if serializer.is_valid():
+            tariff = self.tariff_service.update_tariff(tariff, **serializer.validated_data)
+            return Response(TariffSerializer(tariff).data, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    @swagger_auto_schema(
+        responses={204: "No Content", 404: "Not Found", 409: "Conflict"},
+    )
+    def delete(self, request, tariff_id: int):
+        """
+        Delete a tariff that no customer is assigned to.
+        """
+        tariff = self.tariff_service.get_tariff(tariff_id)
+        if tariff is None:
+            return Response({"error": "Tariff not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            self.tariff_service.delete_tariff(tariff)
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        except ProtectedError:
+            return Response({"error": "Tariff is still assigned to customers."}, status=status.HTTP_409_CONFLICT)
+
+
+class TariffRateView(APIView):
+    """
+    Admins: add an effective-dated rate to a tariff.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, tariff_service: Optional[TariffService] = None, **kwargs):
+        """
+        Dependency injection for TariffService.
+        """
+        super().__init__(**kwargs)
+        self.tariff_service = tariff_service or TariffService(TariffRepository())
+
+    @swagger_auto_schema(
+        request_body=TariffRateSerializer,
+        responses={201: TariffRateSerializer, 400: "Bad Request", 404: "Not Found"}
+    )
+    def post(self, request, tariff_id: int):
+        """
+        Add a rate; it must not overlap the tariff's existing rates.
+        """
+        tariff = self.tariff_service.get_tariff(tariff_id)
+        if tariff is None:
+            return Response({"error": "Tariff not found."}, status=status.HTTP_404_NOT_FOUND)
+        serializer = TariffRateSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                rate = self.tariff_service.add_rate(tariff, **serializer.validated_data)
+                return Response(TariffRateSerializer(rate).data, status=status.HTTP_201_CREATED)
+            except ValidationError as e:
+                return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class TariffAssignmentView(APIView):
+    """
+    Admins: put a customer on a tariff from a date.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, tariff_service: Optional[TariffService] = None, **kwargs):
+        """
+        Dependency injection for TariffService.
+        """
+        super().__init__(**kwargs)
+        self.tariff_service = tariff_service or TariffService(TariffRepository())
+
+    @swagger_auto_schema(
+        request_body=TariffAssignmentSerializer,
+        responses={201: TariffAssignmentSerializer, 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Assign a tariff; the assignment must not overlap the customer's other assignments.
+        """
+        serializer = TariffAssignmentSerializer(data=request.data)
+        if serializer.is_valid():
+            data = serializer.validated_data
+            try:
+                assignment = self.tariff_service.assign_tariff(
+                    data['user'].id, data['tariff'],
+                    valid_from=data['valid_from'],
+                    valid_to=data.get('valid_to'),
+                )
+                return Response(TariffAssignmentSerializer(assignment).data, status=status.HTTP_201_CREATED)
+            except ValidationError as e:
+                return Response({"error": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,228 @@
+from datetime import timedelta
+from functools import lru_cache
+from rest_framework.renderers import JSONRenderer # type: ignore
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.QuarantinedReadingRepository import QuarantinedReadingRepository
+from apps.consumption.serializers.ConsumptionSerializers import ConsumptionSerializer
+from apps.consumption.services.ConsumptionService import ConsumptionService
+from apps.monitoring.services.BenchmarkService import benchmark
+from energy_billing.renderers import ORJSONRenderer
+
+RENDER_ROWS = 100_000  # Rows of the rendered consumption list, whatever the dataset scale
+
+# Cases for `manage.py benchmark`; each returns the call to time, see BenchmarkService.benchmark
+
+
+def _last_month(data):
+    return data.end_date - timedelta(days=29), data.end_date
+
+
+def _new_days(data, count):
+    # Days after the seeded period, so inserts never collide with existing readings
+    return [data.end_date + timedelta(days=offset) for offset in range(1, count + 1)]
+
+
+@benchmark(ConsumptionRepository, 'create_consumption')
+def create_consumption(data):
+    repository = ConsumptionRepository()
+    day = _new_days(data, 1)[0].isoformat()
+    return lambda: repository.create_consumption(data.user, day, 12.5)
+
+
+@benchmark(ConsumptionRepository, 'upsert_daily_totals')
+def upsert_daily_totals(data):
+    repository = ConsumptionRepository()
+    # Half of the days exist and are updated, half are new
+    totals = {day: 10.0 for day in [data.end_date - timedelta(days=offset) for offset in range(15)] + _new_days(data, 15)}
+    return lambda: repository.upsert_daily_totals(data.user, totals)
+
+
+@benchmark(ConsumptionRepository, 'bulk_create_consumptions')
+def bulk_create_consumptions(data):
+    repository = ConsumptionRepository()
+    records = [Consumption(user=data.user, date=day, consumption=10.0) for day in _new_days(data, 100)]
+    return lambda: repository.bulk_create_consumptions(records)
+
+
+@benchmark(ConsumptionRepository, 'get_stored_keys')
+def get_stored_keys(data):
+    repository = ConsumptionRepository()
+    start_date, end_date = _last_month(data)
+    return lambda: repository.get_stored_keys(data.user_ids[:100], start_date, end_date)
+
+
+@benchmark(ConsumptionRepository, 'delete_estimates')
+def delete_estimates(data):
+    repository = ConsumptionRepository()
+    Consumption.objects.filter(user=data.user, date__gte=_last_month(data)[0]).update(is_estimated=True)
+    days = [data.end_date - timedelta(days=offset) for offset in range(30)]
+    return lambda: repository.delete_estimates(data.user, days)
+
+
+@benchmark(ConsumptionRepository, 'get_consumption_by_id')
+def get_consumption_by_id(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.get_consumption_by_id(data.consumption_ids[0])
+
+
+@benchmark(ConsumptionRepository, 'filter_consumption')
+def filter_consumption(data):
+    repository = ConsumptionRepository()
+    start_date, end_date = _last_month(data)
+    return lambda: list(repository.filter_consumption(data.user, start_date, end_date))
+
+
+@benchmark(ConsumptionRepository, 'get_consumption_by_user')
+def get_consumption_by_user(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.get_consumption_by_user(data.user)
+
+
+@benchmark(ConsumptionRepository, 'get_all_consumption')
+def get_all_consumption(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.get_all_consumption(data.end_date, data.end_date)
+
+
+@benchmark(ConsumptionRepository, 'get_period_consumption')
+def get_period_consumption(data):
+    repository = ConsumptionRepository()
+    start_date, end_date = _last_month(data)
+    return lambda: repository.get_period_consumption(data.user.id, start_date, end_date)
+
+
+@benchmark(ConsumptionRepository, 'get_kwh_series')
+def get_kwh_series(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.get_kwh_series(data.user.id, data.start_date, data.end_date)
+
+
+@benchmark(ConsumptionRepository, 'update_consumption')
+def update_consumption(data):
+    repository = ConsumptionRepository()
+    record = Consumption.objects.get(id=data.consumption_ids[0])
+    return lambda: repository.update_consumption(record, consumption=record.consumption + 1)
+
+
+@benchmark(ConsumptionRepository, 'update_consumption_fields')
+def update_consumption_fields(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.update_consumption_fields(data.consumption_ids[0], consumption=1.0)
+
+
+@benchmark(ConsumptionRepository, 'bulk_update_consumption_fields')
+def bulk_update_consumption_fields(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.bulk_update_consumption_fields(data.consumption_ids, is_estimated=True)
+
+
+@benchmark(ConsumptionRepository, 'bulk_update_consumptions')
+def bulk_update_consumptions(data):
+    repository = ConsumptionRepository()
+    records = list(Consumption.objects.filter(id__in=data.consumption_ids))
+    for record in records:
+        record.consumption += 1
+    return lambda: repository.bulk_update_consumptions(records, ['consumption'])
+
+
+@benchmark(ConsumptionRepository, 'delete_consumption')
+def delete_consumption(data):
+    repository = ConsumptionRepository()
+    record = Consumption.objects.get(id=data.consumption_ids[0])
+    return lambda: repository.delete_consumption(record)
+
+
+@benchmark(ConsumptionRepository, 'aggregate_user_consumption')
+def aggregate_user_consumption(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.aggregate_user_consumption(data.user)
+
+
+@benchmark(ConsumptionRepository, 'aggregate_all_users_consumption')
+def aggregate_all_users_consumption(data):
+    repository = ConsumptionRepository()
+    return lambda: repository.aggregate_all_users_consumption()
+
+
+@benchmark(ConsumptionService, 'ingest_consumptions')
+def ingest_consumptions(data):
+    service = ConsumptionService(ConsumptionRepository())
+    entries = [{'date': day, 'consumption': 10.0} for day in _new_days(data, 30)]
+    return lambda: service.ingest_consumptions(data.user, entries)
+
+
+@benchmark(ConsumptionService, 'get_user_consumptions')
+def get_user_consumptions(data):
+    service = ConsumptionService(ConsumptionRepository())
+    start_date, end_date = _last_month(data)
+    return lambda: service.get_user_consumptions(data.user, start_date, end_date)
+
+
+@benchmark(ConsumptionService, 'get_all_consumptions')
+def get_all_consumptions(data):
+    service = ConsumptionService(ConsumptionRepository())
+    return lambda: service.get_all_consumptions(data.end_date, data.end_date)
+
+
+@benchmark(ConsumptionService, 'aggregate_user_consumption')
+def service_aggregate_user_consumption(data):
+    service = ConsumptionService(ConsumptionRepository())
+    return lambda: service.aggregate_user_consumption(data.user)
+
+
+@benchmark(ConsumptionService, 'aggregate_all_users_consumption')
+def service_aggregate_all_users_consumption(data):
+    service = ConsumptionService(ConsumptionRepository())
+    return lambda: service.aggregate_all_users_consumption()
+
+
+def _quarantine(data, count):
+    readings = [QuarantinedReading(user=data.user, date=day, consumption=10.0, reasons='spike') for day in _new_days(data, count)]
+    return [reading.id for reading in QuarantinedReadingRepository().quarantine_readings(readings)]
+
+
+@benchmark(ConsumptionService, 'get_quarantined_readings')
+def get_quarantined_readings(data):
+    service = ConsumptionService(ConsumptionRepository())
+    _quarantine(data, 30)
+    return lambda: service.get_quarantined_readings(data.user)
+
+
+@benchmark(ConsumptionService, 'release_quarantined_readings')
+def release_quarantined_readings(data):
+    service = ConsumptionService(ConsumptionRepository())
+    quarantine_ids = _quarantine(data, 30)
+    return lambda: service.release_quarantined_readings(quarantine_ids)
+
+
+@benchmark(ConsumptionService, 'discard_quarantined_readings')
+def discard_quarantined_readings(data):
+    service = ConsumptionService(ConsumptionRepository())
+    quarantine_ids = _quarantine(data, 30)
+    return lambda: service.discard_quarantined_readings(quarantine_ids)
+
+
+@lru_cache(maxsize=1)
+def _consumption_list(user_ids, end_date):
+    # A serialized list as the consumption view returns it, built once from unsaved readings
+    readings = [
+        Consumption(id=index + 1, user_id=user_ids[index % len(user_ids)], date=end_date - timedelta(days=index % 365), consumption=round(7.5 + index % 97 / 10, 3))
+        for index in range(RENDER_ROWS)
+    ]
+    return ConsumptionSerializer(readings, many=True).data
+
+
+@benchmark(JSONRenderer, 'render')
+def render_json(data):
+    renderer = JSONRenderer()
+    payload = _consumption_list(tuple(data.user_ids), data.end_date)
+    return lambda: renderer.render(payload)
+
+
+@benchmark(ORJSONRenderer, 'render')
+def render_orjson(data):
+    renderer = ORJSONRenderer()
+    payload = _consumption_list(tuple(data.user_ids), data.end_date)
+    return lambda: renderer.render(payload)
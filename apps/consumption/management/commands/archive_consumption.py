@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand # type: ignore
+from django.conf import settings
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.consumption.services.ConsumptionArchiveService import ConsumptionArchiveService
+
+
+class Command(BaseCommand):
+    """
+    Moves consumption readings older than the hot window into compressed Parquet files.
+    """
+    help = 'Archive closed consumption periods to Parquet cold storage.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--after-months', type=int, default=settings.CONSUMPTION_ARCHIVE_AFTER_MONTHS,
+                            help='Archive months that ended more than this many months ago.')
+        parser.add_argument('--chunk-size', type=int, default=settings.CONSUMPTION_ARCHIVE_CHUNK_SIZE,
+                            help='Maximum number of readings per Parquet file.')
+
+    def handle(self, *args, **options):
+        service = ConsumptionArchiveService(ConsumptionArchiveRepository())
+        archives = service.archive_closed_periods(options['after_months'], options['chunk_size'])
+        for archive in archives:
+            self.stdout.write(f'Archived {archive.row_count} readings to {archive.path}')
+        self.stdout.write(self.style.SUCCESS(f'Archived {sum(a.row_count for a in archives)} readings in {len(archives)} files.'))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from apps.consumption.repositories.ConsumptionGapRepository import ConsumptionGapRepository
+from apps.consumption.services.ConsumptionGapService import ConsumptionGapService
+
+
+class Command(BaseCommand):
+    """
+    Finds days without a consumption reading and stores flagged estimates for them.
+    """
+    help = 'Detect missing daily consumption readings and fill them with estimates.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day of the period (YYYY-MM-DD). Defaults to the trailing CONSUMPTION_GAP_FILL_DAYS.')
+        parser.add_argument('--end', help='Last day of the period (YYYY-MM-DD). Defaults to yesterday.')
+        parser.add_argument('--chunk-size', type=int, default=settings.CONSUMPTION_GAP_CHUNK_SIZE,
+                            help='Users processed per chunk.')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the missing days.')
+
+    def handle(self, *args, **options):
+        service = ConsumptionGapService(ConsumptionGapRepository())
+        if options['start'] or options['end']:
+            start_date, end_date = parse_date(options['start'] or ''), parse_date(options['end'] or '')
+            if start_date is None or end_date is None or start_date > end_date:
+                raise CommandError('--start and --end must both be dates, with --start not after --end.')
+            result = service.fill_gaps(start_date, end_date, chunk_size=options['chunk_size'], dry_run=options['dry_run'])
+        elif options['dry_run']:
+            raise CommandError('--dry-run needs an explicit --start and --end.')
+        else:
+            result = service.fill_recent_gaps()
+        self.stdout.write(self.style.SUCCESS(f"Found {result['missing']} missing days, stored {result['estimated']} estimates."))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from apps.consumption.repositories.ConsumptionPartitionRepository import ConsumptionPartitionRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.services.ConsumptionPartitionService import ConsumptionPartitionService, EXPIRED_PARTITION_ACTIONS
+from apps.authentication.models.UserModel import User
+
+
+class Command(BaseCommand):
+    """
+    Pre-creates future monthly consumption partitions and detaches or drops expired ones.
+    """
+    help = 'Maintain the monthly partitions of the consumption table (PostgreSQL only).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=settings.CONSUMPTION_PARTITION_PREMAKE_MONTHS,
+                            help='Number of future months to pre-create.')
+        parser.add_argument('--retention-months', type=int, default=settings.CONSUMPTION_PARTITION_RETENTION_MONTHS,
+                            help='Expire partitions older than this many months. Omit to keep everything.')
+        parser.add_argument('--expired-action', choices=EXPIRED_PARTITION_ACTIONS,
+                            default=settings.CONSUMPTION_PARTITION_EXPIRED_ACTION,
+                            help='Whether expired partitions are detached (kept as tables) or dropped.')
+        parser.add_argument('--verify-pruning', nargs=2, metavar=('START_DATE', 'END_DATE'),
+                            help='Show which partitions the repository query scans for a date range.')
+        parser.add_argument('--user-id', type=int, help='Restrict --verify-pruning to one user.')
+
+    def handle(self, *args, **options):
+        service = ConsumptionPartitionService(ConsumptionPartitionRepository(), ConsumptionRepository())
+        if not service.partition_repository.is_partitioned():
+            self.stdout.write('The consumption table is not partitioned on this database; nothing to do.')
+            return
+
+        if options['verify_pruning']:
+            start_date, end_date = (parse_date(value) for value in options['verify_pruning'])
+            if start_date is None or end_date is None:
+                raise CommandError('Dates must use the YYYY-MM-DD format.')
+            user = User.objects.filter(id=options['user_id']).first() if options['user_id'] else None
+            for name in service.verify_pruning(start_date, end_date, user):
+                self.stdout.write(name)
+            return
+
+        for name in service.ensure_future_partitions(options['months_ahead']):
+            self.stdout.write(f'Created partition {name}')
+        if options['retention_months'] is not None:
+            for name in service.expire_partitions(options['retention_months'], options['expired_action']):
+                self.stdout.write(f"{'Dropped' if options['expired_action'] == 'drop' else 'Detached'} partition {name}")
+        self.stdout.write(self.style.SUCCESS('Consumption partitions are up to date.'))
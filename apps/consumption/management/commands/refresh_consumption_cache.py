@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand # type: ignore
+from apps.consumption.repositories.ConsumptionColumnarRepository import ConsumptionColumnarRepository
+
+
+class Command(BaseCommand):
+    """
+    Refreshes the memory-mapped columnar consumption cache used by analytics workers.
+    """
+    help = 'Merge new consumption readings into the columnar cache, or rebuild it with --full.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help='Rebuild every shard, picking up updated and deleted readings.')
+
+    def handle(self, *args, **options):
+        repository = ConsumptionColumnarRepository()
+        read = repository.refresh(full=options['full'])
+        manifest = repository.read_manifest()
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {read} readings; cache generation {manifest['generation']} covers IDs up to {manifest['watermark']}."
+        ))
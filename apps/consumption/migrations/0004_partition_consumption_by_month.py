@@ -0,0 +1,128 @@
+"""
+Converts consumption_consumption into a table range-partitioned by month on `date`.
+
+PostgreSQL requires the primary key of a partitioned table to include the partition key,
+so the key becomes (id, date). Other backends are left untouched. On PostgreSQL, after this
+migration:
+
+- `id` alone is no longer unique in the database. Ids still come from one sequence, so rows
+  inserted through the ORM never share one, but an insert with an explicit id that exists
+  under another date is accepted.
+- Foreign keys cannot target a partitioned table without the full key, so the constraint from
+  billing_bill_consumption.consumption_id to consumption is dropped. Django's delete collector
+  still removes the links of readings deleted through the ORM; raw SQL deletes can leave
+  dangling links, which the reverse migration removes before restoring the constraint.
+"""
+from datetime import date
+
+from django.db import migrations, models
+
+TABLE = 'consumption_consumption'
+LEGACY_TABLE = 'consumption_consumption_legacy'
+SEQUENCE = 'consumption_consumption_partitioned_id_seq'
+THROUGH_TABLE = 'billing_bill_consumption'
+PREMAKE_MONTHS = 3
+
+
+def _add_months(day, months):
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    user_table = apps.get_model('authentication', 'User')._meta.db_table
+    execute = schema_editor.execute
+
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+    execute(f'CREATE SEQUENCE "{SEQUENCE}"')
+    execute(f'''
+        CREATE TABLE "{TABLE}" (
+            "id" bigint NOT NULL DEFAULT nextval('"{SEQUENCE}"'),
+            "date" date NOT NULL,
+            "consumption" double precision NOT NULL,
+            "unit" varchar(10) NOT NULL,
+            "user_id" bigint NOT NULL REFERENCES "{user_table}" ("id") DEFERRABLE INITIALLY DEFERRED,
+            PRIMARY KEY ("id", "date")
+        ) PARTITION BY RANGE ("date")
+    ''')
+    execute(f'ALTER SEQUENCE "{SEQUENCE}" OWNED BY "{TABLE}"."id"')
+    execute(f'CREATE INDEX "{TABLE}_partitioned_user_id" ON "{TABLE}" ("user_id")')
+    execute(f'CREATE TABLE "{TABLE}_default" PARTITION OF "{TABLE}" DEFAULT')
+
+    # One partition per month from the oldest reading up to a few months ahead
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN("date") FROM "{LEGACY_TABLE}"')
+        oldest = cursor.fetchone()[0]
+    current = date.today().replace(day=1)
+    month = (oldest or current).replace(day=1)
+    while month <= _add_months(current, PREMAKE_MONTHS):
+        execute(
+            f'CREATE TABLE "{TABLE}_y{month.year:04d}m{month.month:02d}" PARTITION OF "{TABLE}" '
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    execute(f'''
+        INSERT INTO "{TABLE}" ("id", "date", "consumption", "unit", "user_id")
+        SELECT "id", "date", "consumption", "unit", "user_id" FROM "{LEGACY_TABLE}"
+    ''')
+    execute(f'''SELECT setval('"{SEQUENCE}"', COALESCE((SELECT MAX("id") FROM "{TABLE}"), 0) + 1, false)''')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND confrelid = to_regclass(%s)",
+            [THROUGH_TABLE, LEGACY_TABLE],
+        )
+        constraints = [row[0] for row in cursor.fetchall()]
+    for constraint in constraints:
+        execute(f'ALTER TABLE "{THROUGH_TABLE}" DROP CONSTRAINT "{constraint}"')
+    execute(f'DROP TABLE "{LEGACY_TABLE}"')
+
+
+def unpartition_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    user_table = apps.get_model('authentication', 'User')._meta.db_table
+    execute = schema_editor.execute
+
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY_TABLE}"')
+    execute(f'''
+        CREATE TABLE "{TABLE}" (
+            "id" bigint NOT NULL PRIMARY KEY GENERATED BY DEFAULT AS IDENTITY,
+            "date" date NOT NULL,
+            "consumption" double precision NOT NULL,
+            "unit" varchar(10) NOT NULL,
+            "user_id" bigint NOT NULL REFERENCES "{user_table}" ("id") DEFERRABLE INITIALLY DEFERRED
+        )
+    ''')
+    execute(f'CREATE INDEX "{TABLE}_user_id" ON "{TABLE}" ("user_id")')
+    execute(f'''
+        INSERT INTO "{TABLE}" ("id", "date", "consumption", "unit", "user_id")
+        SELECT "id", "date", "consumption", "unit", "user_id" FROM "{LEGACY_TABLE}"
+    ''')
+    execute(f'''SELECT setval(pg_get_serial_sequence('"{TABLE}"', 'id'), COALESCE((SELECT MAX("id") FROM "{TABLE}"), 0) + 1, false)''')
+    execute(f'DELETE FROM "{THROUGH_TABLE}" WHERE "consumption_id" NOT IN (SELECT "id" FROM "{TABLE}")')
+    execute(f'''
+        ALTER TABLE "{THROUGH_TABLE}" ADD CONSTRAINT "{THROUGH_TABLE}_consumption_id_fk"
+        FOREIGN KEY ("consumption_id") REFERENCES "{TABLE}" ("id") DEFERRABLE INITIALLY DEFERRED
+    ''')
+    execute(f'DROP TABLE "{LEGACY_TABLE}" CASCADE')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0003_initial'),
+        ('billing', '0003_initial'),
+        ('authentication', '0002_user_role'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_table, unpartition_table),
+        migrations.AddIndex(
+            model_name='consumption',
+            index=models.Index(fields=['user', 'date'], name='consumption_user_date_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0004_partition_consumption_by_month'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsumptionArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('path', models.CharField(max_length=255, unique=True)),
+                ('row_count', models.PositiveIntegerField()),
+                ('user_id_min', models.BigIntegerField()),
+                ('user_id_max', models.BigIntegerField()),
+                ('date_min', models.DateField()),
+                ('date_max', models.DateField()),
+                ('total_consumption', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date_min', 'date_max'], name='consumption_archive_dates_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0005_consumptionarchive'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntervalReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('meter_id', models.CharField(default='', max_length=32)),
+                ('date', models.DateField()),
+                ('interval_minutes', models.PositiveSmallIntegerField(default=15)),
+                ('packed_values', models.BinaryField()),
+                ('total', models.FloatField()),
+                ('unit', models.CharField(default='kWh', max_length=10)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interval_readings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'meter_id', 'date'), name='interval_reading_meter_day_unique')],
+            },
+        ),
+    ]
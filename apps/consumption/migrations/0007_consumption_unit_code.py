@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:40
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+# Unit names as stored in the old free-text column, mapped to their EnergyUnits codes
+UNIT_CODES = {'wh': 1, 'kwh': 2, 'mwh': 3, 'gwh': 4}
+KWH = 2
+
+
+def forwards(apps, schema_editor):
+    Consumption = apps.get_model('consumption', 'Consumption')
+    readings = Consumption.objects.annotate(unit_lower=Lower(Trim('unit')))
+    # Readings in an unknown unit would silently become kWh; stop instead, before anything changed
+    unknown = list(
+        readings.exclude(unit_lower__in=UNIT_CODES)
+        .values('unit').annotate(readings=Count('id')).order_by('unit').values_list('unit', 'readings')
+    )
+    if unknown:
+        listed = ', '.join(f'{unit!r}: {count}' for unit, count in unknown)
+        raise ValueError(
+            f'Consumption readings have units outside Wh, kWh, MWh and GWh ({listed}). '
+            'Convert or delete them, then run the migration again.'
+        )
+    for name, code in UNIT_CODES.items():
+        if code != KWH:
+            readings.filter(unit_lower=name).update(unit_code=code)
+
+
+def backwards(apps, schema_editor):
+    Consumption = apps.get_model('consumption', 'Consumption')
+    names = {1: 'Wh', 2: 'kWh', 3: 'MWh', 4: 'GWh'}
+    for code, name in names.items():
+        Consumption.objects.filter(unit_code=code).update(unit=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0006_intervalreading'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consumption',
+            name='unit_code',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Wh'), (2, 'kWh'), (3, 'MWh'), (4, 'GWh')], default=2),
+        ),
+        migrations.RunPython(forwards, backwards),
+        migrations.RemoveField(
+            model_name='consumption',
+            name='unit',
+        ),
+        migrations.RenameField(
+            model_name='consumption',
+            old_name='unit_code',
+            new_name='unit',
+        ),
+    ]
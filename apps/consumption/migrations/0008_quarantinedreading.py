@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0007_consumption_unit_code'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuarantinedReading',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('consumption', models.FloatField()),
+                ('unit', models.PositiveSmallIntegerField(choices=[(1, 'Wh'), (2, 'kWh'), (3, 'MWh'), (4, 'GWh')], default=2)),
+                ('reasons', models.CharField(max_length=100)),
+                ('expected', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quarantined_readings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'date'], name='quarantined_user_date_idx')],
+            },
+        ),
+    ]
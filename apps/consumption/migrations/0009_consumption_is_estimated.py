@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('consumption', '0008_quarantinedreading'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='consumption',
+            name='is_estimated',
+            field=models.BooleanField(default=False),
+        ),
+    ]
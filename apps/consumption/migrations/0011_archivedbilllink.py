@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:40
+
+"""
+Keeps the bill links of archived readings in a table. Links of readings archived before this
+migration survive only in the `bill_ids` column of their Parquet files; they are copied back
+for the bills that still exist.
+"""
+import os
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def copy_archived_links(apps, schema_editor):
+    ConsumptionArchive = apps.get_model('consumption', 'ConsumptionArchive')
+    ArchivedBillLink = apps.get_model('consumption', 'ArchivedBillLink')
+    Bill = apps.get_model('billing', 'Bill')
+    if not ConsumptionArchive.objects.exists():
+        return
+    import pyarrow.parquet as pq # type: ignore
+
+    for path in ConsumptionArchive.objects.values_list('path', flat=True).iterator():
+        table = pq.read_table(os.path.join(settings.CONSUMPTION_ARCHIVE_ROOT, path), columns=['id', 'bill_ids'])
+        links = [(bill_id, row['id']) for row in table.to_pylist() for bill_id in row['bill_ids'] or ()]
+        existing = set(Bill.objects.filter(id__in={bill_id for bill_id, _ in links}).values_list('id', flat=True))
+        ArchivedBillLink.objects.bulk_create(
+            [ArchivedBillLink(bill_id=bill_id, consumption_id=consumption_id) for bill_id, consumption_id in links if bill_id in existing],
+            batch_size=10000,
+            ignore_conflicts=True,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0006_user_balance'),
+        ('consumption', '0010_dirtyperiod'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedBillLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumption_id', models.BigIntegerField()),
+                ('bill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_links', to='billing.bill')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('bill', 'consumption_id'), name='archived_bill_link_unique')],
+            },
+        ),
+        migrations.RunPython(copy_archived_links, migrations.RunPython.noop),
+    ]
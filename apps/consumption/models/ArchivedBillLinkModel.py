@@ -0,0 +1,17 @@
+from django.db import models
+
+class ArchivedBillLink(models.Model):
+    """
+    Link between a bill and one of its readings that was moved to the Parquet archive,
+    replacing the bill's consumption row deleted with the hot reading.
+    """
+    bill = models.ForeignKey('billing.Bill', on_delete=models.CASCADE, related_name='archived_links')
+    consumption_id = models.BigIntegerField()  # ID of the archived reading
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['bill', 'consumption_id'], name='archived_bill_link_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Bill {self.bill_id} - archived reading {self.consumption_id}' #type: ignore
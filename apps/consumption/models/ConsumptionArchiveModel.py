@@ -0,0 +1,23 @@
+from django.db import models
+
+class ConsumptionArchive(models.Model):
+    """
+    Manifest entry for one compressed Parquet file of archived consumption readings.
+    """
+    month = models.DateField()  # First day of the archived month
+    path = models.CharField(max_length=255, unique=True)  # Relative to CONSUMPTION_ARCHIVE_ROOT
+    row_count = models.PositiveIntegerField()
+    user_id_min = models.BigIntegerField()
+    user_id_max = models.BigIntegerField()
+    date_min = models.DateField()
+    date_max = models.DateField()
+    total_consumption = models.FloatField()  # In kWh
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_min', 'date_max'], name='consumption_archive_dates_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'Archive {self.path}: {self.row_count} readings ({self.date_min} - {self.date_max})'
@@ -1,5 +1,6 @@
 from django.db import models
 from apps.authentication.models.UserModel import User
+from apps.consumption.models.EnergyUnits import UNIT_CHOICES, KWH
 from typing import Optional
 
 class Consumption(models.Model):
@@ -9,7 +10,14 @@ class Consumption(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='consumptions')
     date = models.DateField()
     consumption = models.FloatField()
-    unit = models.CharField(max_length=10, default='kWh')
+    unit = models.PositiveSmallIntegerField(choices=UNIT_CHOICES, default=KWH)  # Code from EnergyUnits
+    is_estimated = models.BooleanField(default=False)  # Filled in by the gap estimator, replaced when a real reading arrives
+
+    class Meta:
+        # On PostgreSQL the table is range-partitioned by month on `date` (see migration 0004)
+        indexes = [
+            models.Index(fields=['user', 'date'], name='consumption_user_date_idx'),
+        ]
 
     def __str__(self) -> str:
-        return f'{self.user.username} - {self.date}: {self.consumption} {self.unit}'
+        return f'{self.user.username} - {self.date}: {self.consumption} {self.get_unit_display()}' #type: ignore
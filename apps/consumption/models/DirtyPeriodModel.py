@@ -0,0 +1,18 @@
+from django.db import models
+from apps.authentication.models.UserModel import User
+
+class DirtyPeriod(models.Model):
+    """
+    Model marking a user's month whose consumption changed since it was last (re)billed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='dirty_periods')
+    month = models.DateField()  # First day of the changed month
+    marked_at = models.DateTimeField()  # Bumped by every change, so a change made during a re-bill is not lost
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'month'], name='dirty_period_user_month_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id} - {self.month:%Y-%m} (changed {self.marked_at})' #type: ignore
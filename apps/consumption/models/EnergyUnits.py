@@ -0,0 +1,78 @@
+from typing import Any, List, NamedTuple, Tuple, Union
+from django.db.models import Case, FloatField, Value, When
+
+class EnergyUnit(NamedTuple):
+    """
+    A unit energy readings can be recorded in, with its conversion factor to kWh.
+    """
+    code: int
+    name: str
+    kwh_factor: float
+
+
+WH = 1
+KWH = 2
+MWH = 3
+GWH = 4
+
+ENERGY_UNITS: Tuple[EnergyUnit, ...] = (
+    EnergyUnit(WH, 'Wh', 0.001),
+    EnergyUnit(KWH, 'kWh', 1.0),
+    EnergyUnit(MWH, 'MWh', 1000.0),
+    EnergyUnit(GWH, 'GWh', 1000000.0),
+)
+
+UNIT_CHOICES: List[Tuple[int, str]] = [(unit.code, unit.name) for unit in ENERGY_UNITS]
+
+_UNITS_BY_CODE = {unit.code: unit for unit in ENERGY_UNITS}
+_UNITS_BY_NAME = {unit.name.lower(): unit for unit in ENERGY_UNITS}
+
+
+def unit_code(unit: Union[int, str]) -> int:
+    """
+    Resolves a unit name (case-insensitive) or code to its small-int code.
+
+    Raises:
+        ValueError: If the unit is not registered.
+    """
+    if isinstance(unit, int) and unit in _UNITS_BY_CODE:
+        return unit
+    if isinstance(unit, str) and unit.strip().lower() in _UNITS_BY_NAME:
+        return _UNITS_BY_NAME[unit.strip().lower()].code
+    raise ValueError(f"Unknown energy unit '{unit}'. Expected one of: {', '.join(u.name for u in ENERGY_UNITS)}.")
+
+
+def unit_name(unit: Union[int, str]) -> str:
+    """
+    Returns the display name of a unit code or name.
+    """
+    return _UNITS_BY_CODE[unit_code(unit)].name
+
+
+def kwh_factor(unit: Union[int, str]) -> float:
+    """
+    Returns the factor converting a value in the given unit (code or name) to kWh.
+    """
+    return _UNITS_BY_CODE[unit_code(unit)].kwh_factor
+
+
+def kwh_factor_case(field: str = 'unit') -> Case:
+    """
+    SQL CASE expression mapping a unit code column to its kWh factor, for set-based aggregates.
+    """
+    return Case(
+        *[When(**{field: unit.code}, then=Value(unit.kwh_factor)) for unit in ENERGY_UNITS],
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+
+
+def to_kwh(values: Any, codes: Any) -> Any:
+    """
+    Converts NumPy arrays of values and unit codes to kWh in one vectorized pass.
+    """
+    import numpy as np # type: ignore
+    factors = np.ones(max(_UNITS_BY_CODE) + 1, dtype=np.float64)
+    for unit in ENERGY_UNITS:
+        factors[unit.code] = unit.kwh_factor
+    return np.asarray(values, dtype=np.float64) * factors[np.asarray(codes, dtype=np.intp)]
@@ -0,0 +1,64 @@
+import sys
+import zlib
+from array import array
+from typing import Iterable
+from django.db import models
+from apps.authentication.models.UserModel import User
+
+# First byte of every packed blob: how the float32 payload that follows is stored
+RAW_FLOAT32 = 1
+ZLIB_FLOAT32 = 2
+
+
+def encode_intervals(values: Iterable[float], compress: bool = True) -> bytes:
+    """
+    Packs a day of interval values into little-endian float32 bytes, optionally zlib-compressed.
+    """
+    packed = array('f', values)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    payload = packed.tobytes()
+    if compress:
+        return bytes([ZLIB_FLOAT32]) + zlib.compress(payload, 1)
+    return bytes([RAW_FLOAT32]) + payload
+
+
+def decode_intervals(blob: bytes) -> array:
+    """
+    Unpacks bytes produced by encode_intervals into an array of float32 values.
+    """
+    blob = bytes(blob)
+    payload = zlib.decompress(blob[1:]) if blob[0] == ZLIB_FLOAT32 else blob[1:]
+    values = array('f')
+    values.frombytes(payload)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class IntervalReading(models.Model):
+    """
+    Model storing one meter-day of smart-meter interval readings as a single packed blob.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='interval_readings')
+    meter_id = models.CharField(max_length=32, default='')
+    date = models.DateField()
+    interval_minutes = models.PositiveSmallIntegerField(default=15)
+    packed_values = models.BinaryField()
+    total = models.FloatField()  # Sum of the day's intervals, rolled up into Consumption
+    unit = models.CharField(max_length=10, default='kWh')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'meter_id', 'date'], name='interval_reading_meter_day_unique'),
+        ]
+
+    @property
+    def values(self) -> array:
+        """
+        The decoded interval values for the day.
+        """
+        return decode_intervals(self.packed_values)
+
+    def __str__(self) -> str:
+        return f'{self.user_id} meter {self.meter_id or "-"} - {self.date}: {self.total} {self.unit}' #type: ignore
@@ -0,0 +1,23 @@
+from django.db import models
+from apps.authentication.models.UserModel import User
+from apps.consumption.models.EnergyUnits import UNIT_CHOICES, KWH
+
+class QuarantinedReading(models.Model):
+    """
+    Model for consumption readings held back by the ingestion validators instead of being billed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='quarantined_readings')
+    date = models.DateField()
+    consumption = models.FloatField()
+    unit = models.PositiveSmallIntegerField(choices=UNIT_CHOICES, default=KWH)  # Code from EnergyUnits
+    reasons = models.CharField(max_length=100)  # Comma-separated reasons of the validators that flagged it
+    expected = models.FloatField(null=True, blank=True)  # The user's baseline in kWh when the reading arrived
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'date'], name='quarantined_user_date_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.user_id} - {self.date}: {self.consumption} {self.get_unit_display()} ({self.reasons})' #type: ignore
@@ -1,2 +1,7 @@
 
 from .ConsumptionModel import Consumption
+from .ConsumptionArchiveModel import ConsumptionArchive
+from .IntervalReadingModel import IntervalReading
+from .QuarantinedReadingModel import QuarantinedReading
+from .DirtyPeriodModel import DirtyPeriod
+from .ArchivedBillLinkModel import ArchivedBillLink
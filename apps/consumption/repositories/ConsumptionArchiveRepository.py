@@ -0,0 +1,264 @@
+import os
+import uuid
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Type
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import Sum
+from apps.consumption.models.ArchivedBillLinkModel import ArchivedBillLink
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.ConsumptionArchiveModel import ConsumptionArchive
+from apps.consumption.models.EnergyUnits import kwh_factor, unit_code
+
+try:
+    import pyarrow as pa # type: ignore
+    import pyarrow.compute as pc # type: ignore
+    import pyarrow.parquet as pq # type: ignore
+except ImportError:  # pragma: no cover - pyarrow is only needed once something is archived
+    pa = None
+    pc = None
+    pq = None
+
+DELETE_BATCH_SIZE = 10000
+READING_COLUMNS = ('id', 'user_id', 'date', 'consumption', 'unit', 'is_estimated')
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImproperlyConfigured("Consumption archiving requires pyarrow. Did you install pyarrow?")
+
+
+class ConsumptionArchiveRepository:
+    """
+    Repository class for moving consumption readings to and from compressed Parquet files.
+
+    Each archived chunk becomes one Parquet file sorted by (user_id, date), described by a
+    ConsumptionArchive manifest row holding its user and date ranges so reads only open the
+    files that can contain matching readings. Bill links of archived readings move to
+    ArchivedBillLink rows, since the bill's consumption rows go with the hot readings.
+    """
+
+    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, archive_model: Optional[Type[ConsumptionArchive]] = None, link_model: Optional[Type[ArchivedBillLink]] = None) -> None:
+        """
+        Initializes the ConsumptionArchiveRepository.
+
+        Args:
+            consumption_model (Optional[Type[Consumption]]): The consumption model to use. Defaults to the project's Consumption model.
+            archive_model (Optional[Type[ConsumptionArchive]]): The manifest model to use. Defaults to ConsumptionArchive.
+            link_model (Optional[Type[ArchivedBillLink]]): The bill link model of archived readings. Defaults to ArchivedBillLink.
+        """
+        self.consumption_model: Type[Consumption] = consumption_model or Consumption
+        self.archive_model: Type[ConsumptionArchive] = archive_model or ConsumptionArchive
+        self.link_model: Type[ArchivedBillLink] = link_model or ArchivedBillLink
+
+    def get_hot_months_before(self, cutoff: date) -> List[date]:
+        """
+        Lists the months before the cutoff that still have readings in the hot table.
+
+        Returns:
+            List[date]: The first day of every such month, oldest first.
+        """
+        months = self.consumption_model.objects.filter(date__lt=cutoff).dates('date', 'month')
+        return list(months)
+
+    def archive_chunk(self, month: date, month_end: date, chunk_size: int) -> Optional[ConsumptionArchive]:
+        """
+        Moves the next chunk of a month's readings from the hot table into a new Parquet file.
+
+        The file is written first; the manifest row, the readings' bill links and the deletion
+        of the hot rows then commit together, so readers always see each reading exactly once
+        and bills keep every reading they cover.
+
+        Args:
+            month (date): The first day of the month being archived.
+            month_end (date): The first day of the following month.
+            chunk_size (int): Maximum number of readings in the file.
+
+        Returns:
+            Optional[ConsumptionArchive]: The manifest entry, or None when the month has no hot readings left.
+        """
+        _require_pyarrow()
+        rows = list(
+            self.consumption_model.objects
+            .filter(date__gte=month, date__lt=month_end)
+            .order_by('user_id', 'date', 'id')
+            .values('id', 'user_id', 'date', 'consumption', 'unit', 'is_estimated')[:chunk_size]
+        )
+        if not rows:
+            return None
+
+        ids = [row['id'] for row in rows]
+        bill_ids: Dict[int, List[int]] = defaultdict(list)
+        through = self.consumption_model.bills.through
+        links = list(through.objects.filter(consumption_id__in=ids).values_list('consumption_id', 'bill_id'))
+        for consumption_id, bill_id in links:
+            bill_ids[consumption_id].append(bill_id)
+
+        table = pa.table({
+            'id': pa.array(ids, type=pa.int64()),
+            'user_id': pa.array([row['user_id'] for row in rows], type=pa.int64()),
+            'date': pa.array([row['date'] for row in rows], type=pa.date32()),
+            'consumption': pa.array([row['consumption'] for row in rows], type=pa.float64()),
+            'unit': pa.array([row['unit'] for row in rows], type=pa.int16()),
+            'is_estimated': pa.array([row['is_estimated'] for row in rows], type=pa.bool_()),
+            'bill_ids': pa.array([bill_ids.get(i, []) for i in ids], type=pa.list_(pa.int64())),
+        })
+        relative_path = os.path.join(f'{month.year:04d}', f'{month.month:02d}', f'part-{uuid.uuid4().hex}.parquet')
+        absolute_path = os.path.join(settings.CONSUMPTION_ARCHIVE_ROOT, relative_path)
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+        pq.write_table(table, absolute_path, compression=settings.CONSUMPTION_ARCHIVE_COMPRESSION)
+
+        try:
+            with transaction.atomic():
+                archive = self.archive_model.objects.create(
+                    month=month,
+                    path=relative_path,
+                    row_count=len(rows),
+                    user_id_min=rows[0]['user_id'],
+                    user_id_max=rows[-1]['user_id'],
+                    date_min=min(row['date'] for row in rows),
+                    date_max=max(row['date'] for row in rows),
+                    total_consumption=sum(row['consumption'] * kwh_factor(row['unit']) for row in rows),
+                )
+                # Deleting the hot rows also deletes their bill links
+                self.link_model.objects.bulk_create(
+                    [self.link_model(bill_id=bill_id, consumption_id=consumption_id) for consumption_id, bill_id in links],
+                    batch_size=DELETE_BATCH_SIZE,
+                    ignore_conflicts=True,
+                )
+                for start in range(0, len(ids), DELETE_BATCH_SIZE):
+                    batch = ids[start:start + DELETE_BATCH_SIZE]
+                    self.consumption_model.objects.filter(date__gte=month, date__lt=month_end, id__in=batch).delete()
+        except Exception:
+            os.remove(absolute_path)
+            raise
+        return archive
+
+    def get_bill_reading_ids(self, bill_id: int) -> List[int]:
+        """
+        Retrieves the IDs of the archived readings a bill covers.
+        """
+        return list(self.link_model.objects.filter(bill_id=bill_id).order_by('consumption_id').values_list('consumption_id', flat=True))
+
+    def set_bill_readings(self, bill_id: int, consumption_ids: Sequence[int]) -> None:
+        """
+        Replaces the archived readings a bill covers, as re-billing recomputes them.
+        """
+        with transaction.atomic():
+            self.link_model.objects.filter(bill_id=bill_id).exclude(consumption_id__in=consumption_ids).delete()
+            self.link_model.objects.bulk_create(
+                [self.link_model(bill_id=bill_id, consumption_id=consumption_id) for consumption_id in consumption_ids],
+                batch_size=DELETE_BATCH_SIZE,
+                ignore_conflicts=True,
+            )
+
+    def get_archives(self, user_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[ConsumptionArchive]:
+        """
+        Retrieves the manifest entries whose files may hold readings for the user and date range.
+        """
+        archives = self.archive_model.objects.all()
+        if user_id is not None:
+            archives = archives.filter(user_id_min__lte=user_id, user_id_max__gte=user_id)
+        if start_date is not None:
+            archives = archives.filter(date_max__gte=start_date)
+        if end_date is not None:
+            archives = archives.filter(date_min__lte=end_date)
+        return list(archives.order_by('date_min'))
+
+    def read_archived(self, user_id: Optional[int] = None, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Dict[str, Any]]:
+        """
+        Reads archived readings matching the user and date range.
+
+        Returns:
+            List[Dict[str, Any]]: One dict per reading with id, user_id, date, consumption, unit and (when archived) is_estimated.
+        """
+        archives = self.get_archives(user_id, start_date, end_date)
+        if not archives:
+            return []
+        _require_pyarrow()
+        filters = []
+        if user_id is not None:
+            filters.append(('user_id', '=', user_id))
+        if start_date is not None:
+            filters.append(('date', '>=', start_date))
+        if end_date is not None:
+            filters.append(('date', '<=', end_date))
+        readings: List[Dict[str, Any]] = []
+        for archive in archives:
+            path = os.path.join(settings.CONSUMPTION_ARCHIVE_ROOT, archive.path)
+            # Files archived before estimated readings existed have no is_estimated column
+            available = set(pq.read_schema(path).names)
+            table = pq.read_table(
+                path,
+                columns=[column for column in READING_COLUMNS if column in available],
+                filters=filters or None,
+            )
+            readings.extend(table.to_pylist())
+        for reading in readings:
+            # Archives written before unit codes existed store the unit name
+            reading['unit'] = unit_code(reading['unit'])
+        return readings
+
+    def purge_user(self, user_id: int) -> int:
+        """
+        Rewrites the archive files holding a user's readings without them, for user deletion.
+
+        Each rewritten file gets a new path and its manifest row is updated in one transaction; a file
+        left empty is dropped with its manifest row. Superseded files are removed once the transaction
+        commits. Running it again after a crash only rewrites the files still holding the user's readings.
+
+        Returns:
+            int: The number of archived readings removed.
+        """
+        archives = self.get_archives(user_id)
+        if not archives:
+            return 0
+        _require_pyarrow()
+        removed = 0
+        for archive in archives:
+            old_path = os.path.join(settings.CONSUMPTION_ARCHIVE_ROOT, archive.path)
+            table = pq.read_table(old_path)
+            kept = table.filter(pc.not_equal(table['user_id'], user_id))
+            if kept.num_rows == table.num_rows:
+                continue
+            removed += table.num_rows - kept.num_rows
+            new_path = None
+            try:
+                with transaction.atomic():
+                    if kept.num_rows == 0:
+                        archive.delete()
+                    else:
+                        archive.path = os.path.join(os.path.dirname(archive.path), f'part-{uuid.uuid4().hex}.parquet')
+                        new_path = os.path.join(settings.CONSUMPTION_ARCHIVE_ROOT, archive.path)
+                        pq.write_table(kept, new_path, compression=settings.CONSUMPTION_ARCHIVE_COMPRESSION)
+                        readings = kept.select(['consumption', 'unit']).to_pylist()
+                        archive.row_count = kept.num_rows
+                        archive.user_id_min = pc.min(kept['user_id']).as_py()
+                        archive.user_id_max = pc.max(kept['user_id']).as_py()
+                        archive.date_min = pc.min(kept['date']).as_py()
+                        archive.date_max = pc.max(kept['date']).as_py()
+                        archive.total_consumption = sum(reading['consumption'] * kwh_factor(reading['unit']) for reading in readings)
+                        archive.save(update_fields=['path', 'row_count', 'user_id_min', 'user_id_max', 'date_min', 'date_max', 'total_consumption'])
+                    transaction.on_commit(lambda path=old_path: self._remove_file(path))
+            except Exception:
+                if new_path is not None and os.path.exists(new_path):
+                    os.remove(new_path)
+                raise
+        return removed
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def sum_archived(self, user_id: Optional[int] = None) -> float:
+        """
+        Sums archived consumption in kWh for one user, or for everyone straight from the manifest.
+        """
+        if user_id is None:
+            return self.archive_model.objects.aggregate(Sum('total_consumption'))['total_consumption__sum'] or 0.0
+        return sum(reading['consumption'] * kwh_factor(reading['unit']) for reading in self.read_archived(user_id))
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional, Sequence, Type
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.timezone import now
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import to_kwh
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the validation stage
+    np = None
+
+BASELINE_KEY = 'consumption-baseline:{}'
+# Columns of the per-user baseline state arrays
+COUNT, MEAN, M2, LAST_VALUE, LAST_DATE = range(5)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImproperlyConfigured("The consumption validation stage requires numpy. Did you install numpy?")
+
+
+class ConsumptionBaselineRepository:
+    """
+    Repository class for the rolling per-user consumption baselines used to validate new readings.
+
+    Each user's baseline is five floats (count, mean, M2, last value, last date ordinal) in kWh,
+    kept in a Django cache so every check is a single ``get_many`` per batch. Point the cache
+    alias at a Redis cache to share baselines between workers. Users missing from the cache are
+    seeded from their recent readings in one query.
+
+    Updates are an unlocked read-modify-write. When two workers validate batches of the same user
+    at once, the last `save_baselines` wins and the other batch's readings are left out of the
+    baseline. That only makes it lag by those readings. Delete a user's key to reseed it from
+    the stored readings.
+    """
+
+    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, cache_alias: Optional[str] = None, window: Optional[int] = None) -> None:
+        """
+        Initializes the ConsumptionBaselineRepository.
+
+        Args:
+            consumption_model (Optional[Type[Consumption]]): The consumption model to use. Defaults to the project's Consumption model.
+            cache_alias (Optional[str]): Cache holding the baselines. Defaults to settings.CONSUMPTION_BASELINE_CACHE.
+            window (Optional[int]): Readings (and days when seeding) a baseline covers. Defaults to settings.CONSUMPTION_BASELINE_WINDOW.
+        """
+        self.consumption_model: Type[Consumption] = consumption_model or Consumption
+        self.cache_alias: str = cache_alias or settings.CONSUMPTION_BASELINE_CACHE
+        self.window: int = window or settings.CONSUMPTION_BASELINE_WINDOW
+
+    def get_baselines(self, user_ids: Sequence[int]) -> Any:
+        """
+        Retrieves the baselines of the given users, seeding the ones that are not cached.
+
+        Args:
+            user_ids (Sequence[int]): Distinct user IDs.
+
+        Returns:
+            Any: A float64 array of shape (len(user_ids), 5), one row per user in the given order.
+        """
+        _require_numpy()
+        cached = caches[self.cache_alias].get_many([BASELINE_KEY.format(user_id) for user_id in user_ids])
+        missing = [user_id for user_id in user_ids if BASELINE_KEY.format(user_id) not in cached]
+        seeded = self._seed(missing) if missing else {}
+        if seeded:
+            caches[self.cache_alias].set_many({BASELINE_KEY.format(user_id): state for user_id, state in seeded.items()}, timeout=None)
+        states = np.zeros((len(user_ids), 5), dtype=np.float64)
+        for row, user_id in enumerate(user_ids):
+            state = cached.get(BASELINE_KEY.format(user_id)) or seeded.get(user_id)
+            if state is not None:
+                states[row] = state
+        return states
+
+    def save_baselines(self, user_ids: Sequence[int], states: Any) -> None:
+        """
+        Stores updated baselines in one cache round trip.
+
+        Args:
+            user_ids (Sequence[int]): Distinct user IDs.
+            states (Any): Array of shape (len(user_ids), 5) as returned by get_baselines.
+        """
+        caches[self.cache_alias].set_many(
+            {BASELINE_KEY.format(user_id): tuple(float(value) for value in state) for user_id, state in zip(user_ids, states)},
+            timeout=None,
+        )
+
+    def _seed(self, user_ids: Sequence[int]) -> Dict[int, tuple]:
+        """
+        Builds baselines from the users' readings of the last `window` days in one query.
+        """
+        since = now().date() - timedelta(days=self.window)
+        rows = list(
+            self.consumption_model.objects
+            .filter(user_id__in=user_ids, date__gte=since)
+            .order_by('user_id', 'date')
+            .values_list('user_id', 'date', 'consumption', 'unit')
+        )
+        if not rows:
+            return {}
+        users, dates, values, units = zip(*rows)
+        users = np.asarray(users, dtype=np.int64)
+        values = to_kwh(values, units)
+        distinct, index, counts = np.unique(users, return_index=True, return_counts=True)
+        sums = np.bincount(np.repeat(np.arange(len(distinct)), counts), weights=values)
+        means = sums / counts
+        deviations = values - np.repeat(means, counts)
+        m2 = np.bincount(np.repeat(np.arange(len(distinct)), counts), weights=deviations ** 2)
+        last = index + counts - 1
+        return {
+            int(user_id): (float(counts[row]), float(means[row]), float(m2[row]), float(values[last[row]]), float(dates[last[row]].toordinal()))
+            for row, user_id in enumerate(distinct)
+        }
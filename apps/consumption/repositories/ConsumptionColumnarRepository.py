@@ -0,0 +1,295 @@
+import glob
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Type
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import to_kwh
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the columnar cache
+    np = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no advisory file locks on Windows; run a single refreshing worker there
+    fcntl = None
+
+CACHE_COLUMNS = ('user_ids', 'offsets', 'dates', 'values')
+FETCH_CHUNK_SIZE = 100000
+MANIFEST_RECHECK_SECONDS = 5.0
+SHARD_GENERATION = re.compile(r'^shard-\d+\.g(\d+)\.')
+
+# Per-process state shared by every repository instance: mapped shards and the last seen generation
+_mapped_shards: Dict[Tuple[str, int], Tuple[int, Dict[str, Any]]] = {}
+_known_generations: Dict[str, Tuple[float, int]] = {}
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImproperlyConfigured("The columnar consumption cache requires numpy. Did you install numpy?")
+
+
+class ConsumptionSeries(NamedTuple):
+    """
+    A user's consumption as parallel read-only arrays, oldest reading first.
+    """
+    dates: Any  # int32 proleptic Gregorian ordinals (date.toordinal())
+    values: Any  # float64 consumption values in kWh
+
+
+class ConsumptionColumnarRepository:
+    """
+    Repository class for the memory-mapped columnar cache of consumption readings.
+
+    Readings are split into shards by ``user_id % shard_count``. Each shard holds four ``.npy``
+    files: the sorted distinct ``user_ids``, CSR ``offsets`` into the reading arrays, and the
+    ``dates`` and ``values`` arrays ordered by (user, date). Worker processes map the files
+    read-only, so one copy in the page cache serves every process and a user's series is a
+    zero-copy slice. A ``manifest.json`` names the current generation of files and the highest
+    consumption ID included, which is the watermark for incremental refreshes.
+
+    Refreshes of one cache root hold an exclusive lock on its ``.refresh.lock`` file, so the
+    periodic and nightly refreshes of any process on the host run one after the other.
+    """
+
+    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, cache_root: Optional[str] = None, shard_count: Optional[int] = None) -> None:
+        """
+        Initializes the ConsumptionColumnarRepository.
+
+        Args:
+            consumption_model (Optional[Type[Consumption]]): The consumption model to use. Defaults to the project's Consumption model.
+            cache_root (Optional[str]): Directory holding the cache files. Defaults to settings.CONSUMPTION_COLUMNAR_CACHE_ROOT.
+            shard_count (Optional[int]): Number of user shards. Defaults to settings.CONSUMPTION_COLUMNAR_SHARDS.
+        """
+        self.consumption_model: Type[Consumption] = consumption_model or Consumption
+        self.cache_root: str = cache_root or settings.CONSUMPTION_COLUMNAR_CACHE_ROOT
+        self.shard_count: int = shard_count or settings.CONSUMPTION_COLUMNAR_SHARDS
+
+    def read_manifest(self) -> Dict[str, int]:
+        """
+        Reads the manifest describing the current cache generation.
+
+        Returns:
+            Dict[str, int]: The generation, watermark and shard count; zeros when nothing is cached.
+        """
+        try:
+            with open(os.path.join(self.cache_root, 'manifest.json')) as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {'generation': 0, 'watermark': 0, 'shard_count': 0}
+
+    def get_user_series(self, user_id: int) -> ConsumptionSeries:
+        """
+        Retrieves a user's cached consumption series without copying it.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            ConsumptionSeries: Read-only views over the memory-mapped date and value arrays.
+        """
+        _require_numpy()
+        arrays = self._map_shard(user_id % self.shard_count)
+        user_ids = arrays['user_ids']
+        index = int(np.searchsorted(user_ids, user_id))
+        if index == len(user_ids) or user_ids[index] != user_id:
+            return ConsumptionSeries(arrays['dates'][:0], arrays['values'][:0])
+        start, end = arrays['offsets'][index], arrays['offsets'][index + 1]
+        return ConsumptionSeries(arrays['dates'][start:end], arrays['values'][start:end])
+
+    def refresh(self, full: bool = False) -> int:
+        """
+        Brings the cache up to date with the consumption table.
+
+        An incremental refresh only reads rows with an ID above the watermark and merges them
+        into the existing shards. It misses in-place updates and deletions of older rows, and rows
+        that commit after a row with a higher ID was merged; the nightly full rebuild picks them up.
+        Waits for a refresh of the same cache root that is already running.
+
+        Args:
+            full (bool): Rebuild every shard from scratch instead of merging new rows.
+
+        Returns:
+            int: The number of readings read from the database.
+        """
+        _require_numpy()
+        with self._refresh_lock():
+            manifest = self.read_manifest()
+            full = full or manifest['shard_count'] != self.shard_count
+            watermark = 0 if full else manifest['watermark']
+            ids, users, dates, values = self._fetch_rows_after(watermark)
+            if len(ids) == 0 and not full:
+                return 0
+
+            generation = self._claim_generation(manifest['generation'])
+            shard_of_row = users % self.shard_count
+            for shard in range(self.shard_count):
+                mask = shard_of_row == shard
+                if not full and not mask.any():
+                    self._link_shard(shard, manifest['generation'], generation)
+                    continue
+                if full:
+                    shard_users, shard_dates, shard_values = users[mask], dates[mask], values[mask]
+                else:
+                    shard_users, shard_dates, shard_values = self._expand_shard(shard, manifest['generation'])
+                    shard_users = np.concatenate([shard_users, users[mask]])
+                    shard_dates = np.concatenate([shard_dates, dates[mask]])
+                    shard_values = np.concatenate([shard_values, values[mask]])
+                self._write_shard(shard, generation, shard_users, shard_dates, shard_values)
+
+            new_watermark = int(ids.max()) if len(ids) else watermark
+            self._write_manifest({'generation': generation, 'watermark': new_watermark, 'shard_count': self.shard_count})
+            _known_generations.pop(self.cache_root, None)
+            for superseded in self._stored_generations() - {generation}:
+                self._remove_generation(superseded)
+        return len(ids)
+
+    @contextmanager
+    def _refresh_lock(self) -> Iterator[None]:
+        """
+        Holds the cache root's refresh lock, waiting for the refresh holding it.
+        """
+        os.makedirs(self.cache_root, exist_ok=True)
+        with open(os.path.join(self.cache_root, '.refresh.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _stored_generations(self) -> Set[int]:
+        """
+        Returns the generations that have shard files in the cache root.
+        """
+        matches = (SHARD_GENERATION.match(name) for name in os.listdir(self.cache_root))
+        return {int(match.group(1)) for match in matches if match}
+
+    def _claim_generation(self, published: int) -> int:
+        """
+        Returns a generation number above the published one and above any files a failed refresh left behind.
+        """
+        return max({published} | self._stored_generations()) + 1
+
+    def _shard_path(self, shard: int, generation: int, column: str) -> str:
+        return os.path.join(self.cache_root, f'shard-{shard:03d}.g{generation}.{column}.npy')
+
+    def _current_generation(self) -> int:
+        """
+        Returns the published generation, re-reading the manifest at most every few seconds.
+        """
+        checked_at, generation = _known_generations.get(self.cache_root, (0.0, -1))
+        if generation < 0 or time.monotonic() - checked_at > MANIFEST_RECHECK_SECONDS:
+            generation = self.read_manifest()['generation']
+            _known_generations[self.cache_root] = (time.monotonic(), generation)
+        return generation
+
+    def _map_shard(self, shard: int) -> Dict[str, Any]:
+        """
+        Memory-maps a shard, re-mapping it only when a refresh published a new generation.
+        """
+        generation = self._current_generation()
+        mapped = _mapped_shards.get((self.cache_root, shard))
+        if mapped is not None and mapped[0] == generation:
+            return mapped[1]
+        if generation == 0:
+            arrays = {
+                'user_ids': np.empty(0, dtype=np.int64),
+                'offsets': np.zeros(1, dtype=np.int64),
+                'dates': np.empty(0, dtype=np.int32),
+                'values': np.empty(0, dtype=np.float64),
+            }
+        else:
+            try:
+                arrays = {column: np.load(self._shard_path(shard, generation, column), mmap_mode='r') for column in CACHE_COLUMNS}
+            except FileNotFoundError:
+                # A refresh replaced this generation since the manifest was last read
+                _known_generations.pop(self.cache_root, None)
+                return self._map_shard(shard)
+        _mapped_shards[(self.cache_root, shard)] = (generation, arrays)
+        return arrays
+
+    def _fetch_rows_after(self, watermark: int) -> Tuple[Any, Any, Any, Any]:
+        """
+        Reads every reading with an ID above the watermark into NumPy arrays, chunk by chunk,
+        converting the values to kWh.
+        """
+        chunks: List[Tuple[Any, Any, Any, Any]] = []
+        rows = self.consumption_model.objects.filter(id__gt=watermark).values_list('id', 'user_id', 'date', 'consumption', 'unit')
+        batch: List[Tuple[int, int, Any, float, int]] = []
+        for row in rows.iterator(chunk_size=FETCH_CHUNK_SIZE):
+            batch.append(row)
+            if len(batch) == FETCH_CHUNK_SIZE:
+                chunks.append(self._batch_to_arrays(batch))
+                batch = []
+        if batch:
+            chunks.append(self._batch_to_arrays(batch))
+        if not chunks:
+            return (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                    np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64))
+        return tuple(np.concatenate([chunk[i] for chunk in chunks]) for i in range(4)) # type: ignore
+
+    def _batch_to_arrays(self, batch: List[Tuple[int, int, Any, float, int]]) -> Tuple[Any, Any, Any, Any]:
+        ids, users, dates, values, units = zip(*batch)
+        return (
+            np.fromiter(ids, dtype=np.int64, count=len(batch)),
+            np.fromiter(users, dtype=np.int64, count=len(batch)),
+            np.fromiter((day.toordinal() for day in dates), dtype=np.int32, count=len(batch)),
+            to_kwh(np.fromiter(values, dtype=np.float64, count=len(batch)), np.fromiter(units, dtype=np.int16, count=len(batch))),
+        )
+
+    def _expand_shard(self, shard: int, generation: int) -> Tuple[Any, Any, Any]:
+        """
+        Loads a shard and expands its CSR index back into one user ID per reading.
+        """
+        user_ids = np.load(self._shard_path(shard, generation, 'user_ids'))
+        offsets = np.load(self._shard_path(shard, generation, 'offsets'))
+        dates = np.load(self._shard_path(shard, generation, 'dates'))
+        values = np.load(self._shard_path(shard, generation, 'values'))
+        return np.repeat(user_ids, np.diff(offsets)), dates, values
+
+    def _write_shard(self, shard: int, generation: int, users: Any, dates: Any, values: Any) -> None:
+        """
+        Sorts a shard's readings by (user, date) and writes its four column files.
+        """
+        order = np.lexsort((dates, users))
+        users, dates, values = users[order], dates[order], values[order]
+        user_ids, starts = np.unique(users, return_index=True)
+        offsets = np.append(starts, len(users)).astype(np.int64)
+        os.makedirs(self.cache_root, exist_ok=True)
+        columns = {'user_ids': user_ids.astype(np.int64), 'offsets': offsets, 'dates': dates, 'values': values}
+        for column, array in columns.items():
+            path = self._shard_path(shard, generation, column)
+            with open(f'{path}.tmp', 'wb') as array_file:
+                np.save(array_file, array)
+            os.replace(f'{path}.tmp', path)
+
+    def _link_shard(self, shard: int, old_generation: int, generation: int) -> None:
+        """
+        Carries an unchanged shard over to the new generation without copying its data.
+        """
+        for column in CACHE_COLUMNS:
+            os.link(self._shard_path(shard, old_generation, column), self._shard_path(shard, generation, column))
+
+    def _write_manifest(self, manifest: Dict[str, int]) -> None:
+        path = os.path.join(self.cache_root, 'manifest.json')
+        with open(f'{path}.tmp', 'w') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(f'{path}.tmp', path)
+
+    def _remove_generation(self, generation: int) -> None:
+        """
+        Unlinks a superseded generation; processes that still map it keep their pages until they re-map.
+        """
+        for path in glob.glob(os.path.join(self.cache_root, f'shard-*.g{generation}.*')):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,146 @@
+from datetime import date, timedelta
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, Type
+from django.db import connection
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import to_kwh
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.authentication.models.UserModel import User
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the gap estimator
+    np = None
+
+INSERT_BATCH_SIZE = 5000
+
+
+class ConsumptionGapRepository:
+    """
+    Repository class for finding days without a consumption reading and storing estimates for them.
+
+    A user is expected to have one reading per day from their first reading in the looked-at
+    window onwards. Users without any reading in the window are treated as inactive.
+    """
+
+    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, user_model: Optional[Type[User]] = None, dirty_period_repository: Optional[DirtyPeriodRepository] = None) -> None:
+        """
+        Initializes the ConsumptionGapRepository.
+
+        Args:
+            consumption_model (Optional[Type[Consumption]]): The consumption model to use. Defaults to the project's Consumption model.
+            user_model (Optional[Type[User]]): The user model to use. Defaults to the project's User model.
+            dirty_period_repository (Optional[DirtyPeriodRepository]): Where estimated days are recorded for re-billing.
+        """
+        self.consumption_model: Type[Consumption] = consumption_model or Consumption
+        self.user_model: Type[User] = user_model or User
+        self.dirty_period_repository: DirtyPeriodRepository = dirty_period_repository or DirtyPeriodRepository()
+
+    def iter_user_id_ranges(self, chunk_size: int) -> Iterator[Tuple[int, int]]:
+        """
+        Walks the user table in ID order and yields inclusive (first ID, last ID) ranges of `chunk_size` users.
+        """
+        last_id = 0
+        while True:
+            ids = list(self.user_model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                return
+            yield ids[0], ids[-1]
+            last_id = ids[-1]
+
+    def find_missing_days(self, user_id_min: int, user_id_max: int, start_date: date, end_date: date, history_start: date) -> List[Tuple[int, date]]:
+        """
+        Finds the (user ID, date) pairs between `start_date` and `end_date` that have no reading.
+
+        On PostgreSQL this is one anti-join of `generate_series` against the consumption table;
+        other databases use a Python fallback over the same rows.
+
+        Args:
+            user_id_min (int): First user ID of the chunk.
+            user_id_max (int): Last user ID of the chunk.
+            start_date (date): First day that must have a reading.
+            end_date (date): Last day that must have a reading.
+            history_start (date): Users without a reading since this date are skipped.
+
+        Returns:
+            List[Tuple[int, date]]: The missing pairs, ordered by user and date.
+        """
+        if connection.vendor == 'postgresql':
+            return self._find_missing_days_sql(user_id_min, user_id_max, start_date, end_date, history_start)
+        return self._find_missing_days_python(user_id_min, user_id_max, start_date, end_date, history_start)
+
+    def _find_missing_days_sql(self, user_id_min: int, user_id_max: int, start_date: date, end_date: date, history_start: date) -> List[Tuple[int, date]]:
+        table = connection.ops.quote_name(self.consumption_model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'''
+                WITH active AS (
+                    SELECT user_id, MIN(date) AS first_date
+                    FROM {table}
+                    WHERE user_id BETWEEN %s AND %s AND date BETWEEN %s AND %s
+                    GROUP BY user_id
+                )
+                SELECT active.user_id, day::date
+                FROM active
+                CROSS JOIN LATERAL generate_series(GREATEST(active.first_date, %s::date), %s::date, interval '1 day') AS day
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM {table} reading
+                    WHERE reading.user_id = active.user_id AND reading.date = day::date
+                )
+                ORDER BY 1, 2
+                ''',
+                [user_id_min, user_id_max, history_start, end_date, start_date, end_date],
+            )
+            return [(user_id, day) for user_id, day in cursor.fetchall()]
+
+    def _find_missing_days_python(self, user_id_min: int, user_id_max: int, start_date: date, end_date: date, history_start: date) -> List[Tuple[int, date]]:
+        rows = (
+            self.consumption_model.objects
+            .filter(user_id__gte=user_id_min, user_id__lte=user_id_max, date__gte=history_start, date__lte=end_date)
+            .values_list('user_id', 'date')
+        )
+        first_dates = {}
+        present = set()
+        for user_id, day in rows.iterator():
+            if user_id not in first_dates or day < first_dates[user_id]:
+                first_dates[user_id] = day
+            present.add((user_id, day))
+        missing = []
+        for user_id in sorted(first_dates):
+            day = max(first_dates[user_id], start_date)
+            while day <= end_date:
+                if (user_id, day) not in present:
+                    missing.append((user_id, day))
+                day += timedelta(days=1)
+        return missing
+
+    def get_measured_history(self, user_ids: Sequence[int], start_date: date, end_date: date) -> Tuple[Any, Any, Any]:
+        """
+        Retrieves the users' measured (not estimated) readings in the window as NumPy arrays.
+
+        Returns:
+            Tuple[Any, Any, Any]: int64 user IDs, int64 date ordinals and float64 kWh values.
+        """
+        rows = list(
+            self.consumption_model.objects
+            .filter(user_id__in=user_ids, date__gte=start_date, date__lte=end_date, is_estimated=False)
+            .values_list('user_id', 'date', 'consumption', 'unit')
+        )
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        users, dates, values, units = zip(*rows)
+        return (
+            np.asarray(users, dtype=np.int64),
+            np.fromiter((day.toordinal() for day in dates), dtype=np.int64, count=len(rows)),
+            to_kwh(values, units),
+        )
+
+    def insert_estimates(self, readings: Sequence[Consumption]) -> int:
+        """
+        Stores estimated readings in batches.
+
+        Returns:
+            int: The number of stored estimates.
+        """
+        self.consumption_model.objects.bulk_create(readings, batch_size=INSERT_BATCH_SIZE)
+        self.dirty_period_repository.mark_dirty((reading.user_id, reading.date) for reading in readings)
+        return len(readings)
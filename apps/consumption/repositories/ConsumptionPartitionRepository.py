@@ -0,0 +1,191 @@
+import json
+import re
+from datetime import date
+from typing import Any, List, Optional, Set
+from django.db import connection, transaction # type: ignore
+from django.db.models import QuerySet # type: ignore
+from apps.consumption.models.ConsumptionModel import Consumption
+
+
+def month_start(day: date) -> date:
+    """
+    Returns the first day of the month containing the given day.
+    """
+    return day.replace(day=1)
+
+
+def add_months(day: date, months: int) -> date:
+    """
+    Returns the first day of the month that is `months` months away from the given day.
+    """
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class ConsumptionPartitionRepository:
+    """
+    Repository class for managing the monthly range partitions of the consumption table.
+
+    Partitioning only exists on PostgreSQL. On any other backend (e.g. SQLite in development)
+    every method is a no-op so callers do not need to check the database vendor themselves.
+    """
+
+    def __init__(self, consumption_model: Optional[type] = None) -> None:
+        """
+        Initializes the ConsumptionPartitionRepository.
+
+        Args:
+            consumption_model (Optional[type]): The consumption model to use. Defaults to the project's Consumption model.
+        """
+        self.consumption_model = consumption_model or Consumption
+        self.parent_table: str = self.consumption_model._meta.db_table
+        self.default_partition: str = f'{self.parent_table}_default'
+        self._partition_pattern = re.compile(rf'^{re.escape(self.parent_table)}_y(\d{{4}})m(\d{{2}})$')
+
+    def partition_name(self, month: date) -> str:
+        """
+        Returns the name of the partition holding the given month.
+        """
+        return f'{self.parent_table}_y{month.year:04d}m{month.month:02d}'
+
+    def is_supported(self) -> bool:
+        """
+        Checks whether the current database supports declarative partitioning.
+        """
+        return connection.vendor == 'postgresql'
+
+    def is_partitioned(self) -> bool:
+        """
+        Checks whether the consumption table has been converted to a partitioned table.
+        """
+        if not self.is_supported():
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+                [self.parent_table],
+            )
+            return cursor.fetchone() is not None
+
+    def list_partition_months(self) -> List[date]:
+        """
+        Lists the months that currently have an attached partition, oldest first.
+
+        Returns:
+            List[date]: The first day of every partitioned month.
+        """
+        if not self.is_partitioned():
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE pg_inherits.inhparent = to_regclass(%s)
+                """,
+                [self.parent_table],
+            )
+            names = [row[0] for row in cursor.fetchall()]
+        months = []
+        for name in names:
+            match = self._partition_pattern.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+        return sorted(months)
+
+    def create_partition(self, month: date) -> str:
+        """
+        Creates and attaches the partition for the given month.
+
+        Rows for that month that already landed in the default partition are moved into the
+        new partition before it is attached, so creation never fails on existing data.
+
+        Args:
+            month (date): Any day within the month to create.
+
+        Returns:
+            str: The name of the created partition.
+        """
+        start = month_start(month)
+        end = add_months(start, 1)
+        name = self.partition_name(start)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS "{name}" '
+                f'(LIKE "{self.parent_table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+            )
+            cursor.execute(
+                f'WITH moved AS (DELETE FROM "{self.default_partition}" '
+                f'WHERE date >= %s AND date < %s RETURNING *) '
+                f'INSERT INTO "{name}" SELECT * FROM moved',
+                [start, end],
+            )
+            cursor.execute(
+                f'ALTER TABLE "{self.parent_table}" ATTACH PARTITION "{name}" '
+                f'FOR VALUES FROM (%s) TO (%s)',
+                [start, end],
+            )
+        return name
+
+    def detach_partition(self, month: date) -> str:
+        """
+        Detaches the partition for the given month, keeping its table and rows for archival.
+
+        Returns:
+            str: The name of the detached partition.
+        """
+        name = self.partition_name(month_start(month))
+        with connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE "{self.parent_table}" DETACH PARTITION "{name}"')
+        return name
+
+    def drop_partition(self, month: date) -> str:
+        """
+        Drops the partition for the given month together with the bill links pointing at its rows.
+
+        Returns:
+            str: The name of the dropped partition.
+        """
+        name = self.partition_name(month_start(month))
+        through_table = self.consumption_model.bills.through._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{through_table}" WHERE consumption_id IN (SELECT id FROM "{name}")'
+            )
+            cursor.execute(f'DROP TABLE "{name}"')
+        return name
+
+    def partitions_scanned(self, queryset: QuerySet) -> List[str]:
+        """
+        Runs EXPLAIN for a consumption queryset and lists the partitions the planner kept.
+
+        Args:
+            queryset (QuerySet): A queryset over the consumption model.
+
+        Returns:
+            List[str]: The names of the scanned partitions, empty on unpartitioned databases.
+        """
+        if not self.is_partitioned():
+            return []
+        plan = json.loads(queryset.explain(format='json'))
+        scanned: Set[str] = set()
+        self._collect_relations(plan, scanned)
+        return sorted(
+            name for name in scanned
+            if name == self.default_partition or self._partition_pattern.match(name)
+        )
+
+    def _collect_relations(self, node: Any, scanned: Set[str]) -> None:
+        """
+        Walks an EXPLAIN (FORMAT JSON) plan and collects every relation name it scans.
+        """
+        if isinstance(node, list):
+            for item in node:
+                self._collect_relations(item, scanned)
+        elif isinstance(node, dict):
+            if 'Relation Name' in node:
+                scanned.add(node['Relation Name'])
+            for value in node.values():
+                if isinstance(value, (list, dict)):
+                    self._collect_relations(value, scanned)
@@ -1,37 +1,136 @@
-from typing import Optional, List, Type, cast
+from typing import Optional, List, Dict, NamedTuple, Sequence, Set, Tuple, Type, Union, cast
+from datetime import date
 from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import unit_code, kwh_factor, kwh_factor_case, to_kwh
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.consumption.repositories.ConsumptionColumnarRepository import ConsumptionSeries
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
 from apps.authentication.models.UserModel import User
-from django.db.models import Sum
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import Sum, QuerySet, F
+from apps.monitoring.services.MetricsService import traced_repository
 
+MOVING_FIELDS = {'user', 'user_id', 'date'}  # Columns whose changes dirty a second (user, month)
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by get_kwh_series
+    np = None
+
+
+class PeriodConsumption(NamedTuple):
+    """
+    A user's consumption over a period in kWh, with the hot-table and archived readings it covers.
+    """
+    kwh: float
+    consumption_ids: List[int]
+    archived_ids: List[int]
+
+
+@traced_repository
 class ConsumptionRepository:
     """
     Repository class for handling consumption-related database operations.
     """
 
-    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, user_model: Optional[Type[User]] = None) -> None:
+    def __init__(self, consumption_model: Optional[Type[Consumption]] = None, user_model: Optional[Type[User]] = None, archive_repository: Optional[ConsumptionArchiveRepository] = None, dirty_period_repository: Optional[DirtyPeriodRepository] = None) -> None:
         """
         Initializes the ConsumptionRepository.
 
         Args:
             consumption_model (Optional[Type[Consumption]]): The consumption model to use. Defaults to the project's Consumption model.
             user_model (Optional[Type[User]]): The user model to use. Defaults to the project's User model.
+            archive_repository (Optional[ConsumptionArchiveRepository]): Where archived readings are read from. Defaults to the Parquet archive.
+            dirty_period_repository (Optional[DirtyPeriodRepository]): Where changed (user, month) keys are recorded for re-billing.
         """
         self.consumption_model: Type[Consumption] = consumption_model or Consumption
         self.user_model: Type[User] = user_model or User
-        
+        self.archive_repository: ConsumptionArchiveRepository = archive_repository or ConsumptionArchiveRepository()
+        self.dirty_period_repository: DirtyPeriodRepository = dirty_period_repository or DirtyPeriodRepository()
 
-    def create_consumption(self, user: User, date: str, consumption: float, unit: str = 'kWh') -> Consumption:
+    def create_consumption(self, user: User, date: str, consumption: float, unit: Union[int, str] = 'kWh') -> Consumption:
         """
         Creates a new consumption record for a user.
         Args:
             user (User): The user for whom the consumption is being recorded.
             date (str): The date of the consumption.
             consumption (float): The energy consumed.
-            unit (str, optional): The unit of measurement. Defaults to 'kWh'.
+            unit (Union[int, str], optional): The unit name or code. Defaults to 'kWh'.
         Returns:
             Consumption: The created consumption record.
         """
-        return Consumption.objects.create(user=user, date=date, consumption=consumption, unit=unit)
+        record = Consumption.objects.create(user=user, date=date, consumption=consumption, unit=unit_code(unit))
+        self.dirty_period_repository.mark_dirty([(user.id, Consumption._meta.get_field('date').to_python(record.date))])
+        return record
+
+    def upsert_daily_totals(self, user: User, totals: Dict[date, float], unit: Union[int, str] = 'kWh') -> None:
+        """
+        Writes one consumption record per date, updating the dates that already have one.
+        Args:
+            user (User): The user the totals belong to.
+            totals (Dict[date, float]): The consumption per date.
+            unit (Union[int, str], optional): The unit name or code. Defaults to 'kWh'.
+        """
+        unit = unit_code(unit)
+        existing = {record.date: record for record in Consumption.objects.filter(user=user, date__in=list(totals))}
+        to_update = []
+        to_create = []
+        for day, total in totals.items():
+            record = existing.get(day)
+            if record is None:
+                to_create.append(Consumption(user=user, date=day, consumption=total, unit=unit))
+            else:
+                record.consumption = total
+                record.unit = unit
+                record.is_estimated = False
+                to_update.append(record)
+        if to_update:
+            Consumption.objects.bulk_update(to_update, ['consumption', 'unit', 'is_estimated'])
+        if to_create:
+            Consumption.objects.bulk_create(to_create)
+        self.dirty_period_repository.mark_dirty((user.id, day) for day in totals)
+
+    def bulk_create_consumptions(self, records: Sequence[Consumption]) -> List[Consumption]:
+        """
+        Inserts several consumption records in one statement.
+        Args:
+            records (Sequence[Consumption]): Unsaved consumption records.
+        Returns:
+            List[Consumption]: The created consumption records.
+        """
+        created = Consumption.objects.bulk_create(records)
+        self.dirty_period_repository.mark_dirty((record.user_id, record.date) for record in created)
+        return created
+
+    def get_stored_keys(self, user_ids: Sequence[int], start_date: date, end_date: date) -> Set[Tuple[int, date]]:
+        """
+        Retrieves the (user ID, date) pairs that already have a measured (not estimated) reading, in one query.
+        Args:
+            user_ids (Sequence[int]): The users to look at.
+            start_date (date): Earliest date to include.
+            end_date (date): Latest date to include.
+        Returns:
+            Set[Tuple[int, date]]: The stored (user ID, date) pairs.
+        """
+        return set(
+            Consumption.objects
+            .filter(user_id__in=user_ids, date__gte=start_date, date__lte=end_date, is_estimated=False)
+            .values_list('user_id', 'date')
+        )
+
+    def delete_estimates(self, user: User, dates: Sequence[date]) -> int:
+        """
+        Deletes a user's estimated readings for the given dates, once measured readings replace them.
+        Args:
+            user (User): The user whose estimates are being replaced.
+            dates (Sequence[date]): The dates that now have a measured reading.
+        Returns:
+            int: The number of deleted estimates.
+        """
+        deleted, _ = Consumption.objects.filter(user=user, date__in=dates, is_estimated=True).delete()
+        if deleted:
+            self.dirty_period_repository.mark_dirty((user.id, day) for day in dates)
+        return deleted
 
     def get_consumption_by_id(self, consumption_id: int) -> Optional[Consumption]:
         """
@@ -46,25 +145,112 @@ class ConsumptionRepository:
         except Consumption.DoesNotExist:
             return None
 
-    def get_consumption_by_user(self, user: User) -> List[Consumption]:
+    def filter_consumption(self, user: Optional[User] = None, start_date: Optional[date] = None, end_date: Optional[date] = None) -> QuerySet:
+        """
+        Builds the newest-first consumption queryset used by the read methods.
+        Date bounds let PostgreSQL prune the monthly partitions outside the range.
+        Args:
+            user (Optional[User]): Restrict the records to this user.
+            start_date (Optional[date]): Earliest date to include.
+            end_date (Optional[date]): Latest date to include.
+        Returns:
+            QuerySet: The filtered consumption records ordered by date descending.
+        """
+        queryset = Consumption.objects.all()
+        if user is not None:
+            queryset = queryset.filter(user=user)
+        if start_date is not None:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date is not None:
+            queryset = queryset.filter(date__lte=end_date)
+        return queryset.order_by('-date')
+
+    def get_consumption_by_user(self, user: User, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Consumption]:
         """
         Retrieves all consumption records for a specific user.
         Args:
             user (User): The user whose consumption records are being retrieved.
+            start_date (Optional[date]): Earliest date to include.
+            end_date (Optional[date]): Latest date to include.
         Returns:
             List[Consumption]: A list of consumption records for the user.
         """
-        return list(Consumption.objects.filter(user=user).order_by('-date'))
+        records = list(self.filter_consumption(user, start_date, end_date))
+        return self._merge_archived(records, user.id, start_date, end_date)
 
-    def get_all_consumption(self) -> List[Consumption]:
+    def get_all_consumption(self, start_date: date, end_date: date) -> List[Consumption]:
         """
-        Retrieves all consumption records.
+        Retrieves all users' consumption records within a date range.
+        The range is required, so only the archive files overlapping it are read.
+        Args:
+            start_date (date): Earliest date to include.
+            end_date (date): Latest date to include.
         Returns:
             List[Consumption]: A list of all consumption records.
         """
-        return list(Consumption.objects.all().order_by('-date'))
+        records = list(self.filter_consumption(None, start_date, end_date))
+        return self._merge_archived(records, None, start_date, end_date)
+
+    def get_period_consumption(self, user_id: int, start_date: date, end_date: date) -> PeriodConsumption:
+        """
+        Totals a user's consumption over a period in kWh, including archived readings.
+        Args:
+            user_id (int): The ID of the user.
+            start_date (date): First day of the period.
+            end_date (date): Last day of the period.
+        Returns:
+            PeriodConsumption: The total in kWh and the IDs of the hot-table and archived readings it covers.
+        """
+        rows = list(
+            Consumption.objects
+            .filter(user_id=user_id, date__gte=start_date, date__lte=end_date)
+            .annotate(kwh=F('consumption') * kwh_factor_case())
+            .values_list('id', 'kwh')
+        )
+        archived = self.archive_repository.read_archived(user_id, start_date, end_date)
+        total = sum(kwh for _, kwh in rows) + sum(reading['consumption'] * kwh_factor(reading['unit']) for reading in archived)
+        return PeriodConsumption(total, [consumption_id for consumption_id, _ in rows], [reading['id'] for reading in archived])
 
-    def update_consumption(self, consumption: Consumption, **updated_fields) -> Consumption:
+    def get_kwh_series(self, user_id: int, start_date: date, end_date: date) -> ConsumptionSeries:
+        """
+        Loads a user's readings over a period as arrays in kWh, including archived readings, in one query.
+        Args:
+            user_id (int): The ID of the user.
+            start_date (date): First day of the period.
+            end_date (date): Last day of the period.
+        Returns:
+            ConsumptionSeries: Date ordinals and kWh values, oldest reading first.
+        """
+        if np is None:
+            raise ImproperlyConfigured("Consumption series require numpy. Did you install numpy?")
+        rows = list(
+            Consumption.objects
+            .filter(user_id=user_id, date__gte=start_date, date__lte=end_date)
+            .values_list('date', 'consumption', 'unit')
+        )
+        rows.extend(
+            (reading['date'], reading['consumption'], unit_code(reading['unit']))
+            for reading in self.archive_repository.read_archived(user_id, start_date, end_date)
+        )
+        dates = np.fromiter((row[0].toordinal() for row in rows), dtype=np.int32, count=len(rows))
+        values = np.fromiter((row[1] for row in rows), dtype=np.float64, count=len(rows))
+        units = np.fromiter((row[2] for row in rows), dtype=np.int16, count=len(rows))
+        order = np.argsort(dates, kind='stable')
+        return ConsumptionSeries(dates[order], to_kwh(values[order], units[order]))
+
+    def _merge_archived(self, records: List[Consumption], user_id: Optional[int], start_date: Optional[date], end_date: Optional[date]) -> List[Consumption]:
+        """
+        Adds the archived readings in the requested range to hot-table records, newest first.
+        Archived readings come back as unsaved Consumption instances carrying their original IDs.
+        """
+        archived = self.archive_repository.read_archived(user_id, start_date, end_date)
+        if not archived:
+            return records
+        records.extend(Consumption(**reading) for reading in archived)
+        records.sort(key=lambda record: record.date, reverse=True)
+        return records
+
+    def update_consumption(self, consumption: Consumption, /, **updated_fields) -> Consumption:
         """
         Updates a consumption record with new fields.
         Args:
@@ -73,11 +259,65 @@ class ConsumptionRepository:
         Returns:
             Consumption: The updated consumption record.
         """
+        previous_date = consumption.date
         for field, value in updated_fields.items():
             setattr(consumption, field, value)
-        consumption.save()
+        # Only the given columns are written
+        consumption.save(update_fields=list(updated_fields))
+        current_date = Consumption._meta.get_field('date').to_python(consumption.date)
+        self.dirty_period_repository.mark_dirty([(consumption.user_id, previous_date), (consumption.user_id, current_date)])
         return consumption
 
+    def update_consumption_fields(self, consumption_id: int, /, **updated_fields) -> bool:
+        """
+        Updates a consumption record's columns by ID in one UPDATE, without loading the whole row.
+        Args:
+            consumption_id (int): The ID of the consumption record.
+            **updated_fields: The columns to set.
+        Returns:
+            bool: True if the record exists.
+        """
+        return self.bulk_update_consumption_fields([consumption_id], **updated_fields) > 0
+
+    def bulk_update_consumption_fields(self, consumption_ids: Sequence[int], /, **updated_fields) -> int:
+        """
+        Sets the same column values on several consumption records in one UPDATE.
+        Args:
+            consumption_ids (Sequence[int]): The IDs of the consumption records.
+            **updated_fields: The columns to set.
+        Returns:
+            int: The number of records updated.
+        """
+        queryset = Consumption.objects.filter(id__in=consumption_ids)
+        keys = list(queryset.values_list('user_id', 'date'))
+        if not keys:
+            return 0
+        updated = queryset.update(**updated_fields)
+        if MOVING_FIELDS & set(updated_fields):
+            keys.extend(queryset.values_list('user_id', 'date'))
+        self.dirty_period_repository.mark_dirty(keys)
+        return updated
+
+    def bulk_update_consumptions(self, records: Sequence[Consumption], fields: Sequence[str], batch_size: Optional[int] = None) -> int:
+        """
+        Writes the given columns of several modified consumption records, in batches of one UPDATE each.
+        Args:
+            records (Sequence[Consumption]): Records whose attributes were changed in memory.
+            fields (Sequence[str]): The columns to write.
+            batch_size (Optional[int]): Records per UPDATE. Defaults to all in one statement.
+        Returns:
+            int: The number of records updated.
+        """
+        if not records:
+            return 0
+        date_field = Consumption._meta.get_field('date')
+        keys = [(record.user_id, date_field.to_python(record.date)) for record in records]
+        if MOVING_FIELDS & set(fields):
+            keys.extend(Consumption.objects.filter(id__in=[record.id for record in records]).values_list('user_id', 'date'))
+        updated = Consumption.objects.bulk_update(records, list(fields), batch_size=batch_size)
+        self.dirty_period_repository.mark_dirty(keys)
+        return updated
+
     def delete_consumption(self, consumption: Consumption) -> bool:
         """
         Deletes a consumption record.
@@ -87,22 +327,25 @@ class ConsumptionRepository:
             bool: True if the consumption was deleted, otherwise False.
         """
         consumption.delete()
+        self.dirty_period_repository.mark_dirty([(consumption.user_id, consumption.date)])
         return True
 
     def aggregate_user_consumption(self, user: User) -> float:
         """
-        Aggregates total consumption for a specific user.
+        Aggregates total consumption for a specific user, converted to kWh.
         Args:
             user (User): The user whose total consumption is being aggregated.
         Returns:
-            float: The total consumption for the user.
+            float: The total consumption for the user, including archived readings.
         """
-        return Consumption.objects.filter(user=user).aggregate(Sum('consumption'))['consumption__sum'] or 0.0
+        hot_total = Consumption.objects.filter(user=user).aggregate(total=Sum(F('consumption') * kwh_factor_case()))['total'] or 0.0
+        return hot_total + self.archive_repository.sum_archived(user.id)
 
     def aggregate_all_users_consumption(self) -> float:
         """
-        Aggregates total consumption across all users.
+        Aggregates total consumption across all users, converted to kWh.
         Returns:
-            float: The total consumption for all users.
+            float: The total consumption for all users, including archived readings.
         """
-        return Consumption.objects.aggregate(Sum('consumption'))['consumption__sum'] or 0.0
+        hot_total = Consumption.objects.aggregate(total=Sum(F('consumption') * kwh_factor_case()))['total'] or 0.0
+        return hot_total + self.archive_repository.sum_archived()
@@ -0,0 +1,86 @@
+import uuid
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Type
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.timezone import now
+from apps.consumption.models.DirtyPeriodModel import DirtyPeriod
+
+DATA_VERSION_KEY = 'consumption-version:{}'
+
+class DirtyPeriodRepository:
+    """
+    Repository class for the (user, month) keys whose consumption changed and need re-billing.
+
+    Every mark also replaces the users' data versions in the `CONSUMPTION_VERSION_CACHE` cache,
+    so results derived from a user's readings can be cached under that version.
+    """
+
+    def __init__(self, dirty_period_model: Optional[Type[DirtyPeriod]] = None) -> None:
+        """
+        Initializes the DirtyPeriodRepository.
+
+        Args:
+            dirty_period_model (Optional[Type[DirtyPeriod]]): The dirty period model to use. Defaults to DirtyPeriod.
+        """
+        self.dirty_period_model: Type[DirtyPeriod] = dirty_period_model or DirtyPeriod
+
+    def mark_dirty(self, changes: Iterable[Tuple[int, date]]) -> None:
+        """
+        Records the months touched by consumption writes, in one statement.
+        Args:
+            changes (Iterable[Tuple[int, date]]): (user ID, reading date) pairs that were written.
+        """
+        months = {(user_id, day.replace(day=1)) for user_id, day in changes}
+        if not months:
+            return
+        marked_at = now()
+        self.dirty_period_model.objects.bulk_create(
+            [self.dirty_period_model(user_id=user_id, month=month, marked_at=marked_at) for user_id, month in sorted(months)],
+            update_conflicts=True,
+            unique_fields=['user', 'month'],
+            update_fields=['marked_at'],
+        )
+        caches[settings.CONSUMPTION_VERSION_CACHE].set_many(
+            {DATA_VERSION_KEY.format(user_id): uuid.uuid4().hex for user_id in {user_id for user_id, _ in months}},
+            timeout=None,
+        )
+
+    def get_data_versions(self, user_ids: Sequence[int]) -> Dict[int, str]:
+        """
+        Retrieves the current data version of each user, starting a new one for users without one.
+        Args:
+            user_ids (Sequence[int]): The users to look up.
+        Returns:
+            Dict[int, str]: An opaque version per user that changes whenever the user's readings change.
+        """
+        cache = caches[settings.CONSUMPTION_VERSION_CACHE]
+        keys = {user_id: DATA_VERSION_KEY.format(user_id) for user_id in user_ids}
+        stored = cache.get_many(list(keys.values()))
+        versions = {}
+        for user_id, key in keys.items():
+            if key not in stored:
+                # add() keeps a version another process just started
+                cache.add(key, uuid.uuid4().hex, timeout=None)
+                stored[key] = cache.get(key)
+            versions[user_id] = stored[key]
+        return versions
+
+    def get_dirty_periods(self, limit: int) -> List[DirtyPeriod]:
+        """
+        Retrieves the oldest dirty periods.
+        Args:
+            limit (int): Maximum number of periods to return.
+        Returns:
+            List[DirtyPeriod]: The dirty periods, least recently changed first.
+        """
+        return list(self.dirty_period_model.objects.order_by('marked_at', 'id')[:limit])
+
+    def clear_period(self, period: DirtyPeriod) -> bool:
+        """
+        Removes a dirty period after it was re-billed, unless it changed again in the meantime.
+        Returns:
+            bool: True if the period was removed.
+        """
+        deleted, _ = self.dirty_period_model.objects.filter(id=period.id, marked_at=period.marked_at).delete()
+        return bool(deleted)
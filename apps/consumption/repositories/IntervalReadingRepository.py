@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional, Sequence, Type
+from datetime import date
+from django.db.models import Sum
+from apps.consumption.models.IntervalReadingModel import IntervalReading
+from apps.consumption.models.EnergyUnits import kwh_factor
+from apps.authentication.models.UserModel import User
+
+class IntervalReadingRepository:
+    """
+    Repository class for handling interval-reading (meter-day) database operations.
+    """
+
+    def __init__(self, interval_model: Optional[Type[IntervalReading]] = None) -> None:
+        """
+        Initializes the IntervalReadingRepository.
+
+        Args:
+            interval_model (Optional[Type[IntervalReading]]): The interval reading model to use. Defaults to IntervalReading.
+        """
+        self.interval_model: Type[IntervalReading] = interval_model or IntervalReading
+
+    def upsert_interval_readings(self, readings: Sequence[IntervalReading]) -> None:
+        """
+        Inserts meter-days in one statement, replacing days that were already stored.
+        Args:
+            readings (Sequence[IntervalReading]): Unsaved interval readings.
+        """
+        self.interval_model.objects.bulk_create(
+            readings,
+            update_conflicts=True,
+            unique_fields=['user', 'meter_id', 'date'],
+            update_fields=['interval_minutes', 'packed_values', 'total', 'unit'],
+        )
+
+    def get_interval_readings(self, user: User, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[IntervalReading]:
+        """
+        Retrieves a user's meter-days, oldest first.
+        Args:
+            user (User): The user whose readings are being retrieved.
+            start_date (Optional[date]): Earliest date to include.
+            end_date (Optional[date]): Latest date to include.
+        Returns:
+            List[IntervalReading]: The matching meter-days.
+        """
+        queryset = self.interval_model.objects.filter(user=user)
+        if start_date is not None:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date is not None:
+            queryset = queryset.filter(date__lte=end_date)
+        return list(queryset.order_by('date', 'meter_id'))
+
+    def get_daily_totals(self, user: User, dates: Sequence[date]) -> Dict[date, float]:
+        """
+        Sums the day totals of all of a user's meters for the given dates, in kWh.
+        Returns:
+            Dict[date, float]: The total consumption per date in kWh.
+        """
+        rows = (
+            self.interval_model.objects
+            .filter(user=user, date__in=dates)
+            .values('date', 'unit')
+            .annotate(day_total=Sum('total'))
+        )
+        totals: Dict[date, float] = {}
+        for row in rows:
+            totals[row['date']] = totals.get(row['date'], 0.0) + row['day_total'] * kwh_factor(row['unit'])
+        return totals
@@ -0,0 +1,85 @@
+from datetime import date
+from functools import reduce
+from operator import or_
+from typing import Dict, List, Optional, Sequence, Set, Type
+from django.db import transaction
+from django.db.models import Q
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.authentication.models.UserModel import User
+
+class QuarantinedReadingRepository:
+    """
+    Repository class for handling quarantined consumption readings.
+    """
+
+    def __init__(self, quarantine_model: Optional[Type[QuarantinedReading]] = None, dirty_period_repository: Optional[DirtyPeriodRepository] = None) -> None:
+        """
+        Initializes the QuarantinedReadingRepository.
+
+        Args:
+            quarantine_model (Optional[Type[QuarantinedReading]]): The quarantine model to use. Defaults to QuarantinedReading.
+            dirty_period_repository (Optional[DirtyPeriodRepository]): Where released readings are recorded for re-billing.
+        """
+        self.quarantine_model: Type[QuarantinedReading] = quarantine_model or QuarantinedReading
+        self.dirty_period_repository: DirtyPeriodRepository = dirty_period_repository or DirtyPeriodRepository()
+
+    def quarantine_readings(self, readings: Sequence[QuarantinedReading]) -> List[QuarantinedReading]:
+        """
+        Stores flagged readings in one statement.
+        Args:
+            readings (Sequence[QuarantinedReading]): Unsaved quarantined readings.
+        Returns:
+            List[QuarantinedReading]: The stored readings.
+        """
+        return self.quarantine_model.objects.bulk_create(readings)
+
+    def get_quarantined_readings(self, user: Optional[User] = None) -> List[QuarantinedReading]:
+        """
+        Retrieves quarantined readings, newest first.
+        Args:
+            user (Optional[User]): Restrict the readings to this user.
+        Returns:
+            List[QuarantinedReading]: The quarantined readings.
+        """
+        queryset = self.quarantine_model.objects.all()
+        if user is not None:
+            queryset = queryset.filter(user=user)
+        return list(queryset.order_by('-created_at'))
+
+    def release_readings(self, quarantine_ids: Sequence[int]) -> List[Consumption]:
+        """
+        Moves quarantined readings into the consumption table after review.
+        Released readings replace any estimates the gap filler stored for the same user and date.
+        Args:
+            quarantine_ids (Sequence[int]): IDs of the readings to release.
+        Returns:
+            List[Consumption]: The consumption records that were created.
+        """
+        with transaction.atomic():
+            quarantined = list(self.quarantine_model.objects.filter(id__in=quarantine_ids))
+            dates_by_user: Dict[int, Set[date]] = {}
+            for reading in quarantined:
+                dates_by_user.setdefault(reading.user_id, set()).add(reading.date)
+            if dates_by_user:
+                Consumption.objects.filter(
+                    reduce(or_, (Q(user_id=user_id, date__in=sorted(dates)) for user_id, dates in dates_by_user.items())),
+                    is_estimated=True,
+                ).delete()
+            records = Consumption.objects.bulk_create([
+                Consumption(user_id=reading.user_id, date=reading.date, consumption=reading.consumption, unit=reading.unit)
+                for reading in quarantined
+            ])
+            self.quarantine_model.objects.filter(id__in=[reading.id for reading in quarantined]).delete()
+            self.dirty_period_repository.mark_dirty((record.user_id, record.date) for record in records)
+        return records
+
+    def discard_readings(self, quarantine_ids: Sequence[int]) -> int:
+        """
+        Deletes quarantined readings that were confirmed as faulty.
+        Returns:
+            int: The number of deleted readings.
+        """
+        deleted, _ = self.quarantine_model.objects.filter(id__in=quarantine_ids).delete()
+        return deleted
@@ -1,14 +1,33 @@
 from rest_framework import serializers # type: ignore
 from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.models.EnergyUnits import KWH, unit_code, unit_name
+
+class EnergyUnitField(serializers.Field):
+    """
+    Exposes the small-int unit code as its name ('Wh', 'kWh', ...) in the API.
+    """
+
+    def to_representation(self, value: int) -> str:
+        return unit_name(value)
+
+    def to_internal_value(self, data) -> int:
+        try:
+            return unit_code(data)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
 
 class ConsumptionSerializer(serializers.ModelSerializer):
     """
     Serializer for the Consumption model, used for validating and serializing consumption data.
     """
+    unit = EnergyUnitField(default=KWH)
+
     class Meta:
         model = Consumption
-        fields = ['id', 'user', 'date', 'consumption', 'unit']
-        read_only_fields = ['user']  # We will automatically assign the user in the views
+        fields = ['id', 'user', 'date', 'consumption', 'unit', 'is_estimated']
+        read_only_fields = ['user', 'is_estimated']  # We will automatically assign the user in the views
 
     def validate_consumption(self, value):
         """
@@ -16,4 +35,39 @@ class ConsumptionSerializer(serializers.ModelSerializer):
         """
         if value <= 0:
             raise serializers.ValidationError("Consumption must be a positive number.")
-        return value
\ No newline at end of file
+        return value
+
+class QuarantinedReadingSerializer(serializers.ModelSerializer):
+    """
+    Serializer for readings held back by the ingestion validators.
+    """
+    unit = EnergyUnitField(read_only=True)
+
+    class Meta:
+        model = QuarantinedReading
+        fields = ['id', 'user', 'date', 'consumption', 'unit', 'reasons', 'expected', 'created_at']
+        read_only_fields = fields
+
+
+class QuarantineDecisionSerializer(serializers.Serializer):
+    """
+    Serializer for an admin decision on quarantined readings.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    action = serializers.ChoiceField(choices=['release', 'discard'])
+
+
+class DateRangeQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the optional `start_date`/`end_date` query parameters of the list endpoints.
+    """
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, data):
+        """
+        Ensure the range does not end before it starts.
+        """
+        if data.get('start_date') and data.get('end_date') and data['start_date'] > data['end_date']:
+            raise serializers.ValidationError("start_date must not be after end_date.")
+        return data
@@ -0,0 +1,55 @@
+from rest_framework import serializers # type: ignore
+from apps.consumption.models.IntervalReadingModel import IntervalReading
+from apps.consumption.models.EnergyUnits import unit_name
+
+class IntervalReadingListSerializer(serializers.ListSerializer):
+    """
+    Serializer for a batch of meter-days, which may name each meter-day only once.
+    """
+
+    def validate(self, data):
+        """
+        Reject batches posting the same meter and date twice.
+        """
+        seen = set()
+        for meter_day in data:
+            key = (meter_day.get('meter_id', ''), meter_day['date'])
+            if key in seen:
+                raise serializers.ValidationError(f"Meter '{key[0]}' has more than one entry for {key[1]}.")
+            seen.add(key)
+        return data
+
+
+class IntervalReadingSerializer(serializers.ModelSerializer):
+    """
+    Serializer for one meter-day of interval readings, exposing the packed values as a list.
+    """
+    values = serializers.ListField(child=serializers.FloatField(min_value=0), allow_empty=False)
+
+    class Meta:
+        model = IntervalReading
+        fields = ['id', 'user', 'meter_id', 'date', 'interval_minutes', 'values', 'total', 'unit']
+        read_only_fields = ['user', 'total']
+        list_serializer_class = IntervalReadingListSerializer
+
+    def validate_unit(self, value: str) -> str:
+        """
+        Ensure the unit is a known energy unit, stored under its display name.
+        """
+        try:
+            return unit_name(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def validate(self, data):
+        """
+        Ensure the number of values matches one day of intervals (allowing for DST transitions).
+        """
+        interval_minutes = data.get('interval_minutes', 15)
+        if 1440 % interval_minutes:
+            raise serializers.ValidationError("Interval length must divide a day evenly.")
+        per_day = 1440 // interval_minutes
+        per_hour = 60 // interval_minutes if interval_minutes <= 60 else 0
+        if len(data['values']) not in {per_day - per_hour, per_day, per_day + per_hour}:
+            raise serializers.ValidationError(f"Expected {per_day} interval values for the day.")
+        return data
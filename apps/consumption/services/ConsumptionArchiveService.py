@@ -0,0 +1,55 @@
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.consumption.repositories.ConsumptionPartitionRepository import add_months, month_start
+from apps.consumption.models.ConsumptionArchiveModel import ConsumptionArchive
+from datetime import date
+from typing import List, Optional
+from django.conf import settings
+from django.utils.timezone import now
+
+
+class ConsumptionArchiveService:
+    """
+    Service class for moving closed consumption periods into cold Parquet storage.
+    """
+
+    def __init__(self, archive_repository: ConsumptionArchiveRepository) -> None:
+        self.archive_repository = archive_repository
+
+    def get_archive_cutoff(self, after_months: int, today: Optional[date] = None) -> date:
+        """
+        Get the first day of the oldest month that stays in the hot table.
+        """
+        return add_months(month_start(today or now().date()), -after_months)
+
+    def archive_month(self, month: date, chunk_size: int) -> List[ConsumptionArchive]:
+        """
+        Archive every hot reading of a month, one Parquet file per chunk.
+
+        Returns:
+            List[ConsumptionArchive]: The manifest entries that were written.
+        """
+        start = month_start(month)
+        end = add_months(start, 1)
+        archives = []
+        archive = self.archive_repository.archive_chunk(start, end, chunk_size)
+        while archive is not None:
+            archives.append(archive)
+            archive = self.archive_repository.archive_chunk(start, end, chunk_size)
+        return archives
+
+    def archive_closed_periods(self, after_months: Optional[int] = None, chunk_size: Optional[int] = None, today: Optional[date] = None) -> List[ConsumptionArchive]:
+        """
+        Archive every month older than the configured hot window.
+
+        Returns:
+            List[ConsumptionArchive]: The manifest entries that were written.
+        """
+        if after_months is None:
+            after_months = settings.CONSUMPTION_ARCHIVE_AFTER_MONTHS
+        if chunk_size is None:
+            chunk_size = settings.CONSUMPTION_ARCHIVE_CHUNK_SIZE
+        cutoff = self.get_archive_cutoff(after_months, today)
+        archives: List[ConsumptionArchive] = []
+        for month in self.archive_repository.get_hot_months_before(cutoff):
+            archives.extend(self.archive_month(month, chunk_size))
+        return archives
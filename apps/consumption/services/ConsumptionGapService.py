@@ -0,0 +1,124 @@
+from apps.consumption.repositories.ConsumptionGapRepository import ConsumptionGapRepository
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import KWH
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils.timezone import now
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the gap estimator
+    np = None
+
+
+def estimate_missing_days(missing_users: Any, missing_days: Any, history_users: Any, history_days: Any, history_values: Any, first_day: int, last_day: int, max_interpolate_days: int) -> Any:
+    """
+    Estimates consumption for missing (user, day) cells from the users' measured history.
+
+    The history becomes a dense users x days matrix (NaN where nothing was measured). A gap of
+    at most `max_interpolate_days` with measurements on both sides is linearly interpolated;
+    longer or open-ended gaps use the user's average for the same weekday, then the user's
+    overall average. Days are date ordinals between `first_day` and `last_day`.
+
+    Returns:
+        Any: float64 kWh estimates aligned with the missing cells, NaN when the user has no history.
+    """
+    users, rows = np.unique(missing_users, return_inverse=True)
+    width = last_day - first_day + 1
+    history_rows = np.searchsorted(users, history_users)
+    in_chunk = (history_rows < len(users)) & (users[np.minimum(history_rows, len(users) - 1)] == history_users)
+    cells = history_rows[in_chunk] * width + (history_days[in_chunk] - first_day)
+    sums = np.bincount(cells, weights=history_values[in_chunk], minlength=len(users) * width)
+    counts = np.bincount(cells, minlength=len(users) * width)
+    matrix = np.where(counts > 0, sums, np.nan).reshape(len(users), width)
+    known = ~np.isnan(matrix)
+
+    # Nearest measured column before and after every cell
+    columns = np.arange(width)
+    previous = np.maximum.accumulate(np.where(known, columns, -1), axis=1)
+    following = np.minimum.accumulate(np.where(known, columns, width)[:, ::-1], axis=1)[:, ::-1]
+    cols = missing_days - first_day
+    before, after = previous[rows, cols], following[rows, cols]
+    bounded = (before >= 0) & (after < width) & (after - before - 1 <= max_interpolate_days)
+    before_value = matrix[rows, np.clip(before, 0, width - 1)]
+    after_value = matrix[rows, np.clip(after, 0, width - 1)]
+    interpolated = before_value + (after_value - before_value) * (cols - before) / np.maximum(after - before, 1)
+
+    weekdays = (first_day + columns) % 7
+    weekday_sums = np.zeros((len(users), 7))
+    weekday_counts = np.zeros((len(users), 7))
+    for weekday in range(7):
+        selected = weekdays == weekday
+        weekday_sums[:, weekday] = np.nansum(matrix[:, selected], axis=1)
+        weekday_counts[:, weekday] = known[:, selected].sum(axis=1)
+    missing_weekdays = (first_day + cols) % 7
+    weekday_count = weekday_counts[rows, missing_weekdays]
+    weekday_mean = weekday_sums[rows, missing_weekdays] / np.maximum(weekday_count, 1)
+    overall_count = known.sum(axis=1)[rows]
+    overall_mean = np.nansum(matrix, axis=1)[rows] / np.maximum(overall_count, 1)
+
+    return np.where(bounded, interpolated,
+                    np.where(weekday_count > 0, weekday_mean,
+                             np.where(overall_count > 0, overall_mean, np.nan)))
+
+
+class ConsumptionGapService:
+    """
+    Service class for detecting missing daily readings and filling them with flagged estimates.
+    """
+
+    def __init__(self, gap_repository: ConsumptionGapRepository) -> None:
+        self.gap_repository = gap_repository
+
+    def fill_gaps(self, start_date: date, end_date: date, lookback_days: Optional[int] = None, chunk_size: Optional[int] = None, dry_run: bool = False) -> Dict[str, int]:
+        """
+        Find every missing (user, date) pair in the period and store an estimated reading for it,
+        one chunk of users at a time.
+
+        Args:
+            start_date (date): First day of the period.
+            end_date (date): Last day of the period.
+            lookback_days (Optional[int]): Days of history before the period used by the estimator. Defaults to settings.CONSUMPTION_GAP_LOOKBACK_DAYS.
+            chunk_size (Optional[int]): Users per chunk. Defaults to settings.CONSUMPTION_GAP_CHUNK_SIZE.
+            dry_run (bool): Only count the gaps.
+
+        Returns:
+            Dict[str, int]: The number of `missing` days found and `estimated` readings stored.
+        """
+        if np is None:
+            raise ImproperlyConfigured("The consumption gap estimator requires numpy. Did you install numpy?")
+        lookback_days = lookback_days or settings.CONSUMPTION_GAP_LOOKBACK_DAYS
+        chunk_size = chunk_size or settings.CONSUMPTION_GAP_CHUNK_SIZE
+        history_start = start_date - timedelta(days=lookback_days)
+        result = {'missing': 0, 'estimated': 0}
+        for user_id_min, user_id_max in self.gap_repository.iter_user_id_ranges(chunk_size):
+            missing = self.gap_repository.find_missing_days(user_id_min, user_id_max, start_date, end_date, history_start)
+            result['missing'] += len(missing)
+            if not missing or dry_run:
+                continue
+            missing_users = np.fromiter((user_id for user_id, _ in missing), dtype=np.int64, count=len(missing))
+            missing_days = np.fromiter((day.toordinal() for _, day in missing), dtype=np.int64, count=len(missing))
+            history = self.gap_repository.get_measured_history(np.unique(missing_users).tolist(), history_start, end_date)
+            estimates = estimate_missing_days(
+                missing_users, missing_days, *history,
+                first_day=history_start.toordinal(), last_day=end_date.toordinal(),
+                max_interpolate_days=settings.CONSUMPTION_GAP_INTERPOLATE_MAX_DAYS,
+            )
+            readings = [
+                Consumption(user_id=user_id, date=day, consumption=round(float(estimate), 3), unit=KWH, is_estimated=True)
+                for (user_id, day), estimate in zip(missing, estimates) if not np.isnan(estimate)
+            ]
+            with transaction.atomic():
+                result['estimated'] += self.gap_repository.insert_estimates(readings)
+        return result
+
+    def fill_recent_gaps(self, days: Optional[int] = None, today: Optional[date] = None) -> Dict[str, int]:
+        """
+        Fill the gaps of the trailing `days` days up to yesterday (settings.CONSUMPTION_GAP_FILL_DAYS by default).
+        """
+        end_date = (today or now().date()) - timedelta(days=1)
+        start_date = end_date - timedelta(days=(days or settings.CONSUMPTION_GAP_FILL_DAYS) - 1)
+        return self.fill_gaps(start_date, end_date)
@@ -0,0 +1,84 @@
+from apps.consumption.repositories.ConsumptionPartitionRepository import ConsumptionPartitionRepository, add_months, month_start
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.authentication.models.UserModel import User
+from datetime import date
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.utils.timezone import now
+
+EXPIRED_PARTITION_ACTIONS = ('detach', 'drop')
+
+
+class ConsumptionPartitionService:
+    """
+    Service class for the monthly partition lifecycle of the consumption table.
+    """
+
+    def __init__(self, partition_repository: ConsumptionPartitionRepository, consumption_repository: ConsumptionRepository) -> None:
+        self.partition_repository = partition_repository
+        self.consumption_repository = consumption_repository
+
+    def ensure_future_partitions(self, months_ahead: int, today: Optional[date] = None) -> List[str]:
+        """
+        Create the partitions for the current month and the next `months_ahead` months if missing.
+
+        Returns:
+            List[str]: The names of the partitions that were created.
+        """
+        if not self.partition_repository.is_partitioned():
+            return []
+        current = month_start(today or now().date())
+        existing = set(self.partition_repository.list_partition_months())
+        created = []
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if month not in existing:
+                created.append(self.partition_repository.create_partition(month))
+        return created
+
+    def expire_partitions(self, retention_months: int, action: str = 'detach', today: Optional[date] = None) -> List[str]:
+        """
+        Detach or drop the partitions entirely older than the retention window.
+
+        Raises:
+            ValueError: If the action is neither 'detach' nor 'drop'.
+
+        Returns:
+            List[str]: The names of the partitions that were detached or dropped.
+        """
+        if action not in EXPIRED_PARTITION_ACTIONS:
+            raise ValueError(f"Unknown expired partition action '{action}'.")
+        if not self.partition_repository.is_partitioned():
+            return []
+        cutoff = add_months(month_start(today or now().date()), -retention_months)
+        expired = [month for month in self.partition_repository.list_partition_months() if month < cutoff]
+        if action == 'drop':
+            return [self.partition_repository.drop_partition(month) for month in expired]
+        return [self.partition_repository.detach_partition(month) for month in expired]
+
+    def maintain_partitions(self, today: Optional[date] = None) -> Dict[str, List[str]]:
+        """
+        Run the configured partition maintenance: pre-create future months and expire old ones.
+
+        Returns:
+            Dict[str, List[str]]: The created and expired partition names.
+        """
+        created = self.ensure_future_partitions(settings.CONSUMPTION_PARTITION_PREMAKE_MONTHS, today)
+        expired: List[str] = []
+        if settings.CONSUMPTION_PARTITION_RETENTION_MONTHS is not None:
+            expired = self.expire_partitions(
+                settings.CONSUMPTION_PARTITION_RETENTION_MONTHS,
+                settings.CONSUMPTION_PARTITION_EXPIRED_ACTION,
+                today,
+            )
+        return {'created': created, 'expired': expired}
+
+    def verify_pruning(self, start_date: date, end_date: date, user: Optional[User] = None) -> List[str]:
+        """
+        List the partitions scanned by the repository's date-ranged consumption query.
+
+        Returns:
+            List[str]: The partitions the planner kept after pruning.
+        """
+        queryset = self.consumption_repository.filter_consumption(user, start_date, end_date)
+        return self.partition_repository.partitions_scanned(queryset)
@@ -1,19 +1,26 @@
 from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.QuarantinedReadingRepository import QuarantinedReadingRepository
+from apps.consumption.services.ConsumptionValidationService import ConsumptionValidationService
 from apps.authentication.models.UserModel import User
 from apps.consumption.models.ConsumptionModel import Consumption
-from typing import Optional, List
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.models.EnergyUnits import unit_code
+from typing import Any, Dict, Optional, List, Sequence, Tuple, Union
+from datetime import date
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 class ConsumptionService:
     """
     Service class for handling business logic related to energy consumption, with exception handling.
     """
 
-    def __init__(self, consumption_repository: ConsumptionRepository) -> None:
+    def __init__(self, consumption_repository: ConsumptionRepository, validation_service: Optional[ConsumptionValidationService] = None, quarantine_repository: Optional[QuarantinedReadingRepository] = None) -> None:
         self.consumption_repository = consumption_repository
+        self.validation_service = validation_service or ConsumptionValidationService(consumption_repository)
+        self.quarantine_repository = quarantine_repository or QuarantinedReadingRepository()
 
-    def create_consumption(self, user: User, date: str, consumption: float, unit: str = 'kWh') -> Consumption:
+    def create_consumption(self, user: User, date: str, consumption: float, unit: Union[int, str] = 'kWh') -> Consumption:
         """
         Create a consumption record using the repository.
         Raises:
@@ -24,17 +31,60 @@ class ConsumptionService:
         except IntegrityError as e:
             raise IntegrityError(f"Failed to create consumption record for {user.username}: {str(e)}")
 
-    def get_user_consumptions(self, user: User) -> List[Consumption]:
+    def ingest_consumptions(self, user: User, entries: Sequence[Dict[str, Any]]) -> Tuple[List[Consumption], List[QuarantinedReading]]:
         """
-        Get all consumption records for a user.
+        Run a batch of readings through the validation stage, storing the accepted ones and quarantining the rest.
+        Accepted readings replace any estimates the gap filler stored for the same dates.
+
+        Each entry is a dict with `date`, `consumption` and optionally `unit`.
+
+        Returns:
+            Tuple[List[Consumption], List[QuarantinedReading]]: The created records and the quarantined readings.
+        """
+        readings = [
+            Consumption(user=user, date=entry['date'], consumption=entry['consumption'], unit=unit_code(entry.get('unit', 'kWh')))
+            for entry in entries
+        ]
+        accepted, quarantined, baselines = self.validation_service.validate_readings(readings)
+        with transaction.atomic():
+            if accepted:
+                self.consumption_repository.delete_estimates(user, sorted({reading.date for reading in accepted}))
+            created = self.consumption_repository.bulk_create_consumptions(accepted) if accepted else []
+            held = self.quarantine_repository.quarantine_readings(quarantined) if quarantined else []
+            # Baselines only learn from readings that were actually stored
+            transaction.on_commit(lambda: self.validation_service.save_baselines(baselines))
+        return created, held
+
+    def get_quarantined_readings(self, user: Optional[User] = None) -> List[QuarantinedReading]:
+        """
+        Get the readings held back by the validation stage, optionally for one user.
+        """
+        return self.quarantine_repository.get_quarantined_readings(user)
+
+    def release_quarantined_readings(self, quarantine_ids: Sequence[int]) -> List[Consumption]:
+        """
+        Accept reviewed quarantined readings into the consumption table.
+        """
+        with transaction.atomic():
+            return self.quarantine_repository.release_readings(quarantine_ids)
+
+    def discard_quarantined_readings(self, quarantine_ids: Sequence[int]) -> int:
+        """
+        Delete quarantined readings confirmed as meter faults.
+        """
+        return self.quarantine_repository.discard_readings(quarantine_ids)
+
+    def get_user_consumptions(self, user: User, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[Consumption]:
+        """
+        Get all consumption records for a user, optionally within a date range.
         """
-        return self.consumption_repository.get_consumption_by_user(user)
+        return self.consumption_repository.get_consumption_by_user(user, start_date, end_date)
 
-    def get_all_consumptions(self) -> List[Consumption]:
+    def get_all_consumptions(self, start_date: date, end_date: date) -> List[Consumption]:
         """
-        Get all consumption records.
+        Get all users' consumption records within a date range.
         """
-        return self.consumption_repository.get_all_consumption()
+        return self.consumption_repository.get_all_consumption(start_date, end_date)
 
     def update_consumption(self, consumption_id: int, **updated_fields) -> Optional[Consumption]:
         """
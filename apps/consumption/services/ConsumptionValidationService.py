@@ -0,0 +1,221 @@
+from apps.consumption.repositories.ConsumptionBaselineRepository import COUNT, LAST_DATE, LAST_VALUE, M2, MEAN, ConsumptionBaselineRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.models.EnergyUnits import to_kwh
+from datetime import date
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the validation stage
+    np = None
+
+DATE_KEY_SPAN = 1 << 22  # Greater than any date ordinal (date.max.toordinal() is 3652059)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImproperlyConfigured("The consumption validation stage requires numpy. Did you install numpy?")
+
+
+class ReadingBatch(NamedTuple):
+    """
+    A batch of incoming readings as parallel arrays, each row next to its user's baseline.
+    """
+    user_ids: Any  # int64
+    dates: Any  # int64 date ordinals
+    values: Any  # float64 consumption in kWh
+    previous_values: Any  # The user's preceding reading in kWh, NaN when there is none
+    baseline_count: Any  # Readings the user's baseline was built from
+    baseline_mean: Any  # Baseline mean in kWh
+    baseline_std: Any  # Baseline standard deviation in kWh
+    duplicates: Any  # True when the (user, date) is already stored or repeated earlier in the batch
+
+
+class ZScoreValidator:
+    """
+    Flags readings too many standard deviations away from the user's rolling baseline.
+    """
+    reason = 'zscore'
+
+    def __init__(self, threshold: Optional[float] = None, min_history: Optional[int] = None) -> None:
+        self.threshold = threshold or settings.CONSUMPTION_ANOMALY_ZSCORE
+        self.min_history = min_history or settings.CONSUMPTION_ANOMALY_MIN_HISTORY
+
+    def __call__(self, batch: ReadingBatch) -> Any:
+        usable = (batch.baseline_count >= self.min_history) & (batch.baseline_std > 0)
+        deviation = np.abs(batch.values - batch.baseline_mean)
+        return usable & (deviation > self.threshold * np.where(usable, batch.baseline_std, 1.0))
+
+
+class RateOfChangeValidator:
+    """
+    Flags readings that jump by more than a factor over the user's previous reading (or baseline mean, if larger).
+    """
+    reason = 'rate_of_change'
+
+    def __init__(self, max_ratio: Optional[float] = None) -> None:
+        self.max_ratio = max_ratio or settings.CONSUMPTION_ANOMALY_MAX_CHANGE_RATIO
+
+    def __call__(self, batch: ReadingBatch) -> Any:
+        reference = np.nan_to_num(np.fmax(batch.previous_values, batch.baseline_mean))
+        return (reference > 0) & (batch.values > self.max_ratio * reference)
+
+
+class DuplicateValidator:
+    """
+    Flags readings for a (user, date) that already has one.
+    """
+    reason = 'duplicate'
+
+    def __call__(self, batch: ReadingBatch) -> Any:
+        return batch.duplicates
+
+
+class BaselineUpdate(NamedTuple):
+    """
+    The baselines of a validated batch with its accepted readings folded in, to store once they are saved.
+    """
+    user_ids: List[int]
+    states: Any  # float64 array of shape (len(user_ids), 5)
+
+
+class ConsumptionValidationService:
+    """
+    Service class for the validation stage of consumption ingestion.
+
+    A whole batch is checked at once: readings are turned into NumPy arrays, lined up with the
+    users' cached baselines (one cache round trip) and the already stored (user, date) pairs
+    (one query), and every configured validator returns a mask over the batch. Flagged readings
+    become QuarantinedReading rows; accepted ones are folded into the baselines, which the caller
+    stores with `save_baselines` once the readings are committed.
+    """
+
+    def __init__(self, consumption_repository: Optional[ConsumptionRepository] = None, baseline_repository: Optional[ConsumptionBaselineRepository] = None, validators: Optional[Sequence[Any]] = None) -> None:
+        self.consumption_repository = consumption_repository or ConsumptionRepository()
+        self.baseline_repository = baseline_repository or ConsumptionBaselineRepository()
+        if validators is None:
+            validators = [import_string(path)() for path in settings.CONSUMPTION_READING_VALIDATORS]
+        self.validators = list(validators)
+
+    def validate_readings(self, readings: Sequence[Consumption]) -> Tuple[List[Consumption], List[QuarantinedReading], Optional[BaselineUpdate]]:
+        """
+        Split a batch of unsaved readings into accepted ones and quarantined ones.
+
+        Returns:
+            Tuple[List[Consumption], List[QuarantinedReading], Optional[BaselineUpdate]]: The accepted readings,
+            the (unsaved) quarantined readings and the updated baselines, or None when nothing was validated.
+        """
+        if not readings or not self.validators:
+            return list(readings), [], None
+        _require_numpy()
+        count = len(readings)
+        user_ids = np.fromiter((reading.user_id for reading in readings), dtype=np.int64, count=count)
+        dates = np.fromiter((reading.date.toordinal() for reading in readings), dtype=np.int64, count=count)
+        values = to_kwh(
+            np.fromiter((reading.consumption for reading in readings), dtype=np.float64, count=count),
+            np.fromiter((reading.unit for reading in readings), dtype=np.int16, count=count),
+        )
+        distinct_users, rows = np.unique(user_ids, return_inverse=True)
+        states = self.baseline_repository.get_baselines(distinct_users.tolist())
+        batch = self._build_batch(user_ids, dates, values, rows, states)
+
+        reasons: List[List[str]] = [[] for _ in range(count)]
+        flagged = np.zeros(count, dtype=bool)
+        for validator in self.validators:
+            mask = np.asarray(validator(batch), dtype=bool)
+            for index in np.flatnonzero(mask):
+                reasons[index].append(validator.reason)
+            flagged |= mask
+
+        baselines = BaselineUpdate(distinct_users.tolist(), self._update_states(states, rows[~flagged], dates[~flagged], values[~flagged]))
+        accepted = [reading for reading, bad in zip(readings, flagged) if not bad]
+        quarantined = [
+            QuarantinedReading(
+                user_id=reading.user_id,
+                date=reading.date,
+                consumption=reading.consumption,
+                unit=reading.unit,
+                reasons=','.join(reasons[index]),
+                expected=float(batch.baseline_mean[index]) if batch.baseline_count[index] else None,
+            )
+            for index, reading in enumerate(readings) if flagged[index]
+        ]
+        return accepted, quarantined, baselines
+
+    def save_baselines(self, baselines: Optional[BaselineUpdate]) -> None:
+        """
+        Store the baselines of a validated batch; call it after the batch's readings are committed.
+        """
+        if baselines is not None:
+            self.baseline_repository.save_baselines(baselines.user_ids, baselines.states)
+
+    def _build_batch(self, user_ids: Any, dates: Any, values: Any, rows: Any, states: Any) -> ReadingBatch:
+        """
+        Lines every reading up with its baseline, its predecessor and its duplicate status.
+        """
+        order = np.lexsort((dates, user_ids))
+        sorted_users, sorted_dates = user_ids[order], dates[order]
+        same_user_as_previous = np.zeros(len(order), dtype=bool)
+        same_user_as_previous[1:] = sorted_users[1:] == sorted_users[:-1]
+
+        # Predecessor: the previous reading of the same user in the batch, else the baseline's last reading
+        previous = np.where(states[rows[order], LAST_DATE] > 0, states[rows[order], LAST_VALUE], np.nan)
+        previous[1:] = np.where(same_user_as_previous[1:], values[order][:-1], previous[1:])
+        previous_values = np.empty_like(previous)
+        previous_values[order] = previous
+
+        repeated = np.zeros(len(order), dtype=bool)
+        repeated[1:] = same_user_as_previous[1:] & (sorted_dates[1:] == sorted_dates[:-1])
+        duplicates = np.empty_like(repeated)
+        duplicates[order] = repeated
+        stored = self.consumption_repository.get_stored_keys(
+            np.unique(user_ids).tolist(), date.fromordinal(int(dates.min())), date.fromordinal(int(dates.max())),
+        )
+        if stored:
+            # Pack (user, date ordinal) into one int64 key so membership is a single np.isin
+            stored_keys = np.fromiter((user_id * DATE_KEY_SPAN + day.toordinal() for user_id, day in stored), dtype=np.int64, count=len(stored))
+            duplicates |= np.isin(user_ids * DATE_KEY_SPAN + dates, stored_keys)
+
+        baseline_count = states[rows, COUNT]
+        baseline_std = np.sqrt(states[rows, M2] / np.maximum(baseline_count - 1, 1))
+        return ReadingBatch(user_ids, dates, values, previous_values, baseline_count, states[rows, MEAN], baseline_std, duplicates)
+
+    def _update_states(self, states: Any, rows: Any, dates: Any, values: Any) -> Any:
+        """
+        Merges accepted readings into the baselines (parallel mean/variance), capped at the window size.
+        """
+        states = states.copy()
+        if len(rows) == 0:
+            return states
+        users = len(states)
+        batch_count = np.bincount(rows, minlength=users).astype(np.float64)
+        batch_mean = np.bincount(rows, weights=values, minlength=users) / np.maximum(batch_count, 1)
+        batch_m2 = np.bincount(rows, weights=(values - batch_mean[rows]) ** 2, minlength=users)
+
+        count = states[:, COUNT]
+        total = count + batch_count
+        delta = batch_mean - states[:, MEAN]
+        has_batch = batch_count > 0
+        states[has_batch, MEAN] += (delta * batch_count / np.maximum(total, 1))[has_batch]
+        states[has_batch, M2] += (batch_m2 + delta ** 2 * count * batch_count / np.maximum(total, 1))[has_batch]
+        states[:, COUNT] = total
+
+        # Keep the baseline rolling: older readings lose weight once the window is full
+        window = self.baseline_repository.window
+        overfull = total > window
+        states[overfull, M2] *= window / total[overfull]
+        states[overfull, COUNT] = window
+
+        # Latest accepted reading per user
+        order = np.lexsort((dates, rows))
+        last = np.flatnonzero(np.append(rows[order][1:] != rows[order][:-1], True))
+        latest_rows, latest_dates, latest_values = rows[order][last], dates[order][last], values[order][last]
+        newer = latest_dates >= states[latest_rows, LAST_DATE]
+        states[latest_rows[newer], LAST_DATE] = latest_dates[newer]
+        states[latest_rows[newer], LAST_VALUE] = latest_values[newer]
+        return states
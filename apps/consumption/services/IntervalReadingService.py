@@ -0,0 +1,51 @@
+from apps.consumption.repositories.IntervalReadingRepository import IntervalReadingRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.models.IntervalReadingModel import IntervalReading, encode_intervals
+from apps.authentication.models.UserModel import User
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+from django.db import transaction
+
+class IntervalReadingService:
+    """
+    Service class for smart-meter interval readings and their daily consumption roll-up.
+    """
+
+    def __init__(self, interval_repository: IntervalReadingRepository, consumption_repository: ConsumptionRepository) -> None:
+        self.interval_repository = interval_repository
+        self.consumption_repository = consumption_repository
+
+    def ingest_meter_days(self, user: User, meter_days: Sequence[Dict[str, Any]], unit: str = 'kWh') -> List[IntervalReading]:
+        """
+        Store meter-days of interval values and derive the affected daily consumption totals in kWh.
+
+        Each meter-day is a dict with `date`, `values` and optionally `meter_id`, `interval_minutes`
+        and `unit` (defaulting to `unit`). A batch names each (meter, date) once.
+
+        Returns:
+            List[IntervalReading]: The stored meter-days.
+        """
+        readings = [
+            IntervalReading(
+                user=user,
+                meter_id=meter_day.get('meter_id', ''),
+                date=meter_day['date'],
+                interval_minutes=meter_day.get('interval_minutes', 15),
+                packed_values=encode_intervals(meter_day['values']),
+                total=float(sum(meter_day['values'])),
+                unit=meter_day.get('unit', unit),
+            )
+            for meter_day in meter_days
+        ]
+        dates = sorted({reading.date for reading in readings})
+        with transaction.atomic():
+            self.interval_repository.upsert_interval_readings(readings)
+            totals = self.interval_repository.get_daily_totals(user, dates)
+            self.consumption_repository.upsert_daily_totals(user, totals, 'kWh')
+        return readings
+
+    def get_user_interval_readings(self, user: User, start_date: Optional[date] = None, end_date: Optional[date] = None) -> List[IntervalReading]:
+        """
+        Get a user's meter-days, optionally within a date range.
+        """
+        return self.interval_repository.get_interval_readings(user, start_date, end_date)
@@ -0,0 +1,40 @@
+from celery import shared_task # type: ignore
+from typing import Dict, List
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.consumption.repositories.ConsumptionColumnarRepository import ConsumptionColumnarRepository
+from apps.consumption.repositories.ConsumptionGapRepository import ConsumptionGapRepository
+from apps.consumption.repositories.ConsumptionPartitionRepository import ConsumptionPartitionRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.services.ConsumptionArchiveService import ConsumptionArchiveService
+from apps.consumption.services.ConsumptionGapService import ConsumptionGapService
+from apps.consumption.services.ConsumptionPartitionService import ConsumptionPartitionService
+
+@shared_task
+def maintain_consumption_partitions() -> Dict[str, List[str]]:
+    """
+    Task to pre-create upcoming monthly consumption partitions and expire old ones.
+    """
+    service = ConsumptionPartitionService(ConsumptionPartitionRepository(), ConsumptionRepository())
+    return service.maintain_partitions()
+
+@shared_task
+def archive_closed_consumption() -> int:
+    """
+    Task to move consumption readings older than the hot window into Parquet cold storage.
+    """
+    archives = ConsumptionArchiveService(ConsumptionArchiveRepository()).archive_closed_periods()
+    return sum(archive.row_count for archive in archives)
+
+@shared_task
+def refresh_consumption_cache(full: bool = False) -> int:
+    """
+    Task to merge new readings into the columnar consumption cache (or rebuild it when `full`).
+    """
+    return ConsumptionColumnarRepository().refresh(full=full)
+
+@shared_task
+def fill_consumption_gaps() -> Dict[str, int]:
+    """
+    Task to store estimated readings for the days users are missing in the trailing fill window.
+    """
+    return ConsumptionGapService(ConsumptionGapRepository()).fill_recent_gaps()
@@ -0,0 +1,124 @@
+import glob
+import os
+import tempfile
+from datetime import date
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase, override_settings
+from apps.authentication.models.UserDeletionJobModel import UserDeletionJob
+from apps.authentication.models.UserModel import User
+from apps.authentication.repositories.UserDeletionRepository import UserDeletionRepository
+from apps.authentication.services.UserDeletionService import UserDeletionService
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.billing.services.BillingService import BillService
+from apps.billing.services.RebillingService import RebillingService
+from apps.consumption.models.ArchivedBillLinkModel import ArchivedBillLink
+from apps.consumption.models.ConsumptionArchiveModel import ConsumptionArchive
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.repositories.ConsumptionArchiveRepository import ConsumptionArchiveRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.repositories.DirtyPeriodRepository import DirtyPeriodRepository
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+try:
+    import pyarrow # type: ignore
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+class ArchiveTestCase(TestCase):
+    def setUp(self):
+        if pyarrow is None:
+            self.skipTest('pyarrow is not installed')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.archive_root = directory.name
+        archive_root = override_settings(CONSUMPTION_ARCHIVE_ROOT=directory.name)
+        archive_root.enable()
+        self.addCleanup(archive_root.disable)
+
+
+class ArchivedReadingDeletionTest(ArchiveTestCase):
+    def setUp(self):
+        super().setUp()
+        self.leaving = User.objects.create_user(username='leaving', password='secret')
+        self.staying = User.objects.create_user(username='staying', password='secret')
+        for day in range(1, 11):
+            Consumption.objects.create(user=self.leaving, date=date(2024, 1, day), consumption=5.0)
+            Consumption.objects.create(user=self.staying, date=date(2024, 1, day), consumption=2.0)
+        Consumption.objects.create(user=self.leaving, date=date(2024, 2, 1), consumption=5.0)
+        self.repository = ConsumptionArchiveRepository()
+        with self.captureOnCommitCallbacks(execute=True):
+            while self.repository.archive_chunk(date(2024, 1, 1), date(2024, 2, 1), 8):
+                pass
+            self.repository.archive_chunk(date(2024, 2, 1), date(2024, 3, 1), 8)
+
+    def test_deletion_job_removes_the_users_archived_readings(self):
+        job, _ = UserDeletionRepository().create_job(self.leaving)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserDeletionService(UserDeletionRepository()).run_job(job.id)
+
+        job = UserDeletionJob.objects.get(id=job.id)
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.deleted_rows['archived_consumptions'], 11)
+        self.assertEqual(self.repository.read_archived(self.leaving.id), [])
+        self.assertEqual(len(self.repository.read_archived(self.staying.id)), 10)
+        self.assertEqual(sum(archive.row_count for archive in ConsumptionArchive.objects.all()), 10)
+        self.assertAlmostEqual(self.repository.sum_archived(), 20.0)
+        self.assertEqual(ConsumptionArchive.objects.filter(month=date(2024, 2, 1)).count(), 0)
+        stored = sorted(os.path.relpath(path, self.archive_root) for path in glob.glob(os.path.join(self.archive_root, '*', '*', '*.parquet')))
+        self.assertEqual(stored, sorted(ConsumptionArchive.objects.values_list('path', flat=True)))
+
+    def test_purging_again_removes_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.repository.purge_user(self.leaving.id)
+
+        self.assertEqual(self.repository.purge_user(self.leaving.id), 0)
+
+
+class ArchivedBillLinkTest(ArchiveTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user(username='billed', password='secret')
+        self.consumption_repository = ConsumptionRepository()
+        self.readings = [self.consumption_repository.create_consumption(self.user, date(2024, 1, day), 10) for day in (5, 10, 15)]
+        self.rebilling_service = RebillingService(BillRepository(), self.consumption_repository, DirtyPeriodRepository(), InvoiceRepository())
+        self.rebilling_service.rebill_dirty_periods()
+        self.bill = BillService(BillRepository(), self.consumption_repository).create_bill(self.user, date(2024, 2, 1), Decimal('6.00'))
+        self.archive_repository = ConsumptionArchiveRepository()
+        self.archive_repository.archive_chunk(date(2024, 1, 1), date(2024, 2, 1), 2)
+
+    def linked_ids(self):
+        return sorted(list(self.bill.consumption.values_list('id', flat=True)) + self.archive_repository.get_bill_reading_ids(self.bill.id))
+
+    def test_archiving_keeps_the_bill_links(self):
+        self.assertEqual(self.bill.consumption.count(), 1)
+        self.assertEqual(self.linked_ids(), sorted(reading.id for reading in self.readings))
+
+    def test_rebilling_links_archived_and_hot_readings(self):
+        late = self.consumption_repository.create_consumption(self.user, date(2024, 1, 20), 15)
+
+        self.assertEqual(self.rebilling_service.rebill_dirty_periods()['adjustments'], 1)
+
+        self.bill.refresh_from_db()
+        self.assertEqual(self.bill.billed_kwh, 45)
+        self.assertEqual(self.linked_ids(), sorted([reading.id for reading in self.readings] + [late.id]))
+
+    def test_new_bill_links_archived_readings(self):
+        bill = BillService(BillRepository(), self.consumption_repository).create_bill(self.user, date(2024, 2, 2), Decimal('6.00'))
+
+        self.assertEqual(len(self.archive_repository.get_bill_reading_ids(bill.id)), 2)
+        self.assertEqual(bill.consumption.count(), 1)
+
+    def test_deletion_job_removes_the_archived_bill_links(self):
+        job, _ = UserDeletionRepository().create_job(self.user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserDeletionService(UserDeletionRepository()).run_job(job.id)
+
+        job = UserDeletionJob.objects.get(id=job.id)
+        self.assertEqual(job.status, 'completed')
+        self.assertEqual(job.deleted_rows['archived_bill_links'], 2)
+        self.assertFalse(ArchivedBillLink.objects.exists())
+        connection.check_constraints()
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest import mock
+from django.test import SimpleTestCase
+from apps.consumption.repositories.ConsumptionColumnarRepository import ConsumptionColumnarRepository
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
+
+DAY = date(2025, 1, 1).toordinal()
+
+
+def rows(count):
+    ids = np.arange(1, count + 1, dtype=np.int64)
+    return ids, ids % 5, np.full(count, DAY, dtype=np.int32) + ids.astype(np.int32), np.ones(count, dtype=np.float64)
+
+
+class ColumnarCacheRefreshTest(SimpleTestCase):
+    def setUp(self):
+        if np is None:
+            self.skipTest('numpy is not installed')
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.repository = ConsumptionColumnarRepository(cache_root=directory.name, shard_count=4)
+
+    def shard_files(self):
+        return sorted(name for name in os.listdir(self.repository.cache_root) if name.startswith('shard-'))
+
+    def test_concurrent_refreshes_run_one_after_the_other(self):
+        with mock.patch.object(ConsumptionColumnarRepository, '_fetch_rows_after', return_value=rows(50)):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                counts = list(executor.map(lambda full: self.repository.refresh(full=full), [True, False, True, False, True, False]))
+
+        manifest = self.repository.read_manifest()
+        self.assertEqual(counts, [50] * 6)
+        self.assertEqual(manifest['generation'], 6)
+        self.assertEqual(self.shard_files(), sorted(f'shard-{shard:03d}.g6.{column}.npy' for shard in range(4) for column in ('user_ids', 'offsets', 'dates', 'values')))
+
+    def test_files_of_a_failed_refresh_are_skipped_and_removed(self):
+        with mock.patch.object(ConsumptionColumnarRepository, '_fetch_rows_after', return_value=rows(10)):
+            self.repository.refresh(full=True)
+        leftover = os.path.join(self.repository.cache_root, 'shard-000.g2.user_ids.npy')
+        open(leftover, 'wb').close()
+
+        with mock.patch.object(ConsumptionColumnarRepository, '_fetch_rows_after', return_value=(np.array([11]), np.array([4]), np.array([DAY], dtype=np.int32), np.array([2.0]))):
+            self.assertEqual(self.repository.refresh(), 1)
+
+        self.assertEqual(self.repository.read_manifest()['generation'], 3)
+        self.assertFalse(os.path.exists(leftover))
+        self.assertEqual(len(self.repository.get_user_series(4).values), 3)
@@ -0,0 +1,45 @@
+from datetime import date
+from django.db.models import Sum
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.repositories.ConsumptionGapRepository import ConsumptionGapRepository
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.services.ConsumptionGapService import ConsumptionGapService
+from apps.consumption.services.ConsumptionService import ConsumptionService
+
+try:
+    import numpy # type: ignore
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+class GapEstimateReplacementTest(TestCase):
+    def setUp(self):
+        if numpy is None:
+            self.skipTest('numpy is not installed')
+        self.user = User.objects.create_user(username='gappy', password='secret')
+        self.gap = date(2024, 3, 4)
+        for day in (1, 2, 3, 5, 6, 7):
+            Consumption.objects.create(user=self.user, date=date(2024, 3, day), consumption=10.0)
+        result = ConsumptionGapService(ConsumptionGapRepository()).fill_gaps(date(2024, 3, 1), date(2024, 3, 7))
+        self.assertEqual(result, {'missing': 1, 'estimated': 1})
+        self.service = ConsumptionService(ConsumptionRepository())
+
+    def day_total(self):
+        return Consumption.objects.filter(user=self.user, date=self.gap).aggregate(total=Sum('consumption'))['total']
+
+    def test_released_reading_replaces_the_estimate(self):
+        held = QuarantinedReading.objects.create(user=self.user, date=self.gap, consumption=42.0, reasons='zscore')
+
+        self.service.release_quarantined_readings([held.id])
+
+        self.assertEqual(self.day_total(), 42.0)
+        self.assertFalse(Consumption.objects.filter(user=self.user, is_estimated=True).exists())
+
+    def test_ingested_reading_replaces_the_estimate(self):
+        self.service.ingest_consumptions(self.user, [{'date': self.gap, 'consumption': 11.0}])
+
+        self.assertEqual(self.day_total(), 11.0)
+        self.assertFalse(Consumption.objects.filter(user=self.user, is_estimated=True).exists())
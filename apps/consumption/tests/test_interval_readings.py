@@ -0,0 +1,43 @@
+from django.test import TestCase
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import KWH
+
+
+class IntervalReadingIngestionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='metered', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, *meter_days):
+        return self.client.post('/consumption/intervals/', list(meter_days), format='json')
+
+    def test_totals_are_stored_in_kwh_whatever_the_posted_unit(self):
+        response = self.post(
+            {'date': '2025-01-01', 'meter_id': 'a', 'values': [250.0] * 96, 'unit': 'Wh'},
+            {'date': '2025-01-01', 'meter_id': 'b', 'values': [0.5] * 96},
+            {'date': '2025-01-02', 'meter_id': 'a', 'values': [0.001] * 96, 'unit': 'mwh'},
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data[2]['unit'], 'MWh')
+        totals = dict(Consumption.objects.filter(user=self.user).values_list('date__day', 'consumption'))
+        self.assertAlmostEqual(totals[1], 72.0)
+        self.assertAlmostEqual(totals[2], 96.0)
+        self.assertEqual(set(Consumption.objects.values_list('unit', flat=True)), {KWH})
+
+    def test_duplicate_meter_days_are_rejected(self):
+        response = self.post(
+            {'date': '2025-01-01', 'meter_id': 'a', 'values': [1.0] * 96},
+            {'date': '2025-01-01', 'meter_id': 'a', 'values': [2.0] * 96},
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Consumption.objects.exists())
+
+    def test_unknown_units_are_rejected(self):
+        response = self.post({'date': '2025-01-01', 'values': [1.0] * 96, 'unit': 'therm'})
+
+        self.assertEqual(response.status_code, 400)
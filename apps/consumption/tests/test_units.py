@@ -0,0 +1,99 @@
+from datetime import date
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models import F, Sum
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from apps.authentication.models.UserModel import User
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.EnergyUnits import GWH, KWH, MWH, WH, kwh_factor, kwh_factor_case, to_kwh, unit_code, unit_name
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class EnergyUnitRegistryTest(SimpleTestCase):
+    def test_names_resolve_case_insensitively_and_codes_pass_through(self):
+        for unit, code in (('Wh', WH), ('kwh', KWH), (' MWh ', MWH), ('GWH', GWH), (KWH, KWH), (GWH, GWH)):
+            with self.subTest(unit=unit):
+                self.assertEqual(unit_code(unit), code)
+
+    def test_unknown_units_are_rejected(self):
+        for unit in ('kW', 'therm', '', 0, 5):
+            with self.subTest(unit=unit):
+                with self.assertRaisesMessage(ValueError, 'Unknown energy unit'):
+                    unit_code(unit)
+
+    def test_names_and_factors(self):
+        self.assertEqual([unit_name(code) for code in (WH, KWH, MWH, GWH)], ['Wh', 'kWh', 'MWh', 'GWh'])
+        self.assertEqual([kwh_factor(name) for name in ('Wh', 'kWh', 'MWh', 'GWh')], [0.001, 1.0, 1000.0, 1000000.0])
+
+    def test_arrays_convert_to_kwh(self):
+        if np is None:
+            self.skipTest('numpy is not installed')
+        self.assertEqual(to_kwh([500.0, 2.0, 1.5, 0.25], [WH, KWH, MWH, GWH]).tolist(), [0.5, 2.0, 1500.0, 250000.0])
+
+
+class MixedUnitAggregateTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='mixed', password='secret')
+        self.repository = ConsumptionRepository()
+        for day, value, unit in ((1, 2500.0, 'Wh'), (2, 3.0, 'kWh'), (3, 0.002, 'MWh'), (4, 0.000001, 'GWh')):
+            self.repository.create_consumption(self.user, date(2024, 1, day), value, unit)
+
+    def test_sql_factor_converts_every_unit(self):
+        factors = dict(Consumption.objects.filter(user=self.user).annotate(factor=kwh_factor_case()).values_list('unit', 'factor'))
+
+        self.assertEqual(factors, {WH: 0.001, KWH: 1.0, MWH: 1000.0, GWH: 1000000.0})
+        total = Consumption.objects.filter(user=self.user).aggregate(total=Sum(F('consumption') * kwh_factor_case()))['total']
+        self.assertAlmostEqual(total, 8.5)
+
+    def test_kwh_aggregates_mix_units(self):
+        self.assertAlmostEqual(self.repository.aggregate_user_consumption(self.user), 8.5)
+        self.assertAlmostEqual(self.repository.aggregate_all_users_consumption(), 8.5)
+        self.assertAlmostEqual(self.repository.get_period_consumption(self.user.id, date(2024, 1, 2), date(2024, 1, 3)).kwh, 5.0)
+
+
+class UnitCodeMigrationTest(TransactionTestCase):
+    migrate_from = [('consumption', '0006_intervalreading')]
+    migrate_to = [('consumption', '0007_consumption_unit_code')]
+
+    def setUp(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(self.migrate_from)
+        self.addCleanup(self.migrate_to_latest)
+        apps = executor.loader.project_state(self.migrate_from).apps
+        user = apps.get_model('authentication', 'User').objects.create(username='legacy', password='!')
+        self.Consumption = apps.get_model('consumption', 'Consumption')
+        for day, unit in ((1, 'kWh'), (2, ' wh'), (3, 'MWH')):
+            self.Consumption.objects.create(user_id=user.id, date=date(2024, 1, day), consumption=1.0, unit=unit)
+        self.user_id = user.id
+
+    def migrate_to_latest(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def migrate(self):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(self.migrate_to)
+        return executor.loader.project_state(self.migrate_to).apps
+
+    def test_known_units_become_codes(self):
+        apps = self.migrate()
+
+        units = apps.get_model('consumption', 'Consumption').objects.order_by('date').values_list('unit', flat=True)
+        self.assertEqual(list(units), [KWH, WH, MWH])
+
+    def test_unknown_units_stop_the_migration(self):
+        self.Consumption.objects.create(user_id=self.user_id, date=date(2024, 1, 4), consumption=1.0, unit='therm')
+
+        with self.assertRaisesMessage(ValueError, "'therm': 1"):
+            self.migrate()
+
+        # Nothing changed: the readings keep their free-text units until the migration is run again
+        self.assertEqual(list(self.Consumption.objects.order_by('date').values_list('unit', flat=True)), ['kWh', ' wh', 'MWH', 'therm'])
+        self.Consumption.objects.filter(unit='therm').delete()
@@ -0,0 +1,188 @@
+from datetime import date, timedelta
+from unittest import mock
+from django.core.cache import caches
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.QuarantinedReadingModel import QuarantinedReading
+from apps.consumption.repositories.ConsumptionBaselineRepository import BASELINE_KEY, COUNT
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.consumption.services.ConsumptionService import ConsumptionService
+from apps.consumption.services.ConsumptionValidationService import (
+    ConsumptionValidationService, DuplicateValidator, RateOfChangeValidator, ReadingBatch, ZScoreValidator,
+)
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def reading_batch(values, previous_values=None, baseline_count=None, baseline_mean=None, baseline_std=None, duplicates=None):
+    size = len(values)
+    return ReadingBatch(
+        user_ids=np.ones(size, dtype=np.int64),
+        dates=np.arange(size, dtype=np.int64) + date(2024, 1, 1).toordinal(),
+        values=np.asarray(values, dtype=np.float64),
+        previous_values=np.asarray(previous_values if previous_values is not None else [np.nan] * size, dtype=np.float64),
+        baseline_count=np.asarray(baseline_count if baseline_count is not None else [0] * size, dtype=np.float64),
+        baseline_mean=np.asarray(baseline_mean if baseline_mean is not None else [0] * size, dtype=np.float64),
+        baseline_std=np.asarray(baseline_std if baseline_std is not None else [0] * size, dtype=np.float64),
+        duplicates=np.asarray(duplicates if duplicates is not None else [False] * size, dtype=bool),
+    )
+
+
+class ValidatorTest(SimpleTestCase):
+    def setUp(self):
+        if np is None:
+            self.skipTest('numpy is not installed')
+
+    def test_zscore_flags_readings_far_from_an_established_baseline(self):
+        validator = ZScoreValidator(threshold=4.0, min_history=14)
+        batch = reading_batch(
+            values=[15.0, 13.0, 5.0, 30.0, 30.0],
+            baseline_count=[20, 20, 20, 13, 20],
+            baseline_mean=[10.0, 10.0, 10.0, 10.0, 10.0],
+            baseline_std=[1.0, 1.0, 1.0, 1.0, 0.0],
+        )
+
+        # Too little history or a flat baseline never flags
+        self.assertEqual(validator(batch).tolist(), [True, False, True, False, False])
+
+    def test_rate_of_change_compares_with_the_larger_of_previous_reading_and_baseline(self):
+        validator = RateOfChangeValidator(max_ratio=10.0)
+        batch = reading_batch(
+            values=[25.0, 15.0, 25.0, 100.0, 5.0],
+            previous_values=[2.0, 2.0, 2.0, np.nan, np.nan],
+            baseline_mean=[1.0, 1.0, 3.0, 0.0, 0.0],
+        )
+
+        self.assertEqual(validator(batch).tolist(), [True, False, False, False, False])
+
+    def test_duplicate_returns_the_batch_duplicates(self):
+        batch = reading_batch(values=[1.0, 1.0, 1.0], duplicates=[False, True, False])
+
+        self.assertEqual(DuplicateValidator()(batch).tolist(), [False, True, False])
+
+
+@override_settings(CONSUMPTION_ANOMALY_ZSCORE=4.0, CONSUMPTION_ANOMALY_MIN_HISTORY=14, CONSUMPTION_ANOMALY_MAX_CHANGE_RATIO=10.0)
+class ValidateReadingsTest(TestCase):
+    def setUp(self):
+        if np is None:
+            self.skipTest('numpy is not installed')
+        caches['default'].clear()
+        self.user = User.objects.create_user(username='metered', password='secret')
+        self.today = date.today()
+        # Baseline: 20 readings alternating 9 and 11 kWh, mean 10
+        for day in range(20):
+            Consumption.objects.create(user=self.user, date=self.today - timedelta(days=30 - day), consumption=9.0 if day % 2 else 11.0)
+        self.service = ConsumptionValidationService(ConsumptionRepository())
+
+    def reading(self, days_ago, consumption):
+        return Consumption(user=self.user, date=self.today - timedelta(days=days_ago), consumption=consumption)
+
+    def test_flagged_readings_are_quarantined_with_every_reason(self):
+        readings = [
+            self.reading(5, 10.5),
+            self.reading(4, 15.0),
+            self.reading(3, 200.0),
+            self.reading(2, 10.0),
+            self.reading(2, 10.0),
+            self.reading(30, 10.0),
+        ]
+
+        accepted, quarantined, baselines = self.service.validate_readings(readings)
+
+        self.assertEqual(accepted, [readings[0], readings[3]])
+        self.assertEqual(
+            [(reading.date, reading.consumption, reading.reasons) for reading in quarantined],
+            [
+                (readings[1].date, 15.0, 'zscore'),
+                (readings[2].date, 200.0, 'zscore,rate_of_change'),
+                (readings[4].date, 10.0, 'duplicate'),
+                (readings[5].date, 10.0, 'duplicate'),
+            ],
+        )
+        self.assertAlmostEqual(quarantined[0].expected, 10.0)
+        # Only the accepted readings are folded into the baseline
+        self.assertEqual(baselines.user_ids, [self.user.id])
+        self.assertEqual(baselines.states[0][COUNT], 22)
+
+    def test_no_validators_accept_everything(self):
+        readings = [self.reading(3, 200.0)]
+
+        self.assertEqual(ConsumptionValidationService(ConsumptionRepository(), validators=[]).validate_readings(readings), (readings, [], None))
+
+
+class QuarantineReviewTest(TestCase):
+    def setUp(self):
+        if np is None:
+            self.skipTest('numpy is not installed')
+        caches['default'].clear()
+        self.user = User.objects.create_user(username='reviewed', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='operator', password='secret', role='admin'))
+        self.day = date.today() - timedelta(days=3)
+        Consumption.objects.create(user=self.user, date=self.day, consumption=10.0)
+        _, self.held = ConsumptionService(ConsumptionRepository()).ingest_consumptions(self.user, [
+            {'date': self.day, 'consumption': 12.0},
+            {'date': self.day + timedelta(days=1), 'consumption': 4.0},
+            {'date': self.day + timedelta(days=1), 'consumption': 5.0},
+        ])
+
+    def test_admins_list_release_and_discard_quarantined_readings(self):
+        self.assertEqual([reading.reasons for reading in self.held], ['duplicate', 'duplicate'])
+        listed = self.client.get('/consumption/admin/quarantine/')
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual(len(listed.data), 2)
+
+        released = self.client.post('/consumption/admin/quarantine/', {'ids': [self.held[0].id], 'action': 'release'}, format='json')
+        discarded = self.client.post('/consumption/admin/quarantine/', {'ids': [self.held[1].id], 'action': 'discard'}, format='json')
+
+        self.assertEqual(released.data, {'released': 1})
+        self.assertEqual(discarded.data, {'discarded': 1})
+        self.assertFalse(QuarantinedReading.objects.exists())
+        self.assertEqual(
+            sorted(Consumption.objects.filter(user=self.user).values_list('date', 'consumption')),
+            [(self.day, 10.0), (self.day, 12.0), (self.day + timedelta(days=1), 4.0)],
+        )
+
+    def test_decisions_are_validated_and_admin_only(self):
+        self.assertEqual(self.client.post('/consumption/admin/quarantine/', {'ids': [], 'action': 'release'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post('/consumption/admin/quarantine/', {'ids': [self.held[0].id], 'action': 'keep'}, format='json').status_code, 400)
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/consumption/admin/quarantine/').status_code, 403)
+
+
+class BaselinePersistenceTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.user = User.objects.create_user(username='validated', password='secret')
+        self.repository = ConsumptionRepository()
+        self.service = ConsumptionService(self.repository)
+        start = date.today() - timedelta(days=10)
+        self.entries = [{'date': start + timedelta(days=day), 'consumption': 10.0} for day in range(5)]
+
+    def baseline_count(self):
+        state = caches['default'].get(BASELINE_KEY.format(self.user.id))
+        return None if state is None else state[COUNT]
+
+    def test_baselines_are_stored_once_the_readings_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            created, _ = self.service.ingest_consumptions(self.user, self.entries)
+            self.assertIsNone(self.baseline_count())
+
+        self.assertEqual(len(created), 5)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.baseline_count(), 5)
+
+    def test_a_failed_insert_leaves_the_baselines_alone(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with mock.patch.object(self.repository, 'bulk_create_consumptions', side_effect=IntegrityError('duplicate key')):
+                with self.assertRaises(IntegrityError):
+                    self.service.ingest_consumptions(self.user, self.entries)
+
+        self.assertIsNone(self.baseline_count())
@@ -0,0 +1,27 @@
+from django.test import TestCase
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+
+
+class DateRangeQueryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user(username='reader', password='secret'))
+
+    def test_valid_ranges_are_accepted(self):
+        for path in ('/consumption/user/', '/consumption/intervals/'):
+            with self.subTest(path=path):
+                self.assertEqual(self.client.get(path, {'start_date': '2024-02-01', 'end_date': '2024-02-29'}).status_code, 200)
+                self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_invalid_dates_are_rejected(self):
+        for path in ('/consumption/user/', '/consumption/intervals/'):
+            for query in ({'start_date': 'yesterday'}, {'end_date': '2024-02-30'}, {'start_date': '2024-03-01', 'end_date': '2024-02-01'}):
+                with self.subTest(path=path, query=query):
+                    self.assertEqual(self.client.get(path, query).status_code, 400)
+
+    def test_admins_must_give_a_range(self):
+        self.client.force_authenticate(User.objects.create_user(username='operator', password='secret', role='admin'))
+
+        self.assertEqual(self.client.get('/consumption/user/', {'start_date': '2024-02-01'}).status_code, 400)
+        self.assertEqual(self.client.get('/consumption/user/', {'start_date': '2024-02-01', 'end_date': '2024-02-29'}).status_code, 200)
@@ -6,7 +6,10 @@ from drf_yasg import openapi # type: ignore
 from rest_framework.permissions import IsAuthenticated, IsAdminUser # type: ignore
 from apps.consumption.services.ConsumptionService import ConsumptionService
 from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
-from apps.consumption.serializers.ConsumptionSerializers import ConsumptionSerializer
+from apps.consumption.serializers.ConsumptionSerializers import ConsumptionSerializer, DateRangeQuerySerializer, QuarantinedReadingSerializer, QuarantineDecisionSerializer
+from apps.consumption.serializers.IntervalReadingSerializers import IntervalReadingSerializer
+from apps.consumption.services.IntervalReadingService import IntervalReadingService
+from apps.consumption.repositories.IntervalReadingRepository import IntervalReadingRepository
 from django.db import IntegrityError
 from typing import Optional
 from apps.authentication.models.UserModel import User
@@ -23,40 +26,56 @@ class ConsumptionView(APIView):
         self.consumption_service = consumption_service or ConsumptionService(ConsumptionRepository())
 
     @swagger_auto_schema(
-        responses={200: ConsumptionSerializer(many=True)},
+        query_serializer=DateRangeQuerySerializer,
+        responses={200: ConsumptionSerializer(many=True), 400: "Bad Request"},
     )
     def get(self, request):
         """
         - Users: Return consumption records for the logged-in user.
-        - Admins: Return all users' consumption records.
+        - Admins: Return all users' consumption records between `start_date` and `end_date`, which are required.
+        Users can narrow their records with the optional `start_date`/`end_date` query parameters.
         """
+        query = DateRangeQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        start_date, end_date = query.validated_data.get('start_date'), query.validated_data.get('end_date')
+        if request.user.is_staff and (start_date is None or end_date is None):
+            # Without a range every archive file would be read
+            return Response({"error": "start_date and end_date are required when listing all users' consumption."}, status=status.HTTP_400_BAD_REQUEST)
         try:
             if request.user.is_staff:
-                consumptions = self.consumption_service.get_all_consumptions()  # Admin: All users
+                consumptions = self.consumption_service.get_all_consumptions(start_date, end_date)  # Admin: All users
             else:
-                consumptions = self.consumption_service.get_user_consumptions(request.user)  # User: Their own records
+                consumptions = self.consumption_service.get_user_consumptions(request.user, start_date, end_date)  # User: Their own records
             return Response(ConsumptionSerializer(consumptions, many=True).data, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     @swagger_auto_schema(
         request_body=ConsumptionSerializer,
-        responses={201: ConsumptionSerializer, 400: "Bad Request"}
+        responses={201: ConsumptionSerializer, 202: QuarantinedReadingSerializer, 400: "Bad Request"}
     )
     def post(self, request):
         """
-        Create a new consumption record for the logged-in user.
+        Create consumption records for the logged-in user from one reading or a list of readings.
+        Readings flagged by the validation stage are quarantined instead: a single reading then
+        answers 202 with the quarantine entry, a list answers with `created` and `quarantined`.
         """
-        serializer = ConsumptionSerializer(data=request.data)
+        many = isinstance(request.data, list)
+        serializer = ConsumptionSerializer(data=request.data, many=many)
         if serializer.is_valid():
             try:
-                consumption = self.consumption_service.create_consumption(
-                    user=request.user,
-                    date=serializer.validated_data['date'],
-                    consumption=serializer.validated_data['consumption'],
-                    unit=serializer.validated_data.get('unit', 'kWh')
+                created, quarantined = self.consumption_service.ingest_consumptions(
+                    request.user, serializer.validated_data if many else [serializer.validated_data]
                 )
-                return Response(ConsumptionSerializer(consumption).data, status=status.HTTP_201_CREATED)
+                if many:
+                    return Response({
+                        'created': ConsumptionSerializer(created, many=True).data,
+                        'quarantined': QuarantinedReadingSerializer(quarantined, many=True).data,
+                    }, status=status.HTTP_201_CREATED)
+                if quarantined:
+                    return Response(QuarantinedReadingSerializer(quarantined[0]).data, status=status.HTTP_202_ACCEPTED)
+                return Response(ConsumptionSerializer(created[0]).data, status=status.HTTP_201_CREATED)
             except IntegrityError as e:
                 return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -111,3 +130,89 @@ class AdminUserAggregationView(APIView):
             return Response({"error": f"User with ID {user_id} not found."}, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class QuarantinedReadingView(APIView):
+    """
+    Lets admins review the readings held back by the ingestion validators.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, consumption_service: Optional[ConsumptionService] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.consumption_service = consumption_service or ConsumptionService(ConsumptionRepository())
+
+    @swagger_auto_schema(responses={200: QuarantinedReadingSerializer(many=True)})
+    def get(self, request):
+        """
+        Admins: List quarantined readings, newest first.
+        """
+        try:
+            readings = self.consumption_service.get_quarantined_readings()
+            return Response(QuarantinedReadingSerializer(readings, many=True).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @swagger_auto_schema(
+        request_body=QuarantineDecisionSerializer,
+        responses={200: openapi.Response('Number of readings released or discarded', openapi.Schema(type=openapi.TYPE_INTEGER)), 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Admins: Release reviewed readings into the consumption table, or discard them.
+        """
+        serializer = QuarantineDecisionSerializer(data=request.data)
+        if serializer.is_valid():
+            ids = serializer.validated_data['ids']
+            if serializer.validated_data['action'] == 'release':
+                count = len(self.consumption_service.release_quarantined_readings(ids))
+                return Response({'released': count}, status=status.HTTP_200_OK)
+            count = self.consumption_service.discard_quarantined_readings(ids)
+            return Response({'discarded': count}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class IntervalReadingView(APIView):
+    """
+    Handles smart-meter interval readings (one record per meter-day) for the logged-in user.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def __init__(self, interval_service: Optional[IntervalReadingService] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.interval_service = interval_service or IntervalReadingService(IntervalReadingRepository(), ConsumptionRepository())
+
+    @swagger_auto_schema(
+        query_serializer=DateRangeQuerySerializer,
+        responses={200: IntervalReadingSerializer(many=True), 400: "Bad Request"},
+    )
+    def get(self, request):
+        """
+        Return the logged-in user's meter-days with their decoded interval values.
+        """
+        query = DateRangeQuerySerializer(data=request.query_params)
+        if not query.is_valid():
+            return Response(query.errors, status=status.HTTP_400_BAD_REQUEST)
+        start_date, end_date = query.validated_data.get('start_date'), query.validated_data.get('end_date')
+        try:
+            readings = self.interval_service.get_user_interval_readings(request.user, start_date, end_date)
+            return Response(IntervalReadingSerializer(readings, many=True).data, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @swagger_auto_schema(
+        request_body=IntervalReadingSerializer(many=True),
+        responses={201: IntervalReadingSerializer(many=True), 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Store one or more meter-days and update the matching daily consumption records.
+        """
+        serializer = IntervalReadingSerializer(data=request.data, many=True)
+        if serializer.is_valid():
+            try:
+                readings = self.interval_service.ingest_meter_days(request.user, serializer.validated_data)
+                return Response(IntervalReadingSerializer(readings, many=True).data, status=status.HTTP_201_CREATED)
+            except IntegrityError as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,136 @@
+from decimal import Decimal
+from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BillingRepository import BillRepository
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+from apps.invoices.services.InvoiceService import InvoiceService
+from apps.monitoring.services.BenchmarkService import benchmark
+
+# Cases for `manage.py benchmark`; each returns the call to time, see BenchmarkService.benchmark
+
+
+def _user_invoice(data):
+    return Invoice.objects.filter(user=data.user).order_by('-due_date').first()
+
+
+@benchmark(InvoiceRepository, 'create_invoice')
+def create_invoice(data):
+    repository = InvoiceRepository()
+    bills = list(Bill.objects.filter(user=data.user).order_by('-date')[:3])
+    return lambda: repository.create_invoice(data.user, data.start_date.isoformat(), data.end_date.isoformat(), 99.0, data.end_date.isoformat(), bills=bills)
+
+
+@benchmark(InvoiceRepository, 'get_invoice_by_id')
+def get_invoice_by_id(data):
+    repository = InvoiceRepository()
+    return lambda: repository.get_invoice_by_id(data.invoice_ids[0])
+
+
+@benchmark(InvoiceRepository, 'get_invoices_by_user')
+def get_invoices_by_user(data):
+    repository = InvoiceRepository()
+    return lambda: repository.get_invoices_by_user(data.user)
+
+
+@benchmark(InvoiceRepository, 'get_all_invoices')
+def get_all_invoices(data):
+    repository = InvoiceRepository()
+    return lambda: repository.get_all_invoices()
+
+
+@benchmark(InvoiceRepository, 'refresh_invoice_totals')
+def refresh_invoice_totals(data):
+    repository = InvoiceRepository()
+    bill = Bill.objects.filter(user=data.user, invoices__status__in=['unpaid', 'overdue']).first() or Bill.objects.filter(user=data.user).first()
+    return lambda: repository.refresh_invoice_totals(bill)
+
+
+@benchmark(InvoiceRepository, 'lock_invoices_for_payment')
+def lock_invoices_for_payment(data):
+    repository = InvoiceRepository()
+    return lambda: repository.lock_invoices_for_payment(data.invoice_ids)
+
+
+@benchmark(InvoiceRepository, 'mark_invoices_paid')
+def mark_invoices_paid(data):
+    repository = InvoiceRepository()
+    return lambda: repository.mark_invoices_paid(data.invoice_ids)
+
+
+@benchmark(InvoiceRepository, 'set_invoices_status')
+def set_invoices_status(data):
+    repository = InvoiceRepository()
+    return lambda: repository.set_invoices_status(data.invoice_ids, 'overdue')
+
+
+@benchmark(InvoiceRepository, 'update_invoice')
+def update_invoice(data):
+    repository = InvoiceRepository()
+    invoice = _user_invoice(data)
+    return lambda: repository.update_invoice(invoice, total_amount=invoice.total_amount + Decimal('1.00'))
+
+
+@benchmark(InvoiceRepository, 'update_invoice_fields')
+def update_invoice_fields(data):
+    repository = InvoiceRepository()
+    return lambda: repository.update_invoice_fields(data.invoice_ids[0], total_amount=Decimal('1.00'))
+
+
+@benchmark(InvoiceRepository, 'bulk_update_invoice_fields')
+def bulk_update_invoice_fields(data):
+    repository = InvoiceRepository()
+    return lambda: repository.bulk_update_invoice_fields(data.invoice_ids, total_amount=Decimal('1.00'))
+
+
+@benchmark(InvoiceRepository, 'bulk_update_invoices')
+def bulk_update_invoices(data):
+    repository = InvoiceRepository()
+    invoices = list(Invoice.objects.filter(id__in=data.invoice_ids))
+    for invoice in invoices:
+        invoice.total_amount += Decimal('1.00')
+    return lambda: repository.bulk_update_invoices(invoices, ['total_amount'])
+
+
+@benchmark(InvoiceRepository, 'delete_invoice')
+def delete_invoice(data):
+    repository = InvoiceRepository()
+    invoice = _user_invoice(data)
+    return lambda: repository.delete_invoice(invoice)
+
+
+@benchmark(InvoiceRepository, 'aggregate_user_invoices')
+def aggregate_user_invoices(data):
+    repository = InvoiceRepository()
+    return lambda: repository.aggregate_user_invoices(data.user)
+
+
+@benchmark(InvoiceService, 'get_user_invoices')
+def get_user_invoices(data):
+    service = InvoiceService(InvoiceRepository(), BillRepository())
+    return lambda: service.get_user_invoices(data.user)
+
+
+@benchmark(InvoiceService, 'get_all_invoices')
+def service_get_all_invoices(data):
+    service = InvoiceService(InvoiceRepository(), BillRepository())
+    return lambda: service.get_all_invoices()
+
+
+@benchmark(InvoiceService, 'update_invoice')
+def service_update_invoice(data):
+    service = InvoiceService(InvoiceRepository(), BillRepository())
+    invoice = _user_invoice(data)
+    return lambda: service.update_invoice(invoice.id, total_amount=invoice.total_amount + Decimal('1.00'))
+
+
+@benchmark(InvoiceService, 'set_invoices_status')
+def service_set_invoices_status(data):
+    service = InvoiceService(InvoiceRepository(), BillRepository())
+    return lambda: service.set_invoices_status(data.invoice_ids, 'paid')
+
+
+@benchmark(InvoiceService, 'delete_invoice')
+def service_delete_invoice(data):
+    service = InvoiceService(InvoiceRepository(), BillRepository())
+    invoice = _user_invoice(data)
+    return lambda: service.delete_invoice(invoice.id)
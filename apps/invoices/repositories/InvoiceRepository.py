@@ -1,36 +1,48 @@
-from typing import Optional, List, Type
+from decimal import Decimal
+from typing import Optional, Dict, List, Sequence, Tuple, Type
 from apps.invoices.models.InvoiceModel import Invoice
 from apps.authentication.models.UserModel import User
 from apps.billing.models.BillingModel import Bill
+from apps.billing.repositories.BalanceRepository import BalanceRepository, new_deltas, add_invoice_delta
+from django.db import transaction
 from django.db.models import Sum
+from apps.monitoring.services.MetricsService import traced_repository
 
+LEDGER_FIELDS = {'user', 'user_id', 'total_amount', 'status'}  # Columns whose changes move balances
+
+@traced_repository
 class InvoiceRepository:
     """
     Repository class for handling invoice-related database operations.
     """
 
-    def __init__(self, invoice_model: Optional[Type[Invoice]] = None) -> None:
+    def __init__(self, invoice_model: Optional[Type[Invoice]] = None, balance_repository: Optional[BalanceRepository] = None) -> None:
         """
-        Initializes the InvoiceRepository with the specified invoice model.
+        Initializes the InvoiceRepository with the specified invoice model and the ledger kept in step with it.
         """
         self.invoice_model: Type[Invoice] = invoice_model or Invoice
+        self.balance_repository: BalanceRepository = balance_repository or BalanceRepository()
 
     def create_invoice(self, user: User, billing_period_start: str, billing_period_end: str, total_amount: float, due_date: str, pdf: Optional[str] = None, bills: Optional[List[Bill]] = None, status: str = 'unpaid') -> Invoice:
         """
         Creates a new invoice for a user, based on the billing period and amount.
         """
-        invoice = self.invoice_model.objects.create(
-            user=user,
-            billing_period_start=billing_period_start,
-            billing_period_end=billing_period_end,
-            total_amount=total_amount,
-            due_date=due_date,
-            pdf=pdf,
-            status=status,
-        )
-        if bills:
-            invoice.bills.set(bills)
-        invoice.save()
+        deltas = new_deltas()
+        add_invoice_delta(deltas, user.id, status, total_amount)
+        with transaction.atomic():
+            invoice = self.invoice_model.objects.create(
+                user=user,
+                billing_period_start=billing_period_start,
+                billing_period_end=billing_period_end,
+                total_amount=total_amount,
+                due_date=due_date,
+                pdf=pdf,
+                status=status,
+            )
+            if bills:
+                invoice.bills.set(bills)
+            invoice.save()
+            self.balance_repository.apply_deltas(deltas)
         return invoice
 
     def get_invoice_by_id(self, invoice_id: int) -> Optional[Invoice]:
@@ -54,20 +66,178 @@ class InvoiceRepository:
         """
         return list(self.invoice_model.objects.all().order_by('-created_at'))
 
+    def refresh_invoice_totals(self, bill: Bill) -> List[Invoice]:
+        """
+        Recomputes the total of every open (unpaid or overdue) invoice that includes the bill.
+        Paid invoices are left untouched.
+
+        Returns:
+            List[Invoice]: The invoices whose total was updated.
+        """
+        updated = []
+        deltas = new_deltas()
+        with transaction.atomic():
+            for invoice in self.invoice_model.objects.filter(bills=bill).exclude(status='paid'):
+                add_invoice_delta(deltas, invoice.user_id, invoice.status, invoice.total_amount, sign=-1)
+                invoice.total_amount = invoice.bills.aggregate(Sum('amount'))['amount__sum'] or 0
+                add_invoice_delta(deltas, invoice.user_id, invoice.status, invoice.total_amount)
+                invoice.save(update_fields=['total_amount'])
+                updated.append(invoice)
+            self.balance_repository.apply_deltas(deltas)
+        return updated
+
+    def lock_invoices_for_payment(self, invoice_ids: Sequence[int]) -> Dict[int, Tuple[int, Decimal, str]]:
+        """
+        Locks the invoices with the given IDs for the rest of the transaction.
+
+        Returns:
+            Dict[int, Tuple[int, Decimal, str]]: (user ID, total amount, status) per existing invoice.
+        """
+        rows = self.invoice_model.objects.filter(id__in=invoice_ids).select_for_update().values_list('id', 'user_id', 'total_amount', 'status')
+        return {invoice_id: (user_id, total, status) for invoice_id, user_id, total, status in rows}
+
+    def mark_invoices_paid(self, invoice_ids: Sequence[int]) -> int:
+        """
+        Marks open (unpaid or overdue) invoices as paid with one UPDATE, updating only the status column and the ledger.
+
+        Returns:
+            int: The number of invoices that changed status.
+        """
+        return self.set_invoices_status(invoice_ids, 'paid')
+
+    def set_invoices_status(self, invoice_ids: Sequence[int], status: str) -> int:
+        """
+        Moves several invoices to a status with one UPDATE of the status column, keeping the ledger in step.
+
+        Returns:
+            int: The number of invoices that changed status.
+        """
+        with transaction.atomic():
+            rows = list(
+                self.invoice_model.objects.filter(id__in=invoice_ids).exclude(status=status)
+                .select_for_update().values_list('id', 'user_id', 'total_amount', 'status')
+            )
+            if not rows:
+                return 0
+            deltas = new_deltas()
+            for _, user_id, total, previous in rows:
+                add_invoice_delta(deltas, user_id, previous, total, sign=-1)
+                add_invoice_delta(deltas, user_id, status, total)
+            self.invoice_model.objects.filter(id__in=[row[0] for row in rows]).update(status=status)
+            self.balance_repository.apply_deltas(deltas)
+        return len(rows)
+
     def update_invoice(self, invoice: Invoice, **updated_fields) -> Invoice:
         """
         Updates an invoice with new fields.
-        """
-        for field, value in updated_fields.items():
-            setattr(invoice, field, value)
-        invoice.save()
+        The ledger moves from the locked row's values, not the possibly stale instance's.
+
+        Raises:
+            Invoice.DoesNotExist: If the invoice was deleted meanwhile.
+        """
+        with transaction.atomic():
+            old = self.invoice_model.objects.filter(id=invoice.id).select_for_update().values_list('user_id', 'total_amount', 'status').first()
+            if old is None:
+                raise self.invoice_model.DoesNotExist(f"Invoice with ID {invoice.id} does not exist.")
+            invoice.user_id, invoice.total_amount, invoice.status = old
+            deltas = new_deltas()
+            add_invoice_delta(deltas, invoice.user_id, invoice.status, invoice.total_amount, sign=-1)
+            for field, value in updated_fields.items():
+                setattr(invoice, field, value)
+            add_invoice_delta(deltas, invoice.user_id, invoice.status, invoice.total_amount)
+            # Only the given columns are written
+            invoice.save(update_fields=list(updated_fields))
+            self.balance_repository.apply_deltas(deltas)
         return invoice
 
-    def delete_invoice(self, invoice: Invoice) -> bool:
+    def update_invoice_fields(self, invoice_id: int, **updated_fields) -> bool:
+        """
+        Updates an invoice's columns by ID in one UPDATE, without loading it first.
+        Changes to the user, total or status also lock and read the old values to keep the ledger in step.
+
+        Returns:
+            bool: True if the invoice exists.
+        """
+        return self.bulk_update_invoice_fields([invoice_id], **updated_fields) > 0
+
+    def bulk_update_invoice_fields(self, invoice_ids: Sequence[int], **updated_fields) -> int:
         """
-        Deletes an invoice.
+        Sets the same column values on several invoices in one UPDATE.
+
+        Returns:
+            int: The number of invoices updated.
+        """
+        queryset = self.invoice_model.objects.filter(id__in=invoice_ids)
+        if not LEDGER_FIELDS & set(updated_fields):
+            return queryset.update(**updated_fields)
+        with transaction.atomic():
+            old = list(queryset.select_for_update().values_list('id', 'user_id', 'total_amount', 'status'))
+            if not old:
+                return 0
+            deltas = new_deltas()
+            for _, user_id, total, status in old:
+                add_invoice_delta(deltas, user_id, status, total, sign=-1)
+                add_invoice_delta(
+                    deltas,
+                    updated_fields.get('user_id', getattr(updated_fields.get('user'), 'id', user_id)),
+                    updated_fields.get('status', status),
+                    updated_fields.get('total_amount', total),
+                )
+            updated = self.invoice_model.objects.filter(id__in=[row[0] for row in old]).update(**updated_fields)
+            self.balance_repository.apply_deltas(deltas)
+        return updated
+
+    def bulk_update_invoices(self, invoices: Sequence[Invoice], fields: Sequence[str], batch_size: Optional[int] = None) -> int:
         """
-        invoice.delete()
+        Writes the given columns of several modified invoices, in batches of one UPDATE each.
+
+        Returns:
+            int: The number of invoices updated.
+        """
+        fields = list(fields)
+        if not invoices:
+            return 0
+        if not LEDGER_FIELDS & set(fields):
+            return self.invoice_model.objects.bulk_update(invoices, fields, batch_size=batch_size)
+        with transaction.atomic():
+            old = {
+                invoice_id: row for invoice_id, *row in
+                self.invoice_model.objects.filter(id__in=[invoice.id for invoice in invoices]).select_for_update().values_list('id', 'user_id', 'total_amount', 'status')
+            }
+            # Invoices deleted meanwhile are not written; columns outside `fields` keep their stored values
+            invoices = [invoice for invoice in invoices if invoice.id in old]
+            if not invoices:
+                return 0
+            deltas = new_deltas()
+            for invoice in invoices:
+                user_id, total, status = old[invoice.id]
+                add_invoice_delta(deltas, user_id, status, total, sign=-1)
+                add_invoice_delta(
+                    deltas,
+                    invoice.user_id if {'user', 'user_id'} & set(fields) else user_id,
+                    invoice.status if 'status' in fields else status,
+                    invoice.total_amount if 'total_amount' in fields else total,
+                )
+            updated = self.invoice_model.objects.bulk_update(invoices, fields, batch_size=batch_size)
+            self.balance_repository.apply_deltas(deltas)
+        return updated
+
+    def delete_invoice(self, invoice: Invoice) -> bool:
+        """
+        Deletes an invoice, removing the locked row's total from the ledger.
+
+        Returns:
+            bool: True if deletion was successful, False if the invoice no longer exists.
+        """
+        with transaction.atomic():
+            old = self.invoice_model.objects.filter(id=invoice.id).select_for_update().values_list('user_id', 'total_amount', 'status').first()
+            if old is None:
+                return False
+            user_id, total, status = old
+            deltas = new_deltas()
+            add_invoice_delta(deltas, user_id, status, total, sign=-1)
+            invoice.delete()
+            self.balance_repository.apply_deltas(deltas)
         return True
 
     def aggregate_user_invoices(self, user: User) -> float:
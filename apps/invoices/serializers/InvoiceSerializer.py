@@ -1,4 +1,5 @@
 from rest_framework import serializers # type: ignore
+from django.conf import settings
 from apps.invoices.models.InvoiceModel import Invoice
 
 class InvoiceSerializer(serializers.ModelSerializer):
@@ -19,3 +20,11 @@ class InvoiceSerializer(serializers.ModelSerializer):
         if value <= 0:
             raise serializers.ValidationError("Total amount must be a positive number.")
         return value
+
+
+class InvoiceStatusUpdateSerializer(serializers.Serializer):
+    """
+    Serializer for moving several invoices to one status.
+    """
+    ids = serializers.ListField(child=serializers.IntegerField(), min_length=1, max_length=settings.BULK_STATUS_UPDATE_MAX_IDS)
+    status = serializers.ChoiceField(choices=Invoice._meta.get_field('status').choices)
@@ -2,8 +2,9 @@ from apps.billing.repositories.BillingRepository import BillRepository
 from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
 from apps.authentication.models.UserModel import User
 from apps.invoices.models.InvoiceModel import Invoice
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
 from apps.billing.models.BillingModel import Bill
 from apps.invoices.tasks import generate_invoice_pdf, send_invoice_ready_email
 
@@ -70,6 +71,16 @@ class InvoiceService:
             return self.invoice_repository.update_invoice(invoice, **updated_fields)
         raise ObjectDoesNotExist(f"Invoice with ID {invoice_id} does not exist.")
 
+    def set_invoices_status(self, invoice_ids: Sequence[int], status: str) -> int:
+        """
+        Move several invoices to a status in one statement; paid invoices also settle their bills.
+        """
+        with transaction.atomic():
+            count = self.invoice_repository.set_invoices_status(invoice_ids, status)
+            if status == 'paid':
+                self.bill_repository.mark_invoice_bills_paid(invoice_ids)
+        return count
+
     def delete_invoice(self, invoice_id: int) -> bool:
         """
         Delete an invoice by its ID.
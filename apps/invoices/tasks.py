@@ -1,10 +1,12 @@
 from celery import shared_task # type: ignore
 from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
 from django.core.mail import send_mail
 from django.conf import settings
 from django.utils.timezone import now
 from django.template.loader import render_to_string
 from weasyprint import HTML # type: ignore
+from apps.monitoring.services.TaskTelemetryService import task_stage
 import os
 
 @shared_task
@@ -16,18 +18,21 @@ def generate_invoice_pdf(invoice_id: int) -> str:
         invoice = Invoice.objects.get(id=invoice_id)
 
         # Define the HTML content for the PDF (using Django's template engine)
-        html_content = render_to_string('templates/invoice_template.html', {'invoice': invoice})
+        with task_stage('template'):
+            html_content = render_to_string('templates/invoice_template.html', {'invoice': invoice})
 
         # Define the path where the PDF will be saved
         pdf_filename = f'invoice_{invoice.id}.pdf'
         pdf_path = os.path.join(settings.MEDIA_ROOT, 'invoices', pdf_filename)
 
-        # Generate the PDF using WeasyPrint
-        HTML(string=html_content).write_pdf(pdf_path)
+        # Generate the PDF using WeasyPrint: lay the pages out, then serialize them to disk
+        with task_stage('layout'):
+            document = HTML(string=html_content).render()
+        with task_stage('write'):
+            document.write_pdf(pdf_path)
 
-        # Update the invoice model with the PDF path
-        invoice.pdf = pdf_filename
-        invoice.save()
+        # Store only the PDF path: the invoice may have been paid or re-totalled while the PDF was rendered
+        InvoiceRepository().update_invoice_fields(invoice.id, pdf=pdf_filename)
 
         return pdf_filename
 
@@ -39,10 +44,11 @@ def send_invoice_ready_email(user_email: str, invoice_id: int) -> None:
     """
     Task to send an email notifying that the invoice is ready.
     """
-    send_mail(
-        subject="Your Invoice is Ready",
-        message=f"Invoice {invoice_id} has been generated and is ready for viewing.",
-        from_email=settings.DEFAULT_FROM_EMAIL,
-        recipient_list=[user_email],
-        fail_silently=False,
-    )
+    with task_stage('send'):
+        send_mail(
+            subject="Your Invoice is Ready",
+            message=f"Invoice {invoice_id} has been generated and is ready for viewing.",
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            recipient_list=[user_email],
+            fail_silently=False,
+        )
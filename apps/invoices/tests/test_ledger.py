@@ -0,0 +1,98 @@
+from datetime import date
+from decimal import Decimal
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+
+class InvoiceLedgerTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ledger', password='secret')
+        self.repository = InvoiceRepository()
+        self.balance_repository = BalanceRepository()
+
+    def assertNoDrift(self):
+        self.assertEqual(self.balance_repository.rebuild_range(self.user.id, self.user.id, dry_run=True), [])
+
+    def create_invoice(self, total_amount=Decimal('100.00')):
+        return self.repository.create_invoice(self.user, date(2025, 1, 1), date(2025, 1, 31), total_amount, date(2025, 2, 28))
+
+    def test_every_write_keeps_the_ledger_in_step(self):
+        invoice = self.create_invoice()
+        self.assertNoDrift()
+        second = self.create_invoice(Decimal('60.00'))
+        self.repository.update_invoice(invoice, total_amount=Decimal('90.00'), status='overdue')
+        self.assertNoDrift()
+        self.repository.update_invoice_fields(second.id, total_amount=Decimal('65.00'))
+        self.assertNoDrift()
+        self.repository.bulk_update_invoice_fields([invoice.id, second.id], status='unpaid')
+        self.assertNoDrift()
+        invoice.total_amount, second.status = Decimal('95.00'), 'overdue'
+        self.repository.bulk_update_invoices([invoice, second], ['total_amount', 'status'])
+        self.assertNoDrift()
+        self.repository.set_invoices_status([invoice.id], 'paid')
+        self.assertNoDrift()
+        self.repository.delete_invoice(second)
+        self.assertNoDrift()
+
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.invoices_overdue, balance.invoices_paid), (Decimal('0.00'), Decimal('95.00')))
+
+    def test_update_of_a_stale_instance_starts_from_the_stored_row(self):
+        invoice = self.create_invoice()
+        stale = Invoice.objects.get(id=invoice.id)
+        self.repository.mark_invoices_paid([invoice.id])
+
+        updated = self.repository.update_invoice(stale, total_amount=Decimal('80.00'))
+
+        self.assertEqual(updated.status, 'paid')
+        self.assertNoDrift()
+
+    def test_delete_of_a_stale_instance_removes_the_stored_row(self):
+        invoice = self.create_invoice()
+        stale = Invoice.objects.get(id=invoice.id)
+        self.repository.mark_invoices_paid([invoice.id])
+
+        self.assertTrue(self.repository.delete_invoice(stale))
+
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.invoices_unpaid, balance.invoices_paid), (Decimal('0.00'), Decimal('0.00')))
+        self.assertNoDrift()
+
+    def test_deleting_a_deleted_invoice_leaves_the_ledger_alone(self):
+        invoice = self.create_invoice()
+        stale = Invoice.objects.get(id=invoice.id)
+        self.repository.delete_invoice(invoice)
+
+        self.assertFalse(self.repository.delete_invoice(stale))
+        with self.assertRaises(Invoice.DoesNotExist):
+            self.repository.update_invoice(stale, total_amount=Decimal('80.00'))
+        self.assertNoDrift()
+
+    def test_bulk_update_writes_only_stored_invoices_and_listed_fields(self):
+        invoice, deleted = self.create_invoice(), self.create_invoice(Decimal('40.00'))
+        stale, gone = Invoice.objects.get(id=invoice.id), Invoice.objects.get(id=deleted.id)
+        self.repository.mark_invoices_paid([invoice.id])
+        self.repository.delete_invoice(deleted)
+        stale.total_amount, gone.total_amount = Decimal('80.00'), Decimal('50.00')
+
+        self.assertEqual(self.repository.bulk_update_invoices([stale, gone], ['total_amount']), 1)
+
+        self.assertEqual(Invoice.objects.get(id=invoice.id).status, 'paid')
+        balance = self.balance_repository.get_balance(self.user.id)
+        self.assertEqual((balance.invoices_unpaid, balance.invoices_paid), (Decimal('0.00'), Decimal('80.00')))
+        self.assertNoDrift()
+
+    def test_bulk_update_of_deleted_invoices_changes_nothing(self):
+        invoice = self.create_invoice()
+        stale = Invoice.objects.get(id=invoice.id)
+        self.repository.delete_invoice(invoice)
+        stale.status = 'paid'
+
+        self.assertEqual(self.repository.bulk_update_invoices([stale], ['status']), 0)
+        self.assertEqual(self.repository.bulk_update_invoice_fields([invoice.id], status='paid'), 0)
+        self.assertFalse(self.repository.update_invoice_fields(invoice.id, total_amount=Decimal('1.00')))
+        self.assertEqual(self.repository.set_invoices_status([invoice.id], 'paid'), 0)
+        self.assertNoDrift()
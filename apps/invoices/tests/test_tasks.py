@@ -0,0 +1,37 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+from django.test import TestCase
+from apps.authentication.models.UserModel import User
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
+
+try:
+    import weasyprint # type: ignore
+except ImportError:  # pragma: no cover
+    weasyprint = None
+
+
+class GenerateInvoicePdfTest(TestCase):
+    def setUp(self):
+        if weasyprint is None:
+            self.skipTest('weasyprint is not installed')
+        self.user = User.objects.create_user(username='pdf', password='secret')
+        self.invoice = InvoiceRepository().create_invoice(self.user, date(2025, 1, 1), date(2025, 1, 31), Decimal('100.00'), date(2025, 2, 28))
+
+    def test_pdf_path_is_stored_without_overwriting_concurrent_changes(self):
+        from apps.invoices.tasks import generate_invoice_pdf
+
+        def pay_while_rendering(path):
+            InvoiceRepository().set_invoices_status([self.invoice.id], 'paid')
+
+        with mock.patch('apps.invoices.tasks.render_to_string', return_value='<p>Invoice</p>'), \
+                mock.patch('apps.invoices.tasks.HTML') as html:
+            html.return_value.render.return_value.write_pdf.side_effect = pay_while_rendering
+            self.assertEqual(generate_invoice_pdf(self.invoice.id), f'invoice_{self.invoice.id}.pdf')
+
+        invoice = Invoice.objects.get(id=self.invoice.id)
+        self.assertEqual(invoice.status, 'paid')
+        self.assertEqual(invoice.pdf.name, f'invoice_{self.invoice.id}.pdf')
+        self.assertEqual(BalanceRepository().rebuild_range(self.user.id, self.user.id, dry_run=True), [])
@@ -2,11 +2,12 @@ from rest_framework.views import APIView # type: ignore
 from rest_framework.response import Response # type: ignore
 from rest_framework import status # type: ignore
 from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
 from rest_framework.permissions import IsAuthenticated, IsAdminUser # type: ignore
 from apps.billing.repositories.BillingRepository import BillRepository
 from apps.invoices.services.InvoiceService import InvoiceService
 from apps.invoices.repositories.InvoiceRepository import InvoiceRepository
-from apps.invoices.serializers.InvoiceSerializer import InvoiceSerializer
+from apps.invoices.serializers.InvoiceSerializer import InvoiceSerializer, InvoiceStatusUpdateSerializer
 from django.core.exceptions import ObjectDoesNotExist
 from typing import Optional
 
@@ -123,3 +124,34 @@ class InvoiceDetailView(APIView):
                 raise ObjectDoesNotExist(f"Invoice with ID {invoice_id} not found.")
         except ObjectDoesNotExist as e:
             return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+
+class AdminInvoiceStatusView(APIView):
+    """
+    Handles status changes of several invoices at once for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, invoice_service: Optional[InvoiceService] = None, **kwargs):
+        """
+        Dependency injection for InvoiceService.
+        """
+        super().__init__(**kwargs)
+        self.invoice_service = invoice_service or InvoiceService(InvoiceRepository(), bill_repository=BillRepository())
+
+    @swagger_auto_schema(
+        request_body=InvoiceStatusUpdateSerializer,
+        responses={200: openapi.Response('Number of invoices that changed status'), 400: "Bad Request"}
+    )
+    def post(self, request):
+        """
+        Admins: move several invoices to a status in one statement; paid invoices also settle their bills.
+        """
+        serializer = InvoiceStatusUpdateSerializer(data=request.data)
+        if serializer.is_valid():
+            try:
+                updated = self.invoice_service.set_invoices_status(serializer.validated_data['ids'], serializer.validated_data['status'])
+                return Response({'updated': updated}, status=status.HTTP_200_OK)
+            except Exception as e:
+                return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,32 @@
+import json
+from django.contrib import admin
+from django.utils.html import format_html
+from apps.monitoring.models.SlowQueryModel import SlowQuery
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the slow-query log. Sequential scans on large tables such as
+    consumption, bills or invoices usually point at a missing index.
+    """
+    list_display = ['captured_at', 'duration_ms', 'repository_method', 'seq_scans', 'plan_cost', 'short_fingerprint']
+    list_filter = ['database', 'repository_method']
+    search_fields = ['fingerprint', 'repository_method']
+    date_hierarchy = 'captured_at'
+    fields = ['captured_at', 'database', 'duration_ms', 'repository_method', 'call_site', 'fingerprint', 'sql', 'param_types', 'stack', 'seq_scans', 'plan_cost', 'formatted_plan', 'explain_error']
+    readonly_fields = fields
+
+    @admin.display(description='Statement')
+    def short_fingerprint(self, obj):
+        return obj.fingerprint[:120]
+
+    @admin.display(description='Plan')
+    def formatted_plan(self, obj):
+        return format_html('<pre>{}</pre>', json.dumps(obj.plan, indent=2)) if obj.plan else '-'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.monitoring'
+
+    def ready(self):
+        if settings.SLOW_QUERY_LOG_ENABLED:
+            from apps.monitoring.services.SlowQueryService import install
+            connection_created.connect(install, dispatch_uid='monitoring-slow-query-recorder')
@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.utils.timezone import now
+from apps.monitoring.services.BenchmarkService import CASES, SCALES, BenchmarkService
+
+
+class Command(BaseCommand):
+    """
+    Benchmarks the repository and service methods at several data scales and compares the
+    wall times and query counts with the stored baseline.
+    """
+    help = 'Run the repository/service benchmarks in a throwaway test database and report regressions against the baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='1k,100k', help=f"Comma-separated dataset sizes, of {', '.join(SCALES)}.")
+        parser.add_argument('--repeat', type=int, default=settings.BENCHMARK_REPEAT, help='Timed repetitions per case.')
+        parser.add_argument('--case', action='append', default=[], help='Only run cases whose name contains this text. Repeatable.')
+        parser.add_argument('--threshold', type=float, default=settings.BENCHMARK_REGRESSION_THRESHOLD,
+                            help='Allowed slowdown of a median against the baseline, e.g. 0.25 for 25%%.')
+        parser.add_argument('--min-delta-ms', type=float, default=settings.BENCHMARK_MIN_DELTA_MS,
+                            help='Slowdowns below this many ms are treated as noise.')
+        parser.add_argument('--output', help='Where to write the results. Defaults to BENCHMARK_ROOT/runs/.')
+        parser.add_argument('--baseline', help='Baseline to compare with. Defaults to BENCHMARK_ROOT/baseline-<vendor>.json.')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline.')
+        parser.add_argument('--list-uncovered', action='store_true', help='Only list the repository and service methods without a case.')
+
+    def handle(self, *args, **options):
+        service = BenchmarkService()
+        if options['list_uncovered']:
+            uncovered = service.get_uncovered_methods()
+            for name in uncovered:
+                self.stdout.write(name)
+            self.stdout.write(self.style.WARNING(f'{len(uncovered)} methods without a benchmark, {len(CASES)} with one.'))
+            return
+
+        scales = [scale.strip() for scale in options['scales'].split(',') if scale.strip()]
+        unknown = [scale for scale in scales if scale not in SCALES]
+        if unknown:
+            raise CommandError(f"Unknown scales: {', '.join(unknown)}. Choose from {', '.join(SCALES)}.")
+        names = sorted(name for name in CASES if not options['case'] or any(text in name for text in options['case']))
+        if not names:
+            raise CommandError('No benchmark matches --case.')
+
+        run = {'vendor': connection.vendor, 'started_at': now().isoformat(timespec='seconds'), 'repeat': options['repeat'], 'scales': {}}
+        # Slow statements of the seeding must not be queued for EXPLAIN capture
+        with override_settings(SLOW_QUERY_SAMPLE_RATE=0.0):
+            databases = setup_databases(verbosity=0, interactive=False)
+            try:
+                for scale in scales:
+                    call_command('flush', interactive=False, verbosity=0)
+                    self.stdout.write(f'Seeding the {scale} dataset...')
+                    data = service.seed(scale)
+                    run['scales'][scale] = service.run(data, options['repeat'], names)
+            finally:
+                teardown_databases(databases, verbosity=0)
+
+        baseline = service.load_baseline(run['vendor'], options['baseline'])
+        for scale, results in run['scales'].items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f'{scale} ({run["vendor"]})'))
+            for name, measured in results.items():
+                before = (baseline or {}).get('scales', {}).get(scale, {}).get(name)
+                line = f"  {name:<60} {measured['median_ms']:>10.3f} ms {measured['queries']:>5} queries"
+                if before:
+                    change = (measured['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0.0
+                    line += f"  ({change:+.0f}%, {measured['queries'] - before['queries']:+d} queries)"
+                self.stdout.write(line)
+        self.stdout.write(f'Results written to {service.save_run(run, options["output"])}')
+
+        if options['save_baseline']:
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {service.save_baseline(run, options["baseline"])}'))
+            return
+        if baseline is None:
+            self.stdout.write(self.style.WARNING('No baseline to compare with; store one with --save-baseline.'))
+            return
+        regressions = service.compare(run, baseline, options['threshold'], options['min_delta_ms'])
+        for regression in regressions:
+            measured, before = regression['measured'], regression['baseline']
+            self.stdout.write(self.style.ERROR(
+                f"{regression['scale']} {regression['case']}: {before['median_ms']} -> {measured['median_ms']} ms, "
+                f"{before['queries']} -> {measured['queries']} queries"
+            ))
+        if regressions:
+            raise CommandError(f'{len(regressions)} benchmarks regressed beyond the baseline.')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline.'))
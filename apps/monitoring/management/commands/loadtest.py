@@ -0,0 +1,100 @@
+import logging
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.db import connection
+from django.test.utils import override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+from django.utils.timezone import now
+from apps.monitoring.services.BenchmarkService import SCALES, BenchmarkService
+from apps.monitoring.services.LoadTestService import DEFAULT_MIX, LoadTestService, parse_mix
+
+
+class Command(BaseCommand):
+    """
+    Load tests the HTTP API in-process, through the WSGI and/or ASGI app, against a seeded
+    throwaway test database.
+    """
+    help = 'Send a concurrent mix of consumption, billing and invoice requests in-process and report throughput, latency percentiles and queries per request.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interface', choices=['wsgi', 'asgi', 'both'], default='wsgi', help='App to drive; asgi requires httpx.')
+        parser.add_argument('--scale', choices=list(SCALES), default='1k', help='Dataset size, as for the benchmark command.')
+        parser.add_argument('--concurrency', type=int, default=settings.LOAD_TEST_CONCURRENCY, help='Virtual users sending requests at once.')
+        parser.add_argument('--requests', type=int, default=settings.LOAD_TEST_REQUESTS, help='Measured requests per interface.')
+        parser.add_argument('--warmup', type=int, default=settings.LOAD_TEST_WARMUP, help='Unmeasured requests sent first.')
+        parser.add_argument('--mix', default=','.join(f'{kind}={weight}' for kind, weight in DEFAULT_MIX.items()),
+                            help='Weighted request kinds, e.g. consumption-list=4,bills-list=1.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the request sequence and arguments.')
+        parser.add_argument('--output', help='Where to write the report. Defaults to BENCHMARK_ROOT/loadtests/.')
+        parser.add_argument('--compare', help='An earlier report to show the changes against.')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1 or options['requests'] < 1 or options['warmup'] < 0:
+            raise CommandError('--concurrency and --requests must be positive and --warmup not negative.')
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        service = LoadTestService()
+        interfaces = ['wsgi', 'asgi'] if options['interface'] == 'both' else [options['interface']]
+        try:
+            for interface in interfaces:
+                service.check_interface(interface)
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e))
+        previous = None
+        if options['compare']:
+            previous = service.load_report(options['compare'])
+            if previous is None:
+                raise CommandError(f"No report at {options['compare']}.")
+
+        report = {
+            'vendor': connection.vendor, 'started_at': now().isoformat(timespec='seconds'), 'scale': options['scale'],
+            'concurrency': options['concurrency'], 'requests': options['requests'], 'mix': mix, 'seed': options['seed'], 'interfaces': {},
+        }
+        plan = service.plan(mix, options['requests'], options['seed'])
+        warmup = service.plan(mix, options['warmup'], options['seed'] + 1)
+        # DEBUG off as in production; every response reports its query count in Server-Timing,
+        # without the instrumentation's per-request log line
+        sql_logger = logging.getLogger('apps.monitoring.sql')
+        sql_logger_disabled, sql_logger.disabled = sql_logger.disabled, True
+        setup_test_environment(debug=False)
+        try:
+            with override_settings(SLOW_QUERY_SAMPLE_RATE=0.0, SQL_INSTRUMENTATION_ENABLED=True, SQL_INSTRUMENTATION_SAMPLE_RATE=1.0):
+                databases = setup_databases(verbosity=0, interactive=False)
+                try:
+                    self.stdout.write(f"Seeding the {options['scale']} dataset...")
+                    data = BenchmarkService().seed(options['scale'])
+                    users = service.prepare_users(data, options['concurrency'])
+                    for interface in interfaces:
+                        if warmup:
+                            service.run(interface, data, users, warmup, options['seed'] + 1)
+                        report['interfaces'][interface] = service.run(interface, data, users, plan, options['seed'])
+                except ValueError as e:
+                    raise CommandError(str(e))
+                finally:
+                    teardown_databases(databases, verbosity=0)
+        finally:
+            teardown_test_environment()
+            sql_logger.disabled = sql_logger_disabled
+
+        for interface, summary in report['interfaces'].items():
+            before = (previous or {}).get('interfaces', {}).get(interface)
+            line = f"{interface} ({report['vendor']}, {options['scale']}, {options['concurrency']} users): {summary['throughput_rps']} requests/s"
+            if before and before['throughput_rps']:
+                line += f" ({(summary['throughput_rps'] - before['throughput_rps']) / before['throughput_rps'] * 100:+.0f}%)"
+            self.stdout.write(self.style.MIGRATE_HEADING(line))
+            self.stdout.write(f"  {'':<18} {'requests':>8} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'queries':>7}")
+            for kind, stats in [('total', summary['total'])] + list(summary['kinds'].items()):
+                queries = stats['queries_per_request']
+                line = (f"  {kind:<18} {stats['requests']:>8} {stats['errors']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+                        f"{stats['p99_ms']:>9.2f} {queries if queries is not None else '-':>7}")
+                earlier = (before or {}).get('total') if kind == 'total' else (before or {}).get('kinds', {}).get(kind)
+                if earlier and earlier['p95_ms']:
+                    line += f"  (p95 {(stats['p95_ms'] - earlier['p95_ms']) / earlier['p95_ms'] * 100:+.0f}%)"
+                self.stdout.write(line)
+            if summary['total']['errors']:
+                self.stdout.write(self.style.WARNING(f"  {summary['total']['errors']} requests failed."))
+            if summary['skipped']:
+                self.stdout.write(self.style.WARNING(f"  {summary['skipped']} detail requests skipped: their users have no bills or invoices."))
+        self.stdout.write(f'Report written to {service.save_report(report, options["output"])}')
@@ -0,0 +1,55 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError # type: ignore
+from django.utils.dateparse import parse_date
+from django.utils.timezone import now
+from apps.monitoring.repositories.SyntheticDataRepository import SyntheticDataRepository
+from apps.monitoring.services.SyntheticDataService import SyntheticDataService
+
+
+class Command(BaseCommand):
+    """
+    Fills the database with a large, reproducible dataset for load and scale tests.
+    """
+    help = 'Generate synthetic users with daily readings, monthly bills and invoices. The same --seed gives the same data.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create.')
+        parser.add_argument('--days', type=int, default=365, help='Days of readings per user, ending at --end.')
+        parser.add_argument('--end', help='Last day of readings (YYYY-MM-DD). Defaults to yesterday; pass it for reproducible runs.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random generator.')
+        parser.add_argument('--prefix', default='synthetic-', help='Username prefix of the generated users.')
+        parser.add_argument('--price-per-kwh', type=float, default=0.25, help='Flat price the bill amounts are computed with.')
+        parser.add_argument('--intervals', action='store_true', help='Also store 15-minute interval readings for every day.')
+        parser.add_argument('--force', action='store_true', help='Allow seeding when DEBUG is off.')
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['force']:
+            raise CommandError('DEBUG is off; pass --force to seed synthetic data into this database.')
+        if options['users'] < 1 or options['days'] < 1:
+            raise CommandError('--users and --days must be positive.')
+        end_date = parse_date(options['end']) if options['end'] else now().date() - timedelta(days=1)
+        if end_date is None:
+            raise CommandError('--end must be a date (YYYY-MM-DD).')
+        start_date = end_date - timedelta(days=options['days'] - 1)
+
+        started = time.monotonic()
+
+        def report(totals):
+            elapsed = time.monotonic() - started
+            self.stdout.write(f"{totals['users']}/{options['users']} users, {totals['consumption']} readings ({totals['consumption'] / elapsed:,.0f}/s)")
+
+        service = SyntheticDataService(SyntheticDataRepository())
+        try:
+            totals = service.seed(
+                options['users'], start_date, end_date, seed=options['seed'], prefix=options['prefix'],
+                price_per_kwh=options['price_per_kwh'], intervals=options['intervals'], progress=report,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {totals['users']} users, {totals['consumption']} readings, {totals['interval_readings']} interval readings, "
+            f"{totals['bills']} bills ({totals['bill_consumption_links']} reading links) and {totals['invoices']} invoices "
+            f"({totals['invoice_bill_links']} bill links) for {start_date} to {end_date} in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,57 @@
+from typing import Any, Callable
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.authentication import BasicAuthentication # type: ignore
+from rest_framework.exceptions import AuthenticationFailed # type: ignore
+from apps.monitoring.services.ProfilingService import ProfilingService
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAMETER = 'profile'
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a single request when an admin asks for it with an `X-Profile: 1` header or a
+    `?profile=1` query parameter, and stores the report for /monitoring/profiles/.
+
+    Requests without the trigger pass straight through. Admins are recognized from the session
+    or, as the API views do, from basic auth credentials; anyone else's trigger is ignored.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.service = ProfilingService()
+
+    def __call__(self, request: Any) -> Any:
+        if not self._requested(request) or not self._is_admin(request):
+            return self.get_response(request)
+        response, capture = self.service.profile(lambda: self.get_response(request))
+        if capture is None:
+            response['X-Profile-Id'] = 'busy'  # Another request of this process is being profiled
+            return response
+        user = getattr(request, 'user', None)
+        report_id = self.service.save(capture, {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'user': user.get_username() if user is not None else '',
+        })
+        response['X-Profile-Id'] = report_id
+        return response
+
+    @staticmethod
+    def _requested(request: Any) -> bool:
+        return request.META.get(PROFILE_HEADER, '') in ('1', 'true') or request.GET.get(PROFILE_PARAMETER, '') in ('1', 'true')
+
+    @staticmethod
+    def _is_admin(request: Any) -> bool:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+        try:
+            authenticated = BasicAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return bool(authenticated and authenticated[0].is_staff)
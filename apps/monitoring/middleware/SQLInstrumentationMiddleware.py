@@ -0,0 +1,42 @@
+import random
+from contextlib import ExitStack
+from typing import Any, Callable
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from apps.monitoring.services.SQLInstrumentationService import QueryRecorder, SQLInstrumentationService
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Opt-in middleware recording each request's query count, SQL time and repeated statements.
+
+    Disabled (the default), Django drops it from the stack at startup, so it costs nothing.
+    Enabled, the sampled requests get a `Server-Timing` header and a log line, and are added
+    to the per-route summary at /monitoring/sql/.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.SQL_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.service = SQLInstrumentationService()
+
+    def __call__(self, request: Any) -> Any:
+        if random.random() >= settings.SQL_INSTRUMENTATION_SAMPLE_RATE:
+            return self.get_response(request)
+        recorder = QueryRecorder(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        match = getattr(request, 'resolver_match', None)
+        route = match.route if match is not None else 'unresolved'
+        report = self.service.record(request.method, route, response.status_code, recorder)
+        timings = [f'sql;dur={report["sql_ms"]};desc="{report["queries"]} queries"']
+        if report['repeated']:
+            timings.append(f'sql-repeated;desc="{len(report["repeated"])} statements run {settings.SQL_N_PLUS_ONE_THRESHOLD}+ times"')
+        if response.has_header('Server-Timing'):
+            timings.insert(0, response['Server-Timing'])
+        response['Server-Timing'] = ', '.join(timings)
+        return response
@@ -0,0 +1,36 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fingerprint', models.TextField()),
+                ('sql', models.TextField()),
+                ('database', models.CharField(max_length=50)),
+                ('duration_ms', models.FloatField()),
+                ('repository_method', models.CharField(blank=True, default='', max_length=200)),
+                ('call_site', models.CharField(blank=True, default='', max_length=300)),
+                ('stack', models.TextField(blank=True, default='')),
+                ('plan', models.JSONField(blank=True, null=True)),
+                ('plan_cost', models.FloatField(blank=True, null=True)),
+                ('seq_scans', models.JSONField(blank=True, default=list)),
+                ('explain_error', models.TextField(blank=True, default='')),
+                ('captured_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name_plural': 'slow queries',
+                'ordering': ['-captured_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:10
+
+from django.db import migrations, models
+
+
+def delete_captures_with_values(apps, schema_editor):
+    # Earlier captures stored statements with their parameter values inlined
+    apps.get_model('monitoring', 'SlowQuery').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_slow_query_log'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='slowquery',
+            name='param_types',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(delete_captures_with_values, migrations.RunPython.noop),
+    ]
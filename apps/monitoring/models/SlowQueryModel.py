@@ -0,0 +1,27 @@
+from django.db import models
+
+class SlowQuery(models.Model):
+    """
+    Model of a captured slow query with its execution plan. The table is bounded to
+    SLOW_QUERY_LOG_MAX_ROWS rows; the oldest captures are deleted first.
+    """
+    fingerprint = models.TextField()  # Statement shape, literals replaced by `?`
+    sql = models.TextField()  # The statement with its placeholders; parameter values are never stored
+    param_types = models.JSONField(null=True, blank=True)  # Type names of the parameters; null for statements without any
+    database = models.CharField(max_length=50)  # Connection alias the statement ran on
+    duration_ms = models.FloatField()
+    repository_method = models.CharField(max_length=200, blank=True, default='')  # e.g. 'BillRepository.get_bills_by_user'
+    call_site = models.CharField(max_length=300, blank=True, default='')
+    stack = models.TextField(blank=True, default='')  # Project frames, outermost first
+    plan = models.JSONField(null=True, blank=True)  # EXPLAIN (FORMAT JSON, GENERIC_PLAN) output
+    plan_cost = models.FloatField(null=True, blank=True)  # Planner's total cost estimate
+    seq_scans = models.JSONField(default=list, blank=True)  # Tables read by sequential scan: candidates for a missing index
+    explain_error = models.TextField(blank=True, default='')
+    captured_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['-captured_at']
+        verbose_name_plural = 'slow queries'
+
+    def __str__(self) -> str:
+        return f'{self.duration_ms:.0f} ms: {self.fingerprint[:80]}'
@@ -0,0 +1 @@
+from .SlowQueryModel import SlowQuery
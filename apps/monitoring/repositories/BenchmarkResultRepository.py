@@ -0,0 +1,59 @@
+import json
+import os
+from typing import Any, Dict, Optional
+from django.conf import settings
+
+
+class BenchmarkResultRepository:
+    """
+    Repository class for benchmark runs, baselines and load test reports, stored as JSON files in BENCHMARK_ROOT.
+
+    Runs are named after their start time and database vendor; the baseline of a vendor is
+    `baseline-<vendor>.json`, meant to be committed so every checkout compares against it.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        """
+        Initializes the BenchmarkResultRepository.
+
+        Args:
+            root (Optional[str]): Directory of the results. Defaults to settings.BENCHMARK_ROOT.
+        """
+        self.root: str = root or settings.BENCHMARK_ROOT
+
+    def baseline_path(self, vendor: str) -> str:
+        """
+        Returns the path of a database vendor's baseline.
+        """
+        return os.path.join(self.root, f'baseline-{vendor}.json')
+
+    def run_path(self, run: Dict[str, Any]) -> str:
+        """
+        Returns the default path of a run's results.
+        """
+        return os.path.join(self.root, 'runs', f"{run['started_at'].replace(':', '')}-{run['vendor']}.json")
+
+    def load_test_path(self, report: Dict[str, Any]) -> str:
+        """
+        Returns the default path of a load test report.
+        """
+        return os.path.join(self.root, 'loadtests', f"{report['started_at'].replace(':', '')}-{report['vendor']}.json")
+
+    def save(self, run: Dict[str, Any], path: str) -> str:
+        """
+        Writes a run to `path` and returns the path.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(run, f, indent=2, sort_keys=True)
+            f.write('\n')
+        return path
+
+    def load(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Reads a run or baseline, or returns None when the file does not exist.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
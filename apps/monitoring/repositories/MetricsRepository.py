@@ -0,0 +1,59 @@
+import glob
+import json
+import os
+import tempfile
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+
+
+class MetricsRepository:
+    """
+    Repository class for the metric snapshots of the processes of one host.
+
+    Each process writes its own file and replaces it atomically from a temporary file unique to the
+    write, so gunicorn workers, Celery children and threads never write to the same file and a
+    reader never sees a partial snapshot.
+    """
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Initializes the MetricsRepository.
+
+        Args:
+            directory (Optional[str]): Directory shared by the processes. Defaults to settings.METRICS_MULTIPROC_DIR;
+            without one, every process only reports its own metrics.
+        """
+        self.directory: Optional[str] = directory or settings.METRICS_MULTIPROC_DIR
+
+    def write_snapshot(self, worker_id: str, snapshot: Dict[str, Any]) -> None:
+        """
+        Replaces the process's snapshot file.
+        """
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=f'.{worker_id}-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, os.path.join(self.directory, f'{worker_id}.json'))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def read_snapshots(self, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Reads every process's snapshot, except the one of `exclude`.
+        """
+        if not self.directory:
+            return []
+        snapshots = []
+        for path in sorted(glob.glob(os.path.join(self.directory, '*.json'))):
+            if exclude and os.path.basename(path) == f'{exclude}.json':
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Removed or replaced while listing
+        return snapshots
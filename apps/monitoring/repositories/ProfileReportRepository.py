@@ -0,0 +1,99 @@
+import glob
+import json
+import os
+import re
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+
+REPORT_ID_PATTERN = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+REPORT_KINDS = {'pstats': '.pstats', 'collapsed': '.collapsed'}
+
+
+class ProfileReportRepository:
+    """
+    Repository class for the bounded on-disk store of request profiles.
+
+    A report is a `.pstats` file, a `.collapsed` stack file and a `.json` metadata file sharing
+    one ID. IDs start with the UTC time, so sorting them orders reports by age; saving a report
+    evicts the oldest ones beyond PROFILING_MAX_REPORTS or PROFILING_MAX_BYTES.
+    """
+
+    def __init__(self, root: Optional[str] = None) -> None:
+        """
+        Initializes the ProfileReportRepository.
+
+        Args:
+            root (Optional[str]): Directory of the store. Defaults to settings.PROFILING_ROOT.
+        """
+        self.root: str = root or settings.PROFILING_ROOT
+
+    def path(self, report_id: str, kind: str) -> Optional[str]:
+        """
+        Returns the path of one file of a report, or None for an unknown ID or kind.
+        """
+        if not REPORT_ID_PATTERN.match(report_id) or kind not in REPORT_KINDS:
+            return None
+        path = os.path.join(self.root, report_id + REPORT_KINDS[kind])
+        return path if os.path.exists(path) else None
+
+    def save(self, report_id: str, metadata: Dict[str, Any], collapsed: str, write_pstats: Any) -> None:
+        """
+        Stores a report and evicts the oldest reports over the limits.
+
+        Args:
+            report_id (str): The report's ID.
+            metadata (Dict[str, Any]): Request and summary data, listed by `list_reports`.
+            collapsed (str): Collapsed stacks, one `frame;frame;frame count` line per stack.
+            write_pstats (Callable[[str], None]): Writes the pstats dump to the given path.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        base = os.path.join(self.root, report_id)
+        write_pstats(base + REPORT_KINDS['pstats'])
+        with open(base + REPORT_KINDS['collapsed'], 'w') as f:
+            f.write(collapsed)
+        # Metadata last: a report is listed only once its files are complete
+        with open(base + '.json', 'w') as f:
+            json.dump(metadata, f)
+        self.evict()
+
+    def list_reports(self) -> List[Dict[str, Any]]:
+        """
+        Lists the stored reports' metadata, newest first.
+        """
+        reports = []
+        for path in sorted(glob.glob(os.path.join(self.root, '*.json')), reverse=True):
+            try:
+                with open(path) as f:
+                    reports.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # Evicted while listing
+        return reports
+
+    def evict(self) -> List[str]:
+        """
+        Deletes the oldest reports until the store is within PROFILING_MAX_REPORTS and PROFILING_MAX_BYTES.
+
+        Returns:
+            List[str]: The IDs of the deleted reports.
+        """
+        sizes: Dict[str, int] = {}
+        for path in glob.glob(os.path.join(self.root, '*')):
+            report_id = os.path.splitext(os.path.basename(path))[0]
+            try:
+                sizes[report_id] = sizes.get(report_id, 0) + os.path.getsize(path)
+            except OSError:
+                continue
+        report_ids = sorted(sizes)
+        total = sum(sizes.values())
+        evicted = []
+        # The newest report is always kept, even when it alone exceeds the byte limit
+        while len(report_ids) > 1 and (len(report_ids) > settings.PROFILING_MAX_REPORTS or total > settings.PROFILING_MAX_BYTES):
+            report_id = report_ids.pop(0)
+            total -= sizes[report_id]
+            for path in glob.glob(os.path.join(self.root, report_id + '.*')):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            evicted.append(report_id)
+        return evicted
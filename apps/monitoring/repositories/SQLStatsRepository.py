@@ -0,0 +1,19 @@
+from typing import Optional
+from django.conf import settings
+from apps.monitoring.repositories.WorkerSnapshotRepository import WorkerSnapshotRepository
+
+
+class SQLStatsRepository(WorkerSnapshotRepository):
+    """
+    Repository class for the per-route SQL statistics each web worker publishes.
+    """
+    namespace = 'sql-stats'
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        """
+        Initializes the SQLStatsRepository.
+
+        Args:
+            cache_alias (Optional[str]): Cache holding the snapshots. Defaults to settings.SQL_INSTRUMENTATION_CACHE.
+        """
+        super().__init__(cache_alias or settings.SQL_INSTRUMENTATION_CACHE, settings.SQL_INSTRUMENTATION_SNAPSHOT_TIMEOUT)
@@ -0,0 +1,86 @@
+import itertools
+import json
+import re
+from typing import Any, Dict, Optional, Type
+from django.db import connections, transaction
+from apps.monitoring.models.SlowQueryModel import SlowQuery
+
+PLACEHOLDER = re.compile(r'%\((\w+)\)s|%s|%%')
+
+
+def numbered_placeholders(sql: str) -> str:
+    """
+    Rewrites a statement's driver placeholders (`%s`, `%(name)s`) as PostgreSQL's `$1`, `$2`, ...,
+    the form EXPLAIN (GENERIC_PLAN) accepts, and unescapes `%%`.
+    """
+    numbers = itertools.count(1)
+    names: Dict[str, int] = {}
+
+    def replace(match: Any) -> str:
+        if match.group(0) == '%%':
+            return '%'
+        if match.group(1) is None:
+            return f'${next(numbers)}'
+        if match.group(1) not in names:
+            names[match.group(1)] = next(numbers)
+        return f'${names[match.group(1)]}'
+
+    return PLACEHOLDER.sub(replace, sql)
+
+
+class SlowQueryRepository:
+    """
+    Repository class for the bounded slow-query log and the execution plans stored in it.
+    """
+
+    def __init__(self, slow_query_model: Optional[Type[SlowQuery]] = None) -> None:
+        """
+        Initializes the SlowQueryRepository.
+
+        Args:
+            slow_query_model (Optional[Type[SlowQuery]]): The SlowQuery model class. Defaults to SlowQuery.
+        """
+        self.slow_query_model: Type[SlowQuery] = slow_query_model or SlowQuery
+
+    def explain(self, database: str, sql: str, parameterized: bool = True) -> Any:
+        """
+        Returns the generic plan of a statement with placeholders from EXPLAIN (FORMAT JSON, GENERIC_PLAN),
+        without executing it or knowing its parameter values.
+
+        Args:
+            database (str): The connection alias to plan on.
+            sql (str): The statement with its driver placeholders.
+            parameterized (bool): Whether the statement was run with parameters, so `%` in it is escaped.
+
+        Raises:
+            ValueError: The database has no generic plans (anything but PostgreSQL 16 or later).
+            DatabaseError: The statement could not be planned.
+        """
+        connection = connections[database]
+        if connection.vendor != 'postgresql':
+            raise ValueError(f'{connection.display_name} has no generic plans; plans need PostgreSQL 16 or later.')
+        statement = numbered_placeholders(sql) if parameterized else sql
+        # A savepoint, so a statement that cannot be planned does not abort an enclosing transaction
+        with transaction.atomic(using=database), connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON, GENERIC_PLAN) {statement}')
+            plan = cursor.fetchone()[0]
+        return json.loads(plan) if isinstance(plan, str) else plan
+
+    def create(self, fields: Dict[str, Any]) -> SlowQuery:
+        """
+        Stores a captured slow query.
+        """
+        return self.slow_query_model.objects.create(**fields)
+
+    def trim(self, max_rows: int) -> int:
+        """
+        Deletes the oldest captures beyond `max_rows`.
+
+        Returns:
+            int: The number of deleted rows.
+        """
+        cutoff = self.slow_query_model.objects.order_by('-id').values_list('id', flat=True)[max_rows:max_rows + 1].first()
+        if cutoff is None:
+            return 0
+        deleted, _ = self.slow_query_model.objects.filter(id__lte=cutoff).delete()
+        return deleted
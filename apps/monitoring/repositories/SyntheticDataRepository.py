@@ -0,0 +1,157 @@
+from datetime import date
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type
+from django.db import connection, transaction
+from django.db.models import Max
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillingModel import Bill
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.consumption.models.IntervalReadingModel import IntervalReading
+from apps.consumption.repositories.ConsumptionPartitionRepository import ConsumptionPartitionRepository, add_months, month_start
+from apps.invoices.models.InvoiceModel import Invoice
+
+USER_BATCH_SIZE = 2000  # Users per bulk INSERT
+EXECUTEMANY_BATCH_SIZE = 50000  # Rows per executemany() on backends without COPY
+
+
+class SyntheticDataRepository:
+    """
+    Repository class writing generated datasets at volume.
+
+    On PostgreSQL rows are streamed with COPY, elsewhere (SQLite in development) with executemany.
+    Neither path builds model instances, so tens of millions of rows stay cheap. Many-to-many links
+    are derived in the database with INSERT ... SELECT over the rows written by the current run.
+    """
+
+    def __init__(self, partition_repository: Optional[ConsumptionPartitionRepository] = None) -> None:
+        """
+        Initializes the SyntheticDataRepository.
+
+        Args:
+            partition_repository (Optional[ConsumptionPartitionRepository]): Creates missing monthly consumption
+                partitions. Defaults to a new ConsumptionPartitionRepository.
+        """
+        self.partition_repository = partition_repository or ConsumptionPartitionRepository()
+
+    def usernames_taken(self, prefix: str) -> bool:
+        """
+        Checks whether users with the given username prefix already exist.
+        """
+        return User.objects.filter(username__startswith=prefix).exists()
+
+    def create_users(self, usernames: Sequence[str], password_hash: str, joined: Any) -> List[int]:
+        """
+        Creates customer users sharing one password hash.
+
+        Returns:
+            List[int]: The new users' IDs, in the order of `usernames`.
+        """
+        users = User.objects.bulk_create(
+            [User(username=username, email=f'{username}@example.com', password=password_hash, role='customer', date_joined=joined) for username in usernames],
+            batch_size=USER_BATCH_SIZE,
+        )
+        return [user.id for user in users]  # Set by INSERT ... RETURNING on PostgreSQL and SQLite
+
+    def get_max_ids(self) -> Tuple[int, int, int]:
+        """
+        Returns the highest consumption, bill and invoice IDs, marking where this run's rows start.
+        """
+        return tuple(  # type: ignore
+            model.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+            for model in (Consumption, Bill, Invoice)
+        )
+
+    def ensure_partitions(self, start_date: date, end_date: date) -> List[str]:
+        """
+        Creates the monthly consumption partitions the period needs (PostgreSQL only), so the
+        readings do not all land in the default partition.
+        """
+        if not self.partition_repository.is_partitioned():
+            return []
+        existing = set(self.partition_repository.list_partition_months())
+        created = []
+        month = month_start(start_date)
+        while month <= end_date:
+            if month not in existing:
+                created.append(self.partition_repository.create_partition(month))
+            month = add_months(month, 1)
+        return created
+
+    def insert_consumption(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Writes (user_id, date, consumption, unit, is_estimated) rows.
+        """
+        self._insert(Consumption, ['user_id', 'date', 'consumption', 'unit', 'is_estimated'], rows)
+
+    def insert_interval_readings(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Writes (user_id, meter_id, date, interval_minutes, packed_values, total, unit) rows.
+        """
+        self._insert(IntervalReading, ['user_id', 'meter_id', 'date', 'interval_minutes', 'packed_values', 'total', 'unit'], rows)
+
+    def insert_bills(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Writes (user_id, date, amount, status, period_start, period_end, billed_kwh) rows.
+        """
+        self._insert(Bill, ['user_id', 'date', 'amount', 'status', 'period_start', 'period_end', 'billed_kwh'], rows)
+
+    def insert_invoices(self, rows: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Writes (user_id, billing_period_start, billing_period_end, total_amount, status, due_date, created_at) rows.
+        """
+        self._insert(Invoice, ['user_id', 'billing_period_start', 'billing_period_end', 'total_amount', 'status', 'due_date', 'created_at'], rows)
+
+    def link_bill_consumption(self, consumption_after: int, bill_after: int) -> int:
+        """
+        Links every new bill to the new readings of its user and period.
+
+        Returns:
+            int: The number of links created.
+        """
+        through = Bill.consumption.through._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO "{through}" (bill_id, consumption_id) '
+                f'SELECT b.id, c.id FROM "{Bill._meta.db_table}" b '
+                f'JOIN "{Consumption._meta.db_table}" c ON c.user_id = b.user_id AND c.date BETWEEN b.period_start AND b.period_end '
+                f'WHERE b.id > %s AND c.id > %s',
+                [bill_after, consumption_after],
+            )
+            return cursor.rowcount
+
+    def link_invoice_bills(self, bill_after: int, invoice_after: int) -> int:
+        """
+        Links every new invoice to the new bill of its user and billing period.
+
+        Returns:
+            int: The number of links created.
+        """
+        through = Invoice.bills.through._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO "{through}" (invoice_id, bill_id) '
+                f'SELECT i.id, b.id FROM "{Invoice._meta.db_table}" i '
+                f'JOIN "{Bill._meta.db_table}" b ON b.user_id = i.user_id '
+                f'AND b.period_start = i.billing_period_start AND b.period_end = i.billing_period_end '
+                f'WHERE i.id > %s AND b.id > %s',
+                [invoice_after, bill_after],
+            )
+            return cursor.rowcount
+
+    def _insert(self, model: Type[Any], columns: List[str], rows: Iterable[Tuple[Any, ...]]) -> None:
+        table = model._meta.db_table
+        column_list = ', '.join(f'"{column}"' for column in columns)
+        with transaction.atomic(), connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                with cursor.copy(f'COPY "{table}" ({column_list}) FROM STDIN') as copy:
+                    for row in rows:
+                        copy.write_row(row)
+                return
+            statement = f'INSERT INTO "{table}" ({column_list}) VALUES ({", ".join(["%s"] * len(columns))})'
+            batch: List[Tuple[Any, ...]] = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == EXECUTEMANY_BATCH_SIZE:
+                    cursor.executemany(statement, batch)
+                    batch = []
+            if batch:
+                cursor.executemany(statement, batch)
@@ -0,0 +1,19 @@
+from typing import Optional
+from django.conf import settings
+from apps.monitoring.repositories.WorkerSnapshotRepository import WorkerSnapshotRepository
+
+
+class TaskTelemetryRepository(WorkerSnapshotRepository):
+    """
+    Repository class for the per-minute Celery task statistics each worker process publishes.
+    """
+    namespace = 'task-telemetry'
+
+    def __init__(self, cache_alias: Optional[str] = None) -> None:
+        """
+        Initializes the TaskTelemetryRepository.
+
+        Args:
+            cache_alias (Optional[str]): Cache holding the snapshots. Defaults to settings.TASK_TELEMETRY_CACHE.
+        """
+        super().__init__(cache_alias or settings.TASK_TELEMETRY_CACHE, settings.TASK_TELEMETRY_WINDOW_MINUTES * 60)
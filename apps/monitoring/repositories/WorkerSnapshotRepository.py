@@ -0,0 +1,48 @@
+from typing import Any, Dict, List
+from django.core.cache import caches
+
+
+class WorkerSnapshotRepository:
+    """
+    Base repository for statistics each process aggregates itself and publishes to a shared cache.
+
+    Every process stores a snapshot of its own totals under its worker key and lists the key in an
+    index, so a summary can merge the numbers of every gunicorn worker or Celery process.
+    """
+    namespace = 'worker-snapshots'
+
+    def __init__(self, cache_alias: str, timeout: int) -> None:
+        """
+        Initializes the repository.
+
+        Args:
+            cache_alias (str): Cache holding the snapshots; must be shared by the processes to merge.
+            timeout (int): Seconds a snapshot outlives the last publish of its process.
+        """
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+
+    def _worker_key(self, worker_id: str) -> str:
+        return f'{self.namespace}:worker:{worker_id}'
+
+    def publish(self, worker_id: str, snapshot: Dict[str, Any]) -> None:
+        """
+        Stores a process's snapshot and makes sure the process is listed in the index.
+        """
+        cache = caches[self.cache_alias]
+        cache.set(self._worker_key(worker_id), snapshot, timeout=self.timeout)
+        workers = cache.get(f'{self.namespace}:workers') or []
+        if worker_id not in workers:
+            cache.set(f'{self.namespace}:workers', workers + [worker_id], timeout=self.timeout)
+
+    def get_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves the snapshots of every listed process that has not expired, dropping expired ones from the index.
+        """
+        cache = caches[self.cache_alias]
+        workers = cache.get(f'{self.namespace}:workers') or []
+        found = cache.get_many([self._worker_key(worker_id) for worker_id in workers])
+        live = [worker_id for worker_id in workers if self._worker_key(worker_id) in found]
+        if len(live) != len(workers):
+            cache.set(f'{self.namespace}:workers', live, timeout=self.timeout)
+        return [found[self._worker_key(worker_id)] for worker_id in live]
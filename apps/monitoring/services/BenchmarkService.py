@@ -0,0 +1,209 @@
+import importlib
+import inspect
+import pkgutil
+import statistics
+import time
+from contextlib import nullcontext
+from datetime import date
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from django.apps import apps
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import autodiscover_modules
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillingModel import Bill
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.invoices.models.InvoiceModel import Invoice
+from energy_billing.db_router import use_primary
+from apps.monitoring.repositories.BenchmarkResultRepository import BenchmarkResultRepository
+from apps.monitoring.repositories.SyntheticDataRepository import SyntheticDataRepository
+from apps.monitoring.services.SyntheticDataService import SyntheticDataService
+
+# Dataset sizes in consumption readings, as (users, days of readings)
+SCALES: Dict[str, Tuple[int, int]] = {
+    '1k': (10, 100),
+    '100k': (1000, 100),
+    '1m': (10000, 100),
+}
+DATASET_END = date(2025, 12, 31)  # Fixed, so every run benchmarks the same data
+DATASET_SEED = 47
+SAMPLE_SIZE = 100  # IDs handed to the bulk cases
+
+
+class BenchmarkData(NamedTuple):
+    """
+    The seeded dataset as seen by the cases.
+    """
+    user: User  # A customer in the middle of the ID range, with a full history
+    admin: User
+    user_ids: List[int]
+    start_date: date
+    end_date: date
+    consumption_ids: List[int]  # Samples of other customers' rows, for the bulk cases
+    bill_ids: List[int]
+    invoice_ids: List[int]
+
+
+class BenchmarkCase(NamedTuple):
+    """
+    A benchmarked method. `setup` prepares the arguments and returns the call to time.
+    """
+    name: str  # 'Class.method'
+    setup: Callable[[BenchmarkData], Callable[[], Any]]
+
+
+CASES: Dict[str, BenchmarkCase] = {}
+
+
+def benchmark(cls: type, method: str) -> Callable:
+    """
+    Registers a benchmark of `cls.method`, in an app's `benchmarks.py`:
+
+        @benchmark(BillRepository, 'get_bills_by_user')
+        def bills_by_user(data):
+            repository = BillRepository()
+            return lambda: repository.get_bills_by_user(data.user)
+
+    Each repetition runs in a transaction that is rolled back, so cases may write freely.
+    Only the returned call is timed; anything the case function does before is setup.
+    """
+    def register(setup: Callable[[BenchmarkData], Callable[[], Any]]) -> Callable:
+        name = f'{cls.__name__}.{method}'
+        CASES[name] = BenchmarkCase(name, setup)
+        return setup
+    return register
+
+
+class BenchmarkService:
+    """
+    Service class running the repository and service benchmarks and comparing them with a baseline.
+    """
+
+    def __init__(self, result_repository: Optional[BenchmarkResultRepository] = None, synthetic_service: Optional[SyntheticDataService] = None) -> None:
+        self.result_repository = result_repository or BenchmarkResultRepository()
+        self.synthetic_service = synthetic_service or SyntheticDataService(SyntheticDataRepository())
+        autodiscover_modules('benchmarks')
+
+    def seed(self, scale: str) -> BenchmarkData:
+        """
+        Seed the (empty) database with the dataset of a scale.
+        """
+        users, days = SCALES[scale]
+        start_date = DATASET_END.toordinal() - days + 1
+        self.synthetic_service.seed(users, date.fromordinal(start_date), DATASET_END, seed=DATASET_SEED, prefix='bench-')
+        user_ids = list(User.objects.filter(username__startswith='bench-').order_by('id').values_list('id', flat=True))
+        user = User.objects.get(id=user_ids[len(user_ids) // 2])
+        admin = User.objects.create_user(username='bench-admin', password='bench-admin', role='admin')
+        others = [user_id for user_id in user_ids if user_id != user.id] or user_ids
+        return BenchmarkData(
+            user=user,
+            admin=admin,
+            user_ids=user_ids,
+            start_date=date.fromordinal(start_date),
+            end_date=DATASET_END,
+            consumption_ids=list(Consumption.objects.filter(user_id__in=others[:SAMPLE_SIZE]).order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE]),
+            bill_ids=list(Bill.objects.filter(user_id__in=others[:SAMPLE_SIZE]).order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE]),
+            invoice_ids=list(Invoice.objects.filter(user_id__in=others[:SAMPLE_SIZE]).order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE]),
+        )
+
+    def run(self, data: BenchmarkData, repeat: int, names: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Time the cases against a seeded dataset.
+
+        Args:
+            data (BenchmarkData): The dataset from `seed`.
+            repeat (int): Timed repetitions per case, after one untimed run that counts the queries.
+            names (Optional[Sequence[str]]): Cases to run. Defaults to all.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per case, the median and fastest wall time in ms and the query count.
+        """
+        results = {}
+        # Reads stay on the connection of the rolled-back transaction, so cases see their own writes
+        with use_primary():
+            for name in sorted(names if names is not None else CASES):
+                case = CASES[name]
+                _, queries = self._run_once(case, data, count_queries=True)
+                timings = [self._run_once(case, data)[0] for _ in range(repeat)]
+                results[name] = {
+                    'median_ms': round(statistics.median(timings) * 1000, 3),
+                    'min_ms': round(min(timings) * 1000, 3),
+                    'queries': queries,
+                }
+        return results
+
+    def compare(self, results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float) -> List[Dict[str, Any]]:
+        """
+        Find the cases that got slower or issue more queries than in the baseline.
+
+        Args:
+            results (Dict[str, Any]): A run, as saved by the result repository.
+            baseline (Dict[str, Any]): The baseline run of the same database vendor.
+            threshold (float): Allowed relative slowdown of the median, e.g. 0.2 for 20%.
+            min_delta_ms (float): Slowdowns smaller than this are noise and never count.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per regression, with the scale, case and both measurements.
+        """
+        regressions = []
+        for scale, cases in results['scales'].items():
+            for name, measured in cases.items():
+                before = baseline.get('scales', {}).get(scale, {}).get(name)
+                if before is None:
+                    continue
+                slower = measured['median_ms'] - before['median_ms']
+                if measured['queries'] > before['queries'] or (slower > min_delta_ms and measured['median_ms'] > before['median_ms'] * (1 + threshold)):
+                    regressions.append({'scale': scale, 'case': name, 'baseline': before, 'measured': measured})
+        return regressions
+
+    def save_run(self, run: Dict[str, Any], path: Optional[str] = None) -> str:
+        """
+        Store a run's results, by default under BENCHMARK_ROOT/runs. Returns the path.
+        """
+        return self.result_repository.save(run, path or self.result_repository.run_path(run))
+
+    def save_baseline(self, run: Dict[str, Any], path: Optional[str] = None) -> str:
+        """
+        Store a run as the baseline of its database vendor. Returns the path.
+        """
+        return self.result_repository.save(run, path or self.result_repository.baseline_path(run['vendor']))
+
+    def load_baseline(self, vendor: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the baseline of a database vendor, or None when there is none yet.
+        """
+        return self.result_repository.load(path or self.result_repository.baseline_path(vendor))
+
+    def get_uncovered_methods(self) -> List[str]:
+        """
+        List the public methods of the project's repository and service classes that have no case.
+        """
+        uncovered = []
+        for app in apps.get_app_configs():
+            if not app.name.startswith('apps.'):
+                continue
+            for layer in ('repositories', 'services'):
+                try:
+                    package = importlib.import_module(f'{app.name}.{layer}')
+                except ImportError:
+                    continue
+                for module_info in pkgutil.iter_modules(package.__path__):
+                    module = importlib.import_module(f'{app.name}.{layer}.{module_info.name}')
+                    for class_name, cls in inspect.getmembers(module, inspect.isclass):
+                        if cls.__module__ != module.__name__ or not class_name.endswith(('Repository', 'Service')):
+                            continue
+                        for method, _ in inspect.getmembers(cls, inspect.isfunction):
+                            if not method.startswith('_') and f'{class_name}.{method}' not in CASES:
+                                uncovered.append(f'{class_name}.{method}')
+        return sorted(uncovered)
+
+    @staticmethod
+    def _run_once(case: BenchmarkCase, data: BenchmarkData, count_queries: bool = False) -> Tuple[float, int]:
+        with transaction.atomic():
+            call = case.setup(data)
+            with CaptureQueriesContext(connection) if count_queries else nullcontext() as captured:
+                start = time.perf_counter()
+                call()
+                elapsed = time.perf_counter() - start
+            transaction.set_rollback(True)
+        return elapsed, len(captured.captured_queries) if count_queries else 0
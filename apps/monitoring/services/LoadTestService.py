@@ -0,0 +1,282 @@
+import asyncio
+import itertools
+import json
+import random
+import re
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+from django.middleware.csrf import CSRF_ALLOWED_CHARS, CSRF_SECRET_LENGTH
+from django.test import Client
+from django.utils.crypto import get_random_string
+from apps.authentication.models.UserModel import User
+from apps.billing.models.BillingModel import Bill
+from apps.invoices.models.InvoiceModel import Invoice
+from apps.monitoring.repositories.BenchmarkResultRepository import BenchmarkResultRepository
+from apps.monitoring.services.BenchmarkService import BenchmarkData
+
+try:
+    import httpx # type: ignore
+except ImportError:  # pragma: no cover - httpx is only needed to drive the ASGI app
+    httpx = None
+
+# Requests the virtual users send, by kind: (method, path, JSON body)
+LoadRequest = Tuple[str, str, Optional[Any]]
+
+
+class VirtualUser(NamedTuple):
+    """
+    A customer the load test sends requests as, with the IDs its detail requests pick from.
+    """
+    user_id: int
+    session_key: str
+    bill_ids: List[int]
+    invoice_ids: List[int]
+
+
+class LoadContext(NamedTuple):
+    """
+    What the request builders need besides the user: the dataset's period and a shared
+    counter handing out days after it, so every posted reading is new.
+    """
+    start_date: date
+    end_date: date
+    new_days: Any  # itertools.count
+
+
+def _last_month(context: LoadContext) -> str:
+    return f'start_date={context.end_date - timedelta(days=29)}&end_date={context.end_date}'
+
+
+REQUEST_KINDS: Dict[str, Callable[[VirtualUser, random.Random, LoadContext], LoadRequest]] = {
+    'consumption-list': lambda user, rng, context: ('GET', f'/consumption/user/?{_last_month(context)}', None),
+    'consumption-post': lambda user, rng, context: (
+        'POST', '/consumption/user/',
+        {'date': (context.end_date + timedelta(days=next(context.new_days))).isoformat(), 'consumption': round(rng.uniform(5, 15), 3)},
+    ),
+    'bills-list': lambda user, rng, context: ('GET', '/billing/user/', None),
+    'bill-detail': lambda user, rng, context: ('GET', f'/billing/user/{rng.choice(user.bill_ids)}/', None),
+    'balance': lambda user, rng, context: ('GET', '/billing/balance/', None),
+    'invoices-list': lambda user, rng, context: ('GET', '/invoices/user/', None),
+    'invoice-detail': lambda user, rng, context: ('GET', f'/invoices/user/{rng.choice(user.invoice_ids)}/', None),
+}
+# Detail kinds pick from the user's own records; users without any skip them
+DETAIL_IDS = {'bill-detail': 'bill_ids', 'invoice-detail': 'invoice_ids'}
+DEFAULT_MIX = {
+    'consumption-list': 4,
+    'consumption-post': 1,
+    'bills-list': 2,
+    'bill-detail': 1,
+    'balance': 1,
+    'invoices-list': 2,
+    'invoice-detail': 1,
+}
+SERVER_TIMING_QUERIES = re.compile(r'sql;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """
+    Parses a request mix such as 'consumption-list=4,bills-list=1' into weights per kind.
+
+    Raises:
+        ValueError: A kind is unknown or a weight is not a non-negative integer.
+    """
+    mix = {}
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        kind, _, weight = item.partition('=')
+        if kind not in REQUEST_KINDS:
+            raise ValueError(f"Unknown request kind '{kind}'. Choose from {', '.join(REQUEST_KINDS)}.")
+        if not weight.isdigit():
+            raise ValueError(f"The weight of '{kind}' must be a non-negative integer.")
+        mix[kind] = int(weight)
+    if not any(mix.values()):
+        raise ValueError('The request mix needs at least one kind with a positive weight.')
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], share: float) -> float:
+    """
+    Returns the value below which `share` of the (sorted) values fall, interpolating linearly.
+    """
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = (len(sorted_values) - 1) * share
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class LoadTestService:
+    """
+    Service class load testing the HTTP API in-process, without a server or network.
+
+    Concurrent virtual users send a weighted mix of consumption, billing and invoice requests
+    through the WSGI app (Django's test client, one thread per user) or the ASGI app (an httpx
+    ASGI transport, one task per user). Query counts come from the `Server-Timing` header of the
+    SQL instrumentation middleware, which the caller enables for the run.
+    """
+
+    def __init__(self, result_repository: Optional[BenchmarkResultRepository] = None) -> None:
+        self.result_repository = result_repository or BenchmarkResultRepository()
+
+    def check_interface(self, interface: str) -> None:
+        """
+        Raises ImproperlyConfigured when the app of an interface cannot be driven here.
+        """
+        if interface == 'asgi' and httpx is None:
+            raise ImproperlyConfigured("Load testing the ASGI app requires httpx. Did you install httpx?")
+
+    def prepare_users(self, data: BenchmarkData, count: int) -> List[VirtualUser]:
+        """
+        Log in `count` customers of a seeded dataset, spread over its ID range.
+        """
+        step = max(len(data.user_ids) // count, 1)
+        users = []
+        for user_id in itertools.islice(itertools.cycle(data.user_ids[::step]), count):
+            client = Client()
+            client.force_login(User.objects.get(id=user_id))
+            users.append(VirtualUser(
+                user_id=user_id,
+                session_key=client.cookies[settings.SESSION_COOKIE_NAME].value,
+                bill_ids=list(Bill.objects.filter(user_id=user_id).values_list('id', flat=True)),
+                invoice_ids=list(Invoice.objects.filter(user_id=user_id).values_list('id', flat=True)),
+            ))
+        return users
+
+    def plan(self, mix: Dict[str, int], requests: int, seed: int = 0) -> List[str]:
+        """
+        Draw the sequence of request kinds; the same mix, count and seed give the same sequence.
+        """
+        kinds = [kind for kind, weight in mix.items() if weight]
+        return random.Random(seed).choices(kinds, weights=[mix[kind] for kind in kinds], k=requests)
+
+    def run(self, interface: str, data: BenchmarkData, users: List[VirtualUser], plan: List[str], seed: int = 0) -> Dict[str, Any]:
+        """
+        Send the planned requests, split round-robin over the virtual users, and summarize them.
+        Detail requests of users without bills or invoices are skipped and counted as such.
+
+        Args:
+            interface (str): 'wsgi' or 'asgi'.
+            data (BenchmarkData): The seeded dataset.
+            users (List[VirtualUser]): One per concurrent client.
+            plan (List[str]): Request kinds, in order; see `plan`.
+            seed (int): Seed of the request arguments (detail IDs, posted values).
+
+        Returns:
+            Dict[str, Any]: The summary, see `summarize`.
+
+        Raises:
+            ImproperlyConfigured: See `check_interface`.
+            ValueError: None of the planned requests can be sent by these users.
+        """
+        self.check_interface(interface)
+        context = LoadContext(data.start_date, data.end_date, itertools.count(1))
+        shares = [
+            (user, random.Random(seed + index), [kind for kind in plan[index::len(users)] if self._can_send(user, kind)])
+            for index, user in enumerate(users)
+        ]
+        sendable = sum(len(share[2]) for share in shares)
+        if plan and not sendable:
+            raise ValueError('None of the virtual users has the bills or invoices the request mix asks for.')
+        started = time.perf_counter()
+        if interface == 'asgi':
+            samples = asyncio.run(self._run_asgi(shares, context))
+        else:
+            with ThreadPoolExecutor(max_workers=len(users)) as executor:
+                samples = list(itertools.chain.from_iterable(executor.map(lambda share: self._run_wsgi(*share, context), shares)))
+        return self.summarize(samples, time.perf_counter() - started, skipped=len(plan) - sendable)
+
+    def summarize(self, samples: List[Tuple[str, int, float, Optional[int]]], elapsed: float, skipped: int = 0) -> Dict[str, Any]:
+        """
+        Aggregate (kind, status, seconds, queries) samples into throughput, latency percentiles,
+        error counts and mean queries per request, overall and per request kind, next to the
+        number of planned requests that were skipped.
+        """
+        def stats(group: List[Tuple[str, int, float, Optional[int]]]) -> Dict[str, Any]:
+            latencies = sorted(sample[2] * 1000 for sample in group)
+            queries = [sample[3] for sample in group if sample[3] is not None]
+            return {
+                'requests': len(group),
+                'errors': sum(1 for sample in group if sample[1] >= 400),
+                'p50_ms': round(percentile(latencies, 0.50), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'p99_ms': round(percentile(latencies, 0.99), 3),
+                'mean_ms': round(statistics.fmean(latencies), 3),
+                'queries_per_request': round(statistics.fmean(queries), 2) if queries else None,
+            }
+
+        by_kind: Dict[str, List[Tuple[str, int, float, Optional[int]]]] = {}
+        for sample in samples:
+            by_kind.setdefault(sample[0], []).append(sample)
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'skipped': skipped,
+            'throughput_rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+            'total': stats(samples),
+            'kinds': {kind: stats(group) for kind, group in sorted(by_kind.items())},
+        }
+
+    def save_report(self, report: Dict[str, Any], path: Optional[str] = None) -> str:
+        """
+        Store a report, by default under BENCHMARK_ROOT/loadtests. Returns the path.
+        """
+        return self.result_repository.save(report, path or self.result_repository.load_test_path(report))
+
+    def load_report(self, path: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an earlier report to compare with, or None when the file does not exist.
+        """
+        return self.result_repository.load(path)
+
+    @staticmethod
+    def _can_send(user: VirtualUser, kind: str) -> bool:
+        return kind not in DETAIL_IDS or bool(getattr(user, DETAIL_IDS[kind]))
+
+    @staticmethod
+    def _queries(server_timing: Optional[str]) -> Optional[int]:
+        match = SERVER_TIMING_QUERIES.search(server_timing or '')
+        return int(match.group(1)) if match else None
+
+    def _run_wsgi(self, user: VirtualUser, rng: random.Random, kinds: List[str], context: LoadContext) -> List[Tuple[str, int, float, Optional[int]]]:
+        client = Client(raise_request_exception=False)
+        client.cookies[settings.SESSION_COOKIE_NAME] = user.session_key
+        samples = []
+        try:
+            for kind in kinds:
+                method, path, body = REQUEST_KINDS[kind](user, rng, context)
+                start = time.perf_counter()
+                response = client.generic(method, path, json.dumps(body) if body is not None else '', content_type='application/json')
+                elapsed = time.perf_counter() - start
+                samples.append((kind, response.status_code, elapsed, self._queries(response.get('Server-Timing'))))
+        finally:
+            connections.close_all()
+        return samples
+
+    async def _run_asgi(self, shares: List[Tuple[VirtualUser, random.Random, List[str]]], context: LoadContext) -> List[Tuple[str, int, float, Optional[int]]]:
+        from django.core.asgi import get_asgi_application
+
+        async def run_user(client: Any, user: VirtualUser, rng: random.Random, kinds: List[str]) -> List[Tuple[str, int, float, Optional[int]]]:
+            # Session requests are CSRF-checked outside the test client: send a matching cookie and header
+            csrf_token = get_random_string(CSRF_SECRET_LENGTH, CSRF_ALLOWED_CHARS)
+            headers = {
+                'Cookie': f'{settings.SESSION_COOKIE_NAME}={user.session_key}; {settings.CSRF_COOKIE_NAME}={csrf_token}',
+                'X-CSRFToken': csrf_token,
+            }
+            samples = []
+            for kind in kinds:
+                method, path, body = REQUEST_KINDS[kind](user, rng, context)
+                start = time.perf_counter()
+                response = await client.request(method, path, json=body, headers=headers)
+                elapsed = time.perf_counter() - start
+                samples.append((kind, response.status_code, elapsed, self._queries(response.headers.get('Server-Timing'))))
+            return samples
+
+        transport = httpx.ASGITransport(app=get_asgi_application())
+        async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+            results = await asyncio.gather(*(run_user(client, *share) for share in shares))
+        return list(itertools.chain.from_iterable(results))
@@ -0,0 +1,260 @@
+import atexit
+import functools
+import inspect
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, TypeVar
+from django.conf import settings
+from django.db.models import Model, QuerySet
+from apps.monitoring.repositories.MetricsRepository import MetricsRepository
+
+logger = logging.getLogger('apps.monitoring.metrics')
+
+Labels = Tuple[Tuple[str, str], ...]
+T = TypeVar('T')
+
+
+class Metric(NamedTuple):
+    """
+    Definition of an exported metric.
+    """
+    kind: str  # 'counter' or 'histogram'
+    help: str
+    buckets: Tuple[float, ...] = ()
+
+
+METRICS: Dict[str, Metric] = {}
+
+
+def define_counter(name: str, help: str) -> str:
+    """
+    Declares a counter; returns its name for use with `inc`.
+    """
+    METRICS[name] = Metric('counter', help)
+    return name
+
+
+def define_histogram(name: str, help: str, buckets: Tuple[float, ...]) -> str:
+    """
+    Declares a histogram with the given upper bounds; returns its name for use with `observe`.
+    """
+    METRICS[name] = Metric('histogram', help, tuple(sorted(buckets)))
+    return name
+
+
+REPOSITORY_CALLS = define_counter('repository_calls_total', 'Repository method calls by outcome.')
+REPOSITORY_ROWS = define_counter('repository_rows_returned_total', 'Rows returned by repository methods that return lists or evaluated querysets.')
+REPOSITORY_LATENCY = define_histogram('repository_call_duration_seconds', 'Repository method latency.', settings.REPOSITORY_LATENCY_BUCKETS)
+
+
+class MetricsRegistry:
+    """
+    Counters and histograms of the current process.
+
+    Values are kept in plain dicts under one lock. Every `METRICS_FLUSH_SECONDS` (and at exit)
+    the process writes a snapshot through `MetricsRepository`, so the /metrics endpoint of any
+    worker can add up every process of the host. A forked child starts from empty values
+    instead of re-reporting its parent's. One thread flushes at a time; the periodic flush of
+    `inc` and `observe` is skipped while another runs and never raises into the caller.
+    """
+
+    def __init__(self, repository: Optional[MetricsRepository] = None) -> None:
+        self.repository = repository
+        self._lock = threading.Lock()
+        self._reset()
+        atexit.register(self.flush)
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._flush_lock = threading.Lock()  # A parent thread may have held it at fork
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], List[float]] = {}  # Count per bucket, +Inf count, then the sum
+        self._flushed_at = time.monotonic()
+
+    @property
+    def worker_id(self) -> str:
+        return f'{socket.gethostname()}-{os.getpid()}'
+
+    def inc(self, name: str, labels: Labels, amount: float = 1.0) -> None:
+        """
+        Adds to a counter.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            key = (name, labels)
+            self._counters[key] = self._counters.get(key, 0.0) + amount
+        self._maybe_flush()
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """
+        Records a value in a histogram.
+        """
+        buckets = METRICS[name].buckets
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            key = (name, labels)
+            counts = self._histograms.get(key)
+            if counts is None:
+                counts = self._histograms[key] = [0.0] * (len(buckets) + 2)
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[len(buckets)] += 1
+            counts[-1] += value
+        self._maybe_flush()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the process's values in a JSON-serializable form.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            return {
+                'counters': [[name, list(map(list, labels)), value] for (name, labels), value in self._counters.items()],
+                'histograms': [[name, list(map(list, labels)), list(counts)] for (name, labels), counts in self._histograms.items()],
+            }
+
+    def flush(self) -> None:
+        """
+        Publishes the process's snapshot for the other workers' /metrics.
+        """
+        with self._flush_lock:
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        self._flushed_at = time.monotonic()
+        (self.repository or MetricsRepository()).write_snapshot(self.worker_id, self.snapshot())
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._flushed_at < settings.METRICS_FLUSH_SECONDS:
+            return
+        if not self._flush_lock.acquire(blocking=False):
+            return  # Another thread is flushing
+        try:
+            if time.monotonic() - self._flushed_at >= settings.METRICS_FLUSH_SECONDS:
+                self._write_snapshot()
+        except Exception:
+            logger.warning('Could not write the metrics snapshot of %s.', self.worker_id, exc_info=True)
+        finally:
+            self._flush_lock.release()
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _row_count(result: Any) -> Optional[int]:
+    """
+    Counts the rows of a result without evaluating lazy querysets.
+    """
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, QuerySet):
+        return len(result._result_cache) if result._result_cache is not None else None
+    if isinstance(result, Model):
+        return 1
+    return None
+
+
+def _trace(repository: str, method: str, func: Callable) -> Callable:
+    ok: Labels = (('repository', repository), ('method', method), ('outcome', 'ok'))
+    error: Labels = (('repository', repository), ('method', method), ('outcome', 'error'))
+    latency: Labels = (('repository', repository), ('method', method))
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        except BaseException:
+            REGISTRY.observe(REPOSITORY_LATENCY, latency, time.perf_counter() - start)
+            REGISTRY.inc(REPOSITORY_CALLS, error)
+            raise
+        REGISTRY.observe(REPOSITORY_LATENCY, latency, time.perf_counter() - start)
+        REGISTRY.inc(REPOSITORY_CALLS, ok)
+        rows = _row_count(result)
+        if rows:
+            REGISTRY.inc(REPOSITORY_ROWS, latency, rows)
+        return result
+
+    return wrapper
+
+
+def traced_repository(cls: Type[T]) -> Type[T]:
+    """
+    Class decorator recording the call count, outcome, latency and returned rows of every public
+    method of a repository. Returns the class untouched when REPOSITORY_TRACING_ENABLED is off.
+    """
+    if not settings.REPOSITORY_TRACING_ENABLED:
+        return cls
+    for name, attribute in list(vars(cls).items()):
+        if not name.startswith('_') and inspect.isfunction(attribute):
+            setattr(cls, name, _trace(cls.__name__, name, attribute))
+    return cls
+
+
+def _format_labels(labels: List[List[str]], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [*labels, *([extra] if extra else [])]
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, value in pairs)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsService:
+    """
+    Service class rendering the metrics of every process of the host in the Prometheus text format.
+    """
+
+    def __init__(self, metrics_repository: Optional[MetricsRepository] = None, registry: Optional[MetricsRegistry] = None) -> None:
+        self.metrics_repository = metrics_repository or MetricsRepository()
+        self.registry = registry or REGISTRY
+
+    def render(self) -> str:
+        """
+        Add up this process's live values and the other processes' latest snapshots.
+        """
+        counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], List[float]] = {}
+        snapshots = self.metrics_repository.read_snapshots(exclude=self.registry.worker_id)
+        for snapshot in snapshots + [self.registry.snapshot()]:
+            for name, labels, value in snapshot['counters']:
+                key = (name, tuple(map(tuple, labels)))
+                counters[key] = counters.get(key, 0.0) + value
+            for name, labels, counts in snapshot['histograms']:
+                key = (name, tuple(map(tuple, labels)))
+                merged = histograms.setdefault(key, [0.0] * len(counts))
+                if len(merged) == len(counts):  # Buckets changed between deploys otherwise
+                    histograms[key] = [a + b for a, b in zip(merged, counts)]
+
+        lines = []
+        for name, metric in sorted(METRICS.items()):
+            series = sorted((labels, value) for (series_name, labels), value in (counters if metric.kind == 'counter' else histograms).items() if series_name == name)
+            if not series:
+                continue
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for labels, value in series:
+                label_list = [list(pair) for pair in labels]
+                if metric.kind == 'counter':
+                    lines.append(f'{name}{_format_labels(label_list)} {_format_value(value)}')
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(metric.buckets + (float('inf'),), value[:-1]):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else repr(float(bound))
+                    lines.append(f'{name}_bucket{_format_labels(label_list, ("le", le))} {_format_value(cumulative)}')
+                lines.append(f'{name}_sum{_format_labels(label_list)} {_format_value(value[-1])}')
+                lines.append(f'{name}_count{_format_labels(label_list)} {_format_value(cumulative)}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,148 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from apps.monitoring.repositories.ProfileReportRepository import ProfileReportRepository
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+TOP_FUNCTIONS = 20  # Functions by cumulative time kept in a report's metadata
+
+# cProfile cannot run two profilers at once, so each process profiles one request at a time
+_profiling = threading.Lock()
+
+
+def _frame_label(code: Any) -> str:
+    filename = code.co_filename
+    if filename.startswith(PROJECT_ROOT):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'
+
+
+class StackSampler:
+    """
+    Samples one thread's call stack at a fixed interval from a background thread, counting
+    identical stacks. The counts are the input of flame graph tools (collapsed-stack format).
+    """
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                stack = ';'.join(reversed(labels))
+                self.counts[stack] = self.counts.get(stack, 0) + 1
+
+    def collapsed(self) -> str:
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.counts.items()))
+
+
+class ProfilingService:
+    """
+    Service class profiling single requests on demand and storing the reports.
+
+    A profiled request runs under cProfile for exact per-function call counts and times, while a
+    sampler thread records the request thread's stacks for a flame graph.
+    """
+
+    def __init__(self, report_repository: Optional[ProfileReportRepository] = None) -> None:
+        self.report_repository = report_repository or ProfileReportRepository()
+
+    def profile(self, func: Callable[[], Any]) -> Tuple[Any, Optional[Tuple[cProfile.Profile, StackSampler, float]]]:
+        """
+        Run `func` under the profilers, unless this process is already profiling another request.
+
+        Returns:
+            Tuple: The result of `func`, and the (profiler, sampler, seconds) to pass to `save`, or
+            None when `func` ran unprofiled.
+        """
+        if not _profiling.acquire(blocking=False):
+            return func(), None
+        try:
+            profiler = cProfile.Profile()
+            sampler = StackSampler(threading.get_ident(), settings.PROFILING_SAMPLE_INTERVAL)
+            sampler.start()
+            start = time.perf_counter()
+            try:
+                result = profiler.runcall(func)
+            finally:
+                seconds = time.perf_counter() - start
+                sampler.stop()
+            return result, (profiler, sampler, seconds)
+        finally:
+            _profiling.release()
+
+    def save(self, capture: Tuple[cProfile.Profile, StackSampler, float], request_info: Dict[str, Any]) -> str:
+        """
+        Store a captured profile with its request details and top functions.
+
+        Args:
+            capture (Tuple): The capture returned by `profile`.
+            request_info (Dict[str, Any]): Method, path, status and user of the request.
+
+        Returns:
+            str: The report ID.
+        """
+        profiler, sampler, seconds = capture
+        created = datetime.now(timezone.utc)
+        report_id = f'{created:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}'
+        stats = pstats.Stats(profiler)
+        metadata = {
+            'id': report_id,
+            'created_at': created.isoformat(),
+            'duration_ms': round(seconds * 1000, 2),
+            'samples': sum(sampler.counts.values()),
+            'top_functions': self._top_functions(stats),
+            **request_info,
+        }
+        self.report_repository.save(report_id, metadata, sampler.collapsed(), stats.dump_stats)
+        return report_id
+
+    def list_reports(self) -> List[Dict[str, Any]]:
+        """
+        List the stored reports, newest first.
+        """
+        return self.report_repository.list_reports()
+
+    def get_report_path(self, report_id: str, kind: str) -> Optional[str]:
+        """
+        Get the file of a report: 'pstats' or 'collapsed'.
+        """
+        return self.report_repository.path(report_id, kind)
+
+    @staticmethod
+    def _top_functions(stats: pstats.Stats) -> List[Dict[str, Any]]:
+        entries = sorted(stats.stats.items(), key=lambda item: -item[1][3])[:TOP_FUNCTIONS]  # type: ignore
+        return [
+            {
+                'function': f'{name} ({os.path.relpath(filename, PROJECT_ROOT) if filename.startswith(PROJECT_ROOT) else filename}:{line})',
+                'calls': calls,
+                'own_ms': round(own * 1000, 3),
+                'cumulative_ms': round(cumulative * 1000, 3),
+            }
+            for (filename, line, name), (_, calls, own, cumulative, _) in entries
+        ]
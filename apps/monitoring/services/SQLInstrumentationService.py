@@ -0,0 +1,212 @@
+import logging
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from apps.monitoring.repositories.SQLStatsRepository import SQLStatsRepository
+
+logger = logging.getLogger('apps.monitoring.sql')
+
+APPS_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MONITORING_ROOT = os.path.join(APPS_ROOT, 'monitoring')
+STATEMENT_LIMIT = 300  # Characters of a fingerprint kept in reports
+REPEATED_PER_ROUTE = 10  # Repeated statements kept per route
+
+_LITERALS = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """
+    Reduces a statement to its shape: literals and placeholders become `?` and IN lists `(...)`,
+    so the same query with different parameters or list lengths counts as one statement.
+    """
+    for pattern, replacement in _LITERALS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()[:STATEMENT_LIMIT]
+
+
+def _call_site() -> str:
+    """
+    Returns the innermost project frame outside this app, i.e. the code that issued the query.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPS_ROOT) and not filename.startswith(MONITORING_ROOT):
+            return f'{os.path.relpath(filename, os.path.dirname(APPS_ROOT))}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return ''
+
+
+class QueryRecorder:
+    """
+    `connection.execute_wrapper` callable counting one request's queries, their time and how
+    often each statement shape ran. The call site of a statement is captured once, when it first
+    reaches the repeat threshold, so the common path costs a counter update.
+    """
+
+    def __init__(self, repeat_threshold: int) -> None:
+        self.repeat_threshold = repeat_threshold
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Dict[str, int] = {}
+        self.call_sites: Dict[str, str] = {}
+
+    def __call__(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            statement = fingerprint(sql)
+            seen = self.statements.get(statement, 0) + 1
+            self.statements[statement] = seen
+            if seen == self.repeat_threshold:
+                self.call_sites[statement] = _call_site()
+
+    def repeated(self) -> List[Tuple[str, int, str]]:
+        """
+        Returns the (statement, times run, call site) of every statement that reached the
+        threshold, most frequent first: the likely N+1 patterns of the request.
+        """
+        return sorted(
+            ((statement, count, self.call_sites.get(statement, '')) for statement, count in self.statements.items() if count >= self.repeat_threshold),
+            key=lambda item: -item[1],
+        )
+
+
+# Totals of this process, published to the shared cache at most every SQL_INSTRUMENTATION_PUBLISH_SECONDS
+_lock = threading.Lock()
+_routes: Dict[str, Dict[str, Any]] = {}
+_worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+_published_at = 0.0
+
+
+def _new_route() -> Dict[str, Any]:
+    return {'requests': 0, 'queries': 0, 'sql_ms': 0.0, 'max_queries': 0, 'n_plus_one_requests': 0, 'repeated': {}}
+
+
+def merge_routes(target: Dict[str, Dict[str, Any]], routes: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Adds per-route totals into `target`, e.g. to combine the snapshots of several processes.
+    """
+    for route, stats in routes.items():
+        merged = target.setdefault(route, _new_route())
+        for field in ('requests', 'queries', 'sql_ms', 'n_plus_one_requests'):
+            merged[field] += stats[field]
+        merged['max_queries'] = max(merged['max_queries'], stats['max_queries'])
+        for statement, repeat in stats['repeated'].items():
+            _add_repeated(merged['repeated'], statement, repeat['requests'], repeat['max_count'], repeat['call_site'])
+
+
+def _add_repeated(repeated: Dict[str, Dict[str, Any]], statement: str, requests: int, max_count: int, call_site: str) -> None:
+    """
+    Counts a repeated statement of a route, keeping at most REPEATED_PER_ROUTE statements: past
+    that, the one seen in the fewest requests (the oldest among equals) is dropped.
+    """
+    entry = repeated.setdefault(statement, {'requests': 0, 'max_count': 0, 'call_site': call_site})
+    entry['requests'] += requests
+    entry['max_count'] = max(entry['max_count'], max_count)
+    if len(repeated) > REPEATED_PER_ROUTE:
+        del repeated[min(repeated, key=lambda key: repeated[key]['requests'])]
+
+
+class SQLInstrumentationService:
+    """
+    Service class aggregating the per-request SQL statistics of the instrumentation middleware.
+    """
+
+    def __init__(self, stats_repository: Optional[SQLStatsRepository] = None) -> None:
+        self.stats_repository = stats_repository or SQLStatsRepository()
+
+    def record(self, method: str, route: str, status_code: int, recorder: QueryRecorder) -> Dict[str, Any]:
+        """
+        Add a finished request to this process's totals and log it.
+
+        Args:
+            method (str): The HTTP method.
+            route (str): The URL pattern the request resolved to, so IDs do not split the totals.
+            status_code (int): The response status.
+            recorder (QueryRecorder): The request's recorder.
+
+        Returns:
+            Dict[str, Any]: The request's report: queries, SQL time in ms and repeated statements.
+        """
+        global _published_at
+        repeated = recorder.repeated()
+        report = {
+            'method': method,
+            'route': route,
+            'status': status_code,
+            'queries': recorder.count,
+            'sql_ms': round(recorder.seconds * 1000, 2),
+            'repeated': [{'statement': statement, 'count': count, 'call_site': site} for statement, count, site in repeated],
+        }
+        with _lock:
+            stats = _routes.setdefault(f'{method} {route}', _new_route())
+            stats['requests'] += 1
+            stats['queries'] += recorder.count
+            stats['sql_ms'] += recorder.seconds * 1000
+            stats['max_queries'] = max(stats['max_queries'], recorder.count)
+            if repeated:
+                stats['n_plus_one_requests'] += 1
+            for statement, count, site in repeated:
+                _add_repeated(stats['repeated'], statement, 1, count, site)
+            publish = time.monotonic() - _published_at >= settings.SQL_INSTRUMENTATION_PUBLISH_SECONDS
+            if publish:
+                _published_at = time.monotonic()
+                snapshot = {'worker': _worker_id, 'routes': {route: dict(stats, repeated=dict(stats['repeated'])) for route, stats in _routes.items()}}
+        if publish:
+            self.stats_repository.publish(_worker_id, snapshot)
+
+        if repeated:
+            logger.warning(
+                'Possible N+1 in %s %s: %s', method, route,
+                '; '.join(f'{count}x {statement[:80]} ({site})' for statement, count, site in repeated),
+                extra={'sql': report},
+            )
+        else:
+            logger.info('%s %s: %d queries in %.1f ms', method, route, recorder.count, recorder.seconds * 1000, extra={'sql': report})
+        return report
+
+    def get_summary(self) -> List[Dict[str, Any]]:
+        """
+        Get the totals per route across every process, routes with the most queries first.
+        """
+        routes: Dict[str, Dict[str, Any]] = {}
+        workers = set()
+        for snapshot in self.stats_repository.get_snapshots():
+            if snapshot['worker'] != _worker_id:
+                merge_routes(routes, snapshot['routes'])
+                workers.add(snapshot['worker'])
+        with _lock:
+            merge_routes(routes, _routes)
+        summary = []
+        for route, stats in routes.items():
+            repeated = sorted(stats['repeated'].items(), key=lambda item: -item[1]['requests'])[:REPEATED_PER_ROUTE]
+            summary.append({
+                'route': route,
+                'requests': stats['requests'],
+                'queries': stats['queries'],
+                'avg_queries': round(stats['queries'] / stats['requests'], 1),
+                'max_queries': stats['max_queries'],
+                'sql_ms': round(stats['sql_ms'], 1),
+                'avg_sql_ms': round(stats['sql_ms'] / stats['requests'], 2),
+                'n_plus_one_requests': stats['n_plus_one_requests'],
+                'repeated': [dict(entry, statement=statement) for statement, entry in repeated],
+            })
+        return sorted(summary, key=lambda item: -item['queries'])
@@ -0,0 +1,175 @@
+import hashlib
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+from apps.monitoring.repositories.SlowQueryRepository import SlowQueryRepository
+from apps.monitoring.services.MetricsService import REGISTRY, define_counter
+from apps.monitoring.services.SQLInstrumentationService import APPS_ROOT, MONITORING_ROOT, fingerprint
+
+logger = logging.getLogger('apps.monitoring.slow_queries')
+
+SLOW_QUERIES = define_counter('slow_queries_total', 'Statements slower than SLOW_QUERY_THRESHOLD_MS by repository method.')
+EXPLAINABLE = ('SELECT', 'WITH', 'UPDATE', 'DELETE', 'INSERT')  # EXPLAIN plans these without running them
+STACK_DEPTH = 15  # Project frames kept per capture
+SQL_LIMIT = 10000  # Characters of the statement kept per capture
+
+# Set while this thread captures a slow query, so the capture's own queries are not recorded
+_capturing = threading.local()
+
+
+def _project_frames() -> List[Any]:
+    """
+    Returns the project frames of the current stack outside this app, innermost first.
+    """
+    frames = []
+    frame: Any = sys._getframe(2)
+    while frame is not None and len(frames) < STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPS_ROOT) and not filename.startswith(MONITORING_ROOT):
+            frames.append(frame)
+        frame = frame.f_back
+    return frames
+
+
+def _describe(frame: Any) -> str:
+    return f'{os.path.relpath(frame.f_code.co_filename, os.path.dirname(APPS_ROOT))}:{frame.f_lineno} in {frame.f_code.co_name}'
+
+
+def _repository_method(frames: List[Any]) -> str:
+    """
+    Names the innermost repository method on the stack, e.g. 'BillRepository.get_bills_by_user'.
+    """
+    for frame in frames:
+        if f'{os.sep}repositories{os.sep}' in frame.f_code.co_filename:
+            owner = frame.f_locals.get('self')
+            return f'{type(owner).__name__}.{frame.f_code.co_name}' if owner is not None else frame.f_code.co_name
+    return ''
+
+
+def _seq_scans(node: Any) -> List[str]:
+    """
+    Lists the relations a JSON plan reads with a sequential scan.
+    """
+    if isinstance(node, list):
+        return sorted({relation for item in node for relation in _seq_scans(item)})
+    if not isinstance(node, dict):
+        return []
+    relations = [node['Relation Name']] if node.get('Node Type') == 'Seq Scan' and 'Relation Name' in node else []
+    for child in [node.get('Plan')] + node.get('Plans', []):
+        if child is not None:
+            relations.extend(_seq_scans(child))
+    return sorted(set(relations))
+
+
+def _param_types(params: Any) -> Optional[List[str]]:
+    """
+    Describes a statement's parameters by type only, e.g. ['int', 'date'], so no value leaves the process.
+    """
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return [f'{name}: {type(value).__name__}' for name, value in sorted(params.items())]
+    return [type(value).__name__ for value in params]
+
+
+def record_slow_query(execute: Callable, sql: str, params: Any, many: bool, context: Dict[str, Any]) -> Any:
+    """
+    `connection.execute_wrapper` callable installed on every connection. It times each statement;
+    above SLOW_QUERY_THRESHOLD_MS a sample of them, at most one per statement shape every
+    SLOW_QUERY_THROTTLE_SECONDS, is handed to a Celery task that runs EXPLAIN and stores it.
+    Captures hold the statement with its placeholders and the parameters' types, never their values.
+    """
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration_ms = (time.perf_counter() - start) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS or many or getattr(_capturing, 'active', False):
+        return result
+    frames = _project_frames()
+    repository_method = _repository_method(frames)
+    REGISTRY.inc(SLOW_QUERIES, (('repository_method', repository_method),))
+    if random.random() >= settings.SLOW_QUERY_SAMPLE_RATE:
+        return result
+    statement = fingerprint(sql)
+    if not caches[settings.SLOW_QUERY_CACHE].add(f'slow-query:{hashlib.md5(statement.encode()).hexdigest()}', 1, settings.SLOW_QUERY_THROTTLE_SECONDS):
+        return result
+    connection = context['connection']
+    from apps.monitoring.tasks import capture_slow_query
+    _capturing.active = True  # An eager task runs here, on this connection
+    try:
+        capture_slow_query.delay({
+            'fingerprint': statement,
+            'sql': sql[:SQL_LIMIT],
+            'param_types': _param_types(params),
+            'database': connection.alias,
+            'duration_ms': round(duration_ms, 2),
+            'repository_method': repository_method,
+            'call_site': _describe(frames[0])[:300] if frames else '',
+            'stack': '\n'.join(_describe(frame) for frame in reversed(frames)),
+        })
+    except Exception:
+        # Capturing must never fail the query it observes, e.g. while the broker is down
+        logger.exception('Could not queue the capture of a %.0f ms query', duration_ms)
+    finally:
+        _capturing.active = False
+    return result
+
+
+def install(connection: Any, **kwargs: Any) -> None:
+    """
+    `connection_created` handler adding the slow-query recorder to a new connection.
+
+    The recorder goes first in the wrapper list: wrappers added with `execute_wrapper()` are
+    removed from the end, so a connection opened inside one must not shift it.
+    """
+    if record_slow_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, record_slow_query)
+
+
+class SlowQueryService:
+    """
+    Service class explaining and storing the slow queries sampled by the recorder.
+    """
+
+    def __init__(self, slow_query_repository: Optional[SlowQueryRepository] = None) -> None:
+        self.slow_query_repository = slow_query_repository or SlowQueryRepository()
+
+    def capture(self, query: Dict[str, Any]) -> int:
+        """
+        Explain a slow query and store it, then trim the log to SLOW_QUERY_LOG_MAX_ROWS.
+
+        Args:
+            query (Dict[str, Any]): The recorder's capture: fingerprint, SQL with placeholders,
+                parameter types, database alias, duration, repository method, call site and stack.
+
+        Returns:
+            int: The ID of the stored capture.
+        """
+        _capturing.active = True
+        try:
+            plan, error = self._explain(query['database'], query['sql'], query.get('param_types') is not None)
+            slow_query = self.slow_query_repository.create({
+                **query,
+                'plan': plan,
+                'plan_cost': plan[0]['Plan'].get('Total Cost') if plan else None,
+                'seq_scans': _seq_scans(plan) if plan else [],
+                'explain_error': error,
+            })
+            self.slow_query_repository.trim(settings.SLOW_QUERY_LOG_MAX_ROWS)
+        finally:
+            _capturing.active = False
+        return slow_query.id
+
+    def _explain(self, database: str, sql: str, parameterized: bool) -> Tuple[Any, str]:
+        if (sql.split(None, 1) or [''])[0].upper() not in EXPLAINABLE:
+            return None, 'Statement type is not explained'
+        try:
+            return self.slow_query_repository.explain(database, sql, parameterized), ''
+        except (ValueError, DatabaseError) as e:
+            return None, str(e)
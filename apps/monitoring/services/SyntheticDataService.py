@@ -0,0 +1,184 @@
+import math
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ImproperlyConfigured
+from apps.billing.repositories.BalanceRepository import BalanceRepository
+from apps.consumption.models.EnergyUnits import KWH
+from apps.consumption.models.IntervalReadingModel import RAW_FLOAT32
+from apps.monitoring.repositories.SyntheticDataRepository import SyntheticDataRepository
+
+try:
+    import numpy as np # type: ignore
+except ImportError:  # pragma: no cover - numpy is only needed by the synthetic data generator
+    np = None
+
+CHUNK_USERS = 1000  # Users generated and written per chunk; part of the seed's definition, keep it fixed
+INTERVALS_PER_DAY = 96  # 15-minute interval readings
+PAYMENT_DAYS = 14  # Days between a bill and its invoice's due date
+
+
+def intraday_profile(intervals: int = INTERVALS_PER_DAY) -> Any:
+    """
+    Returns the share of a household's daily consumption falling in each interval of the day:
+    a night-time base load with a morning and a larger evening peak. The shares sum to 1.
+    """
+    hours = (np.arange(intervals) + 0.5) * 24 / intervals
+    shape = 0.5 + 0.9 * np.exp(-((hours - 7.5) / 1.5) ** 2) + 1.4 * np.exp(-((hours - 19.0) / 2.0) ** 2)
+    return shape / shape.sum()
+
+
+def daily_consumption(rng: Any, base: Any, amplitude: Any, weekend: Any, days: List[date]) -> Any:
+    """
+    Generates a users x days matrix of daily kWh.
+
+    Every user has a base load, a winter peak of `amplitude` around mid-January and a weekend
+    factor; on top of that each day gets multiplicative noise.
+    """
+    day_of_year = np.array([day.timetuple().tm_yday for day in days])
+    is_weekend = np.array([day.weekday() >= 5 for day in days])
+    season = 1 + amplitude[:, None] * np.cos(2 * math.pi * (day_of_year[None, :] - 15) / 365.25)
+    weekday = np.where(is_weekend[None, :], weekend[:, None], 1.0)
+    noise = rng.lognormal(0.0, 0.15, size=(len(base), len(days)))
+    return np.round(base[:, None] * season * weekday * noise, 3)
+
+
+def billing_periods(days: List[date]) -> List[Tuple[int, int]]:
+    """
+    Splits the days into calendar months, as (first index, end index) pairs. A trailing month
+    that has not ended yet is left out, since it would not have been billed.
+    """
+    periods = []
+    start = 0
+    for index, day in enumerate(days):
+        if (day + timedelta(days=1)).day == 1:
+            periods.append((start, index + 1))
+            start = index + 1
+    return periods
+
+
+class SyntheticDataService:
+    """
+    Service class generating realistic, reproducible datasets for load and scale testing.
+
+    Users get daily readings with seasonal and weekly shapes (optionally with 15-minute interval
+    readings following an intraday curve), a bill per completed month linked to its readings and
+    an invoice per bill. Values are generated with NumPy a chunk of users at a time; the same seed
+    and arguments always produce the same data.
+    """
+
+    def __init__(self, synthetic_repository: SyntheticDataRepository, balance_repository: Optional[BalanceRepository] = None) -> None:
+        self.synthetic_repository = synthetic_repository
+        self.balance_repository = balance_repository or BalanceRepository()
+
+    def seed(self, users: int, start_date: date, end_date: date, seed: int = 0, prefix: str = 'synthetic-',
+             price_per_kwh: float = 0.25, intervals: bool = False, progress: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+        """
+        Generate and store a dataset.
+
+        Args:
+            users (int): Number of users to create.
+            start_date (date): First day of readings.
+            end_date (date): Last day of readings; bill and invoice statuses are relative to it.
+            seed (int): Seed of the random generator.
+            prefix (str): Username prefix; usernames are the prefix and a sequence number.
+            price_per_kwh (float): Flat price the bill amounts are computed with.
+            intervals (bool): Also store 15-minute interval readings for every reading.
+            progress (Optional[Callable]): Called with the running totals after each chunk of users.
+
+        Returns:
+            Dict[str, int]: Rows created per table.
+
+        Raises:
+            ImproperlyConfigured: numpy is not installed.
+            ValueError: The period is empty or the username prefix is already in use.
+        """
+        if np is None:
+            raise ImproperlyConfigured("The synthetic data generator requires numpy. Did you install numpy?")
+        if start_date > end_date:
+            raise ValueError('The start date must not be after the end date.')
+        if self.synthetic_repository.usernames_taken(prefix):
+            raise ValueError(f"Users named '{prefix}...' already exist; delete them or use another prefix.")
+
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        periods = billing_periods(days)
+        profile = intraday_profile() if intervals else None
+        rng = np.random.default_rng(seed)
+        # Per-user traits come from the main generator, so they do not depend on the chunking
+        base = rng.lognormal(math.log(9.0), 0.45, size=users)  # Typical daily kWh
+        amplitude = rng.uniform(0.05, 0.45, size=users)  # Winter peak: electric heating varies a lot
+        weekend = rng.uniform(0.95, 1.3, size=users)
+        reliability = rng.uniform(0.85, 1.0, size=users)  # Chance of paying a bill by its due date
+
+        self.synthetic_repository.ensure_partitions(start_date, end_date)
+        consumption_after, bill_after, invoice_after = self.synthetic_repository.get_max_ids()
+        password = make_password('synthetic', salt='synthetic')
+        joined = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+        totals = {'users': 0, 'consumption': 0, 'interval_readings': 0, 'bills': 0, 'invoices': 0}
+
+        for first in range(0, users, CHUNK_USERS):
+            chunk = slice(first, min(first + CHUNK_USERS, users))
+            chunk_rng = np.random.default_rng([seed, first])
+            user_ids = self.synthetic_repository.create_users(
+                [f'{prefix}{number:07d}' for number in range(chunk.start, chunk.stop)], password, joined,
+            )
+            values = daily_consumption(chunk_rng, base[chunk], amplitude[chunk], weekend[chunk], days)
+            self.synthetic_repository.insert_consumption(self._consumption_rows(user_ids, days, values))
+            if profile is not None:
+                self.synthetic_repository.insert_interval_readings(self._interval_rows(chunk_rng, user_ids, days, values, profile))
+            bills, invoices = self._bill_rows(chunk_rng, user_ids, days, values, periods, reliability[chunk], price_per_kwh, end_date)
+            self.synthetic_repository.insert_bills(bills)
+            self.synthetic_repository.insert_invoices(invoices)
+            self.balance_repository.rebuild_range(user_ids[0], user_ids[-1])
+
+            totals['users'] += len(user_ids)
+            totals['consumption'] += values.size
+            totals['interval_readings'] += values.size if profile is not None else 0
+            totals['bills'] += len(bills)
+            totals['invoices'] += len(invoices)
+            if progress:
+                progress(totals)
+
+        totals['bill_consumption_links'] = self.synthetic_repository.link_bill_consumption(consumption_after, bill_after)
+        totals['invoice_bill_links'] = self.synthetic_repository.link_invoice_bills(bill_after, invoice_after)
+        return totals
+
+    @staticmethod
+    def _consumption_rows(user_ids: List[int], days: List[date], values: Any) -> Iterator[Tuple[Any, ...]]:
+        for user_id, readings in zip(user_ids, values.tolist()):
+            for day, reading in zip(days, readings):
+                yield user_id, day, reading, KWH, False
+
+    @staticmethod
+    def _interval_rows(rng: Any, user_ids: List[int], days: List[date], values: Any, profile: Any) -> Iterator[Tuple[Any, ...]]:
+        prefix = bytes([RAW_FLOAT32])
+        for user_id, readings in zip(user_ids, values):
+            # Noisy copies of the intraday curve, rescaled so each day adds up to its daily reading
+            curves = profile[None, :] * rng.lognormal(0.0, 0.2, size=(len(days), len(profile)))
+            curves *= (readings / curves.sum(axis=1))[:, None]
+            packed = curves.astype('<f4')
+            for index, day in enumerate(days):
+                yield user_id, '', day, 24 * 60 // len(profile), prefix + packed[index].tobytes(), float(readings[index]), 'kWh'
+
+    @staticmethod
+    def _bill_rows(rng: Any, user_ids: List[int], days: List[date], values: Any, periods: List[Tuple[int, int]],
+                   reliability: Any, price_per_kwh: float, end_date: date) -> Tuple[List[Tuple[Any, ...]], List[Tuple[Any, ...]]]:
+        if not periods:
+            return [], []
+        kwh = np.add.reduceat(values[:, :periods[-1][1]], [start for start, _ in periods], axis=1)
+        paid = rng.random(size=kwh.shape) < reliability[:, None]
+        bills, invoices = [], []
+        for row, user_id in enumerate(user_ids):
+            for column, (start, end) in enumerate(periods):
+                period_start, period_end = days[start], days[end - 1]
+                billed_on = period_end + timedelta(days=1)
+                due_date = billed_on + timedelta(days=PAYMENT_DAYS)
+                amount = Decimal(f'{kwh[row, column] * price_per_kwh:.2f}')
+                is_paid = bool(paid[row, column]) and due_date <= end_date
+                status = 'paid' if is_paid else 'unpaid'
+                bills.append((user_id, billed_on, amount, status, period_start, period_end, round(float(kwh[row, column]), 3)))
+                invoice_status = 'paid' if is_paid else ('overdue' if due_date < end_date else 'unpaid')
+                created_at = datetime.combine(billed_on, time.min, tzinfo=timezone.utc)
+                invoices.append((user_id, period_start, period_end, amount, invoice_status, due_date, created_at))
+        return bills, invoices
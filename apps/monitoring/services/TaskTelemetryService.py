@@ -0,0 +1,225 @@
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from django.conf import settings
+from apps.monitoring.repositories.TaskTelemetryRepository import TaskTelemetryRepository
+from apps.monitoring.services.MetricsService import REGISTRY, define_counter, define_histogram
+
+SENT_AT_HEADER = 'sent_at'  # Epoch seconds stamped on every published task message
+
+TASK_RUNS = define_counter('celery_tasks_total', 'Finished Celery task runs by outcome (success, failure, retry).')
+TASK_QUEUE_WAIT = define_histogram('celery_task_queue_wait_seconds', 'Time between publishing a task and a worker starting it.', settings.TASK_TELEMETRY_BUCKETS)
+TASK_RUNTIME = define_histogram('celery_task_runtime_seconds', 'Celery task runtime.', settings.TASK_TELEMETRY_BUCKETS)
+TASK_STAGE = define_histogram('celery_task_stage_duration_seconds', 'Duration of the named stages of a Celery task.', settings.TASK_TELEMETRY_BUCKETS)
+
+# Rolling per-minute statistics of this process, published every TASK_TELEMETRY_PUBLISH_SECONDS
+_lock = threading.Lock()
+_minutes: Dict[int, Dict[str, Dict[str, Any]]] = {}
+_started: Dict[str, Tuple[float, str]] = {}  # Task ID -> (perf_counter at start, task name)
+_running = threading.local()  # Stack of the task names running in this thread (eager tasks nest)
+_published_at = 0.0
+
+
+def _worker_id() -> str:
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _new_minute_stats() -> Dict[str, Any]:
+    buckets = len(settings.TASK_TELEMETRY_BUCKETS) + 1
+    return {
+        'started': 0, 'succeeded': 0, 'failed': 0, 'retried': 0,
+        'wait': [0] * buckets, 'wait_sum': 0.0, 'wait_count': 0,
+        'runtime': [0] * buckets, 'runtime_sum': 0.0,
+        'stages': {},
+    }
+
+
+def _bucket(value: float) -> int:
+    for index, bound in enumerate(settings.TASK_TELEMETRY_BUCKETS):
+        if value <= bound:
+            return index
+    return len(settings.TASK_TELEMETRY_BUCKETS)
+
+
+def _minute_stats(task_name: str) -> Dict[str, Any]:
+    """
+    Returns the current minute's statistics of a task; the caller holds the lock.
+    """
+    minute = int(time.time() // 60)
+    tasks = _minutes.get(minute)
+    if tasks is None:
+        tasks = _minutes[minute] = {}
+        oldest = minute - settings.TASK_TELEMETRY_WINDOW_MINUTES
+        for expired in [m for m in _minutes if m <= oldest]:
+            del _minutes[expired]
+    return tasks.setdefault(task_name, _new_minute_stats())
+
+
+def stamp_sent_at(headers: Dict[str, Any]) -> None:
+    """
+    `before_task_publish` handler: stamps the publish time on the message, for the queue wait.
+    """
+    headers.setdefault(SENT_AT_HEADER, time.time())
+
+
+def task_started(task_id: str, task: Any) -> None:
+    """
+    `task_prerun` handler: records the queue wait and starts the runtime clock.
+    """
+    sent_at = getattr(task.request, SENT_AT_HEADER, None)
+    wait = max(time.time() - float(sent_at), 0.0) if sent_at else None
+    labels = (('task', task.name),)
+    with _lock:
+        _started[task_id] = (time.perf_counter(), task.name)
+        stats = _minute_stats(task.name)
+        stats['started'] += 1
+        if wait is not None:
+            stats['wait'][_bucket(wait)] += 1
+            stats['wait_sum'] += wait
+            stats['wait_count'] += 1
+    if not hasattr(_running, 'tasks'):
+        _running.tasks = []
+    _running.tasks.append(task.name)
+    if wait is not None:
+        REGISTRY.observe(TASK_QUEUE_WAIT, labels, wait)
+
+
+def task_finished(task_id: str, task: Any, state: Optional[str]) -> None:
+    """
+    `task_postrun` handler: records the runtime and outcome, then publishes if due.
+    """
+    global _published_at
+    if getattr(_running, 'tasks', None):
+        _running.tasks.pop()
+    outcome = {'SUCCESS': 'success', 'RETRY': 'retry'}.get(state or '', 'failure')
+    with _lock:
+        started = _started.pop(task_id, None)
+        if started is None:
+            return
+        runtime = time.perf_counter() - started[0]
+        stats = _minute_stats(task.name)
+        stats['runtime'][_bucket(runtime)] += 1
+        stats['runtime_sum'] += runtime
+        stats[{'success': 'succeeded', 'retry': 'retried', 'failure': 'failed'}[outcome]] += 1
+        publish = time.monotonic() - _published_at >= settings.TASK_TELEMETRY_PUBLISH_SECONDS
+        if publish:
+            _published_at = time.monotonic()
+            snapshot = {'worker': _worker_id(), 'minutes': {str(minute): tasks for minute, tasks in _minutes.items()}}
+            snapshot = _copy(snapshot)
+    REGISTRY.observe(TASK_RUNTIME, (('task', task.name), ('outcome', outcome)), runtime)
+    REGISTRY.inc(TASK_RUNS, (('task', task.name), ('outcome', outcome)))
+    if publish:
+        TaskTelemetryRepository().publish(snapshot['worker'], snapshot)
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+@contextmanager
+def task_stage(stage: str) -> Iterator[None]:
+    """
+    Times a named stage (e.g. 'template', 'layout', 'write') of the running task.
+    When the task function is called directly rather than through Celery, the stage is timed under 'direct'.
+    """
+    tasks = getattr(_running, 'tasks', None)
+    task_name = tasks[-1] if tasks else 'direct'
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            stage_stats = _minute_stats(task_name)['stages'].setdefault(stage, [0.0, 0])
+            stage_stats[0] += elapsed
+            stage_stats[1] += 1
+        REGISTRY.observe(TASK_STAGE, (('task', task_name), ('stage', stage)), elapsed)
+
+
+def _percentile(counts: List[int], quantile: float) -> Optional[float]:
+    """
+    Upper bound of the bucket holding the quantile; None above the largest bucket or without data.
+    """
+    total = sum(counts)
+    if not total:
+        return None
+    target = quantile * total
+    cumulative = 0
+    for bound, count in zip(settings.TASK_TELEMETRY_BUCKETS, counts):
+        cumulative += count
+        if cumulative >= target:
+            return bound
+    return None
+
+
+class TaskTelemetryService:
+    """
+    Service class summarizing the rolling Celery task statistics of every worker process.
+    """
+
+    def __init__(self, telemetry_repository: Optional[TaskTelemetryRepository] = None) -> None:
+        self.telemetry_repository = telemetry_repository or TaskTelemetryRepository()
+
+    def get_summary(self, minutes: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get per-task throughput, failure rate, queue wait and runtime over the last minutes.
+
+        Args:
+            minutes (Optional[int]): Window length. Defaults to (and is capped at) settings.TASK_TELEMETRY_WINDOW_MINUTES.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per task, busiest first. Percentiles are bucket upper
+            bounds; None means no data or above the largest bucket.
+        """
+        minutes = min(minutes or settings.TASK_TELEMETRY_WINDOW_MINUTES, settings.TASK_TELEMETRY_WINDOW_MINUTES)
+        since = int(time.time() // 60) - minutes
+        totals: Dict[str, Dict[str, Any]] = {}
+        snapshots = [snapshot for snapshot in self.telemetry_repository.get_snapshots() if snapshot['worker'] != _worker_id()]
+        with _lock:
+            snapshots.append({'minutes': _copy({str(minute): tasks for minute, tasks in _minutes.items()})})
+        for snapshot in snapshots:
+            for minute, tasks in snapshot['minutes'].items():
+                if int(minute) <= since:
+                    continue
+                for task_name, stats in tasks.items():
+                    merged = totals.setdefault(task_name, _new_minute_stats())
+                    for field in ('started', 'succeeded', 'failed', 'retried', 'wait_sum', 'wait_count', 'runtime_sum'):
+                        merged[field] += stats[field]
+                    for field in ('wait', 'runtime'):
+                        merged[field] = [a + b for a, b in zip(merged[field], stats[field])]
+                    for stage, (seconds, count) in stats['stages'].items():
+                        stage_totals = merged['stages'].setdefault(stage, [0.0, 0])
+                        stage_totals[0] += seconds
+                        stage_totals[1] += count
+
+        summary = []
+        for task_name, stats in totals.items():
+            finished = stats['succeeded'] + stats['failed'] + stats['retried']
+            summary.append({
+                'task': task_name,
+                'started': stats['started'],
+                'succeeded': stats['succeeded'],
+                'failed': stats['failed'],
+                'retried': stats['retried'],
+                'failure_rate': round(stats['failed'] / finished, 4) if finished else 0.0,
+                'per_minute': round(finished / minutes, 2),
+                'queue_wait': {
+                    'avg_seconds': round(stats['wait_sum'] / stats['wait_count'], 3) if stats['wait_count'] else None,
+                    'p50_seconds': _percentile(stats['wait'], 0.5),
+                    'p95_seconds': _percentile(stats['wait'], 0.95),
+                },
+                'runtime': {
+                    'avg_seconds': round(stats['runtime_sum'] / finished, 3) if finished else None,
+                    'p50_seconds': _percentile(stats['runtime'], 0.5),
+                    'p95_seconds': _percentile(stats['runtime'], 0.95),
+                },
+                'stages': {stage: round(seconds / count, 3) for stage, (seconds, count) in stats['stages'].items()},
+            })
+        return sorted(summary, key=lambda item: -item['started'])
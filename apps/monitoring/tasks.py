@@ -0,0 +1,10 @@
+from celery import shared_task # type: ignore
+from typing import Any, Dict
+from apps.monitoring.services.SlowQueryService import SlowQueryService
+
+@shared_task(ignore_result=True)
+def capture_slow_query(query: Dict[str, Any]) -> int:
+    """
+    Task to run EXPLAIN on a slow query sampled by the recorder and store it in the slow-query log.
+    """
+    return SlowQueryService().capture(query)
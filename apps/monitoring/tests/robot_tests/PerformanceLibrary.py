@@ -0,0 +1,147 @@
+import math
+import os
+import re
+import sys
+from robot.api import logger # type: ignore
+from robot.api.deco import keyword, library # type: ignore
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
+SERVER_TIMING_SQL = re.compile(r'sql;dur=([\d.]+);desc="(\d+) queries"')
+SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(B|KB|MB)?\s*$', re.IGNORECASE)
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 * 1024}
+
+
+@library(scope='SUITE')
+class PerformanceLibrary:
+    """
+    Robot keywords asserting performance budgets on RequestsLibrary responses: response time,
+    SQL queries per request and payload size.
+
+    Query counts are read from the `Server-Timing` header added by the SQL instrumentation
+    middleware, so the server under test must run with SQL_INSTRUMENTATION_ENABLED=true.
+    The seeding and login keywords work on the server's database through Django and need the
+    same settings as the server (DJANGO_SETTINGS_MODULE, defaulting to energy_billing.settings).
+    """
+
+    def __init__(self) -> None:
+        self.timings = {}
+
+    @keyword
+    def response_time_should_be_below(self, response, max_ms):
+        """
+        Fails if the response took `max_ms` milliseconds or longer, up to its headers.
+        """
+        elapsed_ms = response.elapsed.total_seconds() * 1000
+        logger.info(f'{response.request.method} {response.url}: {elapsed_ms:.1f} ms (budget {max_ms} ms)')
+        if elapsed_ms >= float(max_ms):
+            raise AssertionError(f'{response.request.method} {response.url} took {elapsed_ms:.1f} ms, over the budget of {max_ms} ms.')
+
+    @keyword
+    def record_response_time(self, name, response):
+        """
+        Adds the response's time to the named series, for `Response Time Percentile Should Be Below`.
+        """
+        self.timings.setdefault(name, []).append(response.elapsed.total_seconds() * 1000)
+
+    @keyword
+    def response_time_percentile_should_be_below(self, name, percentile, max_ms):
+        """
+        Fails if the given percentile (e.g. 95) of the named series is `max_ms` milliseconds or more.
+        Single requests are noisy; budget a percentile of repeated requests instead.
+        """
+        timings = sorted(self.timings.get(name, []))
+        if not timings:
+            raise AssertionError(f"No response times recorded as '{name}'.")
+        value = timings[min(math.ceil(len(timings) * float(percentile) / 100), len(timings)) - 1]
+        logger.info(f'{name}: p{percentile} {value:.1f} ms of {len(timings)} requests (budget {max_ms} ms)')
+        if value >= float(max_ms):
+            raise AssertionError(f'{name}: p{percentile} is {value:.1f} ms over {len(timings)} requests, over the budget of {max_ms} ms.')
+
+    @keyword
+    def get_sql_query_count(self, response):
+        """
+        Returns the number of SQL queries the server ran for the response.
+        """
+        match = SERVER_TIMING_SQL.search(response.headers.get('Server-Timing', ''))
+        if match is None:
+            raise AssertionError(
+                f'{response.request.method} {response.url} has no SQL Server-Timing entry; '
+                'run the server with SQL_INSTRUMENTATION_ENABLED=true and SQL_INSTRUMENTATION_SAMPLE_RATE=1.'
+            )
+        return int(match.group(2))
+
+    @keyword
+    def sql_queries_should_be_at_most(self, response, max_queries):
+        """
+        Fails if the server ran more than `max_queries` SQL queries for the response.
+        """
+        queries = self.get_sql_query_count(response)
+        logger.info(f'{response.request.method} {response.url}: {queries} queries (limit {max_queries})')
+        if queries > int(max_queries):
+            raise AssertionError(f'{response.request.method} {response.url} ran {queries} SQL queries, over the limit of {max_queries}.')
+
+    @keyword
+    def payload_size_should_be_at_most(self, response, max_size):
+        """
+        Fails if the response body is larger than `max_size`, given in bytes or as e.g. `512 KB` or `2 MB`.
+        """
+        match = SIZE.match(str(max_size))
+        if match is None:
+            raise ValueError(f"Invalid size '{max_size}'; use bytes or a number with B, KB or MB.")
+        limit = float(match.group(1)) * SIZE_UNITS[(match.group(2) or 'B').upper()]
+        size = len(response.content)
+        logger.info(f'{response.request.method} {response.url}: {size} bytes (limit {max_size})')
+        if size > limit:
+            raise AssertionError(f'{response.request.method} {response.url} returned {size} bytes, over the limit of {max_size}.')
+
+    @keyword
+    def seed_synthetic_data(self, users, days, end, prefix, seed=0):
+        """
+        Runs `seed_synthetic` on the server's database, unless users with the prefix already exist.
+        """
+        self._setup_django()
+        from django.core.management import call_command
+        from apps.monitoring.repositories.SyntheticDataRepository import SyntheticDataRepository
+
+        if SyntheticDataRepository().usernames_taken(prefix):
+            logger.info(f"Users named '{prefix}...' exist; keeping their data.")
+            return
+        call_command('seed_synthetic', users=int(users), days=int(days), end=end, prefix=prefix, seed=int(seed), force=True)
+
+    @keyword
+    def log_in_as(self, username, admin=False):
+        """
+        Opens a server session for the user and returns its cookies, for `Create Session    cookies=`.
+        With `admin=True` a missing user is created as an admin.
+        """
+        self._setup_django()
+        from django.conf import settings
+        from django.test import Client
+        from apps.authentication.models.UserModel import User
+
+        user = User.objects.filter(username=username).first()
+        if user is None:
+            if not admin:
+                raise AssertionError(f"No user named '{username}'.")
+            user = User.objects.create_user(username=username, password=None, role='admin')
+        client = Client()
+        client.force_login(user)
+        return {settings.SESSION_COOKIE_NAME: client.cookies[settings.SESSION_COOKIE_NAME].value}
+
+    @keyword
+    def get_user_id(self, username):
+        """
+        Returns the ID of the user with the given username.
+        """
+        self._setup_django()
+        from apps.authentication.models.UserModel import User
+
+        return User.objects.values_list('id', flat=True).get(username=username)
+
+    @staticmethod
+    def _setup_django():
+        if ROOT not in sys.path:
+            sys.path.insert(0, ROOT)
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'energy_billing.settings')
+        import django
+        django.setup()
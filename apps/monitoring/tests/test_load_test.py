@@ -0,0 +1,46 @@
+from datetime import date
+from unittest import mock
+from django.test import SimpleTestCase
+from apps.monitoring.services.BenchmarkService import BenchmarkData
+from apps.monitoring.services.LoadTestService import LoadTestService, VirtualUser
+
+DATA = BenchmarkData(None, None, [1, 2], date(2024, 1, 1), date(2024, 3, 31), [], [], [])
+
+
+def fake_run_wsgi(user, rng, kinds, context):
+    return [(kind, 200, 0.001, 3) for kind in kinds]
+
+
+class LoadTestRunTest(SimpleTestCase):
+    def setUp(self):
+        self.service = LoadTestService()
+        run_wsgi = mock.patch.object(self.service, '_run_wsgi', side_effect=fake_run_wsgi)
+        self.run_wsgi = run_wsgi.start()
+        self.addCleanup(run_wsgi.stop)
+
+    def test_detail_requests_of_users_without_records_are_skipped(self):
+        users = [VirtualUser(1, 'a', [10, 11], []), VirtualUser(2, 'b', [], [20])]
+        plan = ['bill-detail', 'bill-detail', 'invoice-detail', 'invoice-detail', 'balance', 'balance']
+
+        summary = self.service.run('wsgi', DATA, users, plan)
+
+        sent = {call.args[0].user_id: call.args[2] for call in self.run_wsgi.call_args_list}
+        self.assertEqual(sent, {1: ['bill-detail', 'balance'], 2: ['invoice-detail', 'balance']})
+        self.assertEqual(summary['skipped'], 2)
+        self.assertEqual(summary['total']['requests'], 4)
+        self.assertEqual(sorted(summary['kinds']), ['balance', 'bill-detail', 'invoice-detail'])
+
+    def test_a_plan_no_user_can_send_is_rejected(self):
+        users = [VirtualUser(1, 'a', [], []), VirtualUser(2, 'b', [], [])]
+
+        with self.assertRaises(ValueError):
+            self.service.run('wsgi', DATA, users, ['bill-detail', 'invoice-detail'])
+        self.run_wsgi.assert_not_called()
+
+    def test_users_with_records_send_the_whole_plan(self):
+        users = [VirtualUser(1, 'a', [10], [20])]
+
+        summary = self.service.run('wsgi', DATA, users, ['bill-detail', 'invoice-detail', 'bills-list'])
+
+        self.assertEqual(summary['skipped'], 0)
+        self.assertEqual(summary['total']['requests'], 3)
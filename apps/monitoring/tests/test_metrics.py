@@ -0,0 +1,70 @@
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient # type: ignore
+from apps.authentication.models.UserModel import User
+from apps.monitoring.repositories.MetricsRepository import MetricsRepository
+from apps.monitoring.services.MetricsService import REPOSITORY_CALLS, MetricsRegistry
+
+LABELS = (('repository', 'TestRepository'), ('method', 'get'), ('outcome', 'ok'))
+
+
+class MetricsSnapshotTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        # Registries of the tests must not flush into the removed directory at exit
+        patcher = mock.patch('apps.monitoring.services.MetricsService.atexit.register')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_concurrent_writes_leave_one_complete_snapshot(self):
+        repository = MetricsRepository(self.directory)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda value: repository.write_snapshot('worker', {'counters': [value], 'histograms': []}), range(200)))
+
+        self.assertEqual(os.listdir(self.directory), ['worker.json'])
+        self.assertEqual(len(repository.read_snapshots()), 1)
+
+    @override_settings(METRICS_FLUSH_SECONDS=0)
+    def test_concurrent_counting_flushes_without_errors(self):
+        registry = MetricsRegistry(MetricsRepository(self.directory))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: registry.inc(REPOSITORY_CALLS, LABELS), range(500)))
+        registry.flush()
+
+        [snapshot] = MetricsRepository(self.directory).read_snapshots()
+        self.assertEqual(snapshot['counters'][0][2], 500)
+
+    @override_settings(METRICS_FLUSH_SECONDS=0)
+    def test_flush_errors_do_not_reach_the_caller(self):
+        repository = MetricsRepository(self.directory)
+        registry = MetricsRegistry(repository)
+
+        with mock.patch.object(repository, 'write_snapshot', side_effect=OSError('disk full')), self.assertLogs('apps.monitoring.metrics', 'WARNING'):
+            registry.inc(REPOSITORY_CALLS, LABELS)
+
+        self.assertEqual(registry.snapshot()['counters'][0][2], 1)
+
+
+class MetricsPermissionTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_without_a_token_only_admins_can_scrape(self):
+        with override_settings(METRICS_BEARER_TOKEN=None):
+            self.assertIn(self.client.get('/metrics').status_code, (401, 403))
+            self.client.force_authenticate(User.objects.create_user(username='customer', password='secret'))
+            self.assertEqual(self.client.get('/metrics').status_code, 403)
+            self.client.force_authenticate(User.objects.create_user(username='operator', password='secret', role='admin'))
+            self.assertEqual(self.client.get('/metrics').status_code, 200)
+
+    def test_scrapers_must_present_the_token(self):
+        with override_settings(METRICS_BEARER_TOKEN='scrape-secret'):
+            self.assertIn(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer wrong').status_code, (401, 403))
+            self.assertEqual(self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200)
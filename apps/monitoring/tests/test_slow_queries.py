@@ -0,0 +1,51 @@
+from datetime import date
+from unittest import mock
+from django.core.cache import caches
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from apps.consumption.models.ConsumptionModel import Consumption
+from apps.monitoring.models.SlowQueryModel import SlowQuery
+from apps.monitoring.repositories.SlowQueryRepository import numbered_placeholders
+from apps.monitoring.services.SlowQueryService import SlowQueryService, record_slow_query
+
+
+class NumberedPlaceholdersTest(SimpleTestCase):
+    def test_driver_placeholders_become_numbered_parameters(self):
+        self.assertEqual(
+            numbered_placeholders('SELECT * FROM t WHERE a = %s AND b LIKE %s AND c LIKE \'x%%\''),
+            'SELECT * FROM t WHERE a = $1 AND b LIKE $2 AND c LIKE \'x%\'',
+        )
+
+    def test_named_placeholders_keep_one_number_per_name(self):
+        self.assertEqual(numbered_placeholders('SELECT %(a)s, %(b)s, %(a)s'), 'SELECT $1, $2, $1')
+
+
+@override_settings(SLOW_QUERY_THRESHOLD_MS=0, SLOW_QUERY_SAMPLE_RATE=1.0)
+class SlowQueryCaptureTest(TestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_captures_hold_parameter_types_but_no_values(self):
+        with mock.patch('apps.monitoring.tasks.capture_slow_query.delay') as delay, connection.execute_wrapper(record_slow_query):
+            Consumption.objects.filter(date=date(2024, 5, 17), consumption__gt=123.5).exists()
+
+        query = delay.call_args.args[0]
+        self.assertNotIn('2024-05-17', str(query))
+        self.assertNotIn('123.5', str(query))
+        self.assertIn('%s', query['sql'])
+        self.assertIn('float', query['param_types'])
+        # Dates are adapted to strings on SQLite
+        self.assertTrue({'date', 'str'} & set(query['param_types']))
+
+    def test_databases_without_generic_plans_store_an_explain_error(self):
+        capture_id = SlowQueryService().capture({
+            'fingerprint': 'SELECT ? FROM consumption_consumption', 'sql': 'SELECT %s FROM consumption_consumption', 'param_types': ['int'],
+            'database': 'default', 'duration_ms': 600.0, 'repository_method': '', 'call_site': '', 'stack': '',
+        })
+
+        slow_query = SlowQuery.objects.get(id=capture_id)
+        if connection.vendor == 'postgresql':
+            self.skipTest('PostgreSQL may produce a generic plan')
+        self.assertIsNone(slow_query.plan)
+        self.assertIn('PostgreSQL 16', slow_query.explain_error)
+        self.assertEqual(slow_query.param_types, ['int'])
@@ -0,0 +1,150 @@
+import re
+from unittest import mock
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from apps.authentication.models.UserModel import User
+from apps.consumption.repositories.ConsumptionRepository import ConsumptionRepository
+from apps.monitoring.middleware.SQLInstrumentationMiddleware import SQLInstrumentationMiddleware
+from apps.monitoring.services import SQLInstrumentationService as instrumentation
+from apps.monitoring.services.LoadTestService import SERVER_TIMING_QUERIES
+from apps.monitoring.services.SQLInstrumentationService import (
+    REPEATED_PER_ROUTE, STATEMENT_LIMIT, QueryRecorder, SQLInstrumentationService, fingerprint, merge_routes,
+)
+
+# The format PerformanceLibrary (robot tests) and LoadTestService parse
+SQL_TIMING = re.compile(r'sql;dur=\d+(?:\.\d+)?;desc="(\d+) queries"')
+
+
+def route_stats(requests=1, queries=3, max_queries=3, repeated=None):
+    return {
+        'requests': requests, 'queries': queries, 'sql_ms': 1.5 * requests, 'max_queries': max_queries,
+        'n_plus_one_requests': 1 if repeated else 0, 'repeated': repeated or {},
+    }
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_literals_and_placeholders_become_question_marks(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE a = 'it''s'  AND b = 42 AND c = 1.5 AND d = %s"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c = ? AND d = ?',
+        )
+
+    def test_in_lists_of_any_length_share_a_fingerprint(self):
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'), 'SELECT ? FROM t WHERE id IN (...)')
+        self.assertEqual(fingerprint('SELECT 1 FROM t WHERE id IN (1,2)'), fingerprint('SELECT 1 FROM t WHERE id IN (%s)'))
+
+    def test_identifiers_with_digits_are_kept_and_long_statements_cut(self):
+        self.assertEqual(fingerprint('SELECT col1 FROM table_2'), 'SELECT col1 FROM table_2')
+        self.assertEqual(len(fingerprint('SELECT ' + ', '.join(f'column_{index}' for index in range(200)))), STATEMENT_LIMIT)
+
+
+class QueryRecorderTest(TestCase):
+    def test_statements_reaching_the_threshold_are_reported_with_their_call_site(self):
+        user = User.objects.create_user(username='counted', password='secret')
+        records = [ConsumptionRepository().create_consumption(user, f'2024-01-{day:02d}', 1.0) for day in range(1, 7)]
+        recorder = QueryRecorder(repeat_threshold=5)
+
+        with connection.execute_wrapper(recorder):
+            for record in records[:5]:
+                ConsumptionRepository().get_consumption_by_id(record.id)
+            User.objects.filter(id=user.id).exists()
+
+        self.assertEqual(recorder.count, 6)
+        (statement, count, call_site), = recorder.repeated()
+        self.assertIn('consumption_consumption', statement)
+        self.assertNotIn(str(records[0].id), statement)
+        self.assertEqual(count, 5)
+        self.assertRegex(call_site, r'^apps/consumption/repositories/ConsumptionRepository\.py:\d+ in get_consumption_by_id$')
+
+    def test_most_repeated_statements_come_first(self):
+        recorder = QueryRecorder(repeat_threshold=2)
+        execute = mock.Mock()
+        for sql, times in (('SELECT 1', 2), ('SELECT a FROM b', 4), ('SELECT c FROM d', 1)):
+            for _ in range(times):
+                recorder(execute, sql, None, False, {})
+
+        self.assertEqual([(statement, count) for statement, count, _ in recorder.repeated()], [('SELECT a FROM b', 4), ('SELECT ?', 2)])
+        self.assertEqual(execute.call_count, 7)
+
+
+@override_settings(SQL_INSTRUMENTATION_ENABLED=True, SQL_INSTRUMENTATION_SAMPLE_RATE=1.0, SQL_N_PLUS_ONE_THRESHOLD=3)
+class ServerTimingTest(TestCase):
+    def setUp(self):
+        routes = mock.patch.dict(instrumentation._routes, clear=True)
+        routes.start()
+        self.addCleanup(routes.stop)
+        self.user = User.objects.create_user(username='timed', password='secret')
+
+    def respond(self, lookups, server_timing=None):
+        def view(request):
+            request.resolver_match = mock.Mock(route='users/<int:pk>/')
+            for _ in range(lookups):
+                User.objects.filter(id=self.user.id).exists()
+            response = HttpResponse()
+            if server_timing:
+                response['Server-Timing'] = server_timing
+            return response
+
+        with self.assertLogs('apps.monitoring.sql', 'INFO'):
+            return SQLInstrumentationMiddleware(view)(RequestFactory().get('/users/1/'))
+
+    def test_header_reports_the_query_count_in_the_parsed_format(self):
+        header = self.respond(2)['Server-Timing']
+
+        self.assertRegex(header, r'^sql;dur=\d+(\.\d+)?;desc="2 queries"$')
+        self.assertEqual(SERVER_TIMING_QUERIES.search(header).group(1), '2')
+
+    def test_repeated_statements_and_earlier_timings_are_kept_in_the_header(self):
+        header = self.respond(3, server_timing='app;dur=12')['Server-Timing']
+
+        first, sql, repeated = header.split(', ')
+        self.assertEqual(first, 'app;dur=12')
+        self.assertEqual(SQL_TIMING.fullmatch(sql).group(1), '3')
+        self.assertEqual(repeated, 'sql-repeated;desc="1 statements run 3+ times"')
+
+
+class MergeRoutesTest(SimpleTestCase):
+    def test_totals_of_several_processes_add_up(self):
+        site = 'apps/billing/views/BillingView.py:10 in get'
+        target = {}
+        merge_routes(target, {'GET bills/': route_stats(repeated={'SELECT ?': {'requests': 1, 'max_count': 8, 'call_site': site}})})
+        merge_routes(target, {
+            'GET bills/': route_stats(requests=2, queries=20, max_queries=12, repeated={'SELECT ?': {'requests': 2, 'max_count': 6, 'call_site': site}}),
+            'GET invoices/': route_stats(),
+        })
+
+        self.assertEqual(target['GET bills/'], {
+            'requests': 3, 'queries': 23, 'sql_ms': 4.5, 'max_queries': 12, 'n_plus_one_requests': 2,
+            'repeated': {'SELECT ?': {'requests': 3, 'max_count': 8, 'call_site': site}},
+        })
+        self.assertEqual(target['GET invoices/']['requests'], 1)
+
+    def test_repeated_statements_are_capped_per_route(self):
+        target = {}
+        repeated = {f'SELECT {index}': {'requests': index + 1, 'max_count': 5, 'call_site': ''} for index in range(REPEATED_PER_ROUTE + 5)}
+
+        merge_routes(target, {'GET bills/': route_stats(repeated=repeated)})
+
+        kept = target['GET bills/']['repeated']
+        self.assertEqual(len(kept), REPEATED_PER_ROUTE)
+        self.assertEqual(set(kept), {f'SELECT {index}' for index in range(5, REPEATED_PER_ROUTE + 5)})
+
+
+class RecordTest(SimpleTestCase):
+    def setUp(self):
+        routes = mock.patch.dict(instrumentation._routes, clear=True)
+        routes.start()
+        self.addCleanup(routes.stop)
+        self.service = SQLInstrumentationService(stats_repository=mock.Mock())
+
+    def test_each_route_keeps_a_bounded_number_of_repeated_statements(self):
+        for index in range(REPEATED_PER_ROUTE * 3):
+            recorder = QueryRecorder(repeat_threshold=1)
+            recorder(mock.Mock(), f'SELECT * FROM table_{index}', None, False, {})
+            with self.assertLogs('apps.monitoring.sql', 'WARNING'):
+                self.service.record('GET', 'bills/', 200, recorder)
+
+        stats = instrumentation._routes['GET bills/']
+        self.assertEqual((stats['requests'], stats['n_plus_one_requests']), (REPEATED_PER_ROUTE * 3, REPEATED_PER_ROUTE * 3))
+        self.assertEqual(len(stats['repeated']), REPEATED_PER_ROUTE)
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from apps.monitoring.services import TaskTelemetryService as telemetry
+from apps.monitoring.services.TaskTelemetryService import (
+    SENT_AT_HEADER, TaskTelemetryService, _percentile, stamp_sent_at, task_finished, task_stage, task_started,
+)
+
+BUCKETS = (1.0, 5.0, 10.0)
+
+
+class FakeClock:
+    """
+    Stands in for the `time` module of the telemetry service; every clock reads the same value.
+    """
+
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+def fake_task(name, sent_at=None):
+    request = SimpleNamespace(**({SENT_AT_HEADER: sent_at} if sent_at is not None else {}))
+    return SimpleNamespace(name=name, request=request)
+
+
+@override_settings(TASK_TELEMETRY_BUCKETS=BUCKETS, TASK_TELEMETRY_WINDOW_MINUTES=10, TASK_TELEMETRY_PUBLISH_SECONDS=3600)
+class TaskTelemetryTest(SimpleTestCase):
+    def setUp(self):
+        for state in (telemetry._minutes, telemetry._started):
+            patcher = mock.patch.dict(state, clear=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.clock = FakeClock(600_000.0)
+        for target, value in (('time', self.clock), ('_published_at', self.clock.now), ('_running', SimpleNamespace())):
+            patcher = mock.patch.object(telemetry, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.repository = mock.Mock(get_snapshots=mock.Mock(return_value=[]))
+
+    def stats(self, task_name):
+        return self.summary()[task_name]
+
+    def summary(self, minutes=None):
+        return {entry['task']: entry for entry in TaskTelemetryService(self.repository).get_summary(minutes)}
+
+    def run_task(self, task, task_id, seconds, state='SUCCESS'):
+        task_started(task_id, task)
+        self.clock.now += seconds
+        task_finished(task_id, task, state)
+
+    def test_publish_stamps_the_send_time_once(self):
+        headers = {}
+        stamp_sent_at(headers)
+        self.assertEqual(headers, {SENT_AT_HEADER: self.clock.now})
+
+        self.clock.now += 5
+        stamp_sent_at(headers)
+        self.assertEqual(headers[SENT_AT_HEADER], self.clock.now - 5)
+
+    def test_queue_wait_is_measured_from_the_send_time(self):
+        self.run_task(fake_task('invoices.pdf', sent_at=self.clock.now - 3), 'a', 0.5)
+        self.run_task(fake_task('invoices.pdf'), 'b', 0.5)
+        # A worker clock behind the publisher's counts as no wait
+        self.run_task(fake_task('invoices.pdf', sent_at=self.clock.now + 2), 'c', 0.5)
+
+        wait = self.stats('invoices.pdf')['queue_wait']
+        self.assertEqual(wait, {'avg_seconds': 1.5, 'p50_seconds': 1.0, 'p95_seconds': 5.0})
+
+    def test_outcomes_are_counted_per_task(self):
+        task = fake_task('billing.rebill')
+        for task_id, state in enumerate(('SUCCESS', 'SUCCESS', 'RETRY', 'FAILURE', None)):
+            self.run_task(task, str(task_id), 2.0, state)
+        task_finished('never-started', task, 'SUCCESS')
+
+        stats = self.stats('billing.rebill')
+        self.assertEqual(
+            {key: stats[key] for key in ('started', 'succeeded', 'retried', 'failed', 'failure_rate')},
+            {'started': 5, 'succeeded': 2, 'retried': 1, 'failed': 2, 'failure_rate': 0.4},
+        )
+        self.assertEqual(stats['runtime'], {'avg_seconds': 2.0, 'p50_seconds': 5.0, 'p95_seconds': 5.0})
+
+    def test_stages_belong_to_the_innermost_running_task(self):
+        outer, inner = fake_task('outer'), fake_task('inner')
+        with task_stage('setup'):
+            self.clock.now += 1
+        task_started('outer-id', outer)
+        with task_stage('load'):
+            self.clock.now += 2
+        # An eager task called from the outer one
+        task_started('inner-id', inner)
+        with task_stage('load'):
+            self.clock.now += 4
+        task_finished('inner-id', inner, 'SUCCESS')
+        with task_stage('write'):
+            self.clock.now += 3
+        task_finished('outer-id', outer, 'SUCCESS')
+
+        summary = self.summary()
+        self.assertEqual(summary['direct']['stages'], {'setup': 1.0})
+        self.assertEqual(summary['outer']['stages'], {'load': 2.0, 'write': 3.0})
+        self.assertEqual(summary['inner']['stages'], {'load': 4.0})
+
+    def test_minutes_leave_the_window(self):
+        task = fake_task('consumption.gaps')
+        self.run_task(task, 'old', 0.1)
+        first_minute = int(self.clock.now // 60)
+        self.clock.now += 5 * 60
+        self.run_task(task, 'recent', 0.1)
+
+        self.assertEqual(self.summary()['consumption.gaps']['started'], 2)
+        self.assertEqual(self.summary(minutes=3)['consumption.gaps']['started'], 1)
+
+        self.clock.now += 6 * 60
+        self.run_task(task, 'new', 0.1)
+        self.assertNotIn(first_minute, telemetry._minutes)
+        self.assertEqual(self.summary()['consumption.gaps']['started'], 2)
+
+    def test_other_workers_snapshots_are_added(self):
+        self.run_task(fake_task('invoices.pdf'), 'local', 0.5)
+        minute = str(int(self.clock.now // 60))
+        remote = telemetry._copy(telemetry._minutes[int(minute)])
+        self.repository.get_snapshots.return_value = [{'worker': 'other-host:1', 'minutes': {minute: remote}}]
+
+        self.assertEqual(self.stats('invoices.pdf')['succeeded'], 2)
+
+
+@override_settings(TASK_TELEMETRY_BUCKETS=BUCKETS)
+class PercentileTest(SimpleTestCase):
+    def test_percentiles_are_bucket_upper_bounds(self):
+        self.assertIsNone(_percentile([0, 0, 0, 0], 0.5))
+        self.assertEqual(_percentile([5, 3, 2, 0], 0.5), 1.0)
+        self.assertEqual(_percentile([5, 3, 2, 0], 0.8), 5.0)
+        self.assertEqual(_percentile([5, 3, 2, 0], 0.95), 10.0)
+
+    def test_values_above_the_largest_bucket_have_no_bound(self):
+        self.assertIsNone(_percentile([1, 0, 0, 9], 0.5))
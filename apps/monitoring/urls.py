@@ -0,0 +1,11 @@
+from django.urls import path
+from .views.SQLStatsView import SQLStatsView
+from .views.TaskTelemetryView import TaskTelemetryView
+from .views.ProfileView import ProfileListView, ProfileDownloadView
+
+urlpatterns = [
+    path('sql/', SQLStatsView.as_view(), name='monitoring-sql-stats'),  # GET
+    path('tasks/', TaskTelemetryView.as_view(), name='monitoring-task-telemetry'),  # GET
+    path('profiles/', ProfileListView.as_view(), name='monitoring-profiles'),  # GET
+    path('profiles/<str:report_id>/<str:kind>/', ProfileDownloadView.as_view(), name='monitoring-profile-download'),  # GET
+]
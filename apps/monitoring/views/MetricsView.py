@@ -0,0 +1,49 @@
+import hmac
+from django.conf import settings
+from django.http import HttpResponse
+from rest_framework.views import APIView # type: ignore
+from rest_framework.permissions import BasePermission # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from apps.monitoring.services.MetricsService import MetricsService
+from typing import Optional
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class MetricsScrapePermission(BasePermission):
+    """
+    Admits admins and, when METRICS_BEARER_TOKEN is set, scrapers presenting it; without a token the endpoint is admin-only.
+    """
+
+    def has_permission(self, request, view):
+        if request.user and request.user.is_staff:
+            return True
+        token = settings.METRICS_BEARER_TOKEN
+        if not token:
+            return False
+        presented = request.META.get('HTTP_AUTHORIZATION', '')
+        return hmac.compare_digest(presented.encode(), f'Bearer {token}'.encode())
+
+
+class MetricsView(APIView):
+    """
+    Handles Prometheus scrapes of the metrics of every worker of this host.
+    """
+    permission_classes = [MetricsScrapePermission]
+
+    def __init__(self, metrics_service: Optional[MetricsService] = None, **kwargs):
+        """
+        Dependency injection for MetricsService.
+        """
+        super().__init__(**kwargs)
+        self.metrics_service = metrics_service or MetricsService()
+
+    @swagger_auto_schema(
+        responses={200: openapi.Response('Metrics in the Prometheus text exposition format'), 403: "Forbidden"}
+    )
+    def get(self, request):
+        """
+        Returns the counters and histograms of every process in the Prometheus text format.
+        """
+        return HttpResponse(self.metrics_service.render(), content_type=PROMETHEUS_CONTENT_TYPE)
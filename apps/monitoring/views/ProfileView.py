@@ -0,0 +1,60 @@
+from django.http import FileResponse
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
+from apps.monitoring.services.ProfilingService import ProfilingService
+from typing import Optional
+
+class ProfileListView(APIView):
+    """
+    Handles the list of stored request profiles for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, profiling_service: Optional[ProfilingService] = None, **kwargs):
+        """
+        Dependency injection for ProfilingService.
+        """
+        super().__init__(**kwargs)
+        self.profiling_service = profiling_service or ProfilingService()
+
+    @swagger_auto_schema(
+        responses={200: openapi.Response('Stored profiles with their request, duration and top functions'), 403: "Forbidden"}
+    )
+    def get(self, request):
+        """
+        Returns the stored profiles, newest first.
+        """
+        try:
+            return Response(self.profiling_service.list_reports(), status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class ProfileDownloadView(APIView):
+    """
+    Handles downloads of a stored profile's files for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, profiling_service: Optional[ProfilingService] = None, **kwargs):
+        """
+        Dependency injection for ProfilingService.
+        """
+        super().__init__(**kwargs)
+        self.profiling_service = profiling_service or ProfilingService()
+
+    @swagger_auto_schema(
+        responses={200: openapi.Response('The pstats dump (open with pstats or snakeviz) or the collapsed stacks (flamegraph.pl, speedscope)'), 404: "Not found"}
+    )
+    def get(self, request, report_id, kind):
+        """
+        Returns a profile's `pstats` or `collapsed` file.
+        """
+        path = self.profiling_service.get_report_path(report_id, kind)
+        if path is None:
+            return Response({"error": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{report_id}.{kind}')
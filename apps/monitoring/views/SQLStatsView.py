@@ -0,0 +1,39 @@
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
+from django.conf import settings
+from apps.monitoring.services.SQLInstrumentationService import SQLInstrumentationService
+from typing import Optional
+
+class SQLStatsView(APIView):
+    """
+    Handles the per-route SQL statistics of the instrumentation middleware for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, instrumentation_service: Optional[SQLInstrumentationService] = None, **kwargs):
+        """
+        Dependency injection for SQLInstrumentationService.
+        """
+        super().__init__(**kwargs)
+        self.instrumentation_service = instrumentation_service or SQLInstrumentationService()
+
+    @swagger_auto_schema(
+        responses={200: openapi.Response('Query counts, SQL time and repeated statements per route'), 403: "Forbidden"}
+    )
+    def get(self, request):
+        """
+        Returns the totals per route across every worker, routes with the most queries first.
+        """
+        try:
+            return Response({
+                'enabled': settings.SQL_INSTRUMENTATION_ENABLED,
+                'sample_rate': settings.SQL_INSTRUMENTATION_SAMPLE_RATE,
+                'n_plus_one_threshold': settings.SQL_N_PLUS_ONE_THRESHOLD,
+                'routes': self.instrumentation_service.get_summary(),
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
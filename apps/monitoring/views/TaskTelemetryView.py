@@ -0,0 +1,41 @@
+from rest_framework.views import APIView # type: ignore
+from rest_framework.response import Response # type: ignore
+from rest_framework import status # type: ignore
+from drf_yasg.utils import swagger_auto_schema # type: ignore
+from drf_yasg import openapi # type: ignore
+from rest_framework.permissions import IsAdminUser # type: ignore
+from django.conf import settings
+from apps.monitoring.services.TaskTelemetryService import TaskTelemetryService
+from typing import Optional
+
+class TaskTelemetryView(APIView):
+    """
+    Handles the rolling Celery task statistics for admins.
+    """
+    permission_classes = [IsAdminUser]
+
+    def __init__(self, telemetry_service: Optional[TaskTelemetryService] = None, **kwargs):
+        """
+        Dependency injection for TaskTelemetryService.
+        """
+        super().__init__(**kwargs)
+        self.telemetry_service = telemetry_service or TaskTelemetryService()
+
+    @swagger_auto_schema(
+        manual_parameters=[openapi.Parameter('minutes', openapi.IN_QUERY, description=f"Window length, at most {settings.TASK_TELEMETRY_WINDOW_MINUTES}", type=openapi.TYPE_INTEGER)],
+        responses={200: openapi.Response('Throughput, failure rate, queue wait, runtime and stage durations per task'), 400: "Bad Request"}
+    )
+    def get(self, request):
+        """
+        Returns per-task statistics across every worker over the last minutes, busiest task first.
+        """
+        try:
+            minutes = int(request.query_params.get('minutes', settings.TASK_TELEMETRY_WINDOW_MINUTES))
+        except ValueError:
+            return Response({"error": "minutes must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        if minutes < 1:
+            return Response({"error": "minutes must be positive."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response({'minutes': min(minutes, settings.TASK_TELEMETRY_WINDOW_MINUTES), 'tasks': self.telemetry_service.get_summary(minutes)}, status=status.HTTP_200_OK)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
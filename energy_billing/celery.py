@@ -1,5 +1,6 @@
 import os
 from celery import Celery # type: ignore
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init # type: ignore
 
 # Set the default Django settings module
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'energy_billing.settings')
@@ -12,6 +13,37 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Celery will auto-discover tasks from each Django app that has a tasks.py file
 app.autodiscover_tasks()
 
+@task_prerun.connect
+def reset_replica_pinning(**kwargs):
+    # Each task starts reading from the replicas again, like a fresh request
+    from energy_billing.db_router import unpin_from_primary
+    unpin_from_primary()
+
+@before_task_publish.connect
+def stamp_task_sent_at(headers=None, **kwargs):
+    # Lets the worker measure how long the task waited in the queue
+    from apps.monitoring.services.TaskTelemetryService import stamp_sent_at
+    if headers is not None:
+        stamp_sent_at(headers)
+
+@task_prerun.connect
+def start_task_telemetry(task_id=None, task=None, **kwargs):
+    from apps.monitoring.services.TaskTelemetryService import task_started
+    task_started(task_id, task)
+
+@task_postrun.connect
+def finish_task_telemetry(task_id=None, task=None, state=None, **kwargs):
+    from apps.monitoring.services.TaskTelemetryService import task_finished
+    task_finished(task_id, task, state)
+
+@worker_init.connect
+def preload_tariff_index(**kwargs):
+    # Build the tariff index in the parent so prefork children share its pages instead of each loading it
+    from django.db import connections
+    from apps.billing.services.TariffService import get_tariff_index
+    get_tariff_index()
+    connections.close_all()
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
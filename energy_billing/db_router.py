@@ -0,0 +1,120 @@
+"""
+Primary/replica database routing for the energy billing project.
+
+Reads (including repository aggregates) are spread across the aliases listed in
+``settings.DATABASE_REPLICAS``; writes and migrations always go to the primary.
+Once something has been written, later reads in the same request or Celery task
+stay on the primary so callers always see their own writes.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Iterator, List, Optional
+
+from django.conf import settings # type: ignore
+from django.db import connections # type: ignore
+
+PRIMARY_DB_ALIAS = 'default'
+
+_pinned_to_primary: ContextVar[bool] = ContextVar('pinned_to_primary', default=False)
+
+
+def pin_to_primary() -> None:
+    """
+    Send every following read in the current context to the primary.
+    """
+    _pinned_to_primary.set(True)
+
+
+def unpin_from_primary() -> None:
+    """
+    Allow reads in the current context to go to the replicas again.
+    """
+    _pinned_to_primary.set(False)
+
+
+def is_pinned_to_primary() -> bool:
+    """
+    Check whether reads in the current context are pinned to the primary.
+    """
+    return _pinned_to_primary.get()
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """
+    Context manager forcing reads inside the block to hit the primary.
+    """
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def get_replica_aliases() -> List[str]:
+    """
+    Returns the configured replica aliases that exist in ``settings.DATABASES``.
+    """
+    return [alias for alias in getattr(settings, 'DATABASE_REPLICAS', []) if alias in settings.DATABASES]
+
+
+class PrimaryReplicaRouter:
+    """
+    Routes reads to a random replica and writes to the primary, with read-your-writes stickiness.
+    """
+
+    def db_for_read(self, model: Any, **hints: Any) -> str:
+        """
+        Pick the database for a read query.
+
+        Returns:
+            str: The primary alias when pinned or inside a transaction, else a replica alias.
+        """
+        if is_pinned_to_primary() or connections[PRIMARY_DB_ALIAS].in_atomic_block:
+            return PRIMARY_DB_ALIAS
+        replicas = get_replica_aliases()
+        if not replicas:
+            return PRIMARY_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        """
+        Pick the database for a write query and pin the following reads to it.
+
+        Returns:
+            str: The primary alias.
+        """
+        pin_to_primary()
+        return PRIMARY_DB_ALIAS
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> Optional[bool]:
+        """
+        Relations are allowed between any aliases since replicas mirror the primary.
+        """
+        aliases = {PRIMARY_DB_ALIAS, *get_replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> bool:
+        """
+        Only the primary is migrated; replicas receive the schema through replication.
+        """
+        return db == PRIMARY_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    """
+    Resets replica pinning around every request so stickiness never leaks between requests.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        token = _pinned_to_primary.set(False)
+        try:
+            return self.get_response(request)
+        finally:
+            _pinned_to_primary.reset(token)
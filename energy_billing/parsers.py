@@ -0,0 +1,34 @@
+"""
+Fast JSON parsing for the project's API.
+
+``ORJSONParser`` decodes request bodies with orjson, falling back to DRF's ``JSONParser``
+when orjson is not installed and for bodies orjson rejects, so invalid input gets DRF's
+error messages. Unlike the stdlib parser, orjson reads integers beyond 64 bits as floats.
+"""
+import io
+from typing import Any, Mapping, Optional
+
+from django.conf import settings # type: ignore
+from rest_framework.parsers import JSONParser # type: ignore
+
+try:
+    import orjson # type: ignore
+except ImportError:  # pragma: no cover - orjson is optional, DRF's parser is the fallback
+    orjson = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON-serialized data with orjson, falling back to DRF's ``JSONParser``.
+    """
+
+    def parse(self, stream: Any, media_type: Optional[str] = None, parser_context: Optional[Mapping[str, Any]] = None) -> Any:
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            return orjson.loads(body if encoding.lower().replace('-', '') == 'utf8' else body.decode(encoding))
+        except (orjson.JSONDecodeError, UnicodeDecodeError):
+            # Let DRF parse or reject it, e.g. NaN is accepted with STRICT_JSON off
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,48 @@
+"""
+Fast JSON rendering for the project's API.
+
+``ORJSONRenderer`` encodes responses with orjson, which is several times faster than the
+stdlib encoder on large lists such as a year of consumption readings. The output matches
+DRF's ``JSONRenderer``: serializer fields already produce strings for decimals, dates and
+datetimes, and whatever orjson would encode differently (raw ``Decimal``, ``datetime``,
+lazy strings, querysets...) goes through the renderer's ``encoder_class``, DRF's encoder.
+Like DRF's renderer, the output escapes U+2028 and U+2029, which JavaScript string literals
+cannot contain. Without orjson, or for data it cannot encode (e.g. integers beyond 64 bits),
+DRF's renderer is used. Two differences remain: NaN and infinite floats render as null instead
+of raising, and floats with an exponent are written without its '+' and leading zeros ('1e16'
+rather than '1e+16'), the same value.
+"""
+from typing import Any, Mapping, Optional
+
+from rest_framework.renderers import JSONRenderer # type: ignore
+
+try:
+    import orjson # type: ignore
+except ImportError:  # pragma: no cover - orjson is optional, DRF's encoder is the fallback
+    orjson = None
+
+# Datetimes, dates and times are passed to DRF's encoder, which writes UTC as 'Z' and
+# microseconds as milliseconds; orjson's own formatting differs
+ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson is not None else 0
+# UTF-8 encodings of the line and paragraph separators, escaped as DRF's renderer does
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer which serializes to JSON with orjson, falling back to DRF's ``JSONRenderer``.
+    """
+
+    def render(self, data: Any, accepted_media_type: Optional[str] = None, renderer_context: Optional[Mapping[str, Any]] = None) -> bytes:
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        options = ORJSON_OPTIONS
+        # orjson only indents by two spaces; any requested indent gets that
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        try:
+            rendered = orjson.dumps(data, default=self.encoder_class().default, option=options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return rendered.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
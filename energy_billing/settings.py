@@ -11,8 +11,14 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 from pathlib import Path
+import json
 import os
 
+try:
+    from psycopg_pool import ConnectionPool # type: ignore
+except ImportError:  # pragma: no cover - without psycopg[pool] each request opens its own connection
+    ConnectionPool = None
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -49,18 +55,22 @@ INSTALLED_APPS = [
     'apps.consumption',
     'apps.billing',
     'apps.invoices',
+    'apps.monitoring',
 
     'django_celery_beat',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.monitoring.middleware.SQLInstrumentationMiddleware.SQLInstrumentationMiddleware',  # Opt-in, see SQL_INSTRUMENTATION_ENABLED
+    'energy_billing.db_router.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.monitoring.middleware.ProfilingMiddleware.ProfilingMiddleware',  # Admin requests with X-Profile: 1 or ?profile=1
 ]
 
 ROOT_URLCONF = 'energy_billing.urls'
@@ -95,9 +105,39 @@ DATABASES = {
         'PASSWORD': 'admin',
         'HOST': 'localhost',
         'PORT': '5432',
+        # Connections are reused through a psycopg pool, when installed, so persistent connections stay off.
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            'pool': {
+                'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+                'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+                'timeout': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+                'max_idle': 300,
+                'check': ConnectionPool.check_connection,  # Health check before handing out a connection
+            },
+        } if ConnectionPool is not None else {},
     }
 }
 
+# Read replicas, e.g. DB_REPLICA_HOSTS="replica1.internal,replica2.internal".
+# Each replica reuses the primary's settings with a different host.
+for index, replica_host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index + 1}'] = {
+        **DATABASES['default'],
+        'HOST': replica_host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Replicas with their own settings, as a JSON object of alias to Django database settings, e.g.
+# DB_REPLICAS='{"replica_east": {"ENGINE": "django.db.backends.postgresql", "NAME": "energy_billing_db", "HOST": "east.internal", "PORT": "5433"}}'.
+# Nothing is inherited from the primary; tests read the primary's test database through them.
+for replica_alias, replica_settings in json.loads(os.environ.get('DB_REPLICAS') or '{}').items():
+    DATABASES[replica_alias] = {'TEST': {'MIRROR': 'default'}, **replica_settings}
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['energy_billing.db_router.PrimaryReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -158,6 +198,166 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.invoices.tasks.send_overdue_invoice_reminder',
         'schedule': crontab(minute=0, hour='*'),  # Every hour
     },
+    'rebill-dirty-periods-hourly': {
+        'task': 'apps.billing.tasks.rebill_dirty_periods',
+        'schedule': crontab(minute=15, hour='*'),  # Every hour at :15
+    },
+    'maintain-consumption-partitions-daily': {
+        'task': 'apps.consumption.tasks.maintain_consumption_partitions',
+        'schedule': crontab(minute=30, hour=1),  # Every day at 01:30
+    },
+    'archive-closed-consumption-monthly': {
+        'task': 'apps.consumption.tasks.archive_closed_consumption',
+        'schedule': crontab(minute=0, hour=2, day_of_month=2),  # 2nd of every month at 02:00
+    },
+    'refresh-consumption-cache-every-10-minutes': {
+        'task': 'apps.consumption.tasks.refresh_consumption_cache',
+        'schedule': crontab(minute='*/10'),  # Every 10 minutes
+    },
+    'fill-consumption-gaps-nightly': {
+        'task': 'apps.consumption.tasks.fill_consumption_gaps',
+        'schedule': crontab(minute=30, hour=0),  # Every day at 00:30
+    },
+    'resume-user-deletions-every-5-minutes': {
+        'task': 'apps.authentication.tasks.resume_user_deletions',
+        'schedule': crontab(minute='*/5'),  # Every 5 minutes
+    },
+    'rebuild-consumption-cache-nightly': {
+        'task': 'apps.consumption.tasks.refresh_consumption_cache',
+        'schedule': crontab(minute=5, hour=3),  # Every day at 03:05, between two 10-minute refreshes
+        'kwargs': {'full': True},
+    },
+}
+
+# Monthly partitions of the consumption table (PostgreSQL only)
+CONSUMPTION_PARTITION_PREMAKE_MONTHS = 3  # Future months created ahead of time
+CONSUMPTION_PARTITION_RETENTION_MONTHS = None  # None keeps every partition attached
+CONSUMPTION_PARTITION_EXPIRED_ACTION = 'detach'  # 'detach' keeps the table, 'drop' deletes it
+
+# Cold storage of old consumption readings as compressed Parquet files (requires pyarrow)
+CONSUMPTION_ARCHIVE_ROOT = os.path.join(BASE_DIR, 'archive', 'consumption')
+CONSUMPTION_ARCHIVE_AFTER_MONTHS = 13  # Months of readings kept in the hot table
+CONSUMPTION_ARCHIVE_CHUNK_SIZE = 500000  # Readings per Parquet file
+CONSUMPTION_ARCHIVE_COMPRESSION = 'zstd'
+
+# Memory-mapped columnar cache of consumption readings for analytics workers (requires numpy)
+CONSUMPTION_COLUMNAR_CACHE_ROOT = os.path.join(BASE_DIR, 'cache', 'consumption')
+CONSUMPTION_COLUMNAR_SHARDS = 16
+
+# Validation stage run on every batch of incoming consumption readings (requires numpy)
+CONSUMPTION_READING_VALIDATORS = [
+    'apps.consumption.services.ConsumptionValidationService.ZScoreValidator',
+    'apps.consumption.services.ConsumptionValidationService.RateOfChangeValidator',
+    'apps.consumption.services.ConsumptionValidationService.DuplicateValidator',
+]
+CONSUMPTION_ANOMALY_ZSCORE = 4.0  # Standard deviations from the user's baseline before a reading is quarantined
+CONSUMPTION_ANOMALY_MIN_HISTORY = 14  # Readings a baseline needs before the z-score check applies
+CONSUMPTION_ANOMALY_MAX_CHANGE_RATIO = 10.0  # Max jump over the previous reading (or baseline mean)
+CONSUMPTION_BASELINE_WINDOW = 90  # Readings a rolling baseline covers (days of history when seeding)
+CONSUMPTION_BASELINE_CACHE = 'default'  # Cache alias for baselines; use a Redis cache to share them across workers
+
+# Nightly detection of missing daily readings and their estimation (requires numpy)
+CONSUMPTION_GAP_FILL_DAYS = 31  # Trailing days (up to yesterday) checked for missing readings
+CONSUMPTION_GAP_LOOKBACK_DAYS = 56  # Days of history before the period the estimator learns from
+CONSUMPTION_GAP_INTERPOLATE_MAX_DAYS = 3  # Longer gaps use the same-weekday average instead of interpolation
+CONSUMPTION_GAP_CHUNK_SIZE = 5000  # Users processed per chunk
+
+# Incremental re-billing of periods whose consumption changed after billing
+REBILLING_BATCH_SIZE = 1000  # Dirty (user, month) periods handled per run
+CONSUMPTION_VERSION_CACHE = 'default'  # Cache alias for per-user data versions; must be shared by every process
+
+# Effective-dated tariffs, looked up through a per-process interval index
+TARIFF_INDEX_CACHE = 'default'  # Cache alias holding the index stamp; use a shared cache (Redis) so every worker sees changes
+TARIFF_INDEX_RECHECK_SECONDS = 5  # How often a process checks whether its tariff index is stale
+
+# Bill what-if simulations against candidate tariffs (requires numpy)
+BILL_SIMULATION_CACHE = 'default'  # Cache alias for simulation results
+BILL_SIMULATION_CACHE_TIMEOUT = 24 * 3600  # Seconds; keys embed data and tariff versions, so entries never go stale
+BILL_SIMULATION_MAX_TARIFFS = 10  # Candidate tariffs accepted per request
+BILL_SIMULATION_MAX_DAYS = 3 * 366 + 1  # Longest simulated period
+
+# Per-user balance ledger reconciliation (reconcile_balances command)
+BALANCE_RECONCILE_CHUNK_SIZE = 5000  # Users rebuilt per chunk and transaction
+BALANCE_RECONCILE_WORKERS = 4  # Chunks rebuilt concurrently, each on its own database connection
+
+# Bank payment file imports (import_payments command and admin API)
+PAYMENT_IMPORT_BATCH_SIZE = 5000  # Payments matched and applied per transaction
+BULK_STATUS_UPDATE_MAX_IDS = 10000  # Bills or invoices per bulk status change request
+
+# Background user deletion
+USER_DELETION_BATCH_SIZE = 5000  # Rows removed per raw DELETE and transaction
+USER_DELETION_STALE_SECONDS = 300  # A running job without a heartbeat for this long is resumed by another worker
+
+# Per-request SQL instrumentation: query counts, SQL time and N+1 detection (opt-in)
+SQL_INSTRUMENTATION_ENABLED = os.environ.get('SQL_INSTRUMENTATION_ENABLED', '').lower() in ('1', 'true')
+SQL_INSTRUMENTATION_SAMPLE_RATE = float(os.environ.get('SQL_INSTRUMENTATION_SAMPLE_RATE', 1.0))  # Share of requests recorded
+SQL_N_PLUS_ONE_THRESHOLD = 5  # Runs of the same statement in one request that flag a likely N+1
+SQL_INSTRUMENTATION_CACHE = 'default'  # Cache alias the workers publish their totals to; use a shared cache (Redis) to see every worker
+SQL_INSTRUMENTATION_PUBLISH_SECONDS = 10  # How often a worker publishes its totals
+SQL_INSTRUMENTATION_SNAPSHOT_TIMEOUT = 24 * 3600  # Seconds a stopped worker's totals stay in the summary
+
+# Repository method tracing and the Prometheus /metrics endpoint
+REPOSITORY_TRACING_ENABLED = os.environ.get('REPOSITORY_TRACING_ENABLED', 'true').lower() in ('1', 'true')
+REPOSITORY_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # Seconds
+METRICS_MULTIPROC_DIR = os.environ.get('METRICS_MULTIPROC_DIR')  # Shared by a host's gunicorn and Celery processes; empty it on deploy
+METRICS_FLUSH_SECONDS = 5  # How often a process writes its snapshot to METRICS_MULTIPROC_DIR
+METRICS_BEARER_TOKEN = os.environ.get('METRICS_BEARER_TOKEN')  # Lets non-admin scrapers in; without it only admins can read /metrics
+
+# Celery task telemetry: queue wait, runtime, stages and failures per task
+TASK_TELEMETRY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)  # Seconds
+TASK_TELEMETRY_WINDOW_MINUTES = 60  # Rolling window of the admin summary
+TASK_TELEMETRY_CACHE = 'default'  # Cache alias the workers publish to; use a shared cache (Redis) so web processes see them
+TASK_TELEMETRY_PUBLISH_SECONDS = 10  # How often a worker process publishes its rolling statistics
+
+# On-demand profiling of single admin requests (X-Profile: 1 header or ?profile=1)
+PROFILING_ENABLED = os.environ.get('PROFILING_ENABLED', 'true').lower() in ('1', 'true')
+PROFILING_ROOT = os.path.join(BASE_DIR, 'profiles')  # Bounded store of pstats and collapsed-stack reports
+PROFILING_MAX_REPORTS = 50  # Oldest reports are evicted beyond this count...
+PROFILING_MAX_BYTES = 200 * 1024 * 1024  # ...or this total size
+PROFILING_SAMPLE_INTERVAL = 0.005  # Seconds between stack samples for the flame graph
+
+# Slow-query log: statements over the threshold are explained and stored for the admin, off by default
+SLOW_QUERY_LOG_ENABLED = os.environ.get('SLOW_QUERY_LOG_ENABLED', '').lower() in ('1', 'true')
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 500))
+SLOW_QUERY_SAMPLE_RATE = 0.2  # Share of slow statements explained; every one is counted in slow_queries_total
+SLOW_QUERY_THROTTLE_SECONDS = 600  # At most one capture per statement shape in this period
+SLOW_QUERY_CACHE = 'default'  # Cache alias holding the throttle keys; use a shared cache (Redis) to throttle across workers
+SLOW_QUERY_LOG_MAX_ROWS = 1000  # Oldest captures are deleted beyond this count
+
+# Django REST framework: JSON is rendered and parsed with orjson (DRF's own when orjson is not installed)
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'energy_billing.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'energy_billing.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+# Repository/service benchmarks (benchmark command), run in a throwaway test database
+BENCHMARK_ROOT = os.path.join(BASE_DIR, 'benchmarks')  # Baselines per database vendor and the results of each run
+BENCHMARK_REPEAT = 5  # Timed repetitions per case; the median is compared
+BENCHMARK_REGRESSION_THRESHOLD = 0.25  # Allowed slowdown of a median against the baseline
+BENCHMARK_MIN_DELTA_MS = 1.0  # Slowdowns below this are noise, whatever the ratio
+
+# In-process HTTP load tests (loadtest command); reports go to BENCHMARK_ROOT/loadtests
+LOAD_TEST_CONCURRENCY = 8  # Virtual users sending requests at once
+LOAD_TEST_REQUESTS = 2000  # Measured requests per interface
+LOAD_TEST_WARMUP = 200  # Unmeasured requests sent first
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        # Per-request SQL reports; the report dict is attached to each record as `sql`
+        'apps.monitoring': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
 }
 
 
@@ -0,0 +1,74 @@
+from unittest import mock
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import TransactionTestCase, override_settings
+from energy_billing.celery import reset_replica_pinning
+from energy_billing.db_router import (
+    PRIMARY_DB_ALIAS, PrimaryReplicaRouter, ReplicaPinningMiddleware, is_pinned_to_primary, pin_to_primary, unpin_from_primary, use_primary,
+)
+from apps.consumption.models.ConsumptionModel import Consumption
+
+
+@override_settings(DATABASE_REPLICAS=['replica_1', 'unconfigured'])
+class PrimaryReplicaRouterTest(TransactionTestCase):
+    def setUp(self):
+        # A second local alias; the router only routes to it, no query reaches it
+        replica = mock.patch.dict(settings.DATABASES, replica_1={'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:', 'TEST': {'MIRROR': 'default'}})
+        replica.start()
+        self.addCleanup(replica.stop)
+        self.router = PrimaryReplicaRouter()
+        unpin_from_primary()
+        self.addCleanup(unpin_from_primary)
+
+    def test_reads_go_to_a_configured_replica(self):
+        self.assertEqual({self.router.db_for_read(Consumption) for _ in range(20)}, {'replica_1'})
+
+    def test_reads_go_to_the_primary_without_replicas(self):
+        with override_settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(self.router.db_for_read(Consumption), PRIMARY_DB_ALIAS)
+
+    def test_writes_go_to_the_primary_and_pin_later_reads(self):
+        self.assertEqual(self.router.db_for_write(Consumption), PRIMARY_DB_ALIAS)
+
+        self.assertTrue(is_pinned_to_primary())
+        self.assertEqual(self.router.db_for_read(Consumption), PRIMARY_DB_ALIAS)
+
+    def test_reads_in_an_atomic_block_go_to_the_primary(self):
+        with transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Consumption), PRIMARY_DB_ALIAS)
+        self.assertEqual(self.router.db_for_read(Consumption), 'replica_1')
+
+    def test_use_primary_pins_only_inside_the_block(self):
+        with use_primary():
+            self.assertEqual(self.router.db_for_read(Consumption), PRIMARY_DB_ALIAS)
+        self.assertEqual(self.router.db_for_read(Consumption), 'replica_1')
+
+    def test_only_the_primary_is_migrated(self):
+        self.assertTrue(self.router.allow_migrate(PRIMARY_DB_ALIAS, 'consumption'))
+        self.assertFalse(self.router.allow_migrate('replica_1', 'consumption'))
+
+    def test_middleware_starts_each_request_unpinned_and_resets_after_it(self):
+        seen = []
+
+        def view(request):
+            seen.append(is_pinned_to_primary())
+            pin_to_primary()
+            return HttpResponse()
+
+        pin_to_primary()
+        ReplicaPinningMiddleware(view)(None)
+
+        self.assertEqual(seen, [False])
+        self.assertTrue(is_pinned_to_primary())
+        unpin_from_primary()
+        ReplicaPinningMiddleware(view)(None)
+        self.assertFalse(is_pinned_to_primary())
+
+    def test_celery_tasks_start_unpinned(self):
+        pin_to_primary()
+
+        reset_replica_pinning()
+
+        self.assertFalse(is_pinned_to_primary())
+        self.assertEqual(self.router.db_for_read(Consumption), 'replica_1')
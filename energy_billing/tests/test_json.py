@@ -0,0 +1,55 @@
+import io
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError # type: ignore
+from rest_framework.parsers import JSONParser # type: ignore
+from rest_framework.renderers import JSONRenderer # type: ignore
+from energy_billing.parsers import ORJSONParser
+from energy_billing.renderers import ORJSONRenderer
+
+PAYLOADS = [
+    {'id': 1, 'amount': '63.00', 'status': 'unpaid', 'consumption': [1, 2.5, None, True, False]},
+    [{'date': '2024-01-31', 'consumption': 12.345, 'unit': 'kWh'}] * 3,
+    {'note': 'line\u2028break and paragraph\u2029break', 'name': 'Zoë ⚡ 東京', 'escaped': 'quote " slash \\ tab \t'},
+    {'decimal': Decimal('10.50'), 'date': date(2024, 2, 29), 'time': time(7, 30, 15, 250000), 'uuid': uuid.UUID(int=1)},
+    {'utc': datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc), 'naive': datetime(2024, 5, 1, 12, 0)},
+    {'lazy': gettext_lazy('Bad Request'), 1: 'integer key', 'nested': {'empty': [], 'also_empty': {}}},
+    {'big': 2 ** 63 - 1, 'small': -(2 ** 63), 'beyond': 2 ** 70},
+]
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    def test_output_matches_drf(self):
+        for payload in PAYLOADS:
+            with self.subTest(payload=payload):
+                self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_line_and_paragraph_separators_are_escaped(self):
+        rendered = ORJSONRenderer().render({'note': 'a\u2028b\u2029c'})
+
+        self.assertEqual(rendered, b'{"note":"a\\u2028b\\u2029c"}')
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), JSONRenderer().render(None))
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': 'utf-8'})
+
+    def test_parsed_data_matches_drf(self):
+        for payload in PAYLOADS[:3]:
+            body = JSONRenderer().render(payload)
+            with self.subTest(body=body):
+                self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+    def test_invalid_bodies_are_rejected_as_by_drf(self):
+        for body in (b'{"unterminated": ', b'', b'\xff\xfe'):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(JSONParser(), body)
+                with self.assertRaises(ParseError):
+                    self.parse(ORJSONParser(), body)
@@ -19,6 +19,7 @@ from django.urls import path, include # type: ignore
 from drf_yasg.views import get_schema_view # type: ignore
 from drf_yasg import openapi # type: ignore
 from rest_framework import permissions # type: ignore
+from apps.monitoring.views.MetricsView import MetricsView
 
 # Swagger schema configuration
 schema_view = get_schema_view(
@@ -40,6 +41,8 @@ urlpatterns = [
     path('consumption/', include('apps.consumption.urls')),  # Consumption app URLs
     path('billing/', include('apps.billing.urls')),  # Billing app URLs
      path('invoices/', include('apps.invoices.urls')),  # Billing app URLs
+    path('monitoring/', include('apps.monitoring.urls')),  # Monitoring app URLs
+    path('metrics', MetricsView.as_view(), name='metrics'),  # Prometheus scrape target
     
     # Swagger and Redoc URLs
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),